@@ -234,7 +234,7 @@ class FileCache:
                 with open(cache_path, 'rb') as f:
                     entry_data = pickle.load(f)
                 
-                entry = CacheEntry(**entry_data['entry'])
+                entry = _file_cache_entry(entry_data)
                 
                 # 检查过期
                 if entry.is_expired():
@@ -267,13 +267,17 @@ class FileCache:
             
             try:
                 entry = CacheEntry(key=key, value=value, ttl=ttl)
+                # 值只保存一份（条目元信息不含值）
                 cache_data = {
-                    'entry': asdict(entry),
+                    'entry': entry.to_dict(),
                     'value': value
                 }
                 
-                with open(cache_path, 'wb') as f:
-                    pickle.dump(cache_data, f)
+                # 先写临时文件再替换，多个进程同时写入同一个键时读取方不会读到不完整的文件
+                temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+                with open(temp_path, 'wb') as f:
+                    pickle.dump(cache_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_path, cache_path)
                 
                 logger.debug(f"文件缓存已设置: {key}")
                 return True
@@ -282,6 +286,24 @@ class FileCache:
                 logger.error(f"写入文件缓存失败 {key}: {e}")
                 return False
     
+    def touch(self, key: str) -> bool:
+        """
+        更新缓存文件的修改时间（记录最近一次使用，供按未使用时间清理）
+        
+        Args:
+            key: 缓存键
+            
+        Returns:
+            是否更新成功
+        """
+        with self._lock:
+            try:
+                os.utime(self._get_cache_path(key))
+                return True
+            except OSError as e:
+                logger.debug(f"更新文件缓存时间失败 {key}: {e}")
+                return False
+    
     def delete(self, key: str) -> bool:
         """删除文件缓存"""
         with self._lock:
@@ -319,7 +341,7 @@ class FileCache:
                         with open(cache_file, 'rb') as f:
                             cache_data = pickle.load(f)
                         
-                        entry = CacheEntry(**cache_data['entry'])
+                        entry = _file_cache_entry(cache_data)
                         if entry.is_expired():
                             cache_file.unlink()
                             count += 1
@@ -335,6 +357,13 @@ class FileCache:
             return count
 
 
+def _file_cache_entry(cache_data: Dict) -> CacheEntry:
+    """由文件缓存数据还原缓存条目（兼容条目元信息中也保存了值的旧格式）"""
+    entry_fields = dict(cache_data['entry'])
+    entry_fields['value'] = cache_data.get('value')
+    return CacheEntry(**entry_fields)
+
+
 class CacheManager:
     """统一的缓存管理器 - 整合内存和文件缓存"""
     
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+重复文件识别
+多语言分支（cn/vn/en/th）中大量表格是逐字节相同的副本（各分支共用的配置表），
+目录扫描时每份内容只需扫描一次，结论按文件路径分发给所有相同内容的副本：
+- 先按文件大小分组：大小与之前所有文件都不同的文件一定是新内容，不读取文件
+- 出现相同大小的文件时才计算内容摘要（同组中较早的文件此时补算），摘要相同即为副本
+
+与目录遍历一样按发现顺序逐个登记，不需要预先知道全部文件
+"""
+
+import hashlib
+import os
+from typing import Any, Dict, List, Optional
+
+
+# 计算摘要时每次读取的字节数
+READ_SIZE = 1 << 20
+
+
+def file_digest(file_path, read_size: int = READ_SIZE) -> str:
+    """
+    计算文件内容摘要（BLAKE2b，128位）
+
+    Args:
+        file_path: 文件路径
+        read_size: 每次读取的字节数
+
+    Returns:
+        str: 十六进制摘要
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        while True:
+            chunk = f.read(read_size)
+            if not chunk:
+                return digest.hexdigest()
+            digest.update(chunk)
+
+
+class DuplicateFileIndex:
+    """按内容识别重复文件，并保存每份内容的扫描结论"""
+
+    def __init__(self):
+        # 文件大小 -> 该大小的文件路径（按登记顺序）
+        self._by_size: Dict[int, List[str]] = {}
+        self._registered = set()
+        # 文件路径 -> 内容摘要（只为存在同大小文件的路径计算）
+        self._digests: Dict[str, str] = {}
+        # 内容摘要 -> 第一个具有该内容的文件路径
+        self._first_by_digest: Dict[str, str] = {}
+        # 文件路径 -> 扫描结论
+        self._results: Dict[str, Any] = {}
+        # 统计：计算过摘要的文件数/字节数，复用了之前扫描结论的副本数及其字节数
+        self.files_hashed = 0
+        self.bytes_hashed = 0
+        self.duplicates = 0
+        self.duplicate_bytes = 0
+
+    def _digest(self, path: str, size: int) -> str:
+        digest = self._digests.get(path)
+        if digest is None:
+            digest = file_digest(path)
+            self._digests[path] = digest
+            self._first_by_digest.setdefault(digest, path)
+            self.files_hashed += 1
+            self.bytes_hashed += size
+        return digest
+
+    def register(self, file_path, stat: Optional[os.stat_result] = None) -> Optional[str]:
+        """
+        登记一个文件，返回之前登记过的相同内容文件的路径
+
+        Args:
+            file_path: 文件路径
+            stat: 文件的 stat（未提供时重新获取）
+
+        Returns:
+            Optional[str]: 内容相同的第一个文件路径；是新内容（或无法读取）时返回None
+        """
+        path = str(file_path)
+        if path in self._registered:
+            return None
+        self._registered.add(path)
+        size = (stat if stat is not None else os.stat(path)).st_size
+        same_size = self._by_size.setdefault(size, [])
+        same_size.append(path)
+        if len(same_size) == 1:
+            return None
+
+        for earlier in list(same_size):
+            try:
+                self._digest(earlier, size)
+            except OSError:
+                # 读取失败的文件不参与比较（当前文件读取失败时按新内容处理）
+                same_size.remove(earlier)
+                if earlier == path:
+                    return None
+
+        source = self._first_by_digest[self._digests[path]]
+        return source if source != path else None
+
+    def record_reuse(self, size: int) -> None:
+        """
+        统计一个复用了之前扫描结论（或仍在扫描中的同一个任务）的副本
+
+        Args:
+            size: 副本的字节数
+        """
+        self.duplicates += 1
+        self.duplicate_bytes += size
+
+    def store(self, file_path, result: Any) -> None:
+        """
+        保存文件的扫描结论（供之后相同内容的副本复用）
+
+        Args:
+            file_path: 文件路径
+            result: 扫描结论，或生成结论的无参函数（只在出现相同内容的副本时才调用，
+                    大多数文件没有副本，不必为每个文件展开完整的结论）
+        """
+        path = str(file_path)
+        self._results[path] = result
+        digest = self._digests.get(path)
+        if digest is not None and self._first_by_digest[digest] not in self._results:
+            # 同内容的第一个文件没有结论（如无法读取）时，之后的副本改为复用本文件的结论
+            self._first_by_digest[digest] = path
+
+    def get(self, file_path) -> Optional[Any]:
+        """获取已保存的扫描结论（保存的是函数时在此生成，之后的副本直接复用）"""
+        path = str(file_path)
+        result = self._results.get(path)
+        if callable(result):
+            result = result()
+            self._results[path] = result
+        return result
+
+    def lookup(self, file_path, stat: Optional[os.stat_result] = None) -> Optional[Any]:
+        """
+        登记文件，若之前扫描过相同内容的文件则返回其扫描结论（并计为复用的副本）
+
+        Args:
+            file_path: 文件路径
+            stat: 文件的 stat
+
+        Returns:
+            Optional[Any]: 相同内容文件的扫描结论；需要扫描时返回None
+        """
+        if stat is None:
+            stat = os.stat(str(file_path))
+        source = self.register(file_path, stat)
+        result = self.get(source) if source is not None else None
+        if result is not None:
+            self.record_reuse(stat.st_size)
+        return result
+
+    def summary(self) -> Dict:
+        """
+        重复文件统计
+
+        Returns:
+            Dict: 副本数、副本字节数、计算摘要的文件数与字节数
+        """
+        return {
+            'duplicate_files': self.duplicates,
+            'duplicate_bytes': self.duplicate_bytes,
+            'files_hashed': self.files_hashed,
+            'bytes_hashed': self.bytes_hashed
+        }
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+目录文件发现
+后台线程用 os.scandir 遍历目录，把 (路径, stat) 流式送入有界队列；
+调用方边发现边处理，文件计数也直接来自这一次遍历，不再重复 glob
+"""
+
+import os
+import queue
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# 队列容量：发现线程最多领先处理方的文件数
+DEFAULT_QUEUE_SIZE = 256
+
+# 队列结束标记
+_DONE = object()
+
+
+class FileDiscovery:
+    """后台目录遍历（单次使用的迭代器）"""
+
+    def __init__(self, root, extensions: Optional[Iterable[str]] = None, recursive: bool = True,
+                 queue_size: int = DEFAULT_QUEUE_SIZE, breadth_first: bool = False,
+                 exclude_dirs: Optional[Iterable] = None):
+        """
+        初始化目录遍历
+
+        Args:
+            root: 要遍历的目录
+            extensions: 需要的扩展名（如 {'.xlsx', '.xls'}，不区分大小写；None 表示全部文件）
+            recursive: 是否递归子目录
+            queue_size: 有界队列容量
+            breadth_first: 是否按层遍历（浅层目录的文件先产出），默认先序深度优先
+            exclude_dirs: 不进入的子目录（如位于输入目录内的输出目录，避免边写边发现）
+        """
+        self.root = Path(root)
+        self.extensions = {ext.lower() for ext in extensions} if extensions is not None else None
+        self.recursive = recursive
+        self.breadth_first = breadth_first
+        self.exclude_dirs = {os.path.realpath(path) for path in exclude_dirs or ()}
+        # 按扩展名统计的匹配文件数、匹配文件总数与总大小（遍历过程中持续更新）
+        self.counts: Dict[str, int] = {}
+        self.discovered = 0
+        self.total_size = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, queue_size))
+        self._stop = threading.Event()
+        self._finished = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def finished(self) -> bool:
+        """遍历是否已经结束（此时计数为最终值）"""
+        return self._finished.is_set()
+
+    def start(self) -> "FileDiscovery":
+        """启动后台遍历线程（重复调用无副作用）"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._walk, name="file-discovery", daemon=True)
+            self._thread.start()
+        return self
+
+    def _put(self, item) -> bool:
+        """放入队列；处理方已停止时放弃"""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _walk(self) -> None:
+        """遍历线程：同一目录内按名称排序，保证结果顺序稳定"""
+        try:
+            pending = deque([self.root])
+            while pending and not self._stop.is_set():
+                directory = pending.popleft() if self.breadth_first else pending.pop()
+                try:
+                    with os.scandir(directory) as iterator:
+                        entries = sorted(iterator, key=lambda entry: entry.name)
+                except OSError:
+                    # 无权限或已被删除的目录直接跳过（与 os.walk 默认行为一致）
+                    continue
+
+                subdirectories = []
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not self.exclude_dirs or os.path.realpath(entry.path) not in self.exclude_dirs:
+                                subdirectories.append(Path(entry.path))
+                            continue
+                        if not entry.is_file():
+                            continue
+                        suffix = os.path.splitext(entry.name)[1].lower()
+                        if self.extensions is not None and suffix not in self.extensions:
+                            continue
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    self.counts[suffix] = self.counts.get(suffix, 0) + 1
+                    self.discovered += 1
+                    self.total_size += stat.st_size
+                    if not self._put((Path(entry.path), stat)):
+                        return
+
+                if self.recursive:
+                    pending.extend(subdirectories if self.breadth_first else reversed(subdirectories))
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._finished.set()
+            self._put(_DONE)
+
+    def __iter__(self) -> Iterator[Tuple[Path, os.stat_result]]:
+        self.start()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _DONE:
+                    break
+                yield item
+            if self._error is not None:
+                raise self._error
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """停止遍历（处理方提前结束时调用，释放被队列阻塞的遍历线程）"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def collect(self) -> List[Tuple[Path, os.stat_result]]:
+        """遍历完成后一次性返回全部 (路径, stat)"""
+        return list(self)
+
+    def progress_total(self) -> str:
+        """进度显示用的总数（遍历未结束时带"+"）"""
+        return str(self.discovered) if self.finished else f"{self.discovered}+"
+
+
+def discover_files(root, extensions: Optional[Iterable[str]] = None, recursive: bool = True,
+                   queue_size: int = DEFAULT_QUEUE_SIZE, breadth_first: bool = False,
+                   exclude_dirs: Optional[Iterable] = None) -> FileDiscovery:
+    """
+    启动后台目录遍历
+
+    Args:
+        root: 要遍历的目录
+        extensions: 需要的扩展名（不区分大小写；None 表示全部文件）
+        recursive: 是否递归子目录
+        queue_size: 有界队列容量
+        breadth_first: 是否按层遍历（浅层目录的文件先产出）
+        exclude_dirs: 不进入的子目录
+
+    Returns:
+        FileDiscovery: 可迭代得到 (路径, stat) 的遍历对象，遍历线程已启动
+    """
+    return FileDiscovery(root, extensions, recursive, queue_size, breadth_first, exclude_dirs).start()
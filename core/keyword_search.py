@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多关键词搜索
+把成千上万个字面关键词（禁用词、占位符如 "{0}"、术语等）编译为一个前缀树正则，
+每个单元格只扫描一遍就能判断是否命中任意关键词；另外可附加少量正则规则（如残留中文）。
+
+KeywordDetector 提供与 VietnameseDetector 相同的检测器接口，交给 ExcelScanEngine 即为关键词搜索模式，
+结果仍是 FindingBatch（"语言类型"一列为命中的关键词），沿用现有的报告/命令行输出
+
+用法:
+    matcher = KeywordMatcher({'{0}': '占位符', '傻瓜': '禁用词'}, patterns={'残留中文': LEFTOVER_CHINESE_PATTERN})
+    processor = VietnameseExcelProcessor(detector=KeywordDetector(matcher))
+    results = processor.scan_directory("越南文版本/表格")
+"""
+
+import hashlib
+import json
+import re
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+# 残留中文（与 VietnameseDetector.chinese_patterns 的范围一致）
+LEFTOVER_CHINESE_PATTERN = r'[\u4e00-\u9fff\u3400-\u4dbf\uf900-\ufaff]'
+
+# 未指定类别的关键词使用的类别名
+DEFAULT_CATEGORY = "关键词"
+
+# 前缀树中标记"到此为一个完整关键词"的键
+_END = ''
+
+
+def _nfc(text: str) -> str:
+    """规范化到 NFC（纯ASCII或已是NFC的文本直接返回）"""
+    if text.isascii() or unicodedata.is_normalized('NFC', text):
+        return text
+    return unicodedata.normalize('NFC', text)
+
+
+def _trie_regex(node: Dict) -> str:
+    """
+    把前缀树转换为正则：公共前缀只出现一次，分支按字符排序，
+    完整关键词节点的后续分支为贪婪可选组，因此每个起点总是匹配最长的关键词
+    """
+    single_chars = []
+    branches = []
+    for char in sorted(key for key in node if key != _END):
+        child = node[char]
+        if list(child) == [_END]:
+            single_chars.append(char)
+        else:
+            branches.append(re.escape(char) + _trie_regex(child))
+
+    if single_chars:
+        if len(single_chars) == 1:
+            branches.append(re.escape(single_chars[0]))
+        else:
+            branches.append('[' + ''.join(re.escape(char) for char in single_chars) + ']')
+
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if _END in node:
+        return f'(?:{body})?'
+    return body
+
+
+class KeywordMatcher:
+    """多关键词匹配器（前缀树正则 + 可选正则规则，一次扫描判断是否命中）"""
+
+    def __init__(self, keywords: Union[Iterable[str], Mapping[str, str]],
+                 patterns: Optional[Mapping[str, str]] = None, ignore_case: bool = False):
+        """
+        编译关键词
+
+        Args:
+            keywords: 关键词列表，或 关键词 -> 类别 的映射（空字符串被忽略）
+            patterns: 附加的正则规则 类别 -> 正则（如残留中文）
+            ignore_case: 是否忽略大小写
+        """
+        if not isinstance(keywords, Mapping):
+            keywords = {keyword: DEFAULT_CATEGORY for keyword in keywords}
+        self.ignore_case = ignore_case
+        self.patterns = dict(patterns or {})
+
+        # 关键词统一为 NFC；忽略大小写时以小写形式作为查找键
+        self.categories: Dict[str, str] = {}
+        self._lookup: Dict[str, str] = {}
+        for keyword, category in keywords.items():
+            keyword = _nfc(str(keyword))
+            if not keyword:
+                continue
+            key = keyword.lower() if ignore_case else keyword
+            if key not in self._lookup:
+                self._lookup[key] = keyword
+                self.categories[keyword] = category or DEFAULT_CATEGORY
+
+        # 构建前缀树，并记录每个关键词的"也是关键词的前缀"（用于找出同一起点的全部关键词）
+        trie: Dict = {}
+        for key in self._lookup:
+            node = trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node[_END] = True
+        self._prefixes: Dict[str, List[str]] = {}
+        for key in self._lookup:
+            node = trie
+            prefixes = []
+            for index, char in enumerate(key[:-1], 1):
+                node = node[char]
+                if _END in node:
+                    prefixes.append(key[:index])
+            self._prefixes[key] = prefixes[::-1]
+
+        flags = re.IGNORECASE if ignore_case else 0
+        keyword_regex = _trie_regex(trie)
+        self.keyword_pattern = re.compile(keyword_regex, flags) if keyword_regex else None
+        # 前瞻匹配：每个起点都尝试一次，重叠的关键词也能找出
+        self._overlapping_pattern = re.compile(f'(?=({keyword_regex}))', flags) if keyword_regex else None
+        self.rule_patterns = {category: re.compile(pattern, flags) for category, pattern in self.patterns.items()}
+
+        # 合并后的正则：关键词与全部附加规则，判定命中只需一次搜索
+        alternatives = [keyword_regex] if keyword_regex else []
+        alternatives += [f'(?:{pattern})' for pattern in self.patterns.values()]
+        # 没有任何关键词/规则时使用永不匹配的正则
+        self.pattern = re.compile('|'.join(alternatives) if alternatives else r'(?!)', flags)
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def signature(self) -> str:
+        """关键词集合的摘要（写入扫描进度日志头，关键词变化后旧日志不再适用）"""
+        data = json.dumps([sorted(self.categories.items()), sorted(self.patterns.items()), self.ignore_case],
+                          ensure_ascii=False)
+        return hashlib.md5(data.encode('utf-8')).hexdigest()
+
+    def search(self, text: str) -> bool:
+        """
+        判断文本是否命中任意关键词或规则
+
+        Args:
+            text: 要检查的文本
+
+        Returns:
+            bool: 是否命中
+        """
+        return self.pattern.search(_nfc(text)) is not None
+
+    def find_all(self, text: str) -> List[Tuple[int, str]]:
+        """
+        找出文本中全部关键词的出现位置（包括重叠的关键词，如 "kiếm" 与 "thanh kiếm sắt" 中的 "kiếm sắt"）
+
+        Args:
+            text: 要检查的文本（按 NFC 规范化后计算位置）
+
+        Returns:
+            List[Tuple[int, str]]: (起始位置, 关键词) 列表，按起始位置、关键词长度排序
+        """
+        if self._overlapping_pattern is None:
+            return []
+        text = _nfc(text)
+        found = []
+        for match in self._overlapping_pattern.finditer(text):
+            # 每个起点匹配到的是最长关键词，同一起点的其他关键词都是它的前缀
+            key = match.group(1).lower() if self.ignore_case else match.group(1)
+            if key not in self._lookup:
+                # 忽略大小写时个别字符的大小写折叠与 str.lower 不一致，无法对应回关键词
+                continue
+            start = match.start()
+            for prefix in reversed(self._prefixes[key]):
+                found.append((start, self._lookup[prefix]))
+            found.append((start, self._lookup[key]))
+        return found
+
+    def matches(self, text: str) -> Dict[str, List[str]]:
+        """
+        按类别汇总文本命中的关键词与规则
+
+        Args:
+            text: 要检查的文本
+
+        Returns:
+            Dict[str, List[str]]: 类别 -> 命中的关键词（去重，按首次出现顺序）；规则命中时为匹配到的文本
+        """
+        text = _nfc(text)
+        result: Dict[str, List[str]] = {}
+        for _, keyword in self.find_all(text):
+            keywords = result.setdefault(self.categories[keyword], [])
+            if keyword not in keywords:
+                keywords.append(keyword)
+        for category, pattern in self.rule_patterns.items():
+            found = list(dict.fromkeys(match.group(0) for match in pattern.finditer(text)))
+            if found:
+                result.setdefault(category, []).extend(value for value in found
+                                                       if value not in result[category])
+        return result
+
+    def describe(self, text: str) -> str:
+        """
+        命中情况的文字描述（写入报告的"匹配关键词"列）
+
+        Args:
+            text: 要检查的文本
+
+        Returns:
+            str: 如 "占位符: {0}、{1}; 禁用词: 傻瓜"
+        """
+        return '; '.join(f"{category}: {'、'.join(values)}" for category, values in self.matches(text).items())
+
+
+class KeywordDetector:
+    """
+    关键词检测器：提供扫描引擎使用的检测器接口（与 VietnameseDetector 的方法名相同），
+    传给 ExcelScanEngine / VietnameseExcelProcessor 即为关键词搜索模式
+    """
+
+    # 关键词可能是纯ASCII（如占位符），扫描引擎不能使用只针对越南文的预筛选和ASCII快速跳过
+    non_ascii_only = False
+    # 报告最后两列的表头（替换 "越南文内容"、"语言类型"）
+    report_columns = ('单元格内容', '匹配关键词')
+
+    def __init__(self, matcher: KeywordMatcher):
+        """
+        Args:
+            matcher: 关键词匹配器
+        """
+        self.matcher = matcher
+        self.combined_pattern = matcher.pattern
+
+    def signature(self) -> Dict:
+        """扫描进度日志头中的检测器信息"""
+        return {'keywords': self.matcher.signature()}
+
+    def contains_vietnamese(self, text: str) -> bool:
+        """单元格是否命中任意关键词或规则"""
+        return self.matcher.search(text)
+
+    def contains_vietnamese_array(self, values: np.ndarray) -> np.ndarray:
+        """
+        向量化检测一维数组：先去重，只检测唯一值，再按编码广播回原数据
+
+        Args:
+            values: 单元格值数组（空值视为不命中，其余值按 str() 检测）
+
+        Returns:
+            np.ndarray: 与输入等长的布尔掩码
+        """
+        codes, uniques = pd.factorize(values)
+        search = self.matcher.search
+        flags = np.fromiter((search(str(value)) for value in uniques), dtype=bool, count=len(uniques))
+        return np.append(flags, False)[codes]
+
+    def detect_language_type(self, text: str) -> str:
+        """命中的关键词描述（写入结果的"语言类型"字段）"""
+        return self.matcher.describe(text)
+
+
+def load_keywords(file_path) -> Dict[str, str]:
+    """
+    读取关键词文件：每行一个关键词，"[类别]" 行开始一个新类别，空行忽略
+
+    例如:
+        [占位符]
+        {0}
+        {1}
+        [禁用词]
+        傻瓜
+
+    Args:
+        file_path: 关键词文件路径（UTF-8，可带BOM）
+
+    Returns:
+        Dict[str, str]: 关键词 -> 类别
+    """
+    keywords: Dict[str, str] = {}
+    category = DEFAULT_CATEGORY
+    with open(Path(file_path), 'r', encoding='utf-8-sig') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if len(line) > 2 and line.startswith('[') and line.endswith(']'):
+                category = line[1:-1].strip() or DEFAULT_CATEGORY
+                continue
+            keywords.setdefault(line, category)
+    return keywords
@@ -8,18 +8,52 @@
 import os
 import re
 import sys
+import threading
 import unicodedata
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Set
+from typing import Dict, List, Optional, Set
+import numpy as np
 import pandas as pd
 import openpyxl
 from openpyxl import load_workbook
 
+try:
+    from .prefilter import xlsx_may_contain_vietnamese, csv_contains_vietnamese
+    from .file_discovery import discover_files
+    from .scan_journal import ScanJournal, default_journal_path
+    from .duplicate_files import DuplicateFileIndex
+    from .script_detector import (script_bits, MAX_SCRIPTS, CJK_MASK, SCRIPT_COMBINING,
+                                  SCRIPT_LATIN_BASIC, SCRIPT_VIETNAMESE)
+except ImportError:
+    from prefilter import xlsx_may_contain_vietnamese, csv_contains_vietnamese
+    from file_discovery import discover_files
+    from scan_journal import ScanJournal, default_journal_path
+    from duplicate_files import DuplicateFileIndex
+    from script_detector import (script_bits, MAX_SCRIPTS, CJK_MASK, SCRIPT_COMBINING,
+                                 SCRIPT_LATIN_BASIC, SCRIPT_VIETNAMESE)
+
+
+# 文本分类位（取自共用的文字体系位集合，越南文位表示规范化后的最终检测结论）
+VIETNAMESE_BIT = SCRIPT_VIETNAMESE
+CHINESE_BIT = CJK_MASK
+ENGLISH_BIT = SCRIPT_LATIN_BASIC
+# 文字体系位之上保存语言类型编号（0 表示尚未计算）
+_LANGUAGE_SHIFT = MAX_SCRIPTS
+_SCRIPTS_MASK = (1 << MAX_SCRIPTS) - 1
+LANGUAGE_TYPES = ("英文", "越南文", "中文", "中越混合", "越英混合", "其他")
+
 
 class VietnameseDetector:
     """越南文检测器"""
     
-    def __init__(self):
+    def __init__(self, memo_size: int = 65536):
+        """
+        初始化越南文检测器
+        
+        Args:
+            memo_size: 检测结果备忘表容量（按单元格字符串缓存，LRU淘汰；0 表示不缓存）
+        """
         # 越南文字符范围
         self.vietnamese_patterns = [
             # 基本拉丁字母 + 越南语声调符号
@@ -56,6 +90,107 @@ class VietnameseDetector:
         
         # 编译中文字符正则表达式
         self.chinese_compiled_patterns = [re.compile(pattern) for pattern in self.chinese_patterns]
+        # 分解写法规则需要判断字符相邻关系，只在文本含组合音标时才执行
+        self.decomposed_pattern = re.compile(self.vietnamese_patterns[-1], re.IGNORECASE)
+        
+        # 检测结果备忘表：单元格字符串 -> 分类位（表格中的物品名、技能描述等大量重复）
+        self.memo_size = memo_size
+        self._memo: "OrderedDict[str, int]" = OrderedDict()
+        self._memo_lock = threading.Lock()
+        self.memo_hits = 0
+        self.memo_misses = 0
+    
+    def _compute_bits(self, text: str) -> int:
+        """计算文本的文字体系位集合（不经过备忘表），越南文位替换为最终检测结论"""
+        bits = script_bits(text)
+        vietnamese = self._contains_vietnamese_uncached(text, bits)
+        bits &= ~VIETNAMESE_BIT
+        return bits | VIETNAMESE_BIT if vietnamese else bits
+    
+    def _contains_vietnamese_uncached(self, text: str, bits: Optional[int] = None) -> bool:
+        """
+        越南文检测（不经过备忘表）
+        
+        依次尝试：纯ASCII直接判否 -> 已是NFC则免规范化 -> 文字体系位判断，
+        只有确实不是NFC的文本才执行 unicodedata.normalize
+        
+        Args:
+            text: 要检测的文本
+            bits: 已计算好的原文文字体系位集合（可选，避免重复遍历）
+        """
+        if text.isascii():
+            return False
+        if unicodedata.is_normalized('NFC', text):
+            if bits is None:
+                bits = script_bits(text)
+        else:
+            # 规范化到 NFC，兼容分解写法
+            text = unicodedata.normalize('NFC', text)
+            bits = script_bits(text)
+        if bits & SCRIPT_VIETNAMESE:
+            return True
+        # 规范化后仍残留的"字母+组合音标"
+        return bool(bits & SCRIPT_COMBINING) and self.decomposed_pattern.search(text) is not None
+    
+    def _classify(self, text: str) -> int:
+        """
+        获取文本的分类位（LRU备忘）
+        
+        Args:
+            text: 要检测的文本
+            
+        Returns:
+            int: 文字体系位集合，高位可能带有已计算的语言类型编号
+        """
+        if not self.memo_size:
+            return self._compute_bits(text)
+        
+        memo = self._memo
+        with self._memo_lock:
+            bits = memo.get(text)
+            if bits is not None:
+                memo.move_to_end(text)
+                self.memo_hits += 1
+                return bits
+            self.memo_misses += 1
+        
+        bits = self._compute_bits(text)
+        self._memo_store(text, bits)
+        return bits
+    
+    def _memo_store(self, text: str, bits: int) -> None:
+        """写入备忘表，超出容量时淘汰最久未使用的条目"""
+        if not self.memo_size:
+            return
+        memo = self._memo
+        with self._memo_lock:
+            memo[text] = bits
+            memo.move_to_end(text)
+            while len(memo) > self.memo_size:
+                memo.popitem(last=False)
+    
+    def memo_stats(self) -> Dict:
+        """
+        获取备忘表统计
+        
+        Returns:
+            Dict: 命中数、未命中数、当前条目数、容量、命中率
+        """
+        total = self.memo_hits + self.memo_misses
+        return {
+            'hits': self.memo_hits,
+            'misses': self.memo_misses,
+            'size': len(self._memo),
+            'max_size': self.memo_size,
+            'hit_rate': self.memo_hits / total if total else 0.0
+        }
+    
+    def clear_memo(self) -> None:
+        """清空备忘表和统计"""
+        with self._memo_lock:
+            self._memo.clear()
+            self.memo_hits = 0
+            self.memo_misses = 0
     
     def contains_vietnamese(self, text: str) -> bool:
         """
@@ -69,15 +204,73 @@ class VietnameseDetector:
         """
         if not isinstance(text, str):
             return False
-        
-        # 规范化到 NFC，兼容分解写法
-        normalized = unicodedata.normalize('NFC', text)
-        # 快速 ASCII 过滤：纯 ASCII 文本直接判否
-        if all(ord(ch) < 128 for ch in normalized):
+        # 快速 ASCII 过滤：纯 ASCII 文本直接判否，无需规范化和查备忘表
+        if text.isascii():
             return False
+        if not self.memo_size:
+            return self._contains_vietnamese_uncached(text)
         
-        # 先用合并正则快速判断
-        return bool(self.combined_pattern.search(normalized))
+        return bool(self._classify(text) & VIETNAMESE_BIT)
+    
+    def scripts(self, text: str) -> int:
+        """
+        获取文本包含的文字体系位集合（与越南文检测共用一次遍历和备忘表）
+        
+        Args:
+            text: 要检测的文本
+            
+        Returns:
+            int: 文字体系位集合（见 script_detector 中的 SCRIPT_* 常量）
+        """
+        if not isinstance(text, str):
+            return 0
+        return self._classify(text) & _SCRIPTS_MASK
+    
+    def contains_script(self, text: str, mask: int) -> bool:
+        """
+        检测文本是否包含指定文字体系（如泰文 SCRIPT_THAI）
+        
+        Args:
+            text: 要检测的文本
+            mask: 文字体系位（可用 | 组合多个）
+            
+        Returns:
+            bool: 是否包含
+        """
+        return bool(self.scripts(text) & mask)
+    
+    def contains_vietnamese_series(self, series: pd.Series) -> pd.Series:
+        """
+        向量化检测一列数据：先去重，只检测唯一值，再按编码广播回原列
+        
+        Args:
+            series: 单元格数据（空值视为不包含越南文，其余值按 str() 检测）
+            
+        Returns:
+            pd.Series: 与原列索引一致的布尔掩码
+        """
+        codes, uniques = pd.factorize(series)
+        return pd.Series(self._broadcast_flags(codes, uniques), index=series.index)
+    
+    def contains_vietnamese_array(self, values: np.ndarray) -> np.ndarray:
+        """
+        向量化检测一维数组（如按行分块读取的单元格值展平后的数组）
+        
+        Args:
+            values: 单元格值数组（空值视为不包含越南文，其余值按 str() 检测）
+            
+        Returns:
+            np.ndarray: 与输入等长的布尔掩码
+        """
+        codes, uniques = pd.factorize(values)
+        return self._broadcast_flags(codes, uniques)
+    
+    def _broadcast_flags(self, codes: np.ndarray, uniques) -> np.ndarray:
+        """只检测 factorize 得到的唯一值，再按编码广播回原数据"""
+        flags = np.fromiter((self.contains_vietnamese(str(value)) for value in uniques),
+                            dtype=bool, count=len(uniques))
+        # 空值的编码为 -1，广播前先补一个 False
+        return np.append(flags, False)[codes]
     
     def contains_chinese(self, text: str) -> bool:
         """
@@ -92,11 +285,7 @@ class VietnameseDetector:
         if not isinstance(text, str):
             return False
             
-        # 检查所有中文模式
-        for pattern in self.chinese_compiled_patterns:
-            if pattern.search(text):
-                return True
-        return False
+        return bool(self._classify(text) & CHINESE_BIT)
     
     def contains_english(self, text: str) -> bool:
         """
@@ -112,8 +301,7 @@ class VietnameseDetector:
             return False
         
         # 英文字符范围：基本拉丁字母
-        english_pattern = re.compile(r'[a-zA-Z]')
-        return bool(english_pattern.search(text))
+        return bool(self._classify(text) & ENGLISH_BIT)
     
     def detect_language_type(self, text: str) -> str:
         """
@@ -128,9 +316,20 @@ class VietnameseDetector:
         if not isinstance(text, str) or not text.strip():
             return "其他"
         
-        has_vietnamese = self.contains_vietnamese(text)
-        has_chinese = self.contains_chinese(text)
-        has_english = self.contains_english(text)
+        bits = self._classify(text)
+        language_index = bits >> _LANGUAGE_SHIFT
+        if language_index:
+            return LANGUAGE_TYPES[language_index - 1]
+        
+        language_type = self._compute_language_type(text, bits)
+        self._memo_store(text, bits | ((LANGUAGE_TYPES.index(language_type) + 1) << _LANGUAGE_SHIFT))
+        return language_type
+    
+    def _compute_language_type(self, text: str, bits: int) -> str:
+        """按字符比例计算语言类型（不经过备忘表）"""
+        has_vietnamese = bool(bits & VIETNAMESE_BIT)
+        has_chinese = bool(bits & CHINESE_BIT)
+        has_english = bool(bits & ENGLISH_BIT)
         
         # 统计各种字符的数量
         vietnamese_count = sum(1 for pattern in self.compiled_patterns for _ in pattern.finditer(text))
@@ -192,6 +391,20 @@ class TableChecker:
     def __init__(self):
         self.vietnamese_detector = VietnameseDetector()
         self.supported_extensions = {'.xlsx', '.xls', '.csv', '.tsv'}
+        # 整个文件无法打开或读取时的错误信息（文件路径 -> 错误信息），由调用方通过 take_file_error 取出
+        self.file_errors: Dict[str, str] = {}
+    
+    def take_file_error(self, file_path: Path) -> Optional[str]:
+        """
+        取出文件的读取错误（检测结果为否时据此区分 "没有越南文" 与 "无法读取"）
+        
+        Args:
+            file_path: 文件路径
+            
+        Returns:
+            Optional[str]: 错误信息；文件已正常读取时返回None
+        """
+        return self.file_errors.pop(str(file_path), None)
     
     def is_table_file(self, file_path: Path) -> bool:
         """
@@ -251,7 +464,11 @@ class TableChecker:
     def _excel_contains_vietnamese_stream(self, file_path: Path) -> bool:
         """
         以只读流式方式扫描Excel，检测到即提前返回。
+        xlsx 文件先经过共享字符串预筛选，预筛选为否的文件直接跳过完整解析。
         """
+        if file_path.suffix.lower() == '.xlsx' and not xlsx_may_contain_vietnamese(
+                file_path, self.vietnamese_detector.combined_pattern):
+            return False
         try:
             workbook = load_workbook(file_path, data_only=True, read_only=True, keep_links=False)
             detector = self.vietnamese_detector
@@ -266,53 +483,45 @@ class TableChecker:
                         # 仅处理字符串，避免无意义的类型转换
                         if isinstance(value, str):
                             # 先做快速非ASCII过滤，减少正则调用
-                            has_non_ascii = False
-                            for ch in value:
-                                if ord(ch) > 127:
-                                    has_non_ascii = True
-                                    break
-                            if not has_non_ascii:
+                            if value.isascii():
                                 continue
                             if combined.search(value):
                                 return True
             return False
         except Exception as e:
             print(f"读取Excel文件 {file_path} 时出错: {e}")
+            self.file_errors[str(file_path)] = f"{type(e).__name__}: {e}"
+            return False
+    
+    def _xls_contains_vietnamese(self, file_path: Path) -> bool:
+        """
+        检测旧版 .xls（openpyxl 不支持该格式，按工作表由 pandas 读取），检测到即提前返回。
+        """
+        try:
+            combined = self.vietnamese_detector.combined_pattern
+            with pd.ExcelFile(file_path) as excel_file:
+                for sheet_name in excel_file.sheet_names:
+                    df = excel_file.parse(sheet_name, header=None, dtype=object)
+                    for value in df.values.ravel():
+                        if isinstance(value, str) and not value.isascii() and combined.search(value):
+                            return True
+            return False
+        except Exception as e:
+            print(f"读取Excel文件 {file_path} 时出错: {e}")
+            self.file_errors[str(file_path)] = f"{type(e).__name__}: {e}"
             return False
 
         
     def _csv_contains_vietnamese_stream(self, file_path: Path) -> bool:
         """
-        分块读取CSV/TSV并向量化检测，检测到即提前返回。
-        """
-        encodings = ['utf-8', 'gbk', 'gb2312', 'utf-8-sig']
-        sep = '\t' if file_path.suffix.lower() == '.tsv' else None
-        pattern = self.vietnamese_detector.combined_pattern
-        for encoding in encodings:
-            try:
-                for chunk in pd.read_csv(
-                    file_path,
-                    encoding=encoding,
-                    sep=sep,
-                    dtype=str,
-                    engine='python',
-                    chunksize=10000,
-                    low_memory=True,
-                    on_bad_lines='skip'
-                ):
-                    for column in chunk.columns:
-                        series = chunk[column].astype(str)
-                        # 使用向量化正则匹配加速
-                        if series.str.contains(pattern, regex=True, na=False).any():
-                            return True
-                # 该编码读取完成仍未发现
-            except UnicodeDecodeError:
-                continue
-            except Exception as e:
-                # 其他读取异常，继续尝试下个编码
-                print(f"读取CSV文件 {file_path} 使用编码 {encoding} 时出错: {e}")
-                continue
-        return False
+        字节级检测CSV/TSV：mmap 顺序读取原始字节，只识别一次编码，检测到即提前返回。
+        """
+        try:
+            return csv_contains_vietnamese(file_path, self.vietnamese_detector.combined_pattern)
+        except Exception as e:
+            print(f"读取CSV文件 {file_path} 时出错: {e}")
+            self.file_errors[str(file_path)] = f"{type(e).__name__}: {e}"
+            return False
     
     def check_table_has_vietnamese(self, file_path: Path) -> bool:
         """
@@ -329,7 +538,9 @@ class TableChecker:
         
         suffix = file_path.suffix.lower()
         # 流式快速路径：避免一次性加载全部内容
-        if suffix in ['.xlsx', '.xls']:
+        if suffix == '.xls':
+            return self._xls_contains_vietnamese(file_path)
+        if suffix == '.xlsx':
             return self._excel_contains_vietnamese_stream(file_path)
         if suffix in ['.csv', '.tsv']:
             return self._csv_contains_vietnamese_stream(file_path)
@@ -341,14 +552,44 @@ class LocalizationChecker:
     
     def __init__(self):
         self.table_checker = TableChecker()
+        # 最近一次目录扫描发现的表格文件数（来自同一次遍历）
+        self.files_discovered = 0
+        # 最近一次目录扫描的重复文件统计（DuplicateFileIndex.summary()）
+        self.duplicate_stats: Dict = {}
+    
+    def open_journal(self, directory_path: str, recursive: bool = False, resume: bool = True,
+                     journal_path: Optional[str] = None) -> ScanJournal:
+        """
+        打开目录扫描的进度日志（每个文件记录是否包含越南文）
+        
+        Args:
+            directory_path: 要扫描的目录路径
+            recursive: 是否递归扫描子目录
+            resume: 是否读取已有日志续扫（False 时清空重新开始）
+            journal_path: 日志路径（None 时按目录生成默认路径）
+            
+        Returns:
+            ScanJournal: 扫描进度日志
+        """
+        signature = {
+            'kind': 'localization',
+            'directory': os.path.realpath(directory_path),
+            'recursive': recursive
+        }
+        path = journal_path or default_journal_path(directory_path, 'localization', recursive)
+        return ScanJournal(path, signature=signature, resume=resume)
     
-    def scan_directory(self, directory_path: str, recursive: bool = False) -> List[str]:
+    def scan_directory(self, directory_path: str, recursive: bool = False, resume: bool = False,
+                       journal_path: Optional[str] = None, dedupe: bool = True) -> List[str]:
         """
         扫描目录下的所有表格文件，检测包含越南文的文件
         
         Args:
             directory_path: 要扫描的目录路径
             recursive: 是否递归扫描子目录，默认为False
+            resume: 是否从扫描进度日志续扫（跳过已完成且未修改的文件；日志不存在时从头开始）
+            journal_path: 扫描进度日志路径（None 且 resume=True 时使用默认路径；均未指定时不记录日志）
+            dedupe: 是否识别内容相同的文件（各语言分支共用的表格），每份内容只检测一次
             
         Returns:
             List[str]: 包含越南文的表格文件名列表
@@ -364,35 +605,68 @@ class LocalizationChecker:
             return []
         
         valid_tables = []
+        self.duplicate_stats = {}
         
         print(f"Scanning directory: {directory_path}")
         print(f"Recursive scan: {'Yes' if recursive else 'No'}")
         print("Supported formats: .xlsx, .xls, .csv, .tsv")
         print("-" * 50)
         
-        # 根据recursive参数决定扫描方式
-        if recursive:
-            # 递归扫描所有文件
-            for file_path in directory.rglob('*'):
-                if file_path.is_file() and self.table_checker.is_table_file(file_path):
-                    print(f"Checking file: {file_path.name}...", end=" ")
-                    
-                    if self.table_checker.check_table_has_vietnamese(file_path):
-                        valid_tables.append(file_path.name)
-                        print("YES - Contains Vietnamese")
-                    else:
-                        print("NO - No Vietnamese")
-        else:
-            # 只扫描当前目录
-            for file_path in directory.iterdir():
-                if file_path.is_file() and self.table_checker.is_table_file(file_path):
+        # 扫描进度日志：每检测完一个文件追加一条记录，中断后可续扫
+        journal = None
+        if resume or journal_path:
+            journal = self.open_journal(directory_path, recursive, resume, journal_path)
+            if journal.entries:
+                print(f"Resuming from journal: {journal.path} ({len(journal.entries)} files done)")
+        
+        # 后台线程遍历目录（recursive 决定是否进入子目录），边发现边检测
+        discovery = discover_files(directory, self.table_checker.supported_extensions, recursive=recursive)
+        # 内容相同的文件复用第一份的检测结论
+        duplicates = DuplicateFileIndex() if dedupe else None
+        try:
+            for file_path, stat in discovery:
+                checkpoint = journal.lookup(file_path, stat) if journal is not None else None
+                duplicate = None
+                if checkpoint is None and duplicates is not None:
+                    duplicate = duplicates.lookup(file_path, stat)
+                
+                if checkpoint is not None:
+                    print(f"Checking file: {file_path.name}... (resumed)", end=" ")
+                    if duplicates is not None:
+                        duplicates.register(file_path, stat)
+                        duplicates.store(file_path, checkpoint)
+                elif duplicate is not None:
+                    checkpoint = duplicate
+                    print(f"Checking file: {file_path.name}... (duplicate)", end=" ")
+                    if journal is not None:
+                        journal.record(file_path, stat, checkpoint)
+                else:
                     print(f"Checking file: {file_path.name}...", end=" ")
-                    
-                    if self.table_checker.check_table_has_vietnamese(file_path):
-                        valid_tables.append(file_path.name)
-                        print("YES - Contains Vietnamese")
-                    else:
-                        print("NO - No Vietnamese")
+                    checkpoint = {'has_vietnamese': self.table_checker.check_table_has_vietnamese(file_path)}
+                    error = self.table_checker.take_file_error(file_path)
+                    if error is not None:
+                        # 无法读取的文件不写入日志，续扫时重新检测
+                        print(f"FAILED - {error}")
+                        continue
+                    if journal is not None:
+                        journal.record(file_path, stat, checkpoint)
+                    if duplicates is not None:
+                        duplicates.store(file_path, checkpoint)
+                has_vietnamese = checkpoint['has_vietnamese']
+                
+                if has_vietnamese:
+                    valid_tables.append(file_path.name)
+                    print("YES - Contains Vietnamese")
+                else:
+                    print("NO - No Vietnamese")
+        finally:
+            if journal is not None:
+                journal.close()
+        self.files_discovered = discovery.discovered
+        if duplicates is not None:
+            self.duplicate_stats = duplicates.summary()
+            if duplicates.duplicates:
+                print(f"{duplicates.duplicates} duplicate files reused earlier results")
         
         return valid_tables
     
@@ -418,15 +692,20 @@ class LocalizationChecker:
 
 
 def main():
-    """主函数"""
+    """主函数（带参数时为无交互批处理模式，见 scan_cli）"""
+    # 带参数运行：无交互批处理（目录 [--format/--workers/--incremental/--fail-on-found ...]）
+    if len(sys.argv) > 1:
+        try:
+            from .scan_cli import run_cli
+        except ImportError:
+            from scan_cli import run_cli
+        sys.exit(run_cli(sys.argv[1:], scanner='checker', default_format='ndjson', recursive=False))
+    
     print("Localization Checker - Vietnamese Table Detector")
     print("=" * 50)
     
     # 获取用户输入的目录路径
-    if len(sys.argv) > 1:
-        directory_path = sys.argv[1]
-    else:
-        directory_path = input("Enter directory path to scan: ").strip()
+    directory_path = input("Enter directory path to scan: ").strip()
     
     if not directory_path:
         print("Error: No directory path provided")
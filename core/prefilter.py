@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+表格文件快速预筛选
+在完整解析之前，以尽量低的代价判断文件是否可能包含越南文：
+- xlsx: 直接打开zip包，只流式扫描共享字符串(sharedStrings.xml)与工作表中的内联字符串，
+  纯ASCII数据块整块跳过，不构建任何单元格对象
+- csv/tsv: 通过 mmap 顺序读取原始字节，只识别一次编码（BOM / UTF-8 有效性），
+  直接搜索越南文字符的 UTF-8 字节序列，仅 GBK 文件回退到解码后匹配
+"""
+
+import codecs
+import mmap
+import re
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Pattern, Tuple
+
+
+# 流式读取的块大小
+CHUNK_SIZE = 1 << 20
+
+# 跨块保留的尾部字符数（覆盖"字母+组合音标"及被截断的数字字符引用）
+_TAIL_CHARS = 16
+
+# XML 数字字符引用（如 &#7899; / &#x1EDB;）
+_NUMERIC_REF_PATTERN = re.compile(r'&#(x[0-9a-fA-F]+|[0-9]+);')
+
+
+def _unescape_numeric_refs(text: str) -> str:
+    """展开XML数字字符引用，避免以转义形式存储的越南文被漏判"""
+    def _replace(match):
+        ref = match.group(1)
+        try:
+            code = int(ref[1:], 16) if ref[0] in 'xX' else int(ref)
+            return chr(code)
+        except (ValueError, OverflowError):
+            return match.group(0)
+    return _NUMERIC_REF_PATTERN.sub(_replace, text)
+
+
+def _stream_contains(stream, pattern: Pattern) -> bool:
+    """
+    流式扫描XML部件，检测到匹配即返回
+
+    Args:
+        stream: 二进制文件对象
+        pattern: 越南文检测正则
+
+    Returns:
+        bool: 是否检测到匹配
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')('replace')
+    tail = ''
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            return False
+        # 纯ASCII且不含字符引用的数据块不可能包含越南文，只保留尾部用于跨块匹配
+        if chunk.isascii() and b'&#' not in chunk:
+            tail = chunk[-_TAIL_CHARS:].decode('ascii')
+            continue
+        text = tail + decoder.decode(chunk)
+        if '&#' in text:
+            text = _unescape_numeric_refs(text)
+        if pattern.search(text):
+            return True
+        tail = text[-_TAIL_CHARS:]
+
+
+def xlsx_may_contain_vietnamese(file_path: Path, pattern: Pattern) -> bool:
+    """
+    xlsx 快速预筛选：只扫描共享字符串和内联字符串所在的XML部件
+
+    Args:
+        file_path: xlsx 文件路径
+        pattern: 越南文检测正则（通常为 VietnameseDetector.combined_pattern）
+
+    Returns:
+        bool: 返回False表示文件一定不包含越南文，可直接跳过；
+              返回True表示可能包含（或无法判断），需要进入完整扫描
+    """
+    try:
+        archive = zipfile.ZipFile(file_path)
+    except (zipfile.BadZipFile, OSError):
+        # 不是标准zip包（如旧版xls），交给完整解析器处理
+        return True
+
+    try:
+        with archive:
+            parts = []
+            for name in archive.namelist():
+                lower_name = name.lower()
+                if lower_name.endswith('sharedstrings.xml'):
+                    # 共享字符串优先扫描：绝大多数文本都在这里
+                    parts.insert(0, name)
+                elif lower_name.startswith('xl/worksheets/') and lower_name.endswith('.xml'):
+                    # 工作表中可能存在内联字符串(inlineStr)和公式字符串结果
+                    parts.append(name)
+            for name in parts:
+                with archive.open(name) as stream:
+                    if _stream_contains(stream, pattern):
+                        return True
+            return False
+    except Exception:
+        # 预筛选失败时保守处理，交给完整扫描
+        return True
+
+
+# 越南文字符所在的码位上限（拉丁扩展附加区之后不再有越南文字母）
+_MAX_VIETNAMESE_CODEPOINT = 0x2000
+
+# 组合音标 U+0300-U+036F 的 UTF-8 字节形式
+_COMBINING_MARK_BYTES = rb'(?:\xcc[\x80-\xbf]|\xcd[\x80-\xaf])'
+
+# 每个文本正则对应的字节匹配器缓存：(字节正则, 非前缀字节删除表)
+_byte_matcher_cache: Dict[Pattern, Tuple[Pattern, bytes]] = {}
+
+
+def _byte_matcher(pattern: Pattern) -> Tuple[Pattern, bytes]:
+    """
+    根据文本正则生成字节匹配器
+
+    枚举可能的码位，收集能被文本正则单独匹配的字符，按 UTF-8 前缀字节分组合并为一个字节正则；
+    若文本正则支持"字母+组合音标"的分解写法，同时加入对应的字节规则。
+    另外返回一张删除表：用 bytes.translate 删除所有非首字节后为空，即可跳过整块数据，
+    无需逐字节执行正则（中文 UTF-8 文本的首字节不会落在越南文首字节集合中）。
+
+    Args:
+        pattern: 越南文检测正则
+
+    Returns:
+        Tuple[Pattern, bytes]: 字节正则与删除表
+    """
+    cached = _byte_matcher_cache.get(pattern)
+    if cached is not None:
+        return cached
+
+    # 按 UTF-8 前缀字节分组，末字节合并为字符集，如 \xe1\xba[\xa0-\xbf]
+    groups: Dict[bytes, List[int]] = {}
+    for code in range(0x80, _MAX_VIETNAMESE_CODEPOINT):
+        if pattern.fullmatch(chr(code)):
+            encoded = chr(code).encode('utf-8')
+            groups.setdefault(encoded[:-1], []).append(encoded[-1])
+    alternatives = [
+        re.escape(prefix) + b'[' + b''.join(b'\\x%02x' % last for last in sorted(lasts)) + b']'
+        for prefix, lasts in sorted(groups.items())
+    ]
+    lead_bytes = {prefix[0] for prefix in groups}
+    if pattern.search('a\u0301'):
+        alternatives.append(rb'[A-Za-z]' + _COMBINING_MARK_BYTES)
+        lead_bytes.update((0xcc, 0xcd))
+
+    byte_pattern = re.compile(b'|'.join(alternatives) if alternatives else rb'(?!)')
+    delete_bytes = bytes(b for b in range(256) if b not in lead_bytes)
+    _byte_matcher_cache[pattern] = (byte_pattern, delete_bytes)
+    return byte_pattern, delete_bytes
+
+
+def vietnamese_byte_pattern(pattern: Pattern) -> Pattern:
+    """
+    根据文本正则生成等价的 UTF-8 字节正则
+
+    Args:
+        pattern: 越南文检测正则（通常为 VietnameseDetector.combined_pattern）
+
+    Returns:
+        Pattern: 可直接在原始字节（含 mmap）上搜索的字节正则
+    """
+    return _byte_matcher(pattern)[0]
+
+
+def _decoded_contains(data, encoding: str, pattern: Pattern, errors: str = 'strict') -> bool:
+    """
+    按指定编码分块解码后匹配（用于非 UTF-8 文件的回退路径）
+
+    Args:
+        data: 原始字节（bytes 或 mmap）
+        encoding: 文本编码
+        pattern: 越南文检测正则
+        errors: 解码错误处理方式
+
+    Returns:
+        bool: 是否检测到越南文
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors)
+    size = len(data)
+    tail = ''
+    for pos in range(0, size, CHUNK_SIZE):
+        text = tail + decoder.decode(data[pos:pos + CHUNK_SIZE], final=pos + CHUNK_SIZE >= size)
+        if pattern.search(text):
+            return True
+        tail = text[-_TAIL_CHARS:]
+    return False
+
+
+def csv_contains_vietnamese(file_path: Path, pattern: Pattern) -> bool:
+    """
+    CSV/TSV 越南文字节级检测：单次顺序读取，检测到即提前返回
+
+    Args:
+        file_path: CSV/TSV 文件路径
+        pattern: 越南文检测正则（通常为 VietnameseDetector.combined_pattern）
+
+    Returns:
+        bool: 是否包含越南文
+    """
+    if file_path.stat().st_size == 0:
+        return False
+
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        head = data[:4]
+        if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            return _decoded_contains(data, 'utf-16', pattern)
+
+        start = len(codecs.BOM_UTF8) if head.startswith(codecs.BOM_UTF8) else 0
+        byte_pattern, delete_bytes = _byte_matcher(pattern)
+        # UTF-8 有效性校验：与字节搜索在同一次顺序读取中完成
+        validator = codecs.getincrementaldecoder('utf-8')('strict')
+        size = len(data)
+
+        for pos in range(start, size, CHUNK_SIZE):
+            end = min(pos + CHUNK_SIZE, size)
+            chunk = data[pos:end]
+            # 纯ASCII数据块不可能包含越南文
+            if chunk.isascii():
+                continue
+            try:
+                validator.decode(chunk, final=end >= size)
+            except UnicodeDecodeError:
+                # 不是 UTF-8：按 GBK 解码匹配，仍失败则容错解码
+                try:
+                    return _decoded_contains(data, 'gbk', pattern)
+                except UnicodeDecodeError:
+                    return _decoded_contains(data, 'utf-8', pattern, errors='replace')
+            # 向前重叠3个字节，覆盖跨块的多字节字符
+            search_start = max(start, pos - 3)
+            # 不含任何越南文首字节（如纯中文数据块）时整块跳过
+            if not data[search_start:end].translate(None, delete_bytes):
+                continue
+            if byte_pattern.search(data, search_start, end):
+                return True
+        return False
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+扫描结果报告写入器
+基于 openpyxl write_only 模式流式写出检测报告：
+- 标题行、数据行分别使用共享的命名样式，只在工作簿中注册一次
+- 每列复用一个已设置样式的单元格模板，不再逐单元格创建边框/对齐对象
+- 数据逐行写入磁盘，不在内存中保留整张工作表，也不需要二次遍历设置格式
+"""
+
+from copy import copy
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.styles.fonts import DEFAULT_FONT
+from openpyxl.utils import get_column_letter
+
+try:
+    from .scan_results import FindingBatch
+except ImportError:
+    from scan_results import FindingBatch
+
+
+# 命名样式名称（同一工作簿内共享）
+HEADER_STYLE_NAME = "scan_report_header"
+BODY_STYLE_NAME = "scan_report_body"
+
+
+def _thin_border() -> Border:
+    """细线边框"""
+    side = Side(style='thin')
+    return Border(left=side, right=side, top=side, bottom=side)
+
+
+def create_header_style(name: str = HEADER_STYLE_NAME) -> NamedStyle:
+    """
+    创建扫描报告标题行样式（蓝底白色粗体、细边框、左对齐自动换行）
+
+    Args:
+        name: 命名样式名称
+
+    Returns:
+        NamedStyle: 标题行命名样式
+    """
+    return NamedStyle(
+        name=name,
+        font=Font(bold=True, color="FFFFFF"),
+        fill=PatternFill(start_color="366092", end_color="366092", fill_type="solid"),
+        border=_thin_border(),
+        alignment=Alignment(horizontal="left", vertical="center", wrap_text=True),
+    )
+
+
+def create_body_style(name: str = BODY_STYLE_NAME) -> NamedStyle:
+    """
+    创建扫描报告数据行样式（细边框、左对齐自动换行）
+
+    Args:
+        name: 命名样式名称
+
+    Returns:
+        NamedStyle: 数据行命名样式
+    """
+    return NamedStyle(
+        name=name,
+        font=copy(DEFAULT_FONT),
+        border=_thin_border(),
+        alignment=Alignment(horizontal="left", vertical="center", wrap_text=True),
+    )
+
+
+class ScanReportWriter:
+    """write_only 模式的报告写入器"""
+
+    def __init__(self, sheet_title: str, headers: Sequence[str], column_widths: Sequence[float],
+                 header_style: Optional[NamedStyle] = None, body_style: Optional[NamedStyle] = None,
+                 freeze_header: bool = True, style_body: bool = True):
+        """
+        初始化报告写入器
+
+        Args:
+            sheet_title: 工作表名称
+            headers: 标题行
+            column_widths: 各列宽度
+            header_style: 标题行命名样式（默认为扫描报告标题样式）
+            body_style: 数据行命名样式（默认为扫描报告数据样式）
+            freeze_header: 是否冻结首行
+            style_body: 数据行是否使用数据行样式（False 时数据行保持默认格式，直接逐行写入值）
+        """
+        self.sheet_title = sheet_title
+        self.headers = list(headers)
+        self.column_widths = list(column_widths)
+        self.header_style = header_style if header_style is not None else create_header_style()
+        self.body_style = body_style if body_style is not None else create_body_style()
+        self.freeze_header = freeze_header
+        self.style_body = style_body
+
+    def _styled_cells(self, ws, style_name: str) -> List[WriteOnlyCell]:
+        """为每一列创建一个复用的样式单元格模板"""
+        cells = []
+        for _ in self.headers:
+            cell = WriteOnlyCell(ws)
+            cell.style = style_name
+            cells.append(cell)
+        return cells
+
+    def write(self, rows: Iterable[Sequence], output_path) -> int:
+        """
+        流式写出报告
+
+        Args:
+            rows: 数据行迭代器，每行与标题列一一对应
+            output_path: 输出文件路径
+
+        Returns:
+            int: 写入的数据行数
+        """
+        wb = Workbook(write_only=True)
+        wb.add_named_style(self.header_style)
+        if self.style_body:
+            wb.add_named_style(self.body_style)
+        ws = wb.create_sheet(title=self.sheet_title)
+
+        # write_only 模式下列宽、冻结窗格需要在写入数据前设置
+        for col, width in enumerate(self.column_widths, 1):
+            ws.column_dimensions[get_column_letter(col)].width = width
+        if self.freeze_header:
+            ws.freeze_panes = "A2"
+
+        header_cells = self._styled_cells(ws, self.header_style.name)
+        for cell, header in zip(header_cells, self.headers):
+            cell.value = header
+        ws.append(header_cells)
+
+        count = 0
+        if not self.style_body:
+            for row in rows:
+                ws.append(row)
+                count += 1
+            wb.save(str(output_path))
+            return count
+
+        # 模板单元格在 append 时被立即序列化，因此可以逐行复用
+        body_cells = self._styled_cells(ws, self.body_style.name)
+        for row in rows:
+            for cell, value in zip(body_cells, row):
+                cell.value = value
+            ws.append(body_cells)
+            count += 1
+
+        wb.save(str(output_path))
+        return count
+
+
+def iter_scan_report_rows(results: Iterable[Dict]) -> Iterable[List]:
+    """
+    将扫描结果转换为报告行：序号、文件名、位置、内容、语言类型
+
+    Args:
+        results: 扫描结果列表
+
+    Returns:
+        Iterable[List]: 报告数据行
+    """
+    if isinstance(results, FindingBatch):
+        # 列式结果：按列一次性取值，位置描述批量生成
+        columns = [results.values(field) for field in ('excel_file', 'position', 'content', 'language_type')]
+        for index, row in enumerate(zip(*columns), 1):
+            yield [index, *row]
+        return
+
+    for index, result in enumerate(results, 1):
+        yield [index, result['excel_file'], result['position'], result['content'], result['language_type']]
+
+
+def write_scan_report(results: Iterable[Dict], output_path, headers: Sequence[str],
+                      column_widths: Sequence[float], sheet_title: str = "越南文检测结果") -> int:
+    """
+    写出越南文扫描报告
+
+    Args:
+        results: 扫描结果列表
+        output_path: 输出文件路径
+        headers: 标题行
+        column_widths: 各列宽度
+        sheet_title: 工作表名称
+
+    Returns:
+        int: 写入的数据行数
+    """
+    writer = ScanReportWriter(sheet_title, headers, column_widths)
+    return writer.write(iter_scan_report_rows(results), Path(output_path))
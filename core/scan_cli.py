@@ -0,0 +1,553 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+越南文扫描命令行（无交互批处理模式）
+供 CI / 构建机使用：不弹出任何输入提示，结果以 NDJSON、CSV 或 Excel 输出，
+并通过退出码反馈是否发现越南文
+
+用法示例:
+    python -m core.scan_cli 表格目录 --format ndjson > result.ndjson
+    python -m core.scan_cli 表格目录 --workers 4 --incremental --fail-on-found --stats
+    python -m core.scan_cli 表格目录 --scanner checker --format csv -o 越南文表格.csv
+    python -m core.scan_cli 越南文表格目录 --keywords 禁用词.txt --leftover-chinese --format xlsx -o 检查结果.xlsx
+
+退出码:
+    0  扫描完成（未指定 --fail-on-found，或未发现越南文）
+    1  指定了 --fail-on-found 且发现越南文
+    2  参数错误、扫描目录不存在，或有文件扫描出错
+"""
+
+import contextlib
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+try:
+    from .duplicate_files import DuplicateFileIndex
+    from .file_discovery import discover_files
+    from .keyword_search import KeywordDetector, KeywordMatcher, LEFTOVER_CHINESE_PATTERN, load_keywords
+    from .report_writer import ScanReportWriter, write_scan_report
+    from .scan_journal import ScanJournal, default_journal_path
+    from .scan_results import FindingBatch
+except ImportError:
+    from duplicate_files import DuplicateFileIndex
+    from file_discovery import discover_files
+    from keyword_search import KeywordDetector, KeywordMatcher, LEFTOVER_CHINESE_PATTERN, load_keywords
+    from report_writer import ScanReportWriter, write_scan_report
+    from scan_journal import ScanJournal, default_journal_path
+    from scan_results import FindingBatch
+
+
+EXIT_OK = 0
+EXIT_FOUND = 1
+EXIT_ERROR = 2
+
+OUTPUT_FORMATS = ('ndjson', 'csv', 'xlsx')
+
+# 扫描器 -> 扫描进度日志类型（与各扫描器自身续扫使用的日志头一致，可共用同一日志）
+SCANNER_JOURNAL_KINDS = {
+    'processor': 'processor',
+    'excel': 'excel_scanner',
+    'checker': 'localization'
+}
+
+# 未指定文件名（或输出到文件夹）时的默认输出文件名
+DEFAULT_OUTPUT_NAME = "越南文检测结果"
+
+# 位置级输出的字段顺序（NDJSON 键 / CSV 表头）
+FINDING_OUTPUT_FIELDS = ('file_path', 'excel_file', 'sheet_name', 'position', 'row', 'col',
+                         'column_name', 'content', 'language_type')
+# 文件级输出（checker）的字段顺序
+FILE_OUTPUT_FIELDS = ('file_path', 'excel_file')
+# 关键词搜索模式下 "语言类型" 字段保存的是命中的关键词，输出时改用该键名
+KEYWORD_MATCH_FIELD = 'matched_keywords'
+
+# Excel 报告的表头与列宽（与各扫描器的 create_output_excel 一致）
+REPORT_LAYOUTS = {
+    'processor': (['序号', '文件名', '位置', '越南文内容', '语言类型'], [8, 30, 20, 60, 15]),
+    'excel': (['序号', 'Excel文件名', '位置', '越南文内容', '语言类型'], [8, 25, 15, 50, 15]),
+    'checker': (['序号', '文件名', '文件路径'], [8, 40, 80])
+}
+
+
+def create_scanner(kind: str, two_phase: bool = True, max_hits_per_file: Optional[int] = None,
+                   detector=None):
+    """
+    创建扫描器实例（按需导入，只加载用到的扫描器）
+
+    Args:
+        kind: 扫描器类型（processor / excel / checker）
+        two_phase: 是否先快速判定工作表再定位
+        max_hits_per_file: 每个文件最多记录的越南文位置数
+        detector: 检测器（None 为越南文检测；KeywordDetector 为关键词搜索，checker 不支持）
+
+    Returns:
+        扫描器实例
+    """
+    if kind == 'processor':
+        try:
+            from .vietnamese_excel_processor import VietnameseExcelProcessor
+        except ImportError:
+            from vietnamese_excel_processor import VietnameseExcelProcessor
+        return VietnameseExcelProcessor(two_phase=two_phase, max_hits_per_file=max_hits_per_file,
+                                        detector=detector)
+    if kind == 'excel':
+        try:
+            from .excel_vietnamese_scanner import ExcelVietnameseScanner
+        except ImportError:
+            sys.path.insert(0, str(Path(__file__).parent.parent))
+            from core.excel_vietnamese_scanner import ExcelVietnameseScanner
+        return ExcelVietnameseScanner(two_phase=two_phase, max_hits_per_file=max_hits_per_file,
+                                      detector=detector)
+    if kind == 'checker':
+        try:
+            from .localization_checker import LocalizationChecker
+        except ImportError:
+            from localization_checker import LocalizationChecker
+        return LocalizationChecker()
+    raise ValueError(f"未知的扫描器类型: {kind}")
+
+
+def supported_extensions(scanner) -> set:
+    """扫描器支持的扩展名"""
+    if hasattr(scanner, 'table_checker'):
+        return scanner.table_checker.supported_extensions
+    return scanner.supported_extensions
+
+
+def scan_file(scanner, kind: str, file_path: Path) -> Dict:
+    """
+    扫描单个文件，返回可JSON序列化的结论（与扫描进度日志中的记录格式相同）
+
+    扫描器自身的提示信息输出到 stderr，保证 stdout 只包含结果。
+    位置级扫描器返回断点记录，工作表级结果与预筛选计数随记录返回后从扫描器中移除，
+    由主进程统一恢复汇总（多进程时每个工作进程的内存不随文件数增长）。
+    整个文件无法打开或读取时返回错误，不当作 "没有越南文"。
+
+    Args:
+        scanner: 扫描器实例
+        kind: 扫描器类型
+        file_path: 文件路径
+
+    Returns:
+        Dict: 扫描结论；出错时为 {'error': 错误信息}
+    """
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            if kind == 'checker':
+                has_vietnamese = bool(scanner.table_checker.check_table_has_vietnamese(file_path))
+                error = scanner.table_checker.take_file_error(file_path)
+                return {'error': error} if error is not None else {'has_vietnamese': has_vietnamese}
+
+            engine = scanner.scan_engine
+            sheet_start = len(engine.sheet_results)
+            prefiltered_start = engine.files_prefiltered
+            if kind == 'processor':
+                findings = scanner.scan_single_file(file_path)
+            else:
+                findings = scanner.scan_excel_file(file_path)
+            checkpoint = engine.file_checkpoint(findings, sheet_start, prefiltered_start)
+            del engine.sheet_results[sheet_start:]
+            engine.files_prefiltered = prefiltered_start
+            error = engine.take_file_error(file_path)
+            return {'error': error} if error is not None else checkpoint
+    except Exception as e:
+        return {'error': f"{type(e).__name__}: {e}"}
+
+
+# 工作进程内的扫描器（每个进程创建一次）
+_worker_scanner = None
+_worker_kind = None
+
+
+def _init_worker(kind: str, two_phase: bool, max_hits_per_file: Optional[int], detector) -> None:
+    """工作进程初始化：创建本进程的扫描器"""
+    global _worker_scanner, _worker_kind
+    _worker_kind = kind
+    _worker_scanner = create_scanner(kind, two_phase, max_hits_per_file, detector)
+
+
+def _scan_in_worker(file_path: str) -> Dict:
+    """在工作进程中扫描单个文件"""
+    return scan_file(_worker_scanner, _worker_kind, Path(file_path))
+
+
+class ResultWriter:
+    """按文件逐个写出结果：NDJSON/CSV 边扫描边写出，Excel 在扫描结束后流式写出"""
+
+    def __init__(self, output_format: str, output_path: Optional[Path], kind: str, position_format,
+                 detector=None):
+        """
+        初始化结果写出器
+
+        Args:
+            output_format: 输出格式（ndjson / csv / xlsx）
+            output_path: 输出文件路径（None 表示标准输出，仅 ndjson/csv）
+            kind: 扫描器类型
+            position_format: 位置描述生成函数
+            detector: 扫描器使用的检测器（关键词搜索模式时决定输出的键名与报告表头）
+        """
+        self.output_format = output_format
+        self.output_path = output_path
+        self.kind = kind
+        self.fields = FILE_OUTPUT_FIELDS if kind == 'checker' else FINDING_OUTPUT_FIELDS
+        self.headers, self.column_widths = REPORT_LAYOUTS[kind]
+        self.names = self.fields
+        if isinstance(detector, KeywordDetector):
+            self.names = tuple(KEYWORD_MATCH_FIELD if field == 'language_type' else field for field in self.fields)
+            self.headers = self.headers[:3] + list(detector.report_columns)
+        self.rows_written = 0
+        # Excel 输出需要在结束时写出，扫描期间以列式批次/文件列表累积
+        self._findings = FindingBatch(position_format=position_format)
+        self._files: List[Dict] = []
+        self._stream = None
+        self._csv_writer = None
+
+        if output_path is not None:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+        if output_format == 'xlsx':
+            return
+        if output_path is None:
+            self._stream = sys.stdout
+        else:
+            # CSV 带 BOM，便于直接用表格软件打开中文内容
+            encoding = 'utf-8-sig' if output_format == 'csv' else 'utf-8'
+            self._stream = open(output_path, 'w', encoding=encoding, newline='')
+        if output_format == 'csv':
+            self._csv_writer = csv.writer(self._stream)
+            self._csv_writer.writerow(self.names)
+
+    def _write_row(self, values: Iterable) -> None:
+        if self.output_format == 'ndjson':
+            item = dict(zip(self.names, values))
+            # 列名可能是数字或日期，统一转为字符串
+            self._stream.write(json.dumps(item, ensure_ascii=False, default=str) + '\n')
+        else:
+            self._csv_writer.writerow(list(values))
+        self.rows_written += 1
+
+    def write_findings(self, findings: FindingBatch) -> None:
+        """写出一个文件的位置级结果"""
+        if self.output_format == 'xlsx':
+            self._findings.extend(findings)
+            return
+        columns = [findings.values(field) for field in self.fields]
+        for values in zip(*columns):
+            self._write_row(values)
+
+    def write_file(self, file_path: Path) -> None:
+        """写出一个包含越南文的文件（文件级结果）"""
+        if self.output_format == 'xlsx':
+            self._files.append({'file_path': str(file_path), 'excel_file': file_path.name})
+            return
+        self._write_row((str(file_path), file_path.name))
+
+    def close(self) -> None:
+        """结束写出（Excel 在此时写入文件）"""
+        if self.output_format == 'xlsx':
+            headers, widths = self.headers, self.column_widths
+            if self.kind == 'checker':
+                writer = ScanReportWriter("越南文表格", headers, widths)
+                rows = ([index, item['excel_file'], item['file_path']]
+                        for index, item in enumerate(self._files, 1))
+                self.rows_written = writer.write(rows, self.output_path)
+            else:
+                self.rows_written = write_scan_report(self._findings, self.output_path, headers, widths)
+            return
+        if self._stream is sys.stdout:
+            self._stream.flush()
+        elif self._stream is not None:
+            self._stream.close()
+
+
+def resolve_output_path(output: Optional[str], output_format: str) -> Optional[Path]:
+    """
+    解析输出路径：'-' 或未指定时 NDJSON/CSV 输出到标准输出；
+    已存在的文件夹或没有扩展名的路径视为输出文件夹，使用默认文件名
+
+    Args:
+        output: 命令行给出的输出路径
+        output_format: 输出格式
+
+    Returns:
+        Optional[Path]: 输出文件路径（None 表示标准输出）
+    """
+    default_name = f"{DEFAULT_OUTPUT_NAME}.{output_format}"
+    if output in (None, '-'):
+        return Path(default_name) if output_format == 'xlsx' else None
+    path = Path(output)
+    if path.is_dir() or not path.suffix:
+        return path / default_name
+    return path
+
+
+def build_parser(scanner: str = 'processor', default_format: str = 'ndjson', recursive: bool = True):
+    """
+    创建命令行参数解析器
+
+    Args:
+        scanner: 默认扫描器类型
+        default_format: 默认输出格式
+        recursive: 默认是否递归扫描子目录
+
+    Returns:
+        argparse.ArgumentParser: 参数解析器
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="扫描目录中表格文件的越南文（无交互批处理模式）",
+        epilog="退出码: 0 完成；1 指定 --fail-on-found 且发现越南文；2 参数错误、目录不存在或有文件扫描出错")
+    parser.add_argument("directory", help="要扫描的目录")
+    parser.add_argument("output", nargs='?',
+                        help="输出文件或文件夹（NDJSON/CSV 默认输出到标准输出，'-' 表示标准输出）")
+    parser.add_argument("-o", "--output", dest="output_option", metavar="OUTPUT", help="输出文件或文件夹（同位置参数 output）")
+    parser.add_argument("--scanner", choices=sorted(SCANNER_JOURNAL_KINDS), default=scanner,
+                        help="processor: 定位 xlsx/xls/csv/tsv 中的单元格（A1 位置）；"
+                             "excel: 定位 xlsx/xls（中文位置）；checker: 只判断文件是否包含越南文"
+                             f"（默认 {scanner}）")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default=default_format,
+                        help=f"输出格式（默认 {default_format}）")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="并行扫描的进程数（默认 1，在当前进程内扫描）")
+    parser.add_argument("--recursive", dest="recursive", action="store_true", help="递归扫描子目录")
+    parser.add_argument("--no-recursive", dest="recursive", action="store_false", help="只扫描目录本身")
+    parser.set_defaults(recursive=recursive)
+    parser.add_argument("--incremental", "--resume", dest="incremental", action="store_true",
+                        help="增量扫描：复用扫描进度日志中未修改文件的结论，只扫描新增/修改的文件")
+    parser.add_argument("--journal", help="扫描进度日志路径（默认按目录生成，位于 .scan_journal）")
+    parser.add_argument("--max-hits", type=int, default=None, help="每个文件最多记录的越南文位置数")
+    parser.add_argument("--no-two-phase", dest="two_phase", action="store_false",
+                        help="不做工作表快速判定，所有工作表都完整定位")
+    parser.add_argument("--no-dedupe", dest="dedupe", action="store_false",
+                        help="不识别内容相同的文件（默认每份内容只扫描一次，结论复用到所有副本）")
+    parser.add_argument("--keywords", action="append", metavar="FILE",
+                        help="关键词搜索模式：关键词文件（每行一个，\"[类别]\" 行开始新类别，可多次指定），"
+                             "一次扫描找出所有关键词，结果中的语言类型改为命中的关键词")
+    parser.add_argument("--leftover-chinese", action="store_true",
+                        help="关键词搜索模式：同时查找残留中文（可单独使用）")
+    parser.add_argument("--ignore-case", action="store_true", help="关键词搜索忽略大小写")
+    parser.add_argument("--fail-on-found", action="store_true", help="发现越南文（或关键词）时以退出码 1 结束")
+    parser.add_argument("--stats", action="store_true", help="扫描结束后向 stderr 输出一行 JSON 统计（含耗时）")
+    return parser
+
+
+def _iter_results(scanner, kind: str, discovery, journal: Optional[ScanJournal], workers: int,
+                  two_phase: bool, max_hits_per_file: Optional[int], detector=None,
+                  duplicates: Optional[DuplicateFileIndex] = None):
+    """
+    按发现顺序产出 (路径, stat, 结论, 来源)，来源为 None（本次扫描）、'journal'（日志）或 'duplicate'（相同内容的文件）
+
+    多进程时同时在途的文件数有上限，结果仍按发现顺序产出，输出顺序与单进程一致。
+    与仍在扫描中的文件内容相同的副本等待同一个扫描任务，不重复提交。
+    本次扫描的结论由调用方在处理时保存到 duplicates（可保存紧凑的形式），产出下一个结果前即已保存。
+    """
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                       initargs=(kind, two_phase, max_hits_per_file, detector))
+
+    def submit(file_path: Path) -> Future:
+        if executor is not None:
+            return executor.submit(_scan_in_worker, str(file_path))
+        future = Future()
+        future.set_result(scan_file(scanner, kind, file_path))
+        return future
+
+    # 单进程时逐个产出；多进程时最多 workers * 4 个文件在途
+    max_pending = workers * 4 if executor is not None else 0
+    pending = deque()
+    # 路径 -> 尚未产出的扫描任务（供内容相同的副本共用）
+    in_flight: Dict[str, Future] = {}
+
+    def finish():
+        file_path, stat, result, future, source = pending.popleft()
+        if future is not None:
+            result = future.result()
+        if source is None:
+            in_flight.pop(str(file_path), None)
+        return file_path, stat, result, source
+
+    try:
+        for file_path, stat in discovery:
+            result, future, source = None, None, None
+            if journal is not None:
+                result = journal.lookup(file_path, stat)
+            if result is not None:
+                source = 'journal'
+                if duplicates is not None:
+                    duplicates.register(file_path, stat)
+                    duplicates.store(file_path, result)
+            elif duplicates is not None:
+                original = duplicates.register(file_path, stat)
+                if original is not None:
+                    result = duplicates.get(original)
+                    future = in_flight.get(original) if result is None else None
+                    if result is not None or future is not None:
+                        source = 'duplicate'
+                        duplicates.record_reuse(stat.st_size)
+            if result is None and future is None:
+                future = submit(file_path)
+                in_flight[str(file_path)] = future
+            pending.append((file_path, stat, result, future, source))
+            while len(pending) > max_pending or (pending and pending[0][3] is None):
+                yield finish()
+        while pending:
+            yield finish()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def run_cli(argv: Optional[List[str]] = None, scanner: str = 'processor', default_format: str = 'ndjson',
+            recursive: bool = True) -> int:
+    """
+    运行命令行扫描
+
+    Args:
+        argv: 命令行参数（None 时使用 sys.argv[1:]）
+        scanner: 默认扫描器类型
+        default_format: 默认输出格式
+        recursive: 默认是否递归扫描子目录
+
+    Returns:
+        int: 退出码
+    """
+    parser = build_parser(scanner, default_format, recursive)
+    # 允许位置参数与选项交替出现（如 "目录 --format xlsx 输出文件"）
+    args = parser.parse_intermixed_args(argv)
+    if args.output and args.output_option:
+        parser.error("输出路径只能指定一次（位置参数 output 或 -o/--output）")
+    if args.workers < 1:
+        parser.error("--workers 至少为 1")
+    keyword_mode = bool(args.keywords or args.leftover_chinese)
+    if keyword_mode and args.scanner == 'checker':
+        parser.error("关键词搜索需要定位单元格，不能与 --scanner checker 同时使用")
+
+    directory = Path(args.directory)
+    if not directory.is_dir():
+        print(f"错误: {args.directory} 不存在或不是一个目录", file=sys.stderr)
+        return EXIT_ERROR
+
+    kind = args.scanner
+    start_time = time.time()
+    detector = None
+    if keyword_mode:
+        keywords = {}
+        for keyword_file in args.keywords or []:
+            for keyword, category in load_keywords(keyword_file).items():
+                keywords.setdefault(keyword, category)
+        patterns = {'残留中文': LEFTOVER_CHINESE_PATTERN} if args.leftover_chinese else None
+        detector = KeywordDetector(KeywordMatcher(keywords, patterns, ignore_case=args.ignore_case))
+
+    main_scanner = create_scanner(kind, args.two_phase, args.max_hits, detector)
+    # 单进程时另建一个扫描器负责扫描，main_scanner 只负责从结论恢复汇总（与多进程路径一致）
+    local_scanner = create_scanner(kind, args.two_phase, args.max_hits, detector) if args.workers <= 1 else None
+    engine = getattr(main_scanner, 'scan_engine', None)
+    position_format = engine.position_format if engine is not None else None
+
+    journal = None
+    if args.incremental or args.journal:
+        journal_kind = SCANNER_JOURNAL_KINDS[kind]
+        if kind == 'checker':
+            journal = main_scanner.open_journal(str(directory), args.recursive, resume=args.incremental,
+                                                journal_path=args.journal)
+        else:
+            signature = {
+                'kind': journal_kind,
+                'directory': os.path.realpath(directory),
+                'recursive': args.recursive,
+                'two_phase': args.two_phase,
+                'max_hits_per_file': args.max_hits
+            }
+            if detector is not None:
+                signature['detector'] = detector.signature()
+            journal = ScanJournal(args.journal or default_journal_path(directory, journal_kind, args.recursive),
+                                  signature=signature, resume=args.incremental)
+
+    output_path = resolve_output_path(args.output or args.output_option, args.format)
+    writer = ResultWriter(args.format, output_path, kind, position_format, detector)
+    discovery = discover_files(directory, supported_extensions(main_scanner), recursive=args.recursive)
+    # 内容相同的文件（各语言分支共用的表格）只扫描一次
+    duplicates = DuplicateFileIndex() if args.dedupe else None
+
+    files_with_vietnamese = 0
+    total_findings = 0
+    errors = 0
+    try:
+        for file_path, stat, result, source in _iter_results(local_scanner, kind, discovery, journal, args.workers,
+                                                            args.two_phase, args.max_hits, detector, duplicates):
+            if 'error' in result:
+                errors += 1
+                print(f"错误: {file_path}: {result['error']}", file=sys.stderr)
+                continue
+            if journal is not None and source != 'journal':
+                journal.record(file_path, stat, result)
+
+            if kind == 'checker':
+                if duplicates is not None and source is None:
+                    duplicates.store(file_path, result)
+                if result['has_vietnamese']:
+                    files_with_vietnamese += 1
+                    writer.write_file(file_path)
+                continue
+
+            sheet_start = len(engine.sheet_results)
+            prefiltered_start = engine.files_prefiltered
+            findings = FindingBatch(position_format=position_format)
+            engine.restore_checkpoint(file_path, result, findings)
+            if duplicates is not None and source is None:
+                # 保存紧凑的检测结果，只在出现副本时才展开为断点记录
+                duplicates.store(file_path, engine.deferred_checkpoint(findings, sheet_start, prefiltered_start))
+            if findings:
+                files_with_vietnamese += 1
+                total_findings += len(findings)
+                writer.write_findings(findings)
+    finally:
+        if journal is not None:
+            journal.close()
+        writer.close()
+
+    if args.stats:
+        elapsed = time.time() - start_time
+        stats = {
+            'scanner': kind,
+            'keywords': len(detector.matcher) if detector is not None else None,
+            'workers': args.workers,
+            'files_discovered': discovery.discovered,
+            'files_resumed': journal.resumed if journal is not None else 0,
+            'duplicate_files': duplicates.duplicates if duplicates is not None else 0,
+            'files_with_errors': errors,
+            'files_with_vietnamese': files_with_vietnamese,
+            'total_vietnamese_locations': total_findings,
+            'rows_written': writer.rows_written,
+            'output': str(output_path) if output_path is not None else '-',
+            'elapsed_seconds': round(elapsed, 3),
+            'files_per_second': round(discovery.discovered / elapsed, 1) if elapsed > 0 else None
+        }
+        if engine is not None:
+            stats.update(engine.summarize_sheets())
+        if duplicates is not None:
+            stats.update(duplicates.summary())
+        print(json.dumps(stats, ensure_ascii=False), file=sys.stderr)
+
+    if args.fail_on_found and files_with_vietnamese:
+        return EXIT_FOUND
+    if errors:
+        return EXIT_ERROR
+    return EXIT_OK
+
+
+def main():
+    """命令行入口"""
+    sys.exit(run_cli())
+
+
+if __name__ == "__main__":
+    main()
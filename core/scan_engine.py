@@ -0,0 +1,589 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel越南文定位扫描引擎
+供 ExcelVietnameseScanner / VietnameseExcelProcessor 共用的两阶段扫描：
+- 阶段一：以 openpyxl 只读流式方式逐个工作表判定是否包含越南文，检测到即跳到下一个工作表
+- 阶段二：只对阶段一判定为包含越南文的工作表做逐单元格定位
+同时记录工作表级结果，并支持 max_hits_per_file 用于快速分诊
+
+xlsx 与 CSV/TSV 的定位同样以流式方式按固定行数分块读取，每块转换为小数组做向量化检测，
+内存占用与工作表行数无关；xls 仍通过 pandas 整表读取（header=None）。
+所有位置均为工作表中的实际行号/列号：第一个非空行作为表头，其上方的空行和数据中的空行都计入行号
+
+检测器可替换为 keyword_search.KeywordDetector，即为多关键词搜索模式（流程与结果格式相同）
+"""
+
+import csv
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+try:
+    from .prefilter import xlsx_may_contain_vietnamese, csv_contains_vietnamese
+    from .scan_results import FindingBatch, a1_position
+except ImportError:
+    from prefilter import xlsx_may_contain_vietnamese, csv_contains_vietnamese
+    from scan_results import FindingBatch, a1_position
+
+
+# 分块定位时每块的行数
+DEFAULT_CHUNK_ROWS = 5000
+
+# CSV/TSV 依次尝试的编码，以及结果中使用的工作表名
+CSV_ENCODINGS = ('utf-8', 'gbk', 'gb2312', 'utf-8-sig')
+CSV_SHEET_NAME = 'CSV数据'
+
+
+def excel_column_names(header: Sequence) -> List:
+    """
+    按 pandas 读取表头的规则生成列名（与 pd.read_excel 默认 header=0 的结果一致）
+
+    空单元格（None、空字符串、NaN）为 "Unnamed: 列序号"，整数值的浮点数转换为整数，重复列名依次加 ".1"、".2" 后缀
+
+    Args:
+        header: 表头行的单元格值
+
+    Returns:
+        List: 列名列表
+    """
+    names = []
+    unnamed = []
+    for index, value in enumerate(header):
+        if value is None or value == '' or (isinstance(value, float) and value != value):
+            value = f"Unnamed: {index}"
+            unnamed.append(index)
+        elif isinstance(value, float) and value.is_integer():
+            value = int(value)
+        names.append(value)
+
+    # 与 pandas 相同：先处理有名称的列，已存在的名称不会被后缀结果覆盖
+    counts: Dict = {}
+    unnamed_set = set(unnamed)
+    for index in [i for i in range(len(names)) if i not in unnamed_set] + unnamed:
+        name = original = names[index]
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[original] = count + 1
+            name = f"{original}.{count}"
+            count = count + 1 if name in names else counts.get(name, 0)
+        names[index] = name
+        counts[name] = count + 1
+    return names
+
+
+def _is_blank_row(row: Sequence) -> bool:
+    """整行为空（None、空字符串或 NaN）"""
+    return all(value is None or value == '' or (isinstance(value, float) and value != value)
+               for value in row)
+
+
+def iter_csv_rows(file_path: Path, encoding: str) -> Iterator[List[str]]:
+    """
+    逐行读取 CSV/TSV（.tsv 以制表符分隔），空行保留为空列表，保证行号与表格软件一致
+
+    Args:
+        file_path: 文件路径
+        encoding: 文件编码
+
+    Returns:
+        Iterator[List[str]]: 每行的单元格文本
+    """
+    delimiter = '\t' if file_path.suffix.lower() == '.tsv' else ','
+    with open(file_path, 'r', encoding=encoding, newline='') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        for row in reader:
+            # 带BOM的UTF-8文件以 utf-8 解码时去掉第一个单元格前的BOM
+            if reader.line_num == 1 and row and row[0].startswith('\ufeff'):
+                row[0] = row[0][1:]
+            yield row
+
+
+def _row_blocks(rows: Iterable[tuple], chunk_rows: int) -> Iterator[List[tuple]]:
+    """把行迭代器切分为固定行数的块"""
+    rows = iter(rows)
+    while True:
+        block = list(islice(rows, chunk_rows))
+        if not block:
+            return
+        yield block
+
+
+def _block_array(block: List[tuple]) -> np.ndarray:
+    """把一块行数据转换为二维 object 数组（行长度不一时右侧补 None）"""
+    width = max(map(len, block))
+    if all(len(row) == width for row in block):
+        values = np.empty((len(block), width), dtype=object)
+        values[:] = block
+        return values
+    values = np.full((len(block), width), None, dtype=object)
+    for index, row in enumerate(block):
+        values[index, :len(row)] = row
+    return values
+
+
+class ExcelScanEngine:
+    """两阶段Excel越南文扫描引擎"""
+
+    def __init__(self, vietnamese_detector, position_format=a1_position, two_phase: bool = True,
+                 max_hits_per_file: Optional[int] = None, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        """
+        初始化扫描引擎
+
+        Args:
+            vietnamese_detector: 越南文检测器（VietnameseDetector）
+            position_format: 位置描述生成函数，接收 (row, col) 返回位置字符串
+            two_phase: 是否先快速判定工作表再定位（False 时所有工作表都做完整定位）
+            max_hits_per_file: 每个文件最多记录的越南文位置数（None 表示不限制）
+            chunk_rows: xlsx 分块定位时每块的行数
+        """
+        self.vietnamese_detector = vietnamese_detector
+        # 检测器只匹配非ASCII文本（越南文）时才能使用字节级预筛选与ASCII快速跳过；
+        # 关键词检测器（KeywordDetector）可能匹配纯ASCII文本，此时每个单元格都要检测
+        self.non_ascii_only = getattr(vietnamese_detector, 'non_ascii_only', True)
+        self.position_format = position_format
+        self.two_phase = two_phase
+        self.max_hits_per_file = max_hits_per_file
+        self.chunk_rows = max(1, chunk_rows)
+        # 工作表级结果（跨文件累积，调用 reset_sheet_results 清空）
+        self.sheet_results: List[Dict] = []
+        # 被预筛选整体跳过的文件数（这些文件不会打开工作表，因此没有工作表级结果）
+        self.files_prefiltered = 0
+        # 整个文件无法打开或读取时的错误信息（文件路径 -> 错误信息），由调用方通过 take_file_error 取出
+        self.file_errors: Dict[str, str] = {}
+
+    def reset_sheet_results(self) -> None:
+        """清空工作表级结果"""
+        self.sheet_results = []
+        self.files_prefiltered = 0
+        self.file_errors = {}
+
+    def take_file_error(self, file_path: Path) -> Optional[str]:
+        """
+        取出文件的读取错误（扫描结果为空时据此区分 "没有越南文" 与 "无法读取"）
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            Optional[str]: 错误信息；文件已正常读取时返回None
+        """
+        return self.file_errors.pop(str(file_path), None)
+
+    def record_sheet(self, file_path: Path, sheet_name: str, has_vietnamese: bool,
+                      hits: int = 0, truncated: bool = False) -> None:
+        """记录一个工作表的扫描结论"""
+        self.sheet_results.append({
+            'excel_file': file_path.name,
+            'file_path': str(file_path),
+            'sheet_name': sheet_name,
+            'has_vietnamese': has_vietnamese,
+            'hits': hits,
+            'truncated': truncated
+        })
+
+    def classify_sheets(self, file_path: Path) -> Optional[Dict[str, bool]]:
+        """
+        阶段一：逐个工作表快速判定是否包含越南文，检测到即提前结束该工作表
+
+        Args:
+            file_path: Excel文件路径
+
+        Returns:
+            Optional[Dict[str, bool]]: 工作表名 -> 是否包含越南文；无法流式读取（如xls）时返回None
+        """
+        if file_path.suffix.lower() != '.xlsx':
+            return None
+
+        combined = self.vietnamese_detector.combined_pattern
+        contains = self.vietnamese_detector.contains_vietnamese
+        non_ascii_only = self.non_ascii_only
+        workbook = load_workbook(file_path, data_only=True, read_only=True, keep_links=False)
+        try:
+            classification = {}
+            for sheet_name in workbook.sheetnames:
+                found = False
+                for row in workbook[sheet_name].iter_rows(values_only=True):
+                    for value in row:
+                        if non_ascii_only:
+                            # 只有非ASCII字符串才可能包含越南文
+                            matched = isinstance(value, str) and not value.isascii() and combined.search(value)
+                        else:
+                            # 与定位阶段一致：非空单元格按 str() 交给检测器（关键词检测器会先做 NFC 规范化）
+                            matched = value is not None and contains(str(value))
+                        if matched:
+                            found = True
+                            break
+                    if found:
+                        break
+                classification[sheet_name] = found
+            return classification
+        finally:
+            workbook.close()
+
+    def scan_dataframe(self, df: pd.DataFrame, file_path: Path, sheet_name: str,
+                       results: FindingBatch, limit: Optional[int]) -> int:
+        """
+        阶段二：定位工作表中的越南文单元格（pandas 读取的整表数据，如 xls）
+
+        df 须以 header=None 读取，第 i 行（从0开始）即工作表第 i+1 行；表头识别与位置计算同 scan_worksheet
+
+        Args:
+            df: 工作表数据（header=None）
+            file_path: 文件路径
+            sheet_name: 工作表名
+            results: 结果批次
+            limit: 本工作表最多记录的位置数（None 表示不限制）
+
+        Returns:
+            int: 记录的位置数
+        """
+        if df.empty:
+            return 0
+        return self.scan_worksheet(df.to_numpy(dtype=object), file_path, sheet_name, results, limit,
+                                   first_row=int(df.index[0]) + 1)
+
+    def scan_worksheet(self, rows: Iterable[Sequence], file_path: Path, sheet_name: str,
+                       results: FindingBatch, limit: Optional[int], first_row: int = 1) -> int:
+        """
+        阶段二：按固定行数分块定位工作表中的越南文单元格
+
+        第一个非空行作为表头（其上方的空行不影响位置），其余行按块转换为小数组，
+        展平后去重检测再按行优先顺序输出；位置直接使用工作表中的实际行号/列号
+
+        Args:
+            rows: 工作表按行的单元格值（如只读工作表的 iter_rows(values_only=True)），须从 first_row 行开始连续给出
+            file_path: 文件路径
+            sheet_name: 工作表名
+            results: 结果批次
+            limit: 本工作表最多记录的位置数（None 表示不限制）
+            first_row: rows 第一行在工作表中的行号
+
+        Returns:
+            int: 记录的位置数
+        """
+        rows = iter(rows)
+        header_row = first_row
+        for header in rows:
+            if not _is_blank_row(header):
+                break
+            header_row += 1
+        else:
+            return 0
+        column_names = excel_column_names(header)
+
+        hits = 0
+        block_row = header_row + 1  # 当前块第一行的实际行号
+        for block in _row_blocks(rows, self.chunk_rows):
+            values = _block_array(block)
+            hits += self._locate_block(values, block_row, column_names, file_path, sheet_name, results,
+                                       None if limit is None else limit - hits)
+            if limit is not None and hits >= limit:
+                break
+            block_row += len(block)
+        return hits
+
+    def _locate_block(self, values: np.ndarray, first_row: int, column_names: List, file_path: Path,
+                      sheet_name: str, results: FindingBatch, limit: Optional[int]) -> int:
+        """定位一块数据中的越南文单元格（first_row 为该块第一行的实际行号）"""
+        detector = self.vietnamese_detector
+        mask = detector.contains_vietnamese_array(values.ravel()).reshape(values.shape)
+        row_positions, col_positions = np.nonzero(mask)
+        if limit is not None:
+            row_positions, col_positions = row_positions[:limit], col_positions[:limit]
+
+        file_path_str = str(file_path)
+        for row_pos, col_idx in zip(row_positions.tolist(), col_positions.tolist()):
+            content = str(values[row_pos, col_idx])
+            results.append(
+                file_path_str,
+                file_path.name,
+                sheet_name,
+                first_row + row_pos,
+                col_idx + 1,
+                column_names[col_idx] if col_idx < len(column_names) else f"Unnamed: {col_idx}",
+                content,
+                detector.detect_language_type(content)
+            )
+        return len(row_positions)
+
+    def scan_csv_rows(self, file_path: Path, results: FindingBatch, limit: Optional[int],
+                      sheet_name: str = CSV_SHEET_NAME) -> Optional[str]:
+        """
+        分块定位 CSV/TSV 中的越南文单元格（依次尝试常用编码，行号即表格软件中的行号）
+
+        Args:
+            file_path: CSV/TSV 文件路径
+            results: 结果批次
+            limit: 最多记录的位置数（None 表示不限制）
+            sheet_name: 结果中使用的工作表名
+
+        Returns:
+            Optional[str]: 成功读取时使用的编码；所有编码都无法解码时返回None
+        """
+        for encoding in CSV_ENCODINGS:
+            # 解码失败可能发生在文件中途，先写入临时批次，成功后再合并
+            attempt = FindingBatch(position_format=results.position_format)
+            try:
+                self.scan_worksheet(iter_csv_rows(file_path, encoding), file_path, sheet_name, attempt, limit)
+            except UnicodeDecodeError:
+                continue
+            results.extend(attempt)
+            return encoding
+        return None
+
+    def scan_csv_file(self, file_path: Path) -> FindingBatch:
+        """
+        扫描单个CSV/TSV文件中的越南文
+
+        Args:
+            file_path: CSV/TSV 文件路径
+
+        Returns:
+            FindingBatch: 包含越南文的位置信息
+        """
+        results = FindingBatch(position_format=self.position_format)
+        max_hits = self.max_hits_per_file
+
+        # 阶段一：字节级快速判定，不包含越南文时不再逐单元格定位
+        if self.two_phase and self.non_ascii_only:
+            try:
+                if not csv_contains_vietnamese(file_path, self.vietnamese_detector.combined_pattern):
+                    self.record_sheet(file_path, CSV_SHEET_NAME, False)
+                    return results
+            except Exception as e:
+                print(f"快速判定CSV文件失败，改为完整扫描 {file_path}: {e}")
+
+        try:
+            if self.scan_csv_rows(file_path, results, max_hits) is not None:
+                self.record_sheet(file_path, CSV_SHEET_NAME, len(results) > 0, len(results),
+                                  truncated=max_hits is not None and len(results) >= max_hits)
+        except Exception as e:
+            print(f"读取CSV文件 {file_path} 时出错: {e}")
+            self.file_errors[str(file_path)] = f"{type(e).__name__}: {e}"
+
+        return results
+
+    def _scan_xlsx_sheets(self, file_path: Path, sheets_to_scan: Optional[List[str]],
+                          results: FindingBatch, found_by_classification: bool) -> None:
+        """以只读流式方式分块定位 xlsx 的工作表（sheets_to_scan 为 None 时定位全部工作表）"""
+        workbook = load_workbook(file_path, data_only=True, read_only=True, keep_links=False)
+        try:
+            if sheets_to_scan is None:
+                sheets_to_scan = list(workbook.sheetnames)
+            remaining = self.max_hits_per_file
+            for sheet_name in sheets_to_scan:
+                if remaining is not None and remaining <= 0:
+                    # 已达到单文件上限，剩余工作表不再定位
+                    self.record_sheet(file_path, sheet_name, found_by_classification, truncated=True)
+                    continue
+                try:
+                    rows = workbook[sheet_name].iter_rows(min_row=1, values_only=True)
+                    hits = self.scan_worksheet(rows, file_path, sheet_name, results, remaining)
+                    if remaining is not None:
+                        remaining -= hits
+                    self.record_sheet(file_path, sheet_name, hits > 0, hits,
+                                      truncated=remaining is not None and remaining <= 0)
+                except Exception as e:
+                    print(f"读取工作表 '{sheet_name}' 时出错: {e}")
+                    continue
+        finally:
+            workbook.close()
+
+    def locate_sheet(self, file_path: Path, sheet_name: Optional[str] = None) -> Tuple[FindingBatch, str]:
+        """
+        定位单个工作表中的全部越南文单元格（不做预筛选和单文件上限截断）
+
+        Args:
+            file_path: Excel文件路径
+            sheet_name: 工作表名（None 表示第一个工作表）
+
+        Returns:
+            Tuple[FindingBatch, str]: 定位结果与实际使用的工作表名（工作表不存在时抛出 KeyError）
+        """
+        results = FindingBatch(position_format=self.position_format)
+        if file_path.suffix.lower() == '.xlsx':
+            workbook = load_workbook(file_path, data_only=True, read_only=True, keep_links=False)
+            try:
+                if sheet_name is None:
+                    sheet_name = workbook.sheetnames[0]
+                rows = workbook[sheet_name].iter_rows(min_row=1, values_only=True)
+                self.scan_worksheet(rows, file_path, sheet_name, results, None)
+            finally:
+                workbook.close()
+        else:
+            with pd.ExcelFile(file_path) as excel_file:
+                if sheet_name is None:
+                    sheet_name = excel_file.sheet_names[0]
+                elif sheet_name not in excel_file.sheet_names:
+                    raise KeyError(f"Worksheet {sheet_name} does not exist.")
+                df = excel_file.parse(sheet_name, header=None)
+                self.scan_dataframe(df, file_path, sheet_name, results, None)
+        return results, sheet_name
+
+    def scan_excel_file(self, file_path: Path) -> FindingBatch:
+        """
+        扫描单个Excel文件中的越南文
+
+        Args:
+            file_path: Excel文件路径
+
+        Returns:
+            FindingBatch: 包含越南文的位置信息
+        """
+        results = FindingBatch(position_format=self.position_format)
+
+        # xlsx 预筛选：共享字符串/内联字符串中没有越南文时不再做完整解析
+        if self.non_ascii_only and file_path.suffix.lower() == '.xlsx' and not xlsx_may_contain_vietnamese(
+                file_path, self.vietnamese_detector.combined_pattern):
+            self.files_prefiltered += 1
+            return results
+
+        try:
+            classification = None
+            if self.two_phase:
+                try:
+                    classification = self.classify_sheets(file_path)
+                except Exception as e:
+                    print(f"快速判定工作表失败，改为完整扫描 {file_path}: {e}")
+
+            if classification is not None:
+                # 只定位包含越南文的工作表，其余工作表直接记录结论
+                for sheet_name, found in classification.items():
+                    if not found:
+                        self.record_sheet(file_path, sheet_name, False)
+                if not any(classification.values()):
+                    return results
+
+            positive_sheets = None
+            if classification is not None:
+                positive_sheets = [name for name, found in classification.items() if found]
+
+            if file_path.suffix.lower() == '.xlsx':
+                # xlsx 按行分块流式定位，内存占用与工作表大小无关
+                self._scan_xlsx_sheets(file_path, positive_sheets, results, classification is not None)
+                return results
+
+            excel_file = pd.ExcelFile(file_path)
+            try:
+                if positive_sheets is None:
+                    sheets_to_scan = list(excel_file.sheet_names)
+                else:
+                    sheets_to_scan = positive_sheets
+
+                remaining = self.max_hits_per_file
+                for sheet_name in sheets_to_scan:
+                    if remaining is not None and remaining <= 0:
+                        # 已达到单文件上限，剩余工作表不再定位
+                        self.record_sheet(file_path, sheet_name, classification is not None,
+                                           truncated=True)
+                        continue
+                    try:
+                        df = excel_file.parse(sheet_name, header=None)
+                        hits = self.scan_dataframe(df, file_path, sheet_name, results, remaining)
+                        if remaining is not None:
+                            remaining -= hits
+                        self.record_sheet(file_path, sheet_name, hits > 0, hits,
+                                           truncated=remaining is not None and remaining <= 0)
+                    except Exception as e:
+                        print(f"读取工作表 '{sheet_name}' 时出错: {e}")
+                        continue
+            finally:
+                excel_file.close()
+
+        except Exception as e:
+            print(f"读取Excel文件 {file_path} 时出错: {e}")
+            self.file_errors[str(file_path)] = f"{type(e).__name__}: {e}"
+
+        return results
+
+    def file_checkpoint(self, findings: FindingBatch, sheet_start: int, prefiltered_start: int) -> Dict:
+        """
+        生成单个文件的断点记录（写入扫描进度日志）
+
+        Args:
+            findings: 该文件的检测结果
+            sheet_start: 扫描该文件前 sheet_results 的长度
+            prefiltered_start: 扫描该文件前 files_prefiltered 的值
+
+        Returns:
+            Dict: 可JSON序列化的断点记录
+        """
+        return self.deferred_checkpoint(findings, sheet_start, prefiltered_start)()
+
+    def deferred_checkpoint(self, results: FindingBatch, sheet_start: int, prefiltered_start: int,
+                            start: int = 0) -> Callable[[], Dict]:
+        """
+        保存单个文件的结果范围，需要时再生成断点记录（供重复文件识别保存每个文件的结论）
+
+        只记录该文件在结果批次中的位置，检测结果不另外保存，只有出现相同内容的副本时才展开为断点记录。
+
+        Args:
+            results: 结果批次（该文件的检测结果为其中 start 之后的部分）
+            sheet_start: 扫描该文件前 sheet_results 的长度
+            prefiltered_start: 扫描该文件前 files_prefiltered 的值
+            start: 该文件的检测结果在结果批次中的起始位置
+
+        Returns:
+            Callable[[], Dict]: 生成断点记录（与 file_checkpoint 相同）的无参函数
+        """
+        prefiltered = self.files_prefiltered > prefiltered_start
+        sheets = self.sheet_results[sheet_start:]
+        end = len(results)
+
+        def checkpoint() -> Dict:
+            return {
+                'prefiltered': prefiltered,
+                'sheets': [
+                    [item['sheet_name'], item['has_vietnamese'], item['hits'], item['truncated']]
+                    for item in sheets
+                ],
+                'findings': [
+                    [record.sheet_name, record.row, record.col, record.column_name,
+                     record.content, record.language_type]
+                    for record in map(results.record, range(start, end))
+                ]
+            }
+
+        return checkpoint
+
+    def restore_checkpoint(self, file_path: Path, checkpoint: Dict, results: FindingBatch) -> int:
+        """
+        从断点记录恢复单个文件的结果（续扫时跳过已完成的文件）
+
+        Args:
+            file_path: 文件路径
+            checkpoint: file_checkpoint 生成的断点记录
+            results: 结果批次
+
+        Returns:
+            int: 恢复的位置数
+        """
+        if checkpoint.get('prefiltered'):
+            self.files_prefiltered += 1
+        for sheet_name, has_vietnamese, hits, truncated in checkpoint.get('sheets', []):
+            self.record_sheet(file_path, sheet_name, has_vietnamese, hits, truncated)
+        file_path_str = str(file_path)
+        findings = checkpoint.get('findings', [])
+        for sheet_name, row, col, column_name, content, language_type in findings:
+            results.append(file_path_str, file_path.name, sheet_name, row, col,
+                           column_name, content, language_type)
+        return len(findings)
+
+    def summarize_sheets(self) -> Dict:
+        """
+        汇总工作表级结果
+
+        Returns:
+            Dict: 预筛选跳过的文件数、工作表总数、包含越南文的工作表数、被截断的工作表数
+        """
+        return {
+            'files_prefiltered': self.files_prefiltered,
+            'sheets_scanned': len(self.sheet_results),
+            'sheets_with_vietnamese': sum(1 for item in self.sheet_results if item['has_vietnamese']),
+            'sheets_truncated': sum(1 for item in self.sheet_results if item['truncated'])
+        }
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+扫描进度日志（断点续扫）
+每完成一个文件就向日志文件追加一行 JSON（文件路径、大小、修改时间及该文件的扫描结论），
+进程中断或用户停止后，以 resume=True 重新扫描时跳过已完成且未修改的文件，并直接复用日志中的结论
+
+日志格式（JSON Lines）:
+    第一行为日志头 {"journal": 版本, "signature": {...扫描参数...}}
+    之后每行一个文件 {"path": ..., "size": ..., "mtime_ns": ..., "result": {...}}
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+
+# 日志格式版本（结论的含义变化时递增，旧日志将被丢弃）
+JOURNAL_VERSION = 1
+
+# 未指定日志路径时的默认目录（与 FileCache 的 ".cache" 一样相对于当前工作目录）
+DEFAULT_JOURNAL_DIR = ".scan_journal"
+
+
+def default_journal_path(directory, kind: str, recursive: bool = True) -> Path:
+    """
+    根据扫描目录生成默认日志路径（同一目录、同一扫描方式对应同一个日志）
+
+    Args:
+        directory: 扫描目录
+        kind: 扫描类型（如 "processor"、"localization"）
+        recursive: 是否递归扫描
+
+    Returns:
+        Path: 日志文件路径
+    """
+    key = f"{kind}|{os.path.realpath(directory)}|{recursive}"
+    key_hash = hashlib.md5(key.encode()).hexdigest()[:16]
+    return Path(DEFAULT_JOURNAL_DIR) / f"{kind}_{key_hash}.jsonl"
+
+
+class ScanJournal:
+    """追加写入的扫描进度日志"""
+
+    def __init__(self, journal_path, signature: Optional[Dict] = None, resume: bool = True,
+                 fsync: bool = False):
+        """
+        打开扫描进度日志
+
+        Args:
+            journal_path: 日志文件路径
+            signature: 扫描参数（目录、选项等）；续扫时与日志头不一致则丢弃旧日志
+            resume: 是否读取已有日志续扫（False 时清空重新开始）
+            fsync: 每个文件记录后是否强制落盘（默认只 flush，进程崩溃不丢数据，系统崩溃可能丢最后几条）
+        """
+        self.path = Path(journal_path)
+        self.signature = dict(signature or {})
+        self.fsync = fsync
+        # 文件路径 -> 日志记录（同一文件多次记录时以最后一条为准）
+        self.entries: Dict[str, Dict] = {}
+        # 本次从日志恢复（跳过扫描）的文件数、本次新记录的文件数
+        self.resumed = 0
+        self.recorded = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if resume and self.path.exists() and self._load():
+            self._file = open(self.path, 'a', encoding='utf-8')
+        else:
+            self.entries = {}
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._write_line({'journal': JOURNAL_VERSION, 'signature': self.signature})
+
+    def _load(self) -> bool:
+        """读取已有日志；日志头不匹配时返回 False"""
+        with open(self.path, 'rb+') as f:
+            data = f.read()
+            # 进程在写入中途被终止时最后一行可能不完整，截掉后再追加
+            end = data.rfind(b'\n') + 1
+            if end < len(data):
+                f.truncate(end)
+            lines = data[:end].decode('utf-8', errors='replace').splitlines()
+
+        if not lines:
+            return False
+        try:
+            header = json.loads(lines[0])
+        except ValueError:
+            return False
+        if header.get('journal') != JOURNAL_VERSION or header.get('signature') != self.signature:
+            return False
+
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+                self.entries[entry['path']] = entry
+            except (ValueError, KeyError, TypeError):
+                continue
+        return True
+
+    def _write_line(self, item: Dict) -> None:
+        """写入一行并刷新到磁盘"""
+        # 列名等可能是数字或日期，统一转为字符串保存
+        self._file.write(json.dumps(item, ensure_ascii=False, default=str) + '\n')
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def lookup(self, file_path, stat: Optional[os.stat_result] = None) -> Optional[Dict]:
+        """
+        查询文件是否已在日志中完成
+
+        Args:
+            file_path: 文件路径
+            stat: 文件当前的 stat（提供时要求大小与修改时间都未变化）
+
+        Returns:
+            Optional[Dict]: 已完成时返回记录的扫描结论，否则返回None
+        """
+        entry = self.entries.get(str(file_path))
+        if entry is None:
+            return None
+        if stat is not None and (entry.get('size') != stat.st_size or entry.get('mtime_ns') != stat.st_mtime_ns):
+            return None
+        self.resumed += 1
+        return entry['result']
+
+    def record(self, file_path, stat: Optional[os.stat_result], result: Dict) -> None:
+        """
+        记录一个已完成的文件
+
+        Args:
+            file_path: 文件路径
+            stat: 文件的 stat（用于续扫时判断文件是否被修改）
+            result: 该文件的扫描结论（可JSON序列化的字典）
+        """
+        entry = {
+            'path': str(file_path),
+            'size': stat.st_size if stat is not None else None,
+            'mtime_ns': stat.st_mtime_ns if stat is not None else None,
+            'result': result
+        }
+        with self._lock:
+            self.entries[entry['path']] = entry
+            self._write_line(entry)
+            self.recorded += 1
+
+    def close(self) -> None:
+        """关闭日志文件（可重复调用）"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self) -> "ScanJournal":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
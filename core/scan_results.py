@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+扫描结果的紧凑表示
+- Finding: 使用 __slots__ 的单条检测结果记录
+- FindingBatch: 列式结果批次，文件、工作表、列名、语言类型、内容统一驻留为整数ID，
+  行号/列号以 int32 数组保存；按需转换为旧版字典格式，兼容现有调用方
+"""
+
+from array import array
+from collections.abc import Sequence
+from typing import Callable, Dict, Iterator, List, Optional, Set
+
+from openpyxl.utils import get_column_letter
+
+
+# 旧版字典结果的字段顺序
+FINDING_FIELDS = (
+    'excel_file', 'sheet_name', 'row', 'col', 'column_name',
+    'content', 'language_type', 'position', 'file_path'
+)
+
+
+def a1_position(row: int, col: int) -> str:
+    """Excel单元格引用格式（如"C5"）"""
+    return f"{get_column_letter(col)}{row}"
+
+
+def chinese_position(row: int, col: int) -> str:
+    """中文位置描述格式（如"第5行第3列"）"""
+    return f"第{row}行第{col}列"
+
+
+def a1_positions(rows: Sequence[int], cols: Sequence[int]) -> List[str]:
+    """
+    批量生成Excel单元格引用（每个不同的列只换算一次列字母）
+
+    Args:
+        rows: 行号序列（从1开始）
+        cols: 列号序列（从1开始）
+
+    Returns:
+        List[str]: 单元格引用列表（如 ["C5", "AA12"]）
+    """
+    letters = {col: get_column_letter(col) for col in set(cols)}
+    return [f"{letters[col]}{row}" for row, col in zip(rows, cols)]
+
+
+def chinese_positions(rows: Sequence[int], cols: Sequence[int]) -> List[str]:
+    """批量生成中文位置描述（如 ["第5行第3列"]）"""
+    return [f"第{row}行第{col}列" for row, col in zip(rows, cols)]
+
+
+# 单条位置格式 -> 批量版本
+_BATCH_POSITION_FORMATS = {a1_position: a1_positions, chinese_position: chinese_positions}
+
+
+class Finding:
+    """单条检测结果（__slots__ 记录，支持按旧版字典键访问）"""
+
+    __slots__ = FINDING_FIELDS
+
+    def __init__(self, excel_file: str, sheet_name: str, row: int, col: int, column_name,
+                 content: str, language_type: str, position: str, file_path: str):
+        self.excel_file = excel_file
+        self.sheet_name = sheet_name
+        self.row = row
+        self.col = col
+        self.column_name = column_name
+        self.content = content
+        self.language_type = language_type
+        self.position = position
+        self.file_path = file_path
+
+    def __getitem__(self, key: str):
+        if key not in FINDING_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        """与 dict.get 相同的访问方式"""
+        if key not in FINDING_FIELDS:
+            return default
+        return getattr(self, key)
+
+    def to_dict(self) -> Dict:
+        """转换为旧版字典格式"""
+        return {field: getattr(self, field) for field in FINDING_FIELDS}
+
+    def __repr__(self) -> str:
+        return f"Finding({self.excel_file!r}, {self.sheet_name!r}, {self.position!r}, {self.content!r})"
+
+
+class FindingBatch(Sequence):
+    """列式扫描结果批次"""
+
+    def __init__(self, position_format: Callable[[int, int], str] = a1_position):
+        """
+        初始化结果批次
+
+        Args:
+            position_format: 位置描述生成函数，接收 (row, col) 返回位置字符串
+        """
+        self.position_format = position_format
+        # 驻留表：值 -> ID，以及 ID -> 值
+        self._intern_index: Dict[object, int] = {}
+        self._interned: List[object] = []
+        # 列式数据
+        self._file_ids = array('i')
+        self._name_ids = array('i')
+        self._sheet_ids = array('i')
+        self._rows = array('i')
+        self._cols = array('i')
+        self._column_ids = array('i')
+        self._content_ids = array('i')
+        self._language_ids = array('i')
+
+    def _intern(self, value) -> int:
+        """驻留一个值，返回其ID"""
+        value_id = self._intern_index.get(value)
+        if value_id is None:
+            value_id = len(self._interned)
+            self._intern_index[value] = value_id
+            self._interned.append(value)
+        return value_id
+
+    def append(self, file_path: str, excel_file: str, sheet_name: str, row: int, col: int,
+               column_name, content: str, language_type: str) -> None:
+        """
+        追加一条检测结果
+
+        Args:
+            file_path: 完整文件路径
+            excel_file: 文件名
+            sheet_name: 工作表名
+            row: 行号（从1开始）
+            col: 列号（从1开始）
+            column_name: 列名
+            content: 单元格内容
+            language_type: 语言类型
+        """
+        intern = self._intern
+        self._file_ids.append(intern(file_path))
+        self._name_ids.append(intern(excel_file))
+        self._sheet_ids.append(intern(sheet_name))
+        self._rows.append(row)
+        self._cols.append(col)
+        self._column_ids.append(intern(column_name))
+        self._content_ids.append(intern(content))
+        self._language_ids.append(intern(language_type))
+
+    def extend(self, other) -> None:
+        """
+        合并另一个批次（或旧版字典结果列表）
+
+        Args:
+            other: FindingBatch 或字典列表
+        """
+        if not isinstance(other, FindingBatch):
+            for item in other:
+                self.append(item.get('file_path', ''), item['excel_file'], item['sheet_name'],
+                            item['row'], item['col'], item['column_name'], item['content'],
+                            item['language_type'])
+            return
+
+        # 重新映射对方驻留表中的ID
+        remap = array('i', (self._intern(value) for value in other._interned))
+        for target, source in (
+            (self._file_ids, other._file_ids),
+            (self._name_ids, other._name_ids),
+            (self._sheet_ids, other._sheet_ids),
+            (self._column_ids, other._column_ids),
+            (self._content_ids, other._content_ids),
+            (self._language_ids, other._language_ids),
+        ):
+            target.extend(remap[value_id] for value_id in source)
+        self._rows.extend(other._rows)
+        self._cols.extend(other._cols)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def record(self, index: int) -> Finding:
+        """
+        获取第 index 条结果的 __slots__ 记录
+
+        Args:
+            index: 结果索引
+
+        Returns:
+            Finding: 检测结果记录
+        """
+        values = self._interned
+        row = self._rows[index]
+        col = self._cols[index]
+        return Finding(
+            excel_file=values[self._name_ids[index]],
+            sheet_name=values[self._sheet_ids[index]],
+            row=row,
+            col=col,
+            column_name=values[self._column_ids[index]],
+            content=values[self._content_ids[index]],
+            language_type=values[self._language_ids[index]],
+            position=self.position_format(row, col),
+            file_path=values[self._file_ids[index]],
+        )
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.record(i).to_dict() for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("FindingBatch index out of range")
+        return self.record(index).to_dict()
+
+    def __iter__(self) -> Iterator[Dict]:
+        for index in range(len(self)):
+            yield self.record(index).to_dict()
+
+    def records(self) -> Iterator[Finding]:
+        """逐条返回 __slots__ 记录（不创建字典）"""
+        for index in range(len(self)):
+            yield self.record(index)
+
+    def positions(self) -> List[str]:
+        """
+        一次性生成全部结果的位置描述（A1 格式每个不同的列只换算一次列字母）
+
+        Returns:
+            List[str]: 与结果顺序一致的位置描述
+        """
+        batch_format = _BATCH_POSITION_FORMATS.get(self.position_format)
+        if batch_format is not None:
+            return batch_format(self._rows, self._cols)
+        return list(map(self.position_format, self._rows, self._cols))
+
+    def values(self, field: str) -> List:
+        """
+        按字段取出全部结果的值（不创建逐条记录）
+
+        Args:
+            field: 字段名（row、col、position 或驻留字段如 excel_file、content）
+
+        Returns:
+            List: 与结果顺序一致的值
+        """
+        if field == 'position':
+            return self.positions()
+        if field in ('row', 'col'):
+            return (self._rows if field == 'row' else self._cols).tolist()
+        ids = {
+            'file_path': self._file_ids, 'excel_file': self._name_ids, 'sheet_name': self._sheet_ids,
+            'column_name': self._column_ids, 'content': self._content_ids, 'language_type': self._language_ids,
+        }[field]
+        values = self._interned
+        return [values[value_id] for value_id in ids]
+
+    def to_dicts(self) -> List[Dict]:
+        """一次性转换为旧版字典列表"""
+        return list(self)
+
+    def unique_files(self) -> Set[str]:
+        """包含检测结果的文件名集合（无需展开为字典）"""
+        values = self._interned
+        return {values[name_id] for name_id in set(self._name_ids)}
+
+    def unique_file_paths(self) -> Set[str]:
+        """包含检测结果的完整文件路径集合"""
+        values = self._interned
+        return {values[file_id] for file_id in set(self._file_ids)}
+
+    def __repr__(self) -> str:
+        return f"FindingBatch({len(self)} findings, {len(self._interned)} interned values)"
+
+
+def as_finding_batch(results, position_format: Optional[Callable[[int, int], str]] = None) -> FindingBatch:
+    """
+    将任意结果转换为 FindingBatch（已是批次则原样返回）
+
+    Args:
+        results: FindingBatch 或字典列表
+        position_format: 位置描述生成函数
+
+    Returns:
+        FindingBatch: 结果批次
+    """
+    if isinstance(results, FindingBatch):
+        return results
+    batch = FindingBatch(position_format or a1_position)
+    batch.extend(results)
+    return batch
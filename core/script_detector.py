@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文字体系检测注册表
+用一张预编译的码位区间表把字符串一次性归类为文字体系位集合（越南文字母、CJK、泰文、
+韩文、假名、西里尔文等），供 VietnameseDetector、文本提取器等所有检测器共用：
+新增一种语言的检查只需要按位判断，不再额外遍历数据
+
+用法:
+    bits = script_bits(text)
+    if bits & SCRIPT_THAI: ...
+    if has_script(text, CJK_MASK): ...
+"""
+
+import re
+from bisect import bisect_right
+from functools import reduce
+from operator import or_
+from typing import Dict, Iterable, List, Tuple
+
+
+# 越南文带声调/变音的字母（不含纯ASCII字母）
+VIETNAMESE_LETTERS = (
+    "àáạảãâầấậẩẫăằắặẳẵèéẹẻẽêềếệểễìíịỉĩòóọỏõôồốộổỗơờớợởỡùúụủũưừứựửữỳýỵỷỹđ"
+)
+
+# 注册表：名称 -> (位, 码位区间列表)
+_registry: Dict[str, Tuple[int, List[Tuple[int, int]]]] = {}
+
+# 预编译的区间表：按起点排序的边界与每段对应的位集合
+_boundaries: List[int] = []
+_segment_bits: List[int] = []
+
+
+class _CharBitsCache(dict):
+    """字符 -> 位集合 缓存（按需填充，上限为实际出现过的不同字符数）"""
+
+    def __missing__(self, char: str) -> int:
+        index = bisect_right(_boundaries, ord(char)) - 1
+        bits = _segment_bits[index] if index >= 0 else 0
+        self[char] = bits
+        return bits
+
+
+_char_bits = _CharBitsCache()
+_char_bits_getitem = _char_bits.__getitem__
+
+# 位集合上限（检测器会在更高位上存放附加信息）
+MAX_SCRIPTS = 32
+
+
+def _compile_table() -> None:
+    """把注册表中的所有区间合并为不重叠的分段表"""
+    events = set()
+    for bit, ranges in _registry.values():
+        for start, end in ranges:
+            events.add(start)
+            events.add(end + 1)
+    boundaries = sorted(events)
+    segment_bits = []
+    for index, start in enumerate(boundaries):
+        bits = 0
+        if index + 1 < len(boundaries):
+            for bit, ranges in _registry.values():
+                for range_start, range_end in ranges:
+                    if range_start <= start <= range_end:
+                        bits |= bit
+                        break
+        segment_bits.append(bits)
+    _boundaries[:] = boundaries
+    _segment_bits[:] = segment_bits
+    _char_bits.clear()
+
+
+def register_script(name: str, ranges: Iterable[Tuple[int, int]]) -> int:
+    """
+    注册一种文字体系
+
+    Args:
+        name: 文字体系名称
+        ranges: 码位闭区间列表，如 [(0x0E00, 0x0E7F)]
+
+    Returns:
+        int: 分配给该文字体系的位（重复注册同名体系时返回原有的位并更新区间）
+    """
+    ranges = [(int(start), int(end)) for start, end in ranges]
+    if name in _registry:
+        bit = _registry[name][0]
+    else:
+        if len(_registry) >= MAX_SCRIPTS:
+            raise ValueError(f"文字体系数量超过上限 {MAX_SCRIPTS}")
+        bit = 1 << len(_registry)
+    _registry[name] = (bit, ranges)
+    _compile_table()
+    return bit
+
+
+def script_bits(text: str) -> int:
+    """
+    一次遍历得到字符串包含的文字体系位集合
+
+    Args:
+        text: 要检测的文本
+
+    Returns:
+        int: 文字体系位集合
+    """
+    if not text:
+        return 0
+    # set() 去重与逐字符查表都在 C 层完成
+    return reduce(or_, map(_char_bits_getitem, set(text)), 0)
+
+
+def has_script(text: str, mask: int) -> bool:
+    """
+    判断文本是否包含指定文字体系之一
+
+    Args:
+        text: 要检测的文本
+        mask: 文字体系位（可用 | 组合多个）
+
+    Returns:
+        bool: 是否包含
+    """
+    return bool(script_bits(text) & mask)
+
+
+def script_bit(name: str) -> int:
+    """获取已注册文字体系的位"""
+    return _registry[name][0]
+
+
+def script_names(bits: int) -> List[str]:
+    """
+    把位集合转换为文字体系名称列表（按注册顺序）
+
+    Args:
+        bits: 文字体系位集合
+
+    Returns:
+        List[str]: 文字体系名称
+    """
+    return [name for name, (bit, _) in _registry.items() if bits & bit]
+
+
+def script_char_class(mask: int) -> str:
+    """
+    生成匹配指定文字体系任一字符的正则字符类（供 pandas 的向量化字符串方法使用）
+
+    Args:
+        mask: 文字体系位（可用 | 组合多个）
+
+    Returns:
+        str: 如 "[一-鿿]"；mask 中没有已注册的文字体系时为永不匹配的 "[^\\s\\S]"
+    """
+    ranges = sorted(code_range for bit, code_ranges in _registry.values() if bit & mask
+                    for code_range in code_ranges)
+    if not ranges:
+        return r'[^\s\S]'
+    return '[' + ''.join(f"{re.escape(chr(start))}-{re.escape(chr(end))}" for start, end in ranges) + ']'
+
+
+def _letter_ranges(letters: str) -> List[Tuple[int, int]]:
+    """把字母集合（含大小写）转换为单码位区间"""
+    codes = sorted({ord(ch) for ch in letters} | {ord(ch) for ch in letters.upper()})
+    return [(code, code) for code in codes]
+
+
+# 内置文字体系（注册顺序即位的顺序）
+SCRIPT_LATIN_BASIC = register_script('latin_basic', [(0x41, 0x5A), (0x61, 0x7A)])
+SCRIPT_VIETNAMESE = register_script('vietnamese', _letter_ranges(VIETNAMESE_LETTERS))
+SCRIPT_COMBINING = register_script('combining_marks', [(0x0300, 0x036F)])
+SCRIPT_LATIN_1 = register_script('latin_1', [(0x00C0, 0x00D6), (0x00D8, 0x00F6), (0x00F8, 0x00FF)])
+SCRIPT_LATIN_EXT_A = register_script('latin_ext_a', [(0x0100, 0x017F)])
+SCRIPT_LATIN_EXT_B = register_script('latin_ext_b', [(0x0180, 0x024F)])
+SCRIPT_LATIN_EXT_ADDITIONAL = register_script('latin_ext_additional', [(0x1E00, 0x1EFF)])
+SCRIPT_GREEK = register_script('greek', [(0x0370, 0x03FF)])
+SCRIPT_GREEK_EXT = register_script('greek_ext', [(0x1F00, 0x1FFF)])
+SCRIPT_CYRILLIC = register_script('cyrillic', [(0x0400, 0x052F)])
+SCRIPT_ARABIC = register_script('arabic', [(0x0600, 0x06FF)])
+SCRIPT_THAI = register_script('thai', [(0x0E00, 0x0E7F)])
+SCRIPT_HANGUL = register_script('hangul', [(0x1100, 0x11FF), (0x3130, 0x318F), (0xAC00, 0xD7AF)])
+SCRIPT_KANA = register_script('kana', [(0x3040, 0x30FF), (0x31F0, 0x31FF), (0xFF66, 0xFF9F)])
+SCRIPT_CJK_UNIFIED = register_script('cjk_unified', [(0x4E00, 0x9FFF)])
+SCRIPT_CJK_EXT_A = register_script('cjk_ext_a', [(0x3400, 0x4DBF)])
+SCRIPT_CJK_COMPAT = register_script('cjk_compat', [(0xF900, 0xFAFF)])
+SCRIPT_DIGIT = register_script('digit', [(0x30, 0x39)])
+
+# 常用组合
+CJK_MASK = SCRIPT_CJK_UNIFIED | SCRIPT_CJK_EXT_A | SCRIPT_CJK_COMPAT
+# 拉丁扩展区（文本提取器沿用的"越南文"宽松范围）
+LATIN_EXTENDED_MASK = (SCRIPT_LATIN_EXT_A | SCRIPT_LATIN_EXT_B |
+                       SCRIPT_LATIN_EXT_ADDITIONAL | SCRIPT_GREEK_EXT)
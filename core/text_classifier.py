@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文本分类器
+一次计算出字符串的全部特征（纯数字、日期、时间、浮点数、数组/表达式格式、中文、越南文、英文字母等）并编码为位集合，
+是否提取（is_text_content）与文本类型（text_type）都只由位集合决定；
+每个不重复的字符串只计算一次，整列文本可用 pandas 字符串方法向量化计算。
+
+用法:
+    classifier = TextClassifier()
+    if classifier.is_text_content(text): ...
+    mask = classifier.content_mask(series)
+"""
+
+import re
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.script_detector import (script_bits, script_char_class, SCRIPT_CJK_UNIFIED, SCRIPT_LATIN_BASIC,
+                                  LATIN_EXTENDED_MASK)
+
+
+# 文本特征位
+TEXT_EMPTY = 1 << 0           # 空白
+TEXT_DIGITS = 1 << 1          # 纯数字（str.isdigit）
+TEXT_DATE = 1 << 2            # 日期（2024-01-01）
+TEXT_TIME = 1 << 3            # 时间（12:30:00）
+TEXT_FLOAT = 1 << 4           # float() 能解析
+TEXT_EXPRESSION = 1 << 5      # 数值表达式（1+2、(3*4)/5）
+TEXT_NUMBER_ARRAY = 1 << 6    # 数值数组（[1,2,3]、{1,2}、(1.5)）
+TEXT_NUMBER_LIST = 1 << 7     # 数值列表（1,2;3）
+TEXT_BRACKETED = 1 << 8       # 整体由 [] 或 {} 包围（JSON 数组/对象）
+TEXT_PUNCTUATION = 1 << 9     # 含特殊字符或标点
+TEXT_CJK = 1 << 10            # 含中文
+TEXT_VIETNAMESE = 1 << 11     # 含越南文（拉丁扩展区）
+TEXT_LATIN = 1 << 12          # 含英文字母
+
+# 任一特征成立即不是需要提取的文本
+NON_TEXT_MASK = (TEXT_EMPTY | TEXT_DIGITS | TEXT_DATE | TEXT_TIME | TEXT_FLOAT | TEXT_EXPRESSION
+                 | TEXT_NUMBER_ARRAY | TEXT_NUMBER_LIST)
+# 需要提取的文字（中文或越南文）
+TEXT_SCRIPT_MASK = TEXT_CJK | TEXT_VIETNAMESE
+
+# 判断特征的正则（re.match 语义：$ 允许末尾一个换行）
+_DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+_TIME_PATTERN = re.compile(r'^\d{2}:\d{2}:\d{2}$')
+_EXPRESSION_PATTERN = re.compile(r'^[\d\+\-\*\/\(\)\.\s]+$')
+_NUMBER_ARRAY_PATTERN = re.compile(r'^[\[\{\(][\d\s,\.]+\]?\}?\)?$')
+_NUMBER_LIST_PATTERN = re.compile(r'^[\d\s,;\.]+$')
+_BRACKETED_PATTERN = re.compile(r'^\[[\s\S]*\]$|^\{[\s\S]*\}$')
+_PUNCTUATION_PATTERN = re.compile(r'[^\w\s\d]')
+# float() 可能接受的写法：数字（含全角/其他文字的数字）、符号、小数点、指数、下划线，或 inf/nan
+_FLOAT_CANDIDATE_PATTERN = re.compile(r'(?i)^\s*(?:(?=\S*\d)[\w\.\+\-]+|[\+\-]?(?:inf|infinity|nan))\s*$')
+
+_MATCH_FEATURES = (
+    (TEXT_DATE, _DATE_PATTERN),
+    (TEXT_TIME, _TIME_PATTERN),
+    (TEXT_EXPRESSION, _EXPRESSION_PATTERN),
+    (TEXT_NUMBER_ARRAY, _NUMBER_ARRAY_PATTERN),
+    (TEXT_NUMBER_LIST, _NUMBER_LIST_PATTERN),
+    (TEXT_BRACKETED, _BRACKETED_PATTERN),
+)
+
+_SCRIPT_FEATURES = (
+    (TEXT_CJK, SCRIPT_CJK_UNIFIED),
+    (TEXT_VIETNAMESE, LATIN_EXTENDED_MASK),
+    (TEXT_LATIN, SCRIPT_LATIN_BASIC),
+)
+# 向量化计算时使用的正则字符类
+_SCRIPT_CHAR_CLASSES = tuple((bit, script_char_class(script_mask)) for bit, script_mask in _SCRIPT_FEATURES)
+
+# 默认最多缓存的不重复字符串数
+DEFAULT_CACHE_SIZE = 500000
+
+
+def is_text_bits(bits):
+    """
+    由特征位判断是否为需要提取的文本：排除数字/日期/时间/表达式/数组等格式；
+    不含中文或越南文的 JSON 数组/对象也排除；包含中文或越南文的提取，
+    不含英文字母但包含特殊字符或标点的也提取，其余（如纯英文）跳过
+
+    Args:
+        bits: 特征位（int，或 numpy 整数数组，此时返回布尔数组）
+
+    Returns:
+        是否为文本内容
+    """
+    # 只用比较与 & | 组合，int 与数组都适用
+    has_text_script = (bits & TEXT_SCRIPT_MASK) != 0
+    symbols_only = ((bits & (TEXT_LATIN | TEXT_BRACKETED)) == 0) & ((bits & TEXT_PUNCTUATION) != 0)
+    return ((bits & NON_TEXT_MASK) == 0) & (has_text_script | symbols_only)
+
+
+def text_type_label(bits: int) -> str:
+    """
+    由特征位得到文本类型描述
+
+    Args:
+        bits: 特征位
+
+    Returns:
+        str: 中越混合 / 中英混合 / 越英混合 / 中文 / 越南文 / 其他
+    """
+    has_chinese = bits & TEXT_CJK
+    has_vietnamese = bits & TEXT_VIETNAMESE
+    has_english = bits & TEXT_LATIN
+
+    if has_chinese and has_vietnamese:
+        return "中越混合"
+    elif has_chinese and has_english:
+        return "中英混合"
+    elif has_vietnamese and has_english:
+        return "越英混合"
+    elif has_chinese:
+        return "中文"
+    elif has_vietnamese:
+        return "越南文"
+    # 由于跳过了纯英文，这里不会返回"英文"类型
+    return "其他"
+
+
+def _parses_as_float(text: str) -> bool:
+    """文本能否被 float() 解析"""
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+
+class TextClassifier:
+    """文本分类器：按不重复的字符串缓存特征位"""
+
+    def __init__(self, max_cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Args:
+            max_cache_size: 最多缓存的字符串数（超出时清空重新缓存）
+        """
+        self.max_cache_size = max_cache_size
+        self._cache: Dict[str, int] = {}
+
+    def classify(self, text: Optional[str]) -> int:
+        """
+        计算字符串的全部特征位（同一字符串只计算一次）
+
+        Args:
+            text: 待分类的文本
+
+        Returns:
+            int: 特征位
+        """
+        if not text:
+            return TEXT_EMPTY
+        bits = self._cache.get(text)
+        if bits is None:
+            bits = self._compute(text)
+            if len(self._cache) >= self.max_cache_size:
+                self._cache.clear()
+            self._cache[text] = bits
+        return bits
+
+    @staticmethod
+    def _compute(text: str) -> int:
+        bits = 0
+        if len(text.strip()) == 0:
+            bits |= TEXT_EMPTY
+        if text.isdigit():
+            bits |= TEXT_DIGITS
+        if _parses_as_float(text):
+            bits |= TEXT_FLOAT
+        for bit, pattern in _MATCH_FEATURES:
+            if pattern.match(text):
+                bits |= bit
+        if _PUNCTUATION_PATTERN.search(text):
+            bits |= TEXT_PUNCTUATION
+        # 一次遍历得到文字体系位集合
+        scripts = script_bits(text)
+        for bit, script_mask in _SCRIPT_FEATURES:
+            if scripts & script_mask:
+                bits |= bit
+        return bits
+
+    def classify_series(self, texts: pd.Series) -> np.ndarray:
+        """
+        向量化计算一列文本的特征位：只计算不重复的字符串，结果与逐个调用 classify 一致
+
+        Args:
+            texts: 文本（str）
+
+        Returns:
+            np.ndarray: 与 texts 等长的特征位（int64）
+        """
+        codes, uniques = pd.factorize(texts)
+        values = pd.Series(uniques, dtype=object)
+        text_str = values.str
+        bits = np.zeros(len(values), dtype=np.int64)
+
+        def add(bit: int, matched: pd.Series):
+            bits[matched.to_numpy(dtype=bool)] |= bit
+
+        add(TEXT_EMPTY, text_str.strip().str.len() == 0)
+        add(TEXT_DIGITS, text_str.isdigit())
+        for bit, pattern in _MATCH_FEATURES:
+            add(bit, text_str.match(pattern.pattern))
+        add(TEXT_PUNCTUATION, text_str.contains(_PUNCTUATION_PATTERN.pattern))
+        for bit, char_class in _SCRIPT_CHAR_CLASSES:
+            add(bit, text_str.contains(char_class))
+        # float() 只对可能的写法逐个复核
+        candidates = np.flatnonzero(text_str.match(_FLOAT_CANDIDATE_PATTERN.pattern).to_numpy(dtype=bool))
+        parsed = [_parses_as_float(text) for text in values.to_numpy()[candidates]]
+        bits[candidates[np.array(parsed, dtype=bool)]] |= TEXT_FLOAT
+
+        if len(self._cache) + len(values) > self.max_cache_size:
+            self._cache.clear()
+        if len(values) <= self.max_cache_size:
+            self._cache.update(zip(uniques.tolist(), bits.tolist()))
+        return bits[codes]
+
+    def is_text_content(self, text: Optional[str]) -> bool:
+        """是否为需要提取的文本（支持中文和越南文，跳过纯英文）"""
+        return bool(is_text_bits(self.classify(text)))
+
+    def text_type(self, text: Optional[str]) -> str:
+        """文本类型描述"""
+        return text_type_label(self.classify(text))
+
+    def content_mask(self, texts: pd.Series) -> np.ndarray:
+        """
+        向量化版本的 is_text_content
+
+        Args:
+            texts: 文本（str）
+
+        Returns:
+            np.ndarray: 与 texts 等长的布尔掩码
+        """
+        return is_text_bits(self.classify_series(texts))
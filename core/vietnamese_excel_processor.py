@@ -9,11 +9,9 @@ import os
 import re
 import sys
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Sequence, Optional
 import pandas as pd
 import openpyxl
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils.dataframe import dataframe_to_rows
 
 # 添加当前目录到路径
@@ -21,14 +19,35 @@ current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
 from localization_checker import VietnameseDetector
+from report_writer import write_scan_report
+from scan_results import FindingBatch, a1_position
+from scan_engine import ExcelScanEngine
+from file_discovery import discover_files
+from scan_journal import ScanJournal, default_journal_path
+from duplicate_files import DuplicateFileIndex
 
 
 class VietnameseExcelProcessor:
     """越南文Excel处理器 - 合并检测和导出功能"""
     
-    def __init__(self):
-        self.vietnamese_detector = VietnameseDetector()
+    def __init__(self, two_phase: bool = True, max_hits_per_file: Optional[int] = None,
+                 detector=None):
+        """
+        初始化处理器
+        
+        Args:
+            two_phase: 是否先快速判定文件/工作表，只定位包含越南文的部分
+            max_hits_per_file: 每个文件最多记录的越南文位置数（None 表示不限制，用于快速分诊）
+            detector: 检测器（默认为越南文检测器；传入 KeywordDetector 时为多关键词搜索模式）
+        """
+        self.vietnamese_detector = detector if detector is not None else VietnameseDetector()
         self.supported_extensions = {'.xlsx', '.xls', '.csv', '.tsv'}
+        # 最近一次目录扫描发现的文件数（来自同一次遍历）
+        self.files_discovered = 0
+        # 最近一次目录扫描的重复文件统计（DuplicateFileIndex.summary()）
+        self.duplicate_stats: Dict = {}
+        self.scan_engine = ExcelScanEngine(self.vietnamese_detector, two_phase=two_phase,
+                                           max_hits_per_file=max_hits_per_file)
     
     def _get_excel_cell_reference(self, row: int, col: int) -> str:
         """
@@ -41,14 +60,7 @@ class VietnameseExcelProcessor:
         Returns:
             str: Excel单元格引用格式（如"C5"）
         """
-        # 将列号转换为Excel列字母
-        col_letter = ""
-        while col > 0:
-            col -= 1
-            col_letter = chr(ord('A') + col % 26) + col_letter
-            col //= 26
-        
-        return f"{col_letter}{row}"
+        return a1_position(row, col)
     
     def is_supported_file(self, file_path: Path) -> bool:
         """
@@ -62,7 +74,7 @@ class VietnameseExcelProcessor:
         """
         return file_path.suffix.lower() in self.supported_extensions
     
-    def scan_excel_file(self, file_path: Path) -> List[Dict]:
+    def scan_excel_file(self, file_path: Path) -> FindingBatch:
         """
         扫描单个Excel文件中的越南文
         
@@ -70,49 +82,12 @@ class VietnameseExcelProcessor:
             file_path: Excel文件路径
             
         Returns:
-            List[Dict]: 包含越南文的位置信息列表
+            FindingBatch: 包含越南文的位置信息（列式存储，可按字典逐条访问）
         """
-        results = []
-        
-        try:
-            # 读取Excel文件的所有工作表
-            excel_file = pd.ExcelFile(file_path)
-            
-            for sheet_name in excel_file.sheet_names:
-                try:
-                    # 读取工作表
-                    df = pd.read_excel(file_path, sheet_name=sheet_name)
-                    
-                    # 扫描每个单元格
-                    for row_idx, row in df.iterrows():
-                        for col_idx, value in enumerate(row):
-                            if pd.notna(value) and self.vietnamese_detector.contains_vietnamese(str(value)):
-                                # 获取实际检测到的单元格内容
-                                content = str(value)
-                                # 基于实际检测到的内容判断语言类型
-                                language_type = self.vietnamese_detector.detect_language_type(content)
-                                results.append({
-                                    'excel_file': file_path.name,
-                                    'sheet_name': sheet_name,
-                                    'row': row_idx + 2,  # +2 因为pandas从0开始，且Excel有标题行
-                                    'col': col_idx + 1,  # +1 因为pandas从0开始
-                                    'column_name': df.columns[col_idx] if col_idx < len(df.columns) else f'Column_{col_idx + 1}',
-                                    'content': content,
-                                    'language_type': language_type,  # 基于实际检测内容判断的语言类型
-                                    'position': self._get_excel_cell_reference(row_idx + 2, col_idx + 1),
-                                    'file_path': str(file_path)
-                                })
-                
-                except Exception as e:
-                    print(f"读取工作表 '{sheet_name}' 时出错: {e}")
-                    continue
-        
-        except Exception as e:
-            print(f"读取Excel文件 {file_path} 时出错: {e}")
-        
-        return results
+        # 预筛选、工作表快速判定与定位均由共用的扫描引擎完成
+        return self.scan_engine.scan_excel_file(file_path)
     
-    def scan_csv_file(self, file_path: Path) -> List[Dict]:
+    def scan_csv_file(self, file_path: Path) -> FindingBatch:
         """
         扫描单个CSV文件中的越南文
         
@@ -120,48 +95,12 @@ class VietnameseExcelProcessor:
             file_path: CSV文件路径
             
         Returns:
-            List[Dict]: 包含越南文的位置信息列表
+            FindingBatch: 包含越南文的位置信息（列式存储，可按字典逐条访问）
         """
-        results = []
-        
-        try:
-            # 尝试不同的编码
-            encodings = ['utf-8', 'gbk', 'gb2312', 'utf-8-sig']
-            
-            for encoding in encodings:
-                try:
-                    df = pd.read_csv(file_path, encoding=encoding)
-                    
-                    # 扫描每个单元格
-                    for row_idx, row in df.iterrows():
-                        for col_idx, value in enumerate(row):
-                            if pd.notna(value) and self.vietnamese_detector.contains_vietnamese(str(value)):
-                                # 获取实际检测到的单元格内容
-                                content = str(value)
-                                # 基于实际检测到的内容判断语言类型
-                                language_type = self.vietnamese_detector.detect_language_type(content)
-                                results.append({
-                                    'excel_file': file_path.name,
-                                    'sheet_name': 'CSV数据',
-                                    'row': row_idx + 2,  # +2 因为pandas从0开始，且CSV有标题行
-                                    'col': col_idx + 1,  # +1 因为pandas从0开始
-                                    'column_name': df.columns[col_idx] if col_idx < len(df.columns) else f'Column_{col_idx + 1}',
-                                    'content': content,
-                                    'language_type': language_type,  # 基于实际检测内容判断的语言类型
-                                    'position': self._get_excel_cell_reference(row_idx + 2, col_idx + 1),
-                                    'file_path': str(file_path)
-                                })
-                    break  # 成功读取后跳出循环
-                    
-                except UnicodeDecodeError:
-                    continue
-            
-        except Exception as e:
-            print(f"读取CSV文件 {file_path} 时出错: {e}")
-        
-        return results
+        # 字节级快速判定与按行分块定位均由共用的扫描引擎完成（行号为表格软件中的实际行号）
+        return self.scan_engine.scan_csv_file(file_path)
     
-    def scan_single_file(self, file_path: Path) -> List[Dict]:
+    def scan_single_file(self, file_path: Path) -> FindingBatch:
         """
         扫描单个文件中的越南文
         
@@ -169,74 +108,138 @@ class VietnameseExcelProcessor:
             file_path: 文件路径
             
         Returns:
-            List[Dict]: 包含越南文的位置信息列表
+            FindingBatch: 包含越南文的位置信息
         """
         if not self.is_supported_file(file_path):
-            return []
+            return FindingBatch()
         
         if file_path.suffix.lower() in ['.xlsx', '.xls']:
             return self.scan_excel_file(file_path)
         elif file_path.suffix.lower() in ['.csv', '.tsv']:
             return self.scan_csv_file(file_path)
         
-        return []
+        return FindingBatch()
     
-    def scan_directory(self, directory_path: str, recursive: bool = True) -> List[Dict]:
+    def _journal_signature(self, directory: Path, recursive: bool) -> Dict:
+        """扫描进度日志头：扫描参数变化后旧日志不再适用"""
+        signature = {
+            'kind': 'processor',
+            'directory': os.path.realpath(directory),
+            'recursive': recursive,
+            'two_phase': self.scan_engine.two_phase,
+            'max_hits_per_file': self.scan_engine.max_hits_per_file
+        }
+        # 关键词搜索模式：关键词集合变化后旧日志不再适用
+        if hasattr(self.vietnamese_detector, 'signature'):
+            signature['detector'] = self.vietnamese_detector.signature()
+        return signature
+    
+    def scan_directory(self, directory_path: str, recursive: bool = True, resume: bool = False,
+                       journal_path: Optional[str] = None, dedupe: bool = True) -> FindingBatch:
         """
         扫描目录下的所有支持文件
         
         Args:
             directory_path: 要扫描的目录路径
             recursive: 是否递归扫描子目录
-            
+            resume: 是否从扫描进度日志续扫（跳过已完成且未修改的文件；日志不存在时从头开始）
+            journal_path: 扫描进度日志路径（None 且 resume=True 时使用默认路径；均未指定时不记录日志）
+            dedupe: 是否识别内容相同的文件（各语言分支共用的表格），每份内容只扫描一次
+        
         Returns:
-            List[Dict]: 所有文件中越南文的位置信息
+            FindingBatch: 所有文件中越南文的位置信息
         """
         directory = Path(directory_path)
+        all_results = FindingBatch()
+        self.scan_engine.reset_sheet_results()
+        self.files_discovered = 0
+        self.duplicate_stats = {}
         
         if not directory.exists():
             print(f"错误: 目录 {directory_path} 不存在")
-            return []
+            return all_results
         
         if not directory.is_dir():
             print(f"错误: {directory_path} 不是一个目录")
-            return []
+            return all_results
         
-        all_results = []
-        supported_files = []
+        # 扫描进度日志：每完成一个文件追加一条记录，中断后可续扫
+        journal = None
+        if resume or journal_path:
+            journal = ScanJournal(journal_path or default_journal_path(directory, 'processor', recursive),
+                                  signature=self._journal_signature(directory, recursive), resume=resume)
+            if journal.entries:
+                print(f"从扫描进度日志续扫: {journal.path}（已完成 {len(journal.entries)} 个文件）")
         
-        # 收集所有支持的文件
-        if recursive:
-            for file_path in directory.rglob('*'):
-                if file_path.is_file() and self.is_supported_file(file_path):
-                    supported_files.append(file_path)
-        else:
-            for file_path in directory.iterdir():
-                if file_path.is_file() and self.is_supported_file(file_path):
-                    supported_files.append(file_path)
+        # 后台线程遍历目录，边发现边扫描
+        discovery = discover_files(directory, self.supported_extensions, recursive=recursive)
+        # 内容相同的文件复用第一份的扫描结论
+        duplicates = DuplicateFileIndex() if dedupe else None
         
-        print(f"找到 {len(supported_files)} 个支持的文件")
+        try:
+            # 扫描每个文件
+            for i, (file_path, stat) in enumerate(discovery, 1):
+                checkpoint = journal.lookup(file_path, stat) if journal is not None else None
+                if checkpoint is not None:
+                    restored = self.scan_engine.restore_checkpoint(file_path, checkpoint, all_results)
+                    print(f"跳过已完成 ({i}/{discovery.progress_total()}): {file_path.name}"
+                          f"（{restored} 个越南文位置）")
+                    if duplicates is not None:
+                        duplicates.register(file_path, stat)
+                        duplicates.store(file_path, checkpoint)
+                    continue
         
-        # 扫描每个文件
-        for i, file_path in enumerate(supported_files, 1):
-            print(f"正在扫描 ({i}/{len(supported_files)}): {file_path.name}")
-            
-            file_results = self.scan_single_file(file_path)
-            all_results.extend(file_results)
-            
-            if file_results:
-                print(f"  - 找到 {len(file_results)} 个越南文位置")
-            else:
-                print(f"  - 未找到越南文")
+                checkpoint = duplicates.lookup(file_path, stat) if duplicates is not None else None
+                if checkpoint is not None:
+                    restored = self.scan_engine.restore_checkpoint(file_path, checkpoint, all_results)
+                    print(f"内容相同，复用扫描结果 ({i}/{discovery.progress_total()}): {file_path.name}"
+                          f"（{restored} 个越南文位置）")
+                    if journal is not None:
+                        journal.record(file_path, stat, checkpoint)
+                    continue
+        
+                print(f"正在扫描 ({i}/{discovery.progress_total()}): {file_path.name}")
+        
+                sheet_start = len(self.scan_engine.sheet_results)
+                prefiltered_start = self.scan_engine.files_prefiltered
+                file_results = self.scan_single_file(file_path)
+                results_start = len(all_results)
+                all_results.extend(file_results)
+                error = self.scan_engine.take_file_error(file_path)
+                if journal is not None and error is None:
+                    # 无法读取的文件不写入日志，续扫时重新扫描
+                    journal.record(file_path, stat,
+                                   self.scan_engine.file_checkpoint(file_results, sheet_start, prefiltered_start))
+                if duplicates is not None and error is None:
+                    # 只在出现副本时才展开为断点记录（无法读取的文件不保存结论，相同内容的副本重新扫描）
+                    duplicates.store(file_path, self.scan_engine.deferred_checkpoint(
+                        all_results, sheet_start, prefiltered_start, results_start))
+        
+                if error is not None:
+                    print(f"  - 读取失败: {error}")
+                elif file_results:
+                    print(f"  - 找到 {len(file_results)} 个越南文位置")
+                else:
+                    print(f"  - 未找到越南文")
+        finally:
+            if journal is not None:
+                journal.close()
+        
+        self.files_discovered = discovery.discovered
+        print(f"共找到 {discovery.discovered} 个支持的文件")
+        if duplicates is not None:
+            self.duplicate_stats = duplicates.summary()
+            if duplicates.duplicates:
+                print(f"其中 {duplicates.duplicates} 个文件与之前的文件内容相同，已复用扫描结果")
         
         return all_results
     
-    def create_output_excel(self, results: List[Dict], output_folder: str, filename: str = "越南文检测结果.xlsx") -> str:
+    def create_output_excel(self, results: Sequence[Dict], output_folder: str, filename: str = "越南文检测结果.xlsx") -> str:
         """
         创建输出Excel文件
         
         Args:
-            results: 扫描结果列表
+            results: 扫描结果（FindingBatch 或字典列表）
             output_folder: 输出文件夹路径
             filename: 输出文件名
             
@@ -251,50 +254,12 @@ class VietnameseExcelProcessor:
             # 构建完整的输出文件路径
             full_output_path = output_path / filename
             
-            # 创建工作簿
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "越南文检测结果"
-            
-            # 设置标题行
-            headers = ['序号', '文件名', '位置', '越南文内容', '语言类型']
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row=1, column=col, value=header)
-                cell.font = Font(bold=True, color="FFFFFF")
-                cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-            
-            # 添加数据
-            for row_idx, result in enumerate(results, 2):
-                ws.cell(row=row_idx, column=1, value=row_idx - 1)  # 序号
-                ws.cell(row=row_idx, column=2, value=result['excel_file'])  # 文件名
-                ws.cell(row=row_idx, column=3, value=result['position'])  # 位置
-                ws.cell(row=row_idx, column=4, value=result['content'])  # 越南文内容
-                ws.cell(row=row_idx, column=5, value=result['language_type'])  # 语言类型
-            
-            # 设置列宽
+            # 以 write_only 模式流式写出，样式由共享命名样式提供
+            # 关键词搜索模式下最后两列为单元格内容、匹配关键词
+            content_headers = getattr(self.vietnamese_detector, 'report_columns', ('越南文内容', '语言类型'))
+            headers = ['序号', '文件名', '位置', *content_headers]
             column_widths = [8, 30, 20, 60, 15]
-            for col, width in enumerate(column_widths, 1):
-                ws.column_dimensions[ws.cell(row=1, column=col).column_letter].width = width
-            
-            # 设置边框
-            thin_border = Border(
-                left=Side(style='thin'),
-                right=Side(style='thin'),
-                top=Side(style='thin'),
-                bottom=Side(style='thin')
-            )
-            
-            for row in ws.iter_rows():
-                for cell in row:
-                    cell.border = thin_border
-                    cell.alignment = Alignment(horizontal="left", vertical="center", wrap_text=True)
-            
-            # 冻结首行
-            ws.freeze_panes = "A2"
-            
-            # 保存文件
-            wb.save(full_output_path)
+            write_scan_report(results, full_output_path, headers, column_widths)
             return str(full_output_path)
             
         except Exception as e:
@@ -303,7 +268,8 @@ class VietnameseExcelProcessor:
     
     
     def process_directory(self, directory_path: str, output_folder: str, recursive: bool = True, 
-                         create_excel: bool = True, create_report: bool = False) -> Dict:
+                         create_excel: bool = True, create_report: bool = False,
+                         resume: bool = False, journal_path: Optional[str] = None) -> Dict:
         """
         处理目录并导出结果
         
@@ -313,6 +279,8 @@ class VietnameseExcelProcessor:
             recursive: 是否递归扫描子目录
             create_excel: 是否创建Excel结果文件
             create_report: 是否创建汇总报告（已废弃，始终为False）
+            resume: 是否从上次中断处续扫（跳过扫描进度日志中已完成且未修改的文件）
+            journal_path: 扫描进度日志路径（续扫时默认为输出文件夹下的 越南文扫描进度.jsonl）
             
         Returns:
             Dict: 包含处理统计信息的字典
@@ -320,26 +288,33 @@ class VietnameseExcelProcessor:
         print("开始扫描文件中的越南文...")
         print("=" * 50)
         
-        # 扫描目录
-        results = self.scan_directory(directory_path, recursive)
+        # 扫描目录（续扫或指定日志路径时每完成一个文件都写入扫描进度日志，进程中断后可用 resume=True 续扫）
+        if journal_path is None and resume:
+            journal_path = str(Path(output_folder) / "越南文扫描进度.jsonl")
+        results = self.scan_directory(directory_path, recursive, resume=resume, journal_path=journal_path)
         
         # 统计信息
         stats = {
-            'total_files_scanned': len(list(Path(directory_path).rglob('*.xlsx'))) + 
-                                 len(list(Path(directory_path).rglob('*.xls'))) +
-                                 len(list(Path(directory_path).rglob('*.csv'))) +
-                                 len(list(Path(directory_path).rglob('*.tsv'))),
-            'files_with_vietnamese': len(set(result['excel_file'] for result in results)),
+            'total_files_scanned': self.files_discovered,
+            'files_with_vietnamese': len(results.unique_files()),
             'total_vietnamese_locations': len(results),
             'results': results,
+            'sheet_results': list(self.scan_engine.sheet_results),
             'output_files': []
         }
+        stats.update(self.scan_engine.summarize_sheets())
+        stats.update(self.duplicate_stats)
         
         print("\n" + "=" * 50)
         print("扫描完成！")
         print(f"扫描的文件总数: {stats['total_files_scanned']}")
         print(f"包含越南文的文件数: {stats['files_with_vietnamese']}")
         print(f"越南文位置总数: {stats['total_vietnamese_locations']}")
+        print(f"包含越南文的工作表数: {stats['sheets_with_vietnamese']}/{stats['sheets_scanned']}")
+        if stats['sheets_truncated']:
+            print(f"达到单文件上限而截断的工作表数: {stats['sheets_truncated']}")
+        if stats.get('duplicate_files'):
+            print(f"内容重复而复用结果的文件数: {stats['duplicate_files']}")
         
         # 创建输出文件
         if results:
@@ -363,26 +338,25 @@ class VietnameseExcelProcessor:
 
 
 def main():
-    """主函数 - 命令行版本"""
+    """主函数 - 命令行版本（带参数时为无交互批处理模式，见 scan_cli）"""
     import sys
     
+    # 带参数运行：无交互批处理（目录 [输出文件夹] [--format/--workers/--incremental ...]）
+    if len(sys.argv) > 1:
+        from scan_cli import run_cli
+        sys.exit(run_cli(sys.argv[1:], scanner='processor', default_format='xlsx'))
+    
     print("越南文Excel处理器")
     print("=" * 50)
     
     # 获取用户输入
-    if len(sys.argv) > 1:
-        directory_path = sys.argv[1]
-    else:
-        directory_path = input("请输入要扫描的目录路径: ").strip()
+    directory_path = input("请输入要扫描的目录路径: ").strip()
     
     if not directory_path:
         print("错误: 未提供目录路径")
         return
     
-    if len(sys.argv) > 2:
-        output_folder = sys.argv[2]
-    else:
-        output_folder = input("请输入输出文件夹路径: ").strip()
+    output_folder = input("请输入输出文件夹路径: ").strip()
     
     if not output_folder:
         print("错误: 未提供输出文件夹路径")
@@ -11,6 +11,9 @@ import os
 from pathlib import Path
 import pandas as pd
 from core.localization_checker import LocalizationChecker
+from core.file_discovery import discover_files
+from core.scan_engine import ExcelScanEngine
+from core.scan_results import FindingBatch
 from version import get_version, format_version_string, get_description
 
 
@@ -107,6 +110,10 @@ class LocalizationGUI:
         self.recursive_var = tk.BooleanVar(value=True)
         ttk.Checkbutton(options_frame, text="递归扫描子目录", variable=self.recursive_var).grid(row=0, column=0, sticky=tk.W)
         
+        # 断点续扫：跳过上次扫描（中断或停止前）已检测完成且未修改的文件
+        self.resume_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(options_frame, text="从上次中断处继续", variable=self.resume_var).grid(row=0, column=1, sticky=tk.W, padx=(20, 0))
+        
         # 支持的文件格式说明
         format_label = ttk.Label(options_frame, text="支持格式: .xlsx, .xls, .csv, .tsv", style='Info.TLabel')
         format_label.grid(row=1, column=0, sticky=tk.W, pady=(5, 0))
@@ -320,78 +327,91 @@ class LocalizationGUI:
             self.update_status("正在扫描中...")
             self.log_message(f"开始扫描目录: {directory}", "INFO")
             
-            # 获取目录中的所有表格文件
-            directory_path = Path(directory)
-            table_files = []
-            
-            if self.recursive_var.get():
-                # 递归扫描
-                for file_path in directory_path.rglob('*'):
-                    if file_path.is_file() and self.checker.table_checker.is_table_file(file_path):
-                        table_files.append(file_path)
-            else:
-                # 只扫描当前目录
-                for file_path in directory_path.iterdir():
-                    if file_path.is_file() and self.checker.table_checker.is_table_file(file_path):
-                        table_files.append(file_path)
-            
-            if not table_files:
-                self.log_message("未找到任何表格文件", "WARN")
-                self.scan_complete([])
-                return
-            
-            self.log_message(f"找到 {len(table_files)} 个表格文件", "INFO")
-            self.log_message("-" * 50, "INFO")
+            # 扫描进度日志：每检测完一个文件即记录，停止或中断后可从此处继续
+            recursive = self.recursive_var.get()
+            journal = self.checker.open_journal(directory, recursive, resume=self.resume_var.get())
+            if journal.entries:
+                self.log_message(f"从上次中断处继续，已完成 {len(journal.entries)} 个文件", "INFO")
             
-            # 目录层级优先级：按路径深度优先（浅层优先），再按文件体积（小优先），再按最近修改时间（新优先）
-            def _priority_key(p: Path):
-                try:
-                    stat = p.stat()
-                    size = stat.st_size
-                    mtime = stat.st_mtime
-                except Exception:
-                    size = 1 << 60
-                    mtime = 0
-                depth = len(p.parts)
-                return (depth, size, -mtime)
-
-            try:
-                table_files.sort(key=_priority_key)
-            except Exception:
-                pass
+            # 后台线程按层遍历目录（浅层目录优先），边发现边提交检测任务
+            directory_path = Path(directory)
+            discovery = discover_files(directory_path, self.checker.table_checker.supported_extensions,
+                                       recursive=recursive, breadth_first=True)
 
             valid_tables = []
-            total_files = len(table_files)
 
             # 并行检测以加速目录扫描
-            from concurrent.futures import ThreadPoolExecutor, as_completed
+            from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
             max_workers = max(4, min(8, (os.cpu_count() or 4) * 2))
+            # 待完成任务上限：发现速度远快于检测时不无限堆积
+            max_pending = max_workers * 4
 
-            def _check_one(path):
+            def _check_one(path, stat):
                 try:
                     result = self.checker.table_checker.check_table_has_vietnamese(path)
-                    return (path, result, None)
+                    # 无法读取的文件按检测失败处理（不写入日志）
+                    return (path, stat, result, self.checker.table_checker.take_file_error(path))
                 except Exception as exc:
-                    return (path, False, exc)
+                    return (path, stat, False, exc)
+
+            completed = 0
 
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # 按优先级顺序提交任务
-                future_to_path = {executor.submit(_check_one, p): p for p in table_files}
-                completed = 0
-                for future in as_completed(future_to_path):
-                    if not self.is_scanning:
-                        break
+            def _report(file_path, has_vietnamese, resumed=False):
+                nonlocal completed
+                completed += 1
+                self.update_progress(f"正在检测文件 {completed}/{discovery.progress_total()}: {file_path.name}")
+                suffix = "（上次已完成）" if resumed else ""
+                if has_vietnamese:
+                    valid_tables.append(file_path.name)
+                    self.log_message(f"✓ {file_path.name} - 包含越南文{suffix}", "SUCCESS")
+                else:
+                    self.log_message(f"✗ {file_path.name} - 不包含越南文{suffix}", "INFO")
+
+            def _handle(future):
+                nonlocal completed
+                file_path, stat, has_vietnamese, err = future.result()
+                if err is not None:
                     completed += 1
-                    file_path, has_vietnamese, err = future.result()
-                    self.update_progress(f"正在检测文件 {completed}/{total_files}: {file_path.name}")
-                    if err is not None:
-                        self.log_message(f"✗ {file_path.name} - 检测失败: {str(err)}", "ERROR")
-                        continue
-                    if has_vietnamese:
-                        valid_tables.append(file_path.name)
-                        self.log_message(f"✓ {file_path.name} - 包含越南文", "SUCCESS")
-                    else:
-                        self.log_message(f"✗ {file_path.name} - 不包含越南文", "INFO")
+                    self.log_message(f"✗ {file_path.name} - 检测失败: {str(err)}", "ERROR")
+                    return
+                # 检测失败的文件不写入日志，续扫时会重新检测
+                journal.record(file_path, stat, {'has_vietnamese': has_vietnamese})
+                _report(file_path, has_vietnamese)
+
+            with journal:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    pending = set()
+                    for file_path, stat in discovery:
+                        if not self.is_scanning:
+                            break
+                        checkpoint = journal.lookup(file_path, stat)
+                        if checkpoint is not None:
+                            _report(file_path, checkpoint['has_vietnamese'], resumed=True)
+                            continue
+                        pending.add(executor.submit(_check_one, file_path, stat))
+                        if len(pending) >= max_pending:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                _handle(future)
+                    while pending and self.is_scanning:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            _handle(future)
+                    # 用户停止扫描时取消尚未开始的任务
+                    for future in pending:
+                        future.cancel()
+                # 停止时已在检测中的文件等其完成后同样写入日志
+                for future in pending:
+                    if not future.cancelled():
+                        _handle(future)
+
+            if not self.is_scanning and journal.recorded + journal.resumed < discovery.discovered:
+                self.log_message("扫描进度已保存，勾选\"从上次中断处继续\"后重新扫描即可继续", "INFO")
+
+            if not discovery.discovered:
+                self.log_message("未找到任何表格文件", "WARN")
+            else:
+                self.log_message(f"共找到 {discovery.discovered} 个表格文件", "INFO")
             
             self.scan_complete(valid_tables)
             
@@ -466,57 +486,38 @@ class LocalizationGUI:
             self.update_locate_status("正在定位中...")
             self.log_locate_message(f"开始分析文件: {os.path.basename(file_path)}", "INFO")
             
-            # 读取表格文件
+            # 按行分块读取并定位，位置为表格中的实际行号/列号（表头上方的空行、数据中的空行都计入行号）
+            engine = ExcelScanEngine(self.checker.table_checker.vietnamese_detector, two_phase=False)
+            path = Path(file_path)
             if file_path.lower().endswith(('.xlsx', '.xls')):
                 # Excel文件
                 if sheet_name:
                     try:
-                        df = pd.read_excel(file_path, sheet_name=sheet_name)
+                        results, _ = engine.locate_sheet(path, sheet_name)
                         self.log_locate_message(f"使用工作表: {sheet_name}", "INFO")
                     except Exception as e:
                         self.log_locate_message(f"无法读取工作表 '{sheet_name}': {str(e)}", "ERROR")
                         self.log_locate_message("尝试使用第一个工作表...", "WARN")
-                        df = pd.read_excel(file_path)
+                        results, _ = engine.locate_sheet(path)
                 else:
-                    df = pd.read_excel(file_path)
+                    results, _ = engine.locate_sheet(path)
                     self.log_locate_message("使用第一个工作表", "INFO")
             else:
                 # CSV文件
-                encodings = ['utf-8', 'gbk', 'gb2312', 'utf-8-sig']
-                df = None
-                for encoding in encodings:
-                    try:
-                        df = pd.read_csv(file_path, encoding=encoding)
-                        self.log_locate_message(f"使用编码: {encoding}", "INFO")
-                        break
-                    except UnicodeDecodeError:
-                        continue
-                
-                if df is None:
+                results = FindingBatch()
+                encoding = engine.scan_csv_rows(path, results, None)
+                if encoding is None:
                     self.log_locate_message("无法读取CSV文件，尝试了多种编码", "ERROR")
                     return
+                self.log_locate_message(f"使用编码: {encoding}", "INFO")
             
-            self.log_locate_message(f"表格尺寸: {df.shape[0]} 行 x {df.shape[1]} 列", "INFO")
             self.log_locate_message("-" * 50, "INFO")
             
-            # 检测越南文位置（向量化加速）
-            vietnamese_locations = []
-            detector = self.checker.table_checker.vietnamese_detector
-            pattern = detector.combined_pattern
-            
-            for col_idx, column in enumerate(df.columns):
-                series = df[column].astype(str)
-                mask = series.str.contains(pattern, regex=True, na=False)
-                if not mask.any():
-                    continue
-                matched = series[mask]
-                for row_idx, value in matched.items():
-                    vietnamese_locations.append({
-                        'row': int(row_idx) + 2,  # +2 因为pandas从0开始，且Excel有标题行
-                        'col': col_idx + 1,       # +1 因为pandas从0开始
-                        'column_name': column,
-                        'content': str(value)
-                    })
+            vietnamese_locations = [
+                {'row': row, 'col': col, 'column_name': column, 'content': content}
+                for row, col, column, content in zip(*(results.values(field) for field in
+                                                       ('row', 'col', 'column_name', 'content')))
+            ]
             
             # 显示结果
             self.log_locate_message("=" * 50, "INFO")
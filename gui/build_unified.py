@@ -109,8 +109,11 @@ a = Analysis(
         'tkinter.messagebox',
         'tkinter.scrolledtext',
         'tools.excel_text_extractor',
+        'tools.multi_language_extractor',
+        'tools.extraction_cache',
         'tools.excel_data_processor',
         'core.localization_checker',
+        'core.report_writer',
     ],
     hookspath=[],
     hooksconfig={},
@@ -8,6 +8,7 @@ gametools - 统一用户界面
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import threading
+import multiprocessing
 import os
 import sys
 from pathlib import Path
@@ -27,6 +28,8 @@ from core.cross_project_translator import CrossProjectTranslator
 from tools.json_error_detector.json_error_detector import JSONErrorDetector
 from tools.excel_data_processor import ExcelDataProcessor
 from tools.excel_text_extractor import ExcelTextExtractor
+from tools.multi_language_extractor import MultiLanguageExtractor, write_summary_workbook
+from tools.extraction_cache import DEFAULT_CACHE_DIR, cache_report
 from version import get_version, format_version_string, get_description, get_latest_changes
 
 
@@ -1454,46 +1457,28 @@ class GameToolsUnified:
                 '泰文版': 'th'
             }
             
-            # 收集所有语言的文本数据
-            all_lang_data = {}  # {lang_code: {file_name: extracted_data}}
+            # 所有语言、所有文件在进程池中并行提取，界面只接收进度事件
+            # 内容未变化的文件直接使用上次的提取结果
+            languages = {lang_map[lang_name]: lang_path for lang_name, lang_path in active_languages.items()}
+            engine = MultiLanguageExtractor(progress_callback=self.update_extractor_progress,
+                                            cache_dir=DEFAULT_CACHE_DIR)
+            result = engine.extract(languages)
             
-            for idx, (lang_name, lang_path) in enumerate(active_languages.items(), 1):
+            for idx, lang_name in enumerate(active_languages, 1):
                 lang_code = lang_map[lang_name]
-                self.root.after(0, lambda n=lang_name, i=idx, t=len(active_languages): 
-                              self.append_result('text_extractor', 
-                                  f"\n📚 提取 [{i}/{t}]: {n}\n"))
-                
-                try:
-                    lang_extractor = ExcelTextExtractor(progress_callback=self.update_extractor_progress)
-                    file_data = {}
-                    
-                    if os.path.isfile(lang_path):
-                        # 单个文件
-                        file_name = os.path.splitext(os.path.basename(lang_path))[0]
-                        self.root.after(0, lambda f=file_name: 
-                                      self.append_result('text_extractor', f"  📄 {f}\n"))
-                        extracted_data = lang_extractor.extract_text_from_excel(lang_path, 1, 1)
-                        if extracted_data:
-                            file_data[file_name] = extracted_data
-                    else:
-                        # 目录批量处理
-                        excel_files = lang_extractor.scan_directory(lang_path)
-                        self.root.after(0, lambda c=len(excel_files): 
-                                      self.append_result('text_extractor', f"  📁 找到 {c} 个文件\n"))
-                        
-                        for file_idx, file_path in enumerate(excel_files, 1):
-                            file_name = os.path.splitext(os.path.basename(file_path))[0]
-                            extracted_data = lang_extractor.extract_text_from_excel(file_path, file_idx, len(excel_files))
-                            if extracted_data:
-                                file_data[file_name] = extracted_data
-                    
-                    all_lang_data[lang_code] = file_data
-                    self.root.after(0, lambda c=len(file_data): 
-                                  self.append_result('text_extractor', f"  ✅ 成功提取 {c} 个文件\n"))
-                    
-                except Exception as e:
-                    error_msg = f"  ❌ 提取 {lang_name} 时出错: {str(e)}\n"
-                    self.root.after(0, lambda m=error_msg: self.append_result('text_extractor', m))
+                if lang_code in result.errors:
+                    message = (f"\n📚 [{idx}/{len(active_languages)}] {lang_name}\n"
+                               f"  ❌ 提取 {lang_name} 时出错: {result.errors[lang_code]}\n")
+                else:
+                    message = (f"\n📚 [{idx}/{len(active_languages)}] {lang_name}\n"
+                               f"  📁 找到 {result.files_found[lang_code]} 个文件\n"
+                               f"  ✅ 成功提取 {result.file_count(lang_code)} 个文件，"
+                               f"{result.text_count(lang_code)} 个文本\n")
+                self.root.after(0, lambda m=message: self.append_result('text_extractor', m))
+            
+            if result.cache_stats is not None:
+                message = f"\n♻️ {cache_report(result.cache_stats)}\n"
+                self.root.after(0, lambda m=message: self.append_result('text_extractor', m))
             
             # 生成汇总Excel表格
             self.root.after(0, lambda: self.append_result('text_extractor', 
@@ -1502,7 +1487,7 @@ class GameToolsUnified:
                 f"📊 生成汇总Excel表格\n"))
             
             output_file = os.path.join(output_dir, "翻译提取汇总.xlsx")
-            success = self._create_extractor_summary_excel(all_lang_data, output_file)
+            success = self._create_extractor_summary_excel(result, output_file)
             
             if success:
                 self.root.after(0, lambda: self.append_result('text_extractor', 
@@ -1519,87 +1504,22 @@ class GameToolsUnified:
             error_msg = f"多语言提取过程中发生错误: {str(e)}"
             self.root.after(0, self._show_extractor_error_result, error_msg)
     
-    def _create_extractor_summary_excel(self, all_lang_data, output_file):
-        """创建汇总Excel表格"""
+    def _create_extractor_summary_excel(self, result, output_file):
+        """创建汇总Excel表格（result 为 MultiLanguageExtractor 的提取结果）"""
         try:
-            import pandas as pd
-            from openpyxl import load_workbook
-            from openpyxl.styles import Font, PatternFill, Alignment
-            
-            # 选择第一个有数据的语言作为基准
-            base_lang = None
-            base_data = None
-            lang_priority = ['cn', 'vn', 'en', 'th']  # 优先级顺序
-            
-            for lang in lang_priority:
-                if lang in all_lang_data and all_lang_data[lang]:
-                    base_lang = lang
-                    base_data = all_lang_data[lang]
-                    logging.info(f"使用 {lang} 作为基准语言")
-                    break
-            
-            if not base_lang or not base_data:
+            # 以第一个有数据的语言为基准，其他语言按 (文件, 工作表, A列ID, 字段名) 对齐，ID 对不上时按位置对齐
+            alignment = result.align()
+            if alignment is None:
                 logging.error("未找到任何语言数据，无法生成汇总表格")
                 return False
+            logging.info(f"使用 {alignment.base_lang} 作为基准语言")
+            logging.info(alignment.report())
+            df = alignment.summary
             
-            # 构建汇总数据
-            summary_data = []
+            # 一次流式写出（标题行样式、列宽在写入数据前设置，不再重新打开文件美化格式）
+            write_summary_workbook(df, output_file)
             
-            for file_name, file_data in base_data.items():
-                for sheet_name, sheet_data in file_data.items():
-                    if not sheet_data or 'items' not in sheet_data:
-                        continue
-                    
-                    for item in sheet_data['items']:
-                        excel_pos = item.get('excel_row_ref', '')
-                        base_text = item.get('text', '')
-                        
-                        # 查找所有语言对应位置的文本
-                        cn_text = base_text if base_lang == 'cn' else self._find_extractor_text_at_position(all_lang_data.get('cn', {}), file_name, sheet_name, excel_pos)
-                        vn_text = base_text if base_lang == 'vn' else self._find_extractor_text_at_position(all_lang_data.get('vn', {}), file_name, sheet_name, excel_pos)
-                        en_text = base_text if base_lang == 'en' else self._find_extractor_text_at_position(all_lang_data.get('en', {}), file_name, sheet_name, excel_pos)
-                        th_text = base_text if base_lang == 'th' else self._find_extractor_text_at_position(all_lang_data.get('th', {}), file_name, sheet_name, excel_pos)
-                        
-                        summary_data.append({
-                            'name': file_name,
-                            'num': excel_pos,
-                            'cn': cn_text,
-                            'vn': vn_text,
-                            'en': en_text,
-                            'th': th_text
-                        })
-            
-            # 创建DataFrame
-            df = pd.DataFrame(summary_data)
-            
-            # 保存到Excel
-            df.to_excel(output_file, index=False, sheet_name='汇总')
-            
-            # 美化Excel格式
-            wb = load_workbook(output_file)
-            ws = wb['汇总']
-            
-            # 设置标题行样式
-            header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF", size=11)
-            
-            for cell in ws[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal='center', vertical='center')
-            
-            # 设置列宽
-            ws.column_dimensions['A'].width = 25  # name
-            ws.column_dimensions['B'].width = 10  # num
-            ws.column_dimensions['C'].width = 40  # cn
-            ws.column_dimensions['D'].width = 40  # vn
-            ws.column_dimensions['E'].width = 40  # en
-            ws.column_dimensions['F'].width = 40  # th
-            
-            # 保存
-            wb.save(output_file)
-            
-            logging.info(f"汇总Excel表格创建成功: {output_file}, 总计 {len(summary_data)} 条记录")
+            logging.info(f"汇总Excel表格创建成功: {output_file}, 总计 {len(df)} 条记录")
             
             return True
             
@@ -1607,25 +1527,6 @@ class GameToolsUnified:
             logging.error(f"创建汇总Excel失败: {str(e)}")
             return False
     
-    def _find_extractor_text_at_position(self, lang_data, file_name, sheet_name, excel_pos):
-        """在指定语言数据中查找特定位置的文本"""
-        if not lang_data or file_name not in lang_data:
-            return ""
-        
-        file_data = lang_data[file_name]
-        if sheet_name not in file_data:
-            return ""
-        
-        sheet_data = file_data[sheet_name]
-        if not sheet_data or 'items' not in sheet_data:
-            return ""
-        
-        for item in sheet_data['items']:
-            if item.get('excel_row_ref') == excel_pos:
-                return item.get('text', '')
-        
-        return ""
-    
     def _show_extractor_multi_lang_success(self):
         """显示多语言提取成功结果"""
         timestamp = self._get_timestamp()
@@ -1900,4 +1801,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 打包为 exe 后，多语言提取的进程池需要
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
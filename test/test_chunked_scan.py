@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+xlsx 分块定位测试
+验证按行分块流式定位与 pandas 整表读取后定位的结果（位置、列名、内容）完全一致，
+并对比两种方式在不同行数工作表上的峰值内存
+
+运行方式:
+  python test/test_chunked_scan.py            # 默认 40000 行
+  python test/test_chunked_scan.py 500000
+"""
+
+import sys
+import time
+import random
+import shutil
+import datetime
+import tracemalloc
+from pathlib import Path
+
+# 添加模块路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pandas as pd
+from openpyxl import Workbook
+
+from core.localization_checker import VietnameseDetector
+from core.scan_engine import ExcelScanEngine, excel_column_names
+from core.scan_results import FindingBatch
+
+
+TEST_DIR = Path("test_chunked_scan_demo")
+VALUES = ['Thanh kiếm', 'Khiên', '宝剑', 'Sword', None, 12, 3.5, 'Nhiệm vụ', '',
+          datetime.datetime(2024, 1, 1), True, 'Đội trưởng 宝剑']
+HEADERS = ['id', 'name', 'name', None, 'name.1', 1, 2.0, 'Tên', '']
+
+
+def _whole_sheet_scan(engine: ExcelScanEngine, file_path: Path, limit=None) -> FindingBatch:
+    """整表定位：pandas 读取整张工作表（header=None）后检测"""
+    results = FindingBatch()
+    with pd.ExcelFile(file_path) as excel_file:
+        for sheet_name in excel_file.sheet_names:
+            df = excel_file.parse(sheet_name, header=None)
+            hits = engine.scan_dataframe(df, file_path, sheet_name, results, limit)
+            if limit is not None:
+                limit -= hits
+                if limit <= 0:
+                    break
+    return results
+
+
+def _create_messy_workbook(path: Path, seed: int):
+    """表头含空值/重复/数字，数据含空行、混合类型、长短不一的行"""
+    rng = random.Random(seed)
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for sheet_index in range(3):
+        sheet = workbook.create_sheet(f"表{sheet_index}")
+        width = rng.randint(1, len(HEADERS))
+        for col, value in enumerate(rng.sample(HEADERS, width), 1):
+            if value is not None:
+                sheet.cell(1, col, value)
+        for row in range(2, rng.randint(2, 60)):
+            if rng.random() < 0.1:
+                continue  # 空行
+            for col in range(1, width + rng.randint(0, 2) + 1):
+                value = rng.choice(VALUES)
+                if value is not None:
+                    sheet.cell(row, col, value)
+    workbook.save(path)
+
+
+def test_same_results():
+    """分块定位与 pandas 整表定位结果一致"""
+    print("\n[1] 验证分块定位结果与 pandas 整表定位一致...")
+    TEST_DIR.mkdir(exist_ok=True)
+    detector = VietnameseDetector()
+    total = 0
+    for seed in range(30):
+        path = TEST_DIR / f"messy_{seed}.xlsx"
+        _create_messy_workbook(path, seed)
+        for chunk_rows in (1, 7, 5000):
+            for limit in (None, 5):
+                engine = ExcelScanEngine(detector, two_phase=False, max_hits_per_file=limit,
+                                         chunk_rows=chunk_rows)
+                actual = engine.scan_excel_file(path).to_dicts()
+                expected = _whole_sheet_scan(engine, path, limit).to_dicts()
+                assert actual == expected, f"seed={seed} chunk_rows={chunk_rows} limit={limit} 结果不一致"
+        total += len(actual)
+    print(f"    ✓ 30 个工作簿 x 3 种分块大小 x 是否限制位置数，共 {total} 个位置完全一致")
+
+    # 表头列名规则与 pandas 一致
+    assert excel_column_names(['a', 'a', None, 'a.1', 1.0, '']) == \
+        ['a', 'a.2', 'Unnamed: 2', 'a.1', 1, 'Unnamed: 5']
+    print("    ✓ 表头列名（空值、重复、数字）与 pandas 一致")
+
+
+def _create_large_workbook(path: Path, rows: int):
+    """单个大工作表：每100行一条越南文（文本取值有限，共享字符串表大小与行数无关）"""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("对白")
+    sheet.append(['id', 'speaker', 'text', 'note'])
+    for i in range(rows):
+        text = f"Xin chào lần {i % 1000}" if i % 100 == 0 else f"对白内容 {i % 1000}"
+        sheet.append([i, f"角色{i % 50}", text, "Dialogue line"])
+    workbook.save(path)
+
+
+def _measure(func):
+    tracemalloc.start()
+    start_time = time.time()
+    result = func()
+    elapsed = time.time() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024 / 1024
+
+
+def test_memory(rows: int):
+    """不同行数下的峰值内存：分块定位与工作表大小无关"""
+    print("\n[2] 峰值内存对比...")
+    # 关闭备忘表，只比较读取与定位本身的内存
+    detector = VietnameseDetector(memo_size=0)
+    for row_count in (rows // 4, rows):
+        path = TEST_DIR / f"large_{row_count}.xlsx"
+        _create_large_workbook(path, row_count)
+        engine = ExcelScanEngine(detector, two_phase=False)
+
+        whole, whole_time, whole_peak = _measure(lambda: _whole_sheet_scan(engine, path))
+        chunked, chunked_time, chunked_peak = _measure(lambda: engine.scan_excel_file(path))
+
+        assert len(chunked) == len(whole) == (row_count + 99) // 100
+        assert chunked[-1] == whole[-1]
+        print(f"    {row_count} 行: pandas 整表 {whole_time:.2f} 秒 / 峰值 {whole_peak:.1f} MB, "
+              f"分块 {chunked_time:.2f} 秒 / 峰值 {chunked_peak:.1f} MB")
+    print("    ✓ pandas 整表读取的峰值内存随行数线性增长，分块定位基本持平")
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 40000
+
+    print("=" * 60)
+    print("xlsx 分块定位测试")
+    print("=" * 60)
+
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    try:
+        test_same_results()
+        test_memory(rows)
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    print("\n✓ 测试完成！")
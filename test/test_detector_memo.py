@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+检测结果备忘表测试
+验证带备忘表的 VietnameseDetector 与不缓存时结论一致、LRU 容量受限，
+并对比大量重复字符串场景下逐单元格检测与去重向量化检测的耗时
+
+运行方式:
+  python test/test_detector_memo.py            # 默认 200000 个单元格
+  python test/test_detector_memo.py 1000000
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# 添加模块路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from core.localization_checker import VietnameseDetector
+
+
+SAMPLES = [
+    'Tên game', 'Thanh kiếm', '宝剑', '宝剑 Thanh kiếm', 'Sword', 'abc ế def ghi jkl mno',
+    'Khiên', '', '   ', '123', 'ế', 'Nhiệm vụ hằng ngày', '每日任务', 'Daily quest',
+]
+
+
+def _make_corpus(count: int, unique: int = 2000):
+    """模拟本地化表：少量唯一字符串大量重复"""
+    values = [f"{SAMPLES[i % len(SAMPLES)]} {i}" for i in range(unique)]
+    rng = np.random.default_rng(0)
+    return [values[i] for i in rng.integers(0, unique, count)]
+
+
+def test_same_results():
+    """备忘表不改变检测结论"""
+    print("\n[1] 验证备忘表不改变检测结论...")
+    memo_detector = VietnameseDetector()
+    plain_detector = VietnameseDetector(memo_size=0)
+    for _ in range(2):
+        for text in SAMPLES + _make_corpus(2000, 200):
+            assert memo_detector.contains_vietnamese(text) == plain_detector.contains_vietnamese(text), text
+            assert memo_detector.contains_chinese(text) == plain_detector.contains_chinese(text), text
+            assert memo_detector.contains_english(text) == plain_detector.contains_english(text), text
+            assert memo_detector.detect_language_type(text) == plain_detector.detect_language_type(text), text
+    stats = memo_detector.memo_stats()
+    assert stats['hits'] > stats['misses'], stats
+    assert plain_detector.memo_stats()['size'] == 0
+    print(f"    ✓ 结论一致, 命中率 {stats['hit_rate']:.1%}")
+
+
+def test_lru_bound():
+    """LRU 容量受限"""
+    print("\n[2] 验证LRU淘汰...")
+    detector = VietnameseDetector(memo_size=100)
+    for i in range(1000):
+        detector.contains_vietnamese(f"Thanh kiếm {i}")
+        # 反复访问的热点字符串不会被淘汰
+        detector.contains_vietnamese("Tên game")
+    stats = detector.memo_stats()
+    assert stats['size'] == 100, stats
+    assert stats['hits'] == 999, stats
+    print(f"    ✓ 条目数保持在 {stats['size']}，热点字符串始终命中")
+
+
+def test_series(count: int):
+    """去重向量化检测与逐单元格检测一致，并对比耗时"""
+    print(f"\n[3] 去重向量化检测（{count} 个单元格）...")
+    corpus = _make_corpus(count)
+    series = pd.Series(corpus + [None, np.nan, 1, 2.5])
+
+    plain_detector = VietnameseDetector(memo_size=0)
+    start_time = time.time()
+    expected = [pd.notna(value) and plain_detector.contains_vietnamese(str(value)) for value in series]
+    plain_time = time.time() - start_time
+
+    memo_detector = VietnameseDetector()
+    start_time = time.time()
+    per_cell = [pd.notna(value) and memo_detector.contains_vietnamese(str(value)) for value in series]
+    memo_time = time.time() - start_time
+
+    series_detector = VietnameseDetector()
+    start_time = time.time()
+    mask = series_detector.contains_vietnamese_series(series)
+    series_time = time.time() - start_time
+
+    assert per_cell == expected
+    assert mask.tolist() == expected
+    print(f"    逐单元格（无缓存）: {plain_time:.3f} 秒")
+    print(f"    逐单元格（备忘表）: {memo_time:.3f} 秒, 命中率 {memo_detector.memo_stats()['hit_rate']:.1%}")
+    print(f"    去重向量化: {series_time:.3f} 秒, 只检测 {series_detector.memo_stats()['misses']} 个唯一值")
+    print(f"    ✓ 加速 {plain_time / max(series_time, 1e-6):.1f}x")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    print("=" * 60)
+    print("检测结果备忘表测试")
+    print("=" * 60)
+
+    test_same_results()
+    test_lru_bound()
+    test_series(count)
+
+    print("\n✓ 测试完成！")
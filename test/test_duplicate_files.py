@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+重复文件复用测试
+模拟 cn/vn/en/th 四个语言分支（共用的配置表在每个分支各有一份逐字节相同的副本），
+验证开启/关闭重复文件识别时三个扫描器与命令行的结果完全相同，并对比耗时
+
+运行方式:
+  python test/test_duplicate_files.py            # 默认每个分支 8 个共用表格
+  python test/test_duplicate_files.py 40
+"""
+
+import io
+import sys
+import json
+import time
+import shutil
+import contextlib
+import subprocess
+import tracemalloc
+from pathlib import Path
+
+# 添加模块路径
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "core"))
+
+import pandas as pd
+
+from core.duplicate_files import DuplicateFileIndex
+from core.excel_vietnamese_scanner import ExcelVietnameseScanner
+from core.localization_checker import LocalizationChecker
+from vietnamese_excel_processor import VietnameseExcelProcessor
+
+
+TEST_DIR = Path("test_duplicate_files_demo").resolve()
+DATA_DIR = TEST_DIR / "project"
+BRANCHES = ("cn", "vn", "en", "th")
+
+
+def _create_tree(shared_count: int):
+    """每个分支一份共用表格副本，另有各分支独有的表格"""
+    shared_dir = TEST_DIR / "shared"
+    shared_dir.mkdir(parents=True, exist_ok=True)
+    for i in range(shared_count):
+        names = [f"Thanh kiếm {i}-{row}" if row % 7 == 0 else f"物品{i}-{row}" for row in range(400)]
+        with pd.ExcelWriter(shared_dir / f"config_{i}.xlsx") as writer:
+            pd.DataFrame({'id': range(400), 'name': names}).to_excel(writer, sheet_name="配置", index=False)
+            pd.DataFrame({'id': [i], 'desc': ['宝剑']}).to_excel(writer, sheet_name="说明", index=False)
+        (shared_dir / f"dialog_{i}.csv").write_text(
+            "id,text\n" + "".join(f"{row},Xin chào {i}-{row}\n" for row in range(200)), encoding='utf-8')
+
+    for branch in BRANCHES:
+        branch_dir = DATA_DIR / branch / "表格"
+        shutil.copytree(shared_dir, branch_dir)
+        # 各分支独有的表格；大小相同但内容不同（需要比较摘要才能区分）
+        text = "Khiên" if branch == "vn" else "Shield"
+        (branch_dir / "branch.csv").write_text(f"id,text\n1,{text}{branch}\n".ljust(40), encoding='utf-8')
+    shutil.rmtree(shared_dir)
+
+
+def test_index():
+    """大小分组与摘要比较"""
+    print("\n[1] 验证重复文件识别...")
+    directory = TEST_DIR / "index"
+    directory.mkdir(parents=True)
+    (directory / "a.txt").write_text("same content")
+    (directory / "b.txt").write_text("diff content")
+    (directory / "c.txt").write_text("other size")
+    (directory / "d.txt").write_text("same content")
+
+    index = DuplicateFileIndex()
+    assert index.register(directory / "a.txt") is None
+    assert index.register(directory / "c.txt") is None
+    assert index.files_hashed == 0, "大小唯一的文件不应计算摘要"
+    assert index.register(directory / "b.txt") is None
+    assert index.files_hashed == 2
+    index.store(directory / "a.txt", {'has_vietnamese': True})
+    assert index.lookup(directory / "d.txt") == {'has_vietnamese': True}
+    assert index.register(directory / "d.txt") is None, "重复登记同一路径不算副本"
+    assert index.summary() == {'duplicate_files': 1, 'duplicate_bytes': 12, 'files_hashed': 3, 'bytes_hashed': 36}
+    print("    ✓ 只为同大小的文件计算摘要，同大小不同内容不会误判")
+
+    # 保存的是函数时只在出现副本时调用一次
+    calls = []
+    index.store(directory / "c.txt", lambda: calls.append(1) or {'has_vietnamese': False})
+    assert not calls
+    (directory / "e.txt").write_text("other size")
+    assert index.lookup(directory / "e.txt") == {'has_vietnamese': False}
+    (directory / "f.txt").write_text("other size")
+    assert index.lookup(directory / "f.txt") == {'has_vietnamese': False}
+    assert calls == [1]
+    print("    ✓ 延迟生成的结论只在出现副本时生成一次")
+
+    # 第一个文件没有结论（无法读取）时副本重新扫描，不计为复用；之后的副本复用重新扫描的结论
+    index = DuplicateFileIndex()
+    assert index.register(directory / "a.txt") is None
+    assert index.lookup(directory / "d.txt") is None
+    assert index.duplicates == 0
+    index.store(directory / "d.txt", {'has_vietnamese': True})
+    (directory / "g.txt").write_text("same content")
+    assert index.lookup(directory / "g.txt") == {'has_vietnamese': True}
+    assert (index.duplicates, index.duplicate_bytes) == (1, 12)
+    print("    ✓ 只有实际复用了结论的副本才计入统计")
+
+
+def _rows(results):
+    return [(item['file_path'], item['sheet_name'], item['position'], item['content']) for item in results]
+
+
+def _timed(scan):
+    with contextlib.redirect_stdout(io.StringIO()):
+        start_time = time.time()
+        result = scan()
+        return result, time.time() - start_time
+
+
+def test_scanners(shared_count: int):
+    """开启/关闭重复文件识别，三个扫描器的结果相同"""
+    print("\n[2] 验证扫描器结果与耗时...")
+    file_count = len(BRANCHES) * (shared_count * 2 + 1)
+    expected_duplicates = (len(BRANCHES) - 1) * shared_count * 2
+
+    processor = VietnameseExcelProcessor()
+    baseline, baseline_time = _timed(lambda: processor.scan_directory(str(DATA_DIR), dedupe=False))
+    baseline_sheets = list(processor.scan_engine.sheet_results)
+    assert processor.duplicate_stats == {}
+    deduped, deduped_time = _timed(lambda: processor.scan_directory(str(DATA_DIR)))
+    assert _rows(deduped) == _rows(baseline)
+    assert processor.scan_engine.sheet_results == baseline_sheets
+    assert processor.files_discovered == file_count
+    assert processor.duplicate_stats['duplicate_files'] == expected_duplicates
+    print(f"    分支数: {len(BRANCHES)}，文件数: {file_count}，其中副本 {expected_duplicates} 个")
+    print(f"    逐个扫描: {baseline_time:.2f} 秒")
+    print(f"    复用副本: {deduped_time:.2f} 秒（计算摘要 {processor.duplicate_stats['files_hashed']} 个文件）")
+    print(f"    ✓ {len(baseline)} 个越南文位置与工作表结果相同，"
+          f"加速 {baseline_time / max(deduped_time, 1e-6):.1f}x")
+
+    scanner = ExcelVietnameseScanner()
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = _rows(scanner.scan_directory(str(DATA_DIR), dedupe=False))
+        assert _rows(scanner.scan_directory(str(DATA_DIR))) == expected
+    assert scanner.duplicate_stats['duplicate_files'] == (len(BRANCHES) - 1) * shared_count
+    print("    ✓ ExcelVietnameseScanner 结果相同")
+
+    checker = LocalizationChecker()
+    journal_path = TEST_DIR / "checker.jsonl"
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = checker.scan_directory(str(DATA_DIR), recursive=True, dedupe=False)
+        assert checker.scan_directory(str(DATA_DIR), recursive=True, journal_path=str(journal_path)) == expected
+        # 续扫时来自日志的文件同样登记，之后的副本仍可复用
+        assert checker.scan_directory(str(DATA_DIR), recursive=True, resume=True,
+                                      journal_path=str(journal_path)) == expected
+    print("    ✓ LocalizationChecker 结果相同（含续扫）")
+
+
+def _peak_memory(scan) -> float:
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            scan()
+        return tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def test_memory(file_count: int):
+    """没有副本的文件不展开为断点记录：开启识别时的峰值内存与关闭时接近"""
+    print("\n[3] 验证没有副本时的内存...")
+    directory = TEST_DIR / "unique"
+    directory.mkdir(parents=True)
+    for i in range(file_count):
+        (directory / f"dialog_{i}.csv").write_text(
+            "id,text\n" + "".join(f"{row},Xin chào {i}-{row}\n" for row in range(2000 + i)), encoding='utf-8')
+
+    processor = VietnameseExcelProcessor()
+    baseline = _peak_memory(lambda: processor.scan_directory(str(directory), dedupe=False))
+    deduped = _peak_memory(lambda: processor.scan_directory(str(directory)))
+    print(f"    关闭识别: {baseline:.1f} MB，开启识别: {deduped:.1f} MB（{file_count} 个文件，大小各不相同）")
+    assert deduped < baseline * 1.2, "没有副本时不应为每个文件保存展开的断点记录"
+    print("    ✓ 峰值内存接近")
+
+
+def test_cli():
+    """命令行多进程时副本等待同一个扫描任务，输出与不识别副本时相同"""
+    print("\n[4] 验证命令行...")
+    outputs = {}
+    for args in (("--no-dedupe",), ("--workers", "2"), ()):
+        completed = subprocess.run(
+            [sys.executable, "-m", "core.scan_cli", str(DATA_DIR), "--stats", *args],
+            cwd=str(ROOT), capture_output=True, text=True, encoding='utf-8')
+        assert completed.returncode == 0, completed.stderr
+        stats = json.loads(completed.stderr.strip().splitlines()[-1])
+        outputs[args] = (completed.stdout, stats['duplicate_files'])
+    baseline, duplicates = outputs[("--no-dedupe",)]
+    assert duplicates == 0
+    assert outputs[("--workers", "2")][0] == baseline and outputs[()][0] == baseline
+    assert outputs[()][1] > 0
+    print(f"    ✓ 单进程/多进程输出与 --no-dedupe 相同（复用 {outputs[()][1]} 个副本）")
+
+    # 内容相同但都无法打开的文件：副本重新扫描，不计为复用
+    broken_dir = TEST_DIR / "broken"
+    broken_dir.mkdir()
+    for name in ("a.xlsx", "b.xlsx"):
+        (broken_dir / name).write_bytes(b"not a zip")
+    for args in ((), ("--workers", "2")):
+        completed = subprocess.run(
+            [sys.executable, "-m", "core.scan_cli", str(broken_dir), "--stats", *args],
+            cwd=str(ROOT), capture_output=True, text=True, encoding='utf-8')
+        stats = json.loads(completed.stderr.strip().splitlines()[-1])
+        assert completed.returncode == 2 and stats['files_with_errors'] == 2, completed.stderr
+        if not args:
+            assert stats['duplicate_files'] == 0 and stats['duplicate_bytes'] == 0, stats
+    for scanner in (VietnameseExcelProcessor(), ExcelVietnameseScanner()):
+        _timed(lambda: scanner.scan_directory(str(broken_dir)))
+        assert scanner.duplicate_stats['duplicate_files'] == 0
+    print("    ✓ 无法打开的文件的副本重新扫描，不计为复用")
+
+
+if __name__ == "__main__":
+    shared_count = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+
+    print("=" * 60)
+    print("重复文件复用测试")
+    print("=" * 60)
+
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    try:
+        test_index()
+        _create_tree(shared_count)
+        test_scanners(shared_count)
+        test_memory(shared_count * 5)
+        test_cli()
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    print("\n✓ 测试完成！")
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+提取结果缓存测试
+验证按 "提取规则版本 + 文件内容摘要" 缓存的提取结果与重新解析完全一致，
+内容修改、规则版本变化、缓存损坏时重新解析，多语言提取引擎的命中/未命中统计，
+长期未使用的条目被清理，并对比首次提取与再次提取的耗时
+
+运行方式:
+  python test/test_extraction_cache.py            # 默认每种语言 6 个文件
+  python test/test_extraction_cache.py 20
+"""
+
+import os
+import sys
+import time
+import pickle
+import shutil
+import logging
+from pathlib import Path
+
+# 添加模块路径
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+import pandas as pd
+
+from core.cache_manager import CacheEntry, FileCache
+from tools.excel_text_extractor import ExcelTextExtractor
+from tools.extraction_cache import (DEFAULT_CACHE_DIR, DEFAULT_MAX_AGE_DAYS, ExtractionCache, cache_report,
+                                    pack_extracted_data, unpack_extracted_data)
+from tools.multi_language_extractor import MultiLanguageExtractor
+
+
+TEST_DIR = Path("test_extraction_cache_demo").resolve()
+CACHE_DIR = TEST_DIR / "cache"
+TEXTS = {
+    'cn': lambda i: f"物品{i}",
+    'vn': lambda i: f"Vật phẩm {i}",
+}
+
+
+def _age_entries(cache_dir: Path, days: float):
+    """把缓存目录中所有条目的修改时间改为 days 天前（模拟长期未使用）"""
+    timestamp = time.time() - days * 86400
+    for cache_file in cache_dir.glob("*.cache"):
+        os.utime(cache_file, (timestamp, timestamp))
+
+
+def _hit_stats(stats):
+    return {key: stats[key] for key in ('cache_hits', 'cache_misses')}
+
+
+def _create_table(path: Path, text, rows: int):
+    """游戏配置表格式：前 6 行为表头区（第 5 行为字段名），之后为数据；第 2 列的列名为数字"""
+    with pd.ExcelWriter(path) as writer:
+        for sheet_index in range(3):
+            data = [['id', 'name', 'desc']] * 4 + [['ID', '名称', '描述'], ['', '', '']]
+            data += [[f"{sheet_index}_{row}", text(row), f"备注{row % 30}"] for row in range(rows)]
+            pd.DataFrame(data, columns=['id', 2, 'desc']).to_excel(writer, sheet_name=f"表{sheet_index}", index=False)
+
+
+def _create_tree(file_count: int):
+    for lang, text in TEXTS.items():
+        directory = TEST_DIR / lang
+        directory.mkdir(parents=True)
+        for file_index in range(file_count):
+            _create_table(directory / f"config_{file_index}.xlsx", text, 300 + 100 * file_index)
+
+
+def test_pack():
+    """按列打包后还原的结果与原结果一致"""
+    print("\n[1] 验证打包格式...")
+    extractor = ExcelTextExtractor()
+    extracted_data = extractor.extract_text_from_excel(str(TEST_DIR / "cn" / "config_0.xlsx"))
+    packed = pack_extracted_data(extracted_data)
+    assert unpack_extracted_data(packed) == extracted_data
+    assert unpack_extracted_data(pack_extracted_data({})) == {}
+    plain_size = len(pickle.dumps(extracted_data))
+    print(f"    ✓ 还原结果一致（{plain_size} 字节 -> {len(packed)} 字节）")
+
+    # FileCache 的值只保存一份，旧格式（条目元信息中也有值）仍可读取
+    file_cache = FileCache(cache_dir=str(TEST_DIR / "file_cache"))
+    file_cache.set("key", packed)
+    assert file_cache.get("key") == packed
+    entry = CacheEntry(key="old", value=b"old value")
+    with open(file_cache._get_cache_path("old"), 'wb') as f:
+        pickle.dump({'entry': entry.__dict__, 'value': b"old value"}, f)
+    assert file_cache.get("old") == b"old value"
+    assert not list(file_cache.cache_dir.glob("*.tmp")), "临时文件应已替换为缓存文件"
+    print("    ✓ FileCache 只保存一份值，兼容旧格式")
+
+
+def test_extractor():
+    """ExcelTextExtractor 的缓存命中与失效"""
+    print("\n[2] 验证文本提取器缓存...")
+    file_path = str(TEST_DIR / "cn" / "config_1.xlsx")
+    expected = ExcelTextExtractor().extract_text_from_excel(file_path)
+
+    cache_dir = str(TEST_DIR / "extractor_cache")
+    first = ExcelTextExtractor(cache_dir=cache_dir)
+    assert first.extract_text_from_excel(file_path) == expected
+    events = []
+    second = ExcelTextExtractor(progress_callback=lambda *event: events.append(event[3]), cache_dir=cache_dir)
+    assert second.extract_text_from_excel(file_path) == expected
+    assert (first.extraction_cache.summary(), second.extraction_cache.summary()) == (
+        {'cache_hits': 0, 'cache_misses': 1}, {'cache_hits': 1, 'cache_misses': 0})
+    assert any("从缓存读取" in message for message in events)
+    print("    ✓ 第二次提取命中缓存，结果与重新解析一致")
+
+    other = ExtractionCache(cache_dir, version=999)
+    assert other.load(file_path)[1] is None
+    print("    ✓ 提取规则版本变化后不再命中")
+
+    for cache_file in Path(cache_dir).glob("*.cache"):
+        cache_file.write_bytes(b"broken")
+    third = ExcelTextExtractor(cache_dir=cache_dir)
+    assert third.extract_text_from_excel(file_path) == expected
+    assert third.extraction_cache.summary() == {'cache_hits': 0, 'cache_misses': 1}
+    assert ExcelTextExtractor(cache_dir=cache_dir).extract_text_from_excel(file_path) == expected
+    print("    ✓ 缓存损坏时重新解析并覆盖")
+
+    _age_entries(Path(cache_dir), DEFAULT_MAX_AGE_DAYS + 1)
+    fourth = ExcelTextExtractor(cache_dir=cache_dir)
+    assert fourth.extraction_cache.prune() == {'cache_pruned': 1, 'cache_files': 0, 'cache_bytes': 0}
+    assert fourth.extract_text_from_excel(file_path) == expected
+    stats = fourth.extraction_cache.prune()
+    assert (stats['cache_pruned'], stats['cache_files']) == (0, 1) and stats['cache_bytes'] > 0
+    assert "缓存共 1 个条目" in fourth.extraction_cache.report()
+    print("    ✓ 长期未使用的条目被清理，报告中包含缓存大小")
+
+    # 默认缓存目录不随当前工作目录变化
+    assert Path(DEFAULT_CACHE_DIR) == ROOT.resolve() / ".cache" / "text_extraction"
+    print(f"    ✓ 默认缓存目录位于项目根目录: {DEFAULT_CACHE_DIR}")
+
+
+def test_engine(file_count: int):
+    """多语言提取引擎：未修改的文件命中缓存，修改过的文件重新解析"""
+    print("\n[3] 验证多语言提取引擎...")
+    languages = {lang: str(TEST_DIR / lang) for lang in TEXTS}
+    expected = MultiLanguageExtractor(workers=1).extract(languages)
+    assert expected.cache_stats is None
+    total_files = len(TEXTS) * file_count
+
+    timings = {}
+    for run, workers in (("首次提取", 2), ("再次提取", 2), ("再次提取（单进程）", 1)):
+        events = []
+        engine = MultiLanguageExtractor(workers=workers, cache_dir=str(CACHE_DIR),
+                                        progress_callback=lambda *event: events.append(event[3]))
+        start_time = time.time()
+        result = engine.extract(languages)
+        timings[run] = time.time() - start_time
+        for lang in TEXTS:
+            assert result.frames[lang].values.tolist() == expected.frames[lang].values.tolist(), f"{run}: {lang}"
+        hits = 0 if run == "首次提取" else total_files
+        assert _hit_stats(result.cache_stats) == {'cache_hits': hits, 'cache_misses': total_files - hits}, result.cache_stats
+        assert (result.cache_stats['cache_files'], result.cache_stats['cache_pruned']) == (total_files, 0)
+        assert "缓存命中" in events[-1] and f"缓存共 {total_files} 个条目" in events[-1]
+    print(f"    ✓ 首次全部解析，再次提取全部命中（{total_files} 个文件），结果与不使用缓存时一致")
+
+    _create_table(TEST_DIR / "vn" / "config_0.xlsx", lambda i: f"Thanh kiếm {i}", 50)
+    expected_vn = MultiLanguageExtractor(workers=1).extract({'vn': languages['vn']})
+    result = MultiLanguageExtractor(workers=1, cache_dir=str(CACHE_DIR)).extract(languages)
+    assert _hit_stats(result.cache_stats) == {'cache_hits': total_files - 1, 'cache_misses': 1}
+    assert result.frames['vn'].values.tolist() == expected_vn.frames['vn'].values.tolist()
+    print("    ✓ 修改过的文件重新解析，其余命中缓存")
+
+    # 修改前内容的条目不再命中；超过保留天数后被清理，仍在使用的条目命中时刷新使用时间而保留
+    assert result.cache_stats['cache_files'] == total_files + 1
+    _age_entries(CACHE_DIR, DEFAULT_MAX_AGE_DAYS + 1)
+    result = MultiLanguageExtractor(workers=2, cache_dir=str(CACHE_DIR)).extract(languages)
+    assert _hit_stats(result.cache_stats) == {'cache_hits': total_files, 'cache_misses': 0}
+    assert (result.cache_stats['cache_files'], result.cache_stats['cache_pruned']) == (total_files, 1)
+    assert len(list(CACHE_DIR.glob("*.cache"))) == total_files
+    assert "已清理 1 个长期未使用的条目" in cache_report(result.cache_stats)
+    print(f"    ✓ 清理超过 {DEFAULT_MAX_AGE_DAYS} 天未使用的条目，缓存目录不随文件修改无限增长")
+
+    for run, elapsed in timings.items():
+        print(f"    {run}: {elapsed:.2f} 秒")
+    print(f"    ✓ 再次提取加速 {timings['首次提取'] / max(timings['再次提取'], 1e-6):.1f}x")
+
+
+if __name__ == "__main__":
+    file_count = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    logging.disable(logging.ERROR)
+
+    print("=" * 60)
+    print("提取结果缓存测试")
+    print("=" * 60)
+
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    try:
+        _create_tree(file_count)
+        test_pack()
+        test_extractor()
+        test_engine(file_count)
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    print("\n✓ 测试完成！")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+目录文件发现测试
+验证后台 os.scandir 遍历与 rglob 结果一致、边发现边处理、提前结束不阻塞，
+并对比旧版"收集列表 + 四次 rglob 计数"与单次遍历的耗时
+
+运行方式:
+  python test/test_file_discovery.py            # 默认 20000 个文件
+  python test/test_file_discovery.py 100000
+"""
+
+import os
+import sys
+import time
+import shutil
+from pathlib import Path
+
+# 添加模块路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.file_discovery import discover_files
+
+
+TEST_DIR = Path("test_file_discovery_demo")
+EXTENSIONS = {'.xlsx', '.xls', '.csv', '.tsv'}
+
+
+def _create_tree(file_count: int):
+    """创建多层目录：表格文件与其它文件混杂"""
+    suffixes = ['.xlsx', '.xls', '.csv', '.tsv', '.txt', '.XLSX', '.json']
+    for i in range(file_count):
+        directory = TEST_DIR / f"level1_{i % 10}" / f"level2_{i % 7}"
+        if i % 5 == 0:
+            directory = TEST_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"file_{i}{suffixes[i % len(suffixes)]}").write_bytes(b"x" * (i % 10))
+    # 名为 .xlsx 的目录不应被当作文件
+    (TEST_DIR / "folder.xlsx").mkdir(exist_ok=True)
+
+
+def _legacy_files(recursive: bool = True):
+    """旧版收集方式"""
+    iterator = TEST_DIR.rglob('*') if recursive else TEST_DIR.iterdir()
+    return [path for path in iterator if path.is_file() and path.suffix.lower() in EXTENSIONS]
+
+
+def test_same_files():
+    """与 rglob/iterdir 收集结果一致"""
+    print("\n[1] 验证发现结果与 rglob 一致...")
+    for recursive in (True, False):
+        discovery = discover_files(TEST_DIR, EXTENSIONS, recursive=recursive)
+        found = [path for path, _ in discovery]
+        legacy = _legacy_files(recursive)
+        assert sorted(found) == sorted(legacy), f"recursive={recursive} 结果不一致"
+        assert discovery.finished and discovery.discovered == len(legacy)
+        assert sum(discovery.counts.values()) == len(legacy)
+        print(f"    ✓ recursive={recursive}: {len(found)} 个文件, 按扩展名 {dict(sorted(discovery.counts.items()))}")
+
+    # 按层遍历：浅层目录的文件先产出
+    depths = [len(path.relative_to(TEST_DIR).parts) for path, _ in discover_files(TEST_DIR, EXTENSIONS,
+                                                                                   breadth_first=True)]
+    assert depths == sorted(depths), "按层遍历顺序错误"
+    # 排除目录
+    excluded = [path for path, _ in discover_files(TEST_DIR, EXTENSIONS, exclude_dirs=[TEST_DIR / "level1_1"])]
+    assert excluded and not any("level1_1" in path.parts for path in excluded)
+    print("    ✓ 按层遍历顺序、排除目录正确")
+
+
+def test_streaming():
+    """边发现边处理，提前结束不阻塞遍历线程"""
+    print("\n[2] 验证流式产出与提前结束...")
+    discovery = discover_files(TEST_DIR, EXTENSIONS, queue_size=4)
+    iterator = iter(discovery)
+    first_path, first_stat = next(iterator)
+    assert first_stat.st_size == first_path.stat().st_size
+    # 队列容量为4时，处理方拿到第一个文件时遍历尚未结束
+    assert not discovery.finished
+    start_time = time.time()
+    iterator.close()
+    assert time.time() - start_time < 2, "提前结束时遍历线程未及时退出"
+    assert not discovery._thread.is_alive()
+    print("    ✓ 第一个文件产出时遍历仍在进行，提前结束后遍历线程立即退出")
+
+
+def test_speed():
+    """旧版：rglob 收集列表后再用四次 rglob 计数；新版：单次后台遍历"""
+    print("\n[3] 耗时对比...")
+    start_time = time.time()
+    legacy = _legacy_files()
+    total = sum(len(list(TEST_DIR.rglob(f'*{ext}'))) for ext in ('.xlsx', '.xls', '.csv', '.tsv'))
+    legacy_time = time.time() - start_time
+
+    start_time = time.time()
+    discovery = discover_files(TEST_DIR, EXTENSIONS)
+    found = discovery.collect()
+    discovery_time = time.time() - start_time
+
+    assert len(found) == len(legacy)
+    print(f"    旧版（rglob收集 + 四次rglob计数）: {legacy_time:.3f} 秒, 计数 {total}")
+    print(f"    单次后台遍历: {discovery_time:.3f} 秒, 计数 {discovery.discovered}")
+    print(f"    ✓ 加速 {legacy_time / max(discovery_time, 1e-6):.1f}x")
+
+
+if __name__ == "__main__":
+    file_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    print("=" * 60)
+    print("目录文件发现测试")
+    print("=" * 60)
+
+    if TEST_DIR.exists():
+        shutil.rmtree(TEST_DIR)
+
+    try:
+        _create_tree(file_count)
+        test_same_files()
+        test_streaming()
+        test_speed()
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    print("\n✓ 测试完成！")
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多关键词搜索测试
+验证前缀树正则找出的关键词与逐个关键词查找完全一致（含重叠、互为前缀、忽略大小写、分解写法），
+关键词搜索模式的扫描结果（xlsx/csv、纯ASCII关键词、残留中文）正确，并对比逐个关键词查找的耗时
+
+运行方式:
+  python test/test_keyword_search.py            # 默认 3000 个关键词
+  python test/test_keyword_search.py 20000
+"""
+
+import io
+import sys
+import time
+import random
+import shutil
+import contextlib
+import subprocess
+import unicodedata
+from pathlib import Path
+
+# 添加模块路径
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "core"))
+
+import pandas as pd
+
+from core.keyword_search import (KeywordMatcher, KeywordDetector, LEFTOVER_CHINESE_PATTERN,
+                                 load_keywords)
+from vietnamese_excel_processor import VietnameseExcelProcessor
+
+
+TEST_DIR = Path("test_keyword_search_demo").resolve()
+
+
+def _brute_force(keywords, text, ignore_case=False):
+    """逐个关键词、逐个起点查找"""
+    if ignore_case:
+        text = text.lower()
+    found = set()
+    for keyword in keywords:
+        key = keyword.lower() if ignore_case else keyword
+        start = text.find(key)
+        while start >= 0:
+            found.add((start, key))
+            start = text.find(key, start + 1)
+    return sorted(found)
+
+
+def test_matcher():
+    """与逐个关键词查找的结果一致"""
+    print("\n[1] 验证关键词匹配...")
+    rng = random.Random(0)
+    alphabet = 'abcAé{}0 '
+    checked = 0
+    for trial in range(400):
+        ignore_case = trial % 2 == 1
+        keywords = {''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 5)))
+                    for _ in range(rng.randint(1, 40))}
+        matcher = KeywordMatcher(keywords, ignore_case=ignore_case)
+        for _ in range(20):
+            text = ''.join(rng.choice(alphabet + 'xyzÉ') for _ in range(rng.randint(0, 30)))
+            expected = _brute_force(keywords, text, ignore_case)
+            actual = sorted({(start, keyword.lower() if ignore_case else keyword)
+                             for start, keyword in matcher.find_all(text)})
+            assert actual == expected, f"{keywords!r} / {text!r}: {actual} != {expected}"
+            assert matcher.search(text) == bool(expected)
+            checked += 1
+    print(f"    ✓ {checked} 段文本的全部关键词位置与逐个查找一致（含重叠、互为前缀、忽略大小写）")
+
+    matcher = KeywordMatcher({'{0}': '占位符', '{1}': '占位符', 'kiếm': '术语', 'kiếm sắt': '术语'},
+                             patterns={'残留中文': LEFTOVER_CHINESE_PATTERN})
+    decomposed = unicodedata.normalize('NFD', "Thanh kiếm sắt {0}{1} 宝剑 {0}")
+    assert matcher.describe(decomposed) == "术语: kiếm、kiếm sắt; 占位符: {0}、{1}; 残留中文: 宝、剑"
+    assert not matcher.search("Thanh kiem {2}")
+    assert not KeywordMatcher([]).search("任何文本")
+    print("    ✓ 分解写法（NFD）、按类别汇总、附加规则正确")
+
+    TEST_DIR.mkdir(exist_ok=True)
+    keyword_file = TEST_DIR / "keywords.txt"
+    keyword_file.write_text("\ufeff{0}\n\n[禁用词]\n傻瓜\n  Sword  \n[占位符]\n%s\n", encoding='utf-8')
+    assert load_keywords(keyword_file) == {'{0}': '关键词', '傻瓜': '禁用词', 'Sword': '禁用词', '%s': '占位符'}
+    print("    ✓ 关键词文件按类别读取")
+
+
+def _create_tables():
+    """占位符、禁用词都是纯ASCII；一个文件只有残留中文"""
+    data_dir = TEST_DIR / "data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    with pd.ExcelWriter(data_dir / "items.xlsx") as writer:
+        pd.DataFrame({'id': [1, 2, 3], 'text': ['Nhận {0} vàng', 'Thanh kiếm', 'Sword of {1}']}).to_excel(
+            writer, sheet_name="物品", index=False)
+        pd.DataFrame({'id': [1], 'text': ['Khiên']}).to_excel(writer, sheet_name="干净", index=False)
+    (data_dir / "dialog.csv").write_text("id,text\n1,Xin chào {0}\n2,宝剑\n3,%s lần\n", encoding='utf-8')
+    (data_dir / "ascii.csv").write_text("id,text\n1,Hello {0}\n", encoding='utf-8')
+    return data_dir
+
+
+def test_scan():
+    """关键词搜索模式的扫描结果"""
+    print("\n[2] 验证关键词搜索扫描...")
+    data_dir = _create_tables()
+    matcher = KeywordMatcher({'{0}': '占位符', '{1}': '占位符', '%s': '占位符', 'Sword': '禁用词'},
+                             patterns={'残留中文': LEFTOVER_CHINESE_PATTERN})
+    expected = [
+        ('ascii.csv', 'B2', 'Hello {0}', '占位符: {0}'),
+        ('dialog.csv', 'B2', 'Xin chào {0}', '占位符: {0}'),
+        ('dialog.csv', 'B3', '宝剑', '残留中文: 宝、剑'),
+        ('dialog.csv', 'B4', '%s lần', '占位符: %s'),
+        ('items.xlsx', 'B2', 'Nhận {0} vàng', '占位符: {0}'),
+        ('items.xlsx', 'B4', 'Sword of {1}', '禁用词: Sword; 占位符: {1}'),
+    ]
+    for two_phase in (True, False):
+        processor = VietnameseExcelProcessor(two_phase=two_phase, detector=KeywordDetector(matcher))
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = processor.scan_directory(str(data_dir))
+        actual = sorted((item['excel_file'], item['position'], item['content'], item['language_type'])
+                        for item in results)
+        assert actual == expected, f"two_phase={two_phase}: {actual}"
+        sheets = {item['sheet_name']: item['has_vietnamese'] for item in processor.scan_engine.sheet_results
+                  if item['excel_file'] == 'items.xlsx'}
+        assert sheets == {'物品': True, '干净': False}
+    print("    ✓ 纯ASCII关键词不被越南文预筛选跳过，两阶段/单阶段结果一致")
+
+    # 分解写法（NFD，如 macOS 输入的越南文）的单元格：两阶段扫描的工作表判定也要先规范化
+    nfd_dir = TEST_DIR / "nfd"
+    nfd_dir.mkdir(parents=True, exist_ok=True)
+    decomposed = unicodedata.normalize('NFD', "Thanh kiếm")
+    pd.DataFrame({'id': [1], 'text': [decomposed]}).to_excel(nfd_dir / "nfd.xlsx", sheet_name="物品", index=False)
+    for two_phase in (True, False):
+        processor = VietnameseExcelProcessor(two_phase=two_phase,
+                                             detector=KeywordDetector(KeywordMatcher({'kiếm': '禁用词'})))
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = processor.scan_directory(str(nfd_dir))
+        actual = [(item['position'], item['content'], item['language_type']) for item in results]
+        assert actual == [('B2', decomposed, '禁用词: kiếm')], f"two_phase={two_phase}: {actual}"
+    print("    ✓ 分解写法（NFD）的单元格在两阶段/单阶段扫描中都能命中")
+
+    output = processor.create_output_excel(results, str(TEST_DIR / "out"))
+    header = next(pd.read_excel(output, header=None).itertuples(index=False))
+    assert list(header) == ['序号', '文件名', '位置', '单元格内容', '匹配关键词']
+    print("    ✓ 报告表头为 单元格内容 / 匹配关键词")
+
+    keyword_file = TEST_DIR / "keywords.txt"
+    keyword_file.write_text("[占位符]\n{1}\n", encoding='utf-8')
+    completed = subprocess.run(
+        [sys.executable, "-m", "core.scan_cli", str(data_dir), "--keywords", str(keyword_file),
+         "--fail-on-found", "--workers", "2"],
+        cwd=str(ROOT), capture_output=True, text=True, encoding='utf-8')
+    assert completed.returncode == 1, completed.stderr
+    assert '"matched_keywords": "占位符: {1}"' in completed.stdout and completed.stdout.count('\n') == 1
+    print("    ✓ 命令行 --keywords 输出命中的关键词")
+
+
+def test_performance(keyword_count: int):
+    """与逐个关键词查找的耗时对比"""
+    print(f"\n[3] 耗时对比（{keyword_count} 个关键词）...")
+    rng = random.Random(1)
+    syllables = ['thanh', 'kiếm', 'khiên', 'vàng', 'nhận', 'lần', 'đội', 'trưởng', 'xin', 'chào', 'bạn']
+    keywords = {' '.join(rng.sample(syllables, 2)) + str(i) for i in range(keyword_count)}
+    keywords |= {f"{{{i}}}" for i in range(20)}
+    cells = [' '.join(rng.choice(syllables) for _ in range(rng.randint(3, 12))) + f" {rng.randint(0, 99999)}"
+             for _ in range(5000)]
+    cells[::50] = [cell + " {3}" for cell in cells[::50]]
+
+    start_time = time.time()
+    naive = [any(keyword in cell for keyword in keywords) for cell in cells]
+    naive_time = time.time() - start_time
+
+    start_time = time.time()
+    matcher = KeywordMatcher(keywords)
+    compile_time = time.time() - start_time
+    start_time = time.time()
+    combined = [matcher.search(cell) for cell in cells]
+    combined_time = time.time() - start_time
+
+    assert combined == naive
+    print(f"    逐个关键词查找: {naive_time:.3f} 秒")
+    print(f"    前缀树正则: 编译 {compile_time:.3f} 秒，查找 {combined_time:.3f} 秒")
+    print(f"    ✓ {len(cells)} 个单元格结果一致，查找加速 {naive_time / max(combined_time, 1e-6):.1f}x")
+
+
+if __name__ == "__main__":
+    keyword_count = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+
+    print("=" * 60)
+    print("多关键词搜索测试")
+    print("=" * 60)
+
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    try:
+        test_matcher()
+        test_scan()
+        test_performance(keyword_count)
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    print("\n✓ 测试完成！")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多语言对齐测试
+验证 align_language_frames 按 (文件, 工作表, A列ID, 字段名) 对齐各语言文本：
+某个语言版本插入/删除行后其后的文本仍能对上，ID 为空时按位置对齐、ID 不同时不按位置对应，
+重复的键按出现顺序对应，未对齐文本报告正确；结构相同时与按位置合并的结果一致，并对比耗时
+
+运行方式:
+  python test/test_language_alignment.py            # 默认每种语言 300000 个文本
+  python test/test_language_alignment.py 1000000
+"""
+
+import sys
+import time
+import shutil
+import logging
+from pathlib import Path
+
+# 添加模块路径
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np
+import pandas as pd
+
+from tools.excel_text_extractor import merge_language_frames
+from tools.multi_language_extractor import (EXTRACTION_COLUMNS, MATCH_BY_POSITION, STATUS_EXTRA, STATUS_MISSING,
+                                            MultiLanguageExtractor, align_language_frames)
+
+
+TEST_DIR = Path("test_language_alignment_demo").resolve()
+
+
+def _frame(rows) -> pd.DataFrame:
+    """由 (文件, 工作表, 位置, 文本, A列ID, 字段名) 构建提取结果"""
+    data = {column: [] for column in EXTRACTION_COLUMNS}
+    for name, sheet, num, text, a_column, field in rows:
+        for column, value in zip(['name', 'sheet', 'num', 'text', 'a_column', 'field'],
+                                 [name, sheet, num, text, a_column, field]):
+            data[column].append(value)
+        data['row'].append(int(num[1:]))
+        data['column'].append('name')
+        data['column_index'].append(1)
+    return pd.DataFrame(data, columns=EXTRACTION_COLUMNS, dtype=object)
+
+
+def _rows(ids, prefix, field='名称'):
+    """依次排列的行（位置由顺序决定）"""
+    return [('item', '表0', f"B{7 + index}", f"{prefix}{a_column or index}", a_column, field)
+            for index, a_column in enumerate(ids)]
+
+
+def _create_table(path: Path, ids, text):
+    """游戏配置表格式：前 6 行为表头区（第 5 行为字段名），之后为数据"""
+    data = [['id', 'name']] * 4 + [['ID', '名称'], ['', '']]
+    data += [[a_column, text(a_column)] for a_column in ids]
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame(data, columns=['id', 'name']).to_excel(writer, sheet_name="表0", index=False)
+
+
+def test_inserted_rows():
+    """某个语言版本插入、删除了行：按 ID 对齐，未对齐的文本列入报告"""
+    print("\n[1] 验证插入/删除行后的对齐...")
+    ids = [str(100 + index) for index in range(40)]
+    vn_ids = ids[:10] + ['900'] + ids[10:25] + ids[26:]  # 第 11 行前插入一行，删除一行
+    for lang, lang_ids, text in (('cn', ids, lambda a: f"物品{a}"), ('vn', vn_ids, lambda a: f"Vật phẩm {a}")):
+        (TEST_DIR / lang).mkdir(parents=True)
+        _create_table(TEST_DIR / lang / "item.xlsx", lang_ids, text)
+
+    result = MultiLanguageExtractor(workers=1).extract({lang: str(TEST_DIR / lang) for lang in ('cn', 'vn')})
+    alignment = result.align()
+    summary = alignment.summary
+    assert alignment.base_lang == 'cn' and len(summary) == len(ids)
+    for cn_text, vn_text in zip(summary['cn'], summary['vn']):
+        a_column = cn_text[len("物品"):]
+        assert vn_text == ("" if a_column == ids[25] else f"Vật phẩm {a_column}"), (cn_text, vn_text)
+    assert alignment.match_counts['vn'] == {'id': len(ids) - 1, 'position': 0, 'missing': 1, 'extra': 1}
+    report = alignment.unmatched
+    assert report[['lang', 'status', 'a_column']].values.tolist() == [
+        ['vn', STATUS_MISSING, ids[25]], ['vn', STATUS_EXTRA, '900']]
+    assert set(summary.columns) == {'name', 'num', 'cn', 'vn', 'en', 'th'} and (summary['en'] == '').all()
+    print(f"    ✓ {len(ids)} 行中插入 1 行、删除 1 行后其余文本按 ID 对齐")
+
+    _, by_position = result.merge(by=MATCH_BY_POSITION)
+    shifted = int((by_position['vn'] != summary['vn']).sum())
+    assert shifted > 0 and result.merge()[1].values.tolist() == summary.values.tolist()
+    print(f"    ✓ 只按位置合并时有 {shifted} 行错位；未对齐报告: {len(report)} 条")
+
+
+def test_fallback():
+    """ID 为空时按位置对齐；ID 不同时不按位置对应；重复的键按出现顺序对应"""
+    print("\n[2] 验证按位置对齐与重复键...")
+    cn = _frame(_rows(['1', '', '3', '4', '5', '5', '5'], "物品"))
+    vn_rows = _rows(['1', '', '9', '4', '5', '5', ''], "vn")
+    vn_rows[3] = vn_rows[3][:5] + ('名字',)  # 字段名改了：ID 相同，按位置对齐
+    vn = _frame(vn_rows)
+    alignment = align_language_frames({'cn': cn, 'vn': vn}, 'cn', ['cn', 'vn'])
+    assert alignment.summary['vn'].tolist() == ['vn1', 'vn1', '', 'vn4', 'vn5', 'vn5', 'vn6']
+    assert alignment.match_counts['vn'] == {'id': 3, 'position': 3, 'missing': 1, 'extra': 1}
+    assert alignment.unmatched[['status', 'a_column', 'num']].values.tolist() == [
+        [STATUS_MISSING, '3', 'B9'], [STATUS_EXTRA, '9', 'B9']]
+    print("    ✓ ID 为空、字段名不同时按位置对齐，ID 不同时不对应，重复的键按出现顺序对应")
+
+    alignment = align_language_frames({'cn': cn, 'vn': _frame([])}, 'cn', ['cn', 'vn'])
+    assert (alignment.summary['vn'] == '').all() and alignment.unmatched.empty and not alignment.match_counts
+    print("    ✓ 没有数据的语言为空列，不列入报告")
+
+
+def _synthetic(count: int, lang: str) -> pd.DataFrame:
+    index = np.arange(count)
+    return pd.DataFrame({
+        'name': [f"config_{i % 200}" for i in index],
+        'sheet': ['表0'] * count,
+        'num': [f"B{i + 7}" for i in index],
+        'text': [f"{lang}{i}" for i in index],
+        'a_column': [str(i) if i % 10 else '' for i in index],
+        'row': index + 7,
+        'column': ['name'] * count,
+        'column_index': [1] * count,
+        'field': ['名称'] * count,
+    }, columns=EXTRACTION_COLUMNS).astype(object)
+
+
+def test_performance(count: int):
+    """结构相同时与按位置合并一致，并对比耗时"""
+    print(f"\n[3] 耗时对比（3 种语言 x {count} 个文本）...")
+    frames = {lang: _synthetic(count, lang) for lang in ('cn', 'vn', 'en')}
+
+    start_time = time.time()
+    expected = merge_language_frames(frames, 'cn')
+    position_time = time.time() - start_time
+
+    start_time = time.time()
+    alignment = align_language_frames(frames, 'cn')
+    alignment_time = time.time() - start_time
+
+    assert alignment.summary.values.tolist() == expected.values.tolist()
+    assert alignment.unmatched.empty
+    print(f"    按位置合并: {position_time:.2f} 秒")
+    print(f"    按 ID 对齐（ID 为空时按位置）: {alignment_time:.2f} 秒")
+    print(f"    ✓ 结构相同时结果一致（{alignment.match_counts['vn']}）")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300000
+    logging.disable(logging.ERROR)
+
+    print("=" * 60)
+    print("多语言对齐测试")
+    print("=" * 60)
+
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    try:
+        test_inserted_rows()
+        test_fallback()
+        test_performance(count)
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    print("\n✓ 测试完成！")
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多语言提取引擎测试
+验证 MultiLanguageExtractor 并行提取的结果与逐个语言、逐个文件用 ExcelTextExtractor 提取的结果完全一致，
+按位置对齐的汇总表与按字典合并的结果一致，进度事件与出错语言的处理，并对比单个语言与四种语言并行提取的耗时
+
+运行方式:
+  python test/test_multi_language_extractor.py            # 默认每种语言 4 个文件
+  python test/test_multi_language_extractor.py 20
+"""
+
+import os
+import sys
+import time
+import shutil
+import logging
+from pathlib import Path
+
+# 添加模块路径
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+import pandas as pd
+
+from tools.excel_text_extractor import ExcelTextExtractor, merge_language_texts
+from tools.multi_language_extractor import (EXTRACTION_COLUMNS, MATCH_BY_POSITION, MultiLanguageExtractor,
+                                            extraction_columns)
+
+
+TEST_DIR = Path("test_multi_language_demo").resolve()
+TEXTS = {
+    'cn': lambda i: f"物品{i}",
+    'vn': lambda i: f"Vật phẩm {i}",
+    'en': lambda i: f"Item {i}",
+    'th': lambda i: f"ไอเท็ม {i}",
+}
+
+
+def _create_table(path: Path, lang: str, file_index: int, rows: int):
+    """游戏配置表格式：前 6 行为表头区（第 6 行为字段名），之后为数据；每种语言都有中文备注列"""
+    text = TEXTS[lang]
+    with pd.ExcelWriter(path) as writer:
+        for sheet_index in range(2):
+            data = [['id', 'name', 'desc', 'count']] * 4 + [['ID', '名称', '备注', '数量'], ['', '', '', '']]
+            data += [[f"{file_index}_{row}", text(row + sheet_index), f"备注{row % 50}", row]
+                     for row in range(rows)]
+            pd.DataFrame(data, columns=['id', 'name', 'desc', 'count']).to_excel(
+                writer, sheet_name=f"表{sheet_index}", index=False)
+
+
+def _create_tree(file_count: int):
+    for lang in TEXTS:
+        directory = TEST_DIR / lang / "表格"
+        directory.mkdir(parents=True)
+        for file_index in range(file_count):
+            # 文件大小不同，大文件应最先提交
+            _create_table(directory / f"config_{file_index}.xlsx", lang, file_index, 100 + 150 * file_index)
+    # 子目录中的同名文件（按文件名建字典时后出现的为准）
+    (TEST_DIR / "cn" / "表格" / "sub").mkdir()
+    _create_table(TEST_DIR / "cn" / "表格" / "sub" / "config_0.xlsx", 'cn', 99, 20)
+
+
+def _reference(lang: str):
+    """原实现：逐个文件提取，按文件名建字典"""
+    extractor = ExcelTextExtractor()
+    file_data = {}
+    for file_path in extractor.scan_directory(str(TEST_DIR / lang)):
+        extracted_data = extractor.extract_text_from_excel(file_path)
+        if extracted_data:
+            file_data[os.path.splitext(os.path.basename(file_path))[0]] = extracted_data
+    return extractor, file_data
+
+
+def _expected_frame(extractor, file_data) -> pd.DataFrame:
+    data = {column: [] for column in EXTRACTION_COLUMNS}
+    for file_name, extracted_data in file_data.items():
+        columns = extraction_columns(extractor, extracted_data)
+        data['name'] += [file_name] * len(columns['text'])
+        for column in EXTRACTION_COLUMNS[1:]:
+            data[column] += columns[column]
+    return pd.DataFrame(data, columns=EXTRACTION_COLUMNS, dtype=object)
+
+
+def test_results(file_count: int):
+    """并行提取与逐个提取的结果一致"""
+    print("\n[1] 验证提取结果...")
+    languages = {lang: str(TEST_DIR / lang) for lang in TEXTS}
+    all_lang_data, expected = {}, {}
+    for lang in TEXTS:
+        extractor, all_lang_data[lang] = _reference(lang)
+        expected[lang] = _expected_frame(extractor, all_lang_data[lang])
+
+    for workers in (1, 4):
+        events = []
+        engine = MultiLanguageExtractor(workers=workers, progress_callback=lambda *event: events.append(event))
+        result = engine.extract(languages)
+        for lang in TEXTS:
+            assert result.frames[lang].values.tolist() == expected[lang].values.tolist(), \
+                f"workers={workers} 时 {lang} 的提取结果不一致"
+        base_lang, summary = result.merge(by=MATCH_BY_POSITION)
+        expected_base, expected_summary = merge_language_texts(all_lang_data)
+        assert base_lang == expected_base == 'cn'
+        assert summary.values.tolist() == expected_summary.values.tolist()
+
+        total_files = sum(result.files_found.values())
+        assert total_files == len(TEXTS) * file_count + 1
+        assert len(events) == total_files + 2 and events[-1][0] == events[-1][1] == total_files
+        assert sorted(event[0] for event in events[1:-1]) == list(range(1, total_files + 1))
+    print(f"    ✓ 单进程/4 进程结果与逐个提取一致（{sum(len(frame) for frame in expected.values())} 个文本），"
+          f"汇总表一致")
+    print(f"    ✓ 每完成一个文件发出一次进度事件（{total_files} 个文件）")
+    print(f"    ✓ 字段名列: {sorted(set(result.frames['cn']['field']))}")
+
+    result = MultiLanguageExtractor(workers=2).extract({'cn': str(TEST_DIR / "cn"), 'vn': str(TEST_DIR / "missing")})
+    assert 'vn' in result.errors and result.text_count('cn') == len(expected['cn'])
+    print("    ✓ 目录不存在的语言记录错误，不影响其他语言")
+
+
+def test_performance():
+    """单个语言与四种语言并行提取的耗时"""
+    print("\n[2] 耗时对比...")
+    timings = {}
+    for lang in TEXTS:
+        start_time = time.time()
+        _reference(lang)
+        timings[lang] = time.time() - start_time
+
+    workers = os.cpu_count() or 1
+    start_time = time.time()
+    MultiLanguageExtractor(workers=workers).extract({lang: str(TEST_DIR / lang) for lang in TEXTS})
+    parallel_time = time.time() - start_time
+
+    print(f"    逐个语言依次提取: {sum(timings.values()):.2f} 秒（最慢的单个语言 {max(timings.values()):.2f} 秒）")
+    print(f"    四种语言并行提取（{workers} 进程）: {parallel_time:.2f} 秒")
+    if workers == 1:
+        print("    （当前环境只有 1 个 CPU，无法体现并行加速）")
+    print(f"    ✓ 加速 {sum(timings.values()) / max(parallel_time, 1e-6):.1f}x")
+
+
+if __name__ == "__main__":
+    file_count = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    logging.disable(logging.INFO)
+
+    print("=" * 60)
+    print("多语言提取引擎测试")
+    print("=" * 60)
+
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    try:
+        _create_tree(file_count)
+        test_results(file_count)
+        test_performance()
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    print("\n✓ 测试完成！")
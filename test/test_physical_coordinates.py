@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+实际行列坐标测试
+验证表头为空、表头上方有空行、数据中有空行时，扫描结果的位置就是表格软件中看到的行号/列号，
+并对比批量生成 A1 引用与逐条生成的耗时
+
+运行方式:
+  python test/test_physical_coordinates.py            # 默认 1000000 个位置
+  python test/test_physical_coordinates.py 5000000
+"""
+
+import sys
+import time
+import random
+import shutil
+from pathlib import Path
+
+# 添加模块路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "core"))
+
+from openpyxl import Workbook
+
+from core.excel_vietnamese_scanner import ExcelVietnameseScanner
+from core.report_writer import iter_scan_report_rows
+from core.scan_results import FindingBatch, a1_positions, chinese_position
+from vietnamese_excel_processor import VietnameseExcelProcessor
+
+
+TEST_DIR = Path("test_physical_coordinates_demo")
+
+
+def _positions(results):
+    return [(item['sheet_name'], item['position'], item['column_name'], item['content']) for item in results]
+
+
+def _create_workbook(path: Path):
+    """表头在第3行（上方两行为空），表头有空单元格和重复列名，数据中有空行"""
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "物品"
+    for col, value in enumerate(['id', '名称', None, '名称'], 1):
+        if value is not None:
+            sheet.cell(3, col, value)
+    for col, value in enumerate([1, 'Thanh kiếm', None, 'Khiên'], 1):
+        if value is not None:
+            sheet.cell(4, col, value)
+    for col, value in enumerate([2, '宝剑', 'Đội trưởng', 'Sword'], 1):
+        sheet.cell(6, col, value)
+
+    # 常规表格：表头在第1行
+    sheet = workbook.create_sheet("常规")
+    sheet.append(['id', 'text'])
+    sheet.append([1, 'Nhiệm vụ'])
+    workbook.save(path)
+
+
+def test_excel():
+    """xlsx 的位置为实际行号/列号"""
+    print("\n[1] 验证 xlsx 实际坐标...")
+    TEST_DIR.mkdir(exist_ok=True)
+    path = TEST_DIR / "leading_blank.xlsx"
+    _create_workbook(path)
+
+    expected = [
+        ("物品", "B4", "名称", "Thanh kiếm"),
+        ("物品", "D4", "名称.1", "Khiên"),
+        ("物品", "C6", "Unnamed: 2", "Đội trưởng"),
+        ("常规", "B2", "text", "Nhiệm vụ"),
+    ]
+    for two_phase in (True, False):
+        processor = VietnameseExcelProcessor(two_phase=two_phase)
+        assert _positions(processor.scan_excel_file(path)) == expected, f"two_phase={two_phase} 坐标错误"
+
+    scanner = ExcelVietnameseScanner()
+    actual = [item['position'] for item in scanner.scan_excel_file(path)]
+    assert actual == ["第4行第2列", "第4行第4列", "第6行第3列", "第2行第2列"], actual
+    print("    ✓ 表头在第3行、数据中有空行时位置与表格软件一致（A1 与中文格式）")
+
+    results, sheet_name = processor.scan_engine.locate_sheet(path, "物品")
+    assert sheet_name == "物品" and _positions(results) == expected[:3]
+    results, sheet_name = processor.scan_engine.locate_sheet(path)
+    assert sheet_name == "物品"
+    try:
+        processor.scan_engine.locate_sheet(path, "不存在")
+        raise AssertionError("不存在的工作表应抛出 KeyError")
+    except KeyError:
+        pass
+    print("    ✓ 单工作表定位（界面定位页使用）坐标一致")
+
+
+def test_csv():
+    """CSV/TSV 的位置为表格软件中的行号"""
+    print("\n[2] 验证 CSV/TSV 实际坐标...")
+    processor = VietnameseExcelProcessor()
+
+    # 两行空行后才是表头，数据中有空行，还有跨行的引号字段（表格软件中占一行）
+    csv_path = TEST_DIR / "leading_blank.csv"
+    csv_path.write_text('\n\nid,name,,name\n1,"宝剑\n说明",,Khiên\n\n2,Thanh kiếm,Đội,\n',
+                        encoding='utf-8-sig')
+    expected = [
+        ("CSV数据", "D4", "name.1", "Khiên"),
+        ("CSV数据", "B6", "name", "Thanh kiếm"),
+        ("CSV数据", "C6", "Unnamed: 2", "Đội"),
+    ]
+    assert _positions(processor.scan_csv_file(csv_path)) == expected
+    print("    ✓ 表头上方空行、数据空行、跨行引号字段、BOM 均不影响行号")
+
+    tsv_path = TEST_DIR / "table.tsv"
+    tsv_path.write_bytes("id\ttext\tnote\n1\t宝剑, 说明\tNhiệm vụ\n".encode('utf-8'))
+    assert _positions(processor.scan_csv_file(tsv_path)) == [("CSV数据", "C2", "note", "Nhiệm vụ")]
+    print("    ✓ TSV 按制表符分列")
+
+    gbk_path = TEST_DIR / "gbk.csv"
+    gbk_path.write_bytes("id,name\n1,宝剑\n".encode('gbk'))
+    results = FindingBatch()
+    assert processor.scan_engine.scan_csv_rows(gbk_path, results, None) == 'gbk' and not results
+    print("    ✓ 按编码依次尝试（GBK）")
+
+
+def legacy_cell_reference(row: int, col: int) -> str:
+    """旧版逐条生成：每个位置都重新换算列字母"""
+    col_letter = ""
+    while col > 0:
+        col -= 1
+        col_letter = chr(ord('A') + col % 26) + col_letter
+        col //= 26
+    return f"{col_letter}{row}"
+
+
+def test_batch_positions(count: int):
+    """批量生成位置与逐条生成一致，并对比耗时"""
+    print(f"\n[3] 批量生成位置（{count} 个）...")
+    rng = random.Random(0)
+    batch = FindingBatch()
+    for i in range(count):
+        batch.append("a.xlsx", "a.xlsx", "表", rng.randint(1, 1048576), rng.randint(1, 200),
+                     "text", "Khiên", "越南文")
+
+    rows, cols = batch.values('row'), batch.values('col')
+    start_time = time.time()
+    legacy = [legacy_cell_reference(row, col) for row, col in zip(rows, cols)]
+    legacy_time = time.time() - start_time
+
+    start_time = time.time()
+    positions = batch.positions()
+    batch_time = time.time() - start_time
+
+    processor = VietnameseExcelProcessor()
+    assert positions == legacy == a1_positions(rows, cols)
+    assert positions[:100] == [processor._get_excel_cell_reference(row, col)
+                               for row, col in zip(rows[:100], cols[:100])]
+    assert positions[:100] == [item['position'] for item in batch[:100]]
+    print(f"    逐条生成: {legacy_time:.3f} 秒")
+    print(f"    批量生成: {batch_time:.3f} 秒")
+    print(f"    ✓ 结果一致，加速 {legacy_time / max(batch_time, 1e-6):.1f}x")
+
+    # 中文格式与报告行
+    small = FindingBatch(position_format=chinese_position)
+    small.extend(batch[:1000])
+    assert small.positions() == [chinese_position(row, col) for row, col in zip(rows[:1000], cols[:1000])]
+    assert list(iter_scan_report_rows(small)) == list(iter_scan_report_rows(small.to_dicts()))
+    print("    ✓ 中文位置格式与报告行一致")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    print("=" * 60)
+    print("实际行列坐标测试")
+    print("=" * 60)
+
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    try:
+        test_excel()
+        test_csv()
+        test_batch_positions(count)
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    print("\n✓ 测试完成！")
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流水线写出测试
+验证 ExcelTextExtractor.process_directory 的流水线模式（提取与写出进程并行）写出的结果文件、统计与逐个文件处理完全一致，
+结果文件内容与原来逐个工作表构建 DataFrame 写出的一致（含清理后重名的工作表），并对比耗时
+
+运行方式:
+  python test/test_pipelined_writing.py            # 默认 12 个表格
+  python test/test_pipelined_writing.py 40
+"""
+
+import io
+import os
+import sys
+import time
+import shutil
+import logging
+import contextlib
+from pathlib import Path
+
+# 添加模块路径
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from tools import excel_text_extractor
+from tools.excel_text_extractor import ExcelTextExtractor, write_text_workbook
+
+
+TEST_DIR = Path("test_pipelined_writing_demo").resolve()
+INPUT_DIR = TEST_DIR / "input"
+
+
+def _create_table(path: Path, file_index: int, rows: int):
+    """游戏配置表格式：前 6 行为表头区（第 5 行为字段名），之后为数据"""
+    with pd.ExcelWriter(path) as writer:
+        for sheet_name in ("道具", "a_b ", "a_b"):
+            data = [['id', 'name', 'desc']] * 4 + [['ID', '名称', '描述'], ['', '', '']]
+            data += [[f"{file_index}_{row}", f"物品{row}", f"Vật phẩm {sheet_name} {row}"] for row in range(rows)]
+            pd.DataFrame(data, columns=['id', 'name', 'desc']).to_excel(writer, sheet_name=sheet_name, index=False)
+
+
+def _reference_create_text_excel(extractor, output_path, extracted_data, source_file):
+    """原实现：每个工作表由字典列表构建 DataFrame，通过 pandas + openpyxl 写出"""
+    with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+        pd.DataFrame(extractor._create_summary_data(extracted_data, source_file)).to_excel(
+            writer, sheet_name="提取汇总", index=False)
+        for sheet_name, sheet_data in extracted_data.items():
+            if sheet_data and sheet_data['items']:
+                text_data = [{
+                    'id': item['a_column'],
+                    '位置': item['excel_row_ref'],
+                    '字段名': extractor._get_original_field_name(item['column_index'], sheet_data['headers']),
+                    'doc': extractor._analyze_text_type(item['text']),
+                    'name': item['text'],
+                } for item in sheet_data['items']]
+                pd.DataFrame(text_data).to_excel(writer, sheet_name=extractor._clean_sheet_name(sheet_name),
+                                                 index=False)
+
+
+def _workbook_values(path: Path):
+    workbook = load_workbook(path, read_only=True)
+    try:
+        return {sheet.title: [list(row) for row in sheet.iter_rows(values_only=True)] for sheet in workbook}
+    finally:
+        workbook.close()
+
+
+def _output_values(directory: Path):
+    return {path.name: _workbook_values(path) for path in sorted(directory.glob("*.xlsx"))}
+
+
+def _run(writers: int, output_dir: Path):
+    events = []
+    extractor = ExcelTextExtractor(progress_callback=lambda current, total, filename, message: events.append(
+        (filename, message)))
+    start_time = time.time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert extractor.process_directory(str(INPUT_DIR), str(output_dir), writers=writers)
+    return extractor, events, time.time() - start_time
+
+
+def test_write_engines():
+    """结果文件内容与原实现一致；工作表名重复时使用 openpyxl"""
+    print("\n[1] 验证结果文件内容...")
+    source = INPUT_DIR / "config_0.xlsx"
+    extractor = ExcelTextExtractor()
+    extracted_data = extractor.extract_text_from_excel(str(source))
+    expected_path = TEST_DIR / "expected.xlsx"
+    _reference_create_text_excel(extractor, expected_path, extracted_data, str(source))
+    expected = _workbook_values(expected_path)
+    # "a_b " 与 "a_b" 清理后重名：原实现写入同一个工作表
+    assert list(expected) == ["提取汇总", "道具", "a_b"]
+
+    actual_path = TEST_DIR / "actual.xlsx"
+    assert extractor.create_text_excel(str(actual_path), extracted_data, str(source))
+    assert _workbook_values(actual_path) == expected
+    print("    ✓ create_text_excel 与原实现一致（含清理后重名的工作表）")
+
+    sheets = extractor._build_output_sheets(extracted_data, str(source))
+    unique_sheets = [sheet for sheet in sheets if sheet[0] != "a_b"]
+    engines = ['openpyxl'] + (['xlsxwriter'] if excel_text_extractor.xlsxwriter is not None else [])
+    results = {}
+    for engine in engines:
+        path = TEST_DIR / f"{engine}.xlsx"
+        write_text_workbook(str(path), unique_sheets, engine=engine)
+        results[engine] = _workbook_values(path)
+    assert all(values == results['openpyxl'] for values in results.values())
+    if excel_text_extractor.xlsxwriter is None:
+        print("    （未安装 xlsxwriter，使用 openpyxl 写出）")
+    print(f"    ✓ 写出引擎 {', '.join(engines)} 的内容一致")
+
+
+def test_pipeline(file_count: int):
+    """流水线模式与逐个文件处理的结果一致"""
+    print("\n[2] 验证流水线模式...")
+    (INPUT_DIR / "empty.xlsx").write_bytes(b"not a zip file")
+
+    runs = {}
+    for writers in (0, 2):
+        output_dir = TEST_DIR / f"output_{writers}"
+        extractor, events, elapsed = _run(writers, output_dir)
+        runs[writers] = (_output_values(output_dir), extractor.processing_stats, sorted(events), elapsed)
+
+    sequential, pipelined = runs[0], runs[2]
+    assert len(sequential[0]) == file_count
+    assert pipelined[0] == sequential[0], "结果文件内容不一致"
+    assert pipelined[1] == sequential[1] and sequential[1]['processed_files'] == file_count
+    assert pipelined[2] == sequential[2], "进度消息不一致"
+    print(f"    ✓ {file_count} 个结果文件内容、统计与进度消息一致")
+
+    # 写出失败（输出路径被目录占用）记为失败文件
+    output_dir = TEST_DIR / "output_blocked"
+    (output_dir / "config_0.xlsx").mkdir(parents=True)
+    extractor, _, _ = _run(2, output_dir)
+    assert extractor.processing_stats['failed_files'] == 1
+    assert extractor.processing_stats['processed_files'] == file_count - 1
+    print("    ✓ 写出进程中的失败计入失败文件")
+
+    print(f"    逐个文件提取、写出: {sequential[3]:.2f} 秒")
+    print(f"    流水线（2 个写出进程）: {pipelined[3]:.2f} 秒")
+    if (os.cpu_count() or 1) == 1:
+        print("    （当前环境只有 1 个 CPU，无法体现并行加速）")
+    print(f"    ✓ 加速 {sequential[3] / max(pipelined[3], 1e-6):.1f}x")
+
+
+if __name__ == "__main__":
+    file_count = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    logging.disable(logging.ERROR)
+
+    print("=" * 60)
+    print("流水线写出测试")
+    print("=" * 60)
+
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+    INPUT_DIR.mkdir(parents=True)
+
+    try:
+        for file_index in range(file_count):
+            _create_table(INPUT_DIR / f"config_{file_index}.xlsx", file_index, 200 + 50 * file_index)
+        test_write_engines()
+        test_pipeline(file_count)
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    print("\n✓ 测试完成！")
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+表格快速预筛选测试
+验证 xlsx 共享字符串预筛选与 CSV/TSV 字节级检测不会漏判，并对比与旧版解析路径的耗时
+"""
+
+import sys
+import time
+import shutil
+import unicodedata
+from pathlib import Path
+
+# 添加模块路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pandas as pd
+from openpyxl import Workbook
+
+from core.localization_checker import TableChecker, VietnameseDetector
+from core.prefilter import xlsx_may_contain_vietnamese, csv_contains_vietnamese
+
+
+TEST_DIR = Path("test_prefilter_demo")
+
+
+def _write_shared_strings_xlsx(path: Path, texts):
+    """普通模式写出（文本存放于 sharedStrings.xml）"""
+    pd.DataFrame({'id': range(len(texts)), 'text': texts}).to_excel(path, index=False)
+
+
+def _write_inline_strings_xlsx(path: Path, texts):
+    """write_only 模式写出（文本以内联字符串存放于工作表XML）"""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    for i, text in enumerate(texts):
+        ws.append([i, text])
+    wb.save(path)
+
+
+def test_no_false_negatives():
+    """预筛选结论与完整扫描一致，不漏判"""
+    print("\n[1] 验证预筛选不漏判...")
+    TEST_DIR.mkdir(exist_ok=True)
+    pattern = VietnameseDetector().combined_pattern
+    checker = TableChecker()
+
+    cases = {
+        'english.xlsx': (['Sword', 'Shield', '宝剑'], False, _write_shared_strings_xlsx),
+        'shared.xlsx': (['Sword', 'Thanh kiếm', '宝剑'], True, _write_shared_strings_xlsx),
+        'inline.xlsx': (['Sword', 'Khiên', '宝剑'], True, _write_inline_strings_xlsx),
+        'nfd.xlsx': (['Sword', unicodedata.normalize('NFD', 'Khiên')], True, _write_shared_strings_xlsx),
+    }
+    for name, (texts, expected, writer) in cases.items():
+        path = TEST_DIR / name
+        writer(path, texts)
+        assert xlsx_may_contain_vietnamese(path, pattern) == expected, f"{name} 预筛选结果错误"
+        assert checker.check_table_has_vietnamese(path) == expected, f"{name} 检测结果错误"
+        print(f"    ✓ {name}: {'包含' if expected else '不包含'}越南文")
+
+
+def test_negative_speed(rows: int = 20000):
+    """不含越南文的大表：预筛选 vs openpyxl 流式解析"""
+    print(f"\n[2] 不含越南文的大表耗时对比（{rows} 行 x 10 列）...")
+    TEST_DIR.mkdir(exist_ok=True)
+    path = TEST_DIR / "big_negative.xlsx"
+    data = {f"col{j}": [f"item_{i}_{j}" if j % 2 else i * j for i in range(rows)] for j in range(10)}
+    pd.DataFrame(data).to_excel(path, index=False)
+
+    pattern = VietnameseDetector().combined_pattern
+    checker = TableChecker()
+
+    start_time = time.time()
+    assert not xlsx_may_contain_vietnamese(path, pattern)
+    prefilter_time = time.time() - start_time
+
+    # 绕过预筛选，直接走 openpyxl 流式解析
+    import core.localization_checker as lc
+    original = lc.xlsx_may_contain_vietnamese
+    lc.xlsx_may_contain_vietnamese = lambda *args: True
+    try:
+        start_time = time.time()
+        assert not checker._excel_contains_vietnamese_stream(path)
+        stream_time = time.time() - start_time
+    finally:
+        lc.xlsx_may_contain_vietnamese = original
+
+    print(f"    openpyxl流式解析: {stream_time:.3f} 秒")
+    print(f"    共享字符串预筛选: {prefilter_time:.3f} 秒")
+    print(f"    ✓ 加速 {stream_time / max(prefilter_time, 1e-6):.1f}x")
+
+
+def _legacy_csv_contains(file_path: Path, pattern) -> bool:
+    """旧版实现：多种编码逐一尝试 pandas 读取并逐列匹配"""
+    sep = '\t' if file_path.suffix.lower() == '.tsv' else None
+    for encoding in ['utf-8', 'gbk', 'gb2312', 'utf-8-sig']:
+        try:
+            for chunk in pd.read_csv(file_path, encoding=encoding, sep=sep, dtype=str, engine='python',
+                                     chunksize=10000, on_bad_lines='skip'):
+                for column in chunk.columns:
+                    if chunk[column].astype(str).str.contains(pattern, regex=True, na=False).any():
+                        return True
+        except UnicodeDecodeError:
+            continue
+    return False
+
+
+def test_csv_encodings():
+    """CSV/TSV 字节级检测覆盖各种编码"""
+    print("\n[3] 验证CSV/TSV字节级检测...")
+    TEST_DIR.mkdir(exist_ok=True)
+    pattern = VietnameseDetector().combined_pattern
+    nfd = unicodedata.normalize('NFD', 'Khiên')
+    cases = [
+        ('ascii.csv', "id,name\n1,Sword\n2,Shield\n", 'utf-8', False),
+        ('utf8.csv', "id,name\n1,宝剑\n2,Thanh kiếm\n", 'utf-8', True),
+        ('utf8_sig.tsv', "id\tname\n1\tThanh kiếm\n", 'utf-8-sig', True),
+        ('utf8_nfd.csv', f"id,name\n1,{nfd}\n", 'utf-8', True),
+        ('utf8_chinese.csv', "id,name\n1,宝剑\n2,盾牌\n", 'utf-8', False),
+        ('gbk_chinese.csv', "id,name\n1,宝剑\n2,盾牌\n3,胀满\n", 'gbk', False),
+        ('gbk_pinyin.csv', "id,name\n1,宝剑\n2,pinyin à\n", 'gbk', True),
+        ('utf16.csv', "id,name\n1,Thanh kiếm\n", 'utf-16', True),
+    ]
+    for name, text, encoding, expected in cases:
+        path = TEST_DIR / name
+        path.write_bytes(text.encode(encoding))
+        assert csv_contains_vietnamese(path, pattern) == expected, f"{name} 检测结果错误"
+        print(f"    ✓ {name}: {'包含' if expected else '不包含'}越南文")
+
+    # 越南文跨越读取块边界
+    import core.prefilter as prefilter
+    original_chunk = prefilter.CHUNK_SIZE
+    prefilter.CHUNK_SIZE = 7
+    try:
+        path = TEST_DIR / "boundary.csv"
+        for offset in range(8):
+            path.write_bytes(("x" * offset + "ế,1\n").encode('utf-8'))
+            assert csv_contains_vietnamese(path, pattern), f"跨块偏移 {offset} 漏判"
+    finally:
+        prefilter.CHUNK_SIZE = original_chunk
+    print("    ✓ 跨读取块边界的字符不漏判")
+
+
+def test_csv_speed(rows: int = 200000):
+    """大CSV：字节级检测 vs 旧版 pandas 多编码读取"""
+    print(f"\n[4] 不含越南文的大CSV耗时对比（{rows} 行）...")
+    TEST_DIR.mkdir(exist_ok=True)
+    path = TEST_DIR / "big.csv"
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("id,name,desc\n")
+        for i in range(rows):
+            f.write(f"{i},物品{i},Item description {i}\n")
+    pattern = VietnameseDetector().combined_pattern
+
+    start_time = time.time()
+    assert not _legacy_csv_contains(path, pattern)
+    legacy_time = time.time() - start_time
+
+    start_time = time.time()
+    assert not csv_contains_vietnamese(path, pattern)
+    byte_time = time.time() - start_time
+
+    print(f"    pandas多编码读取: {legacy_time:.3f} 秒")
+    print(f"    字节级检测: {byte_time:.3f} 秒")
+    print(f"    ✓ 加速 {legacy_time / max(byte_time, 1e-6):.1f}x")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("表格快速预筛选测试")
+    print("=" * 60)
+
+    if TEST_DIR.exists():
+        shutil.rmtree(TEST_DIR)
+
+    try:
+        test_no_false_negatives()
+        test_negative_speed(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
+        test_csv_encodings()
+        test_csv_speed()
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    print("\n✓ 测试完成！")
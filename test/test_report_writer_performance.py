@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+扫描报告写入性能对比测试
+对比旧版逐单元格写入+二次遍历设置格式与 write_only 报告写入器的耗时和内存
+
+运行方式:
+  python test/test_report_writer_performance.py            # 默认 20000 行
+  python test/test_report_writer_performance.py 500000     # 50 万行基准
+"""
+
+import sys
+import time
+import shutil
+import tracemalloc
+from pathlib import Path
+
+# 添加模块路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+
+from core.report_writer import write_scan_report
+
+
+HEADERS = ['序号', '文件名', '位置', '越南文内容', '语言类型']
+COLUMN_WIDTHS = [8, 30, 20, 60, 15]
+OUTPUT_DIR = Path("test_report_writer_demo")
+
+
+def make_results(count: int):
+    """生成模拟扫描结果"""
+    return [
+        {
+            'excel_file': f"table_{i % 200}.xlsx",
+            'position': f"C{i % 5000 + 2}",
+            'content': f"Xin chào thế giới {i}",
+            'language_type': "越南文",
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_create_output_excel(results, output_path):
+    """旧版实现：逐单元格写入后再遍历全部单元格设置边框和对齐"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "越南文检测结果"
+    for col, header in enumerate(HEADERS, 1):
+        cell = ws.cell(row=1, column=col, value=header)
+        cell.font = Font(bold=True, color="FFFFFF")
+        cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        cell.alignment = Alignment(horizontal="center", vertical="center")
+    for row_idx, result in enumerate(results, 2):
+        ws.cell(row=row_idx, column=1, value=row_idx - 1)
+        ws.cell(row=row_idx, column=2, value=result['excel_file'])
+        ws.cell(row=row_idx, column=3, value=result['position'])
+        ws.cell(row=row_idx, column=4, value=result['content'])
+        ws.cell(row=row_idx, column=5, value=result['language_type'])
+    for col, width in enumerate(COLUMN_WIDTHS, 1):
+        ws.column_dimensions[ws.cell(row=1, column=col).column_letter].width = width
+    thin_border = Border(left=Side(style='thin'), right=Side(style='thin'),
+                         top=Side(style='thin'), bottom=Side(style='thin'))
+    for row in ws.iter_rows():
+        for cell in row:
+            cell.border = thin_border
+            cell.alignment = Alignment(horizontal="left", vertical="center", wrap_text=True)
+    ws.freeze_panes = "A2"
+    wb.save(output_path)
+
+
+def _cell_layout(cell):
+    """提取单元格的可见格式"""
+    return (
+        cell.value,
+        cell.font.b, cell.font.color.rgb if cell.font.color else None,
+        cell.fill.fill_type, cell.fill.start_color.rgb,
+        cell.border.left.style, cell.border.right.style, cell.border.top.style, cell.border.bottom.style,
+        cell.alignment.horizontal, cell.alignment.vertical, cell.alignment.wrap_text,
+    )
+
+
+def test_same_layout():
+    """验证新旧两种写法的可见布局一致"""
+    print("\n[1] 验证布局一致性...")
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    results = make_results(50)
+    legacy_path = OUTPUT_DIR / "legacy.xlsx"
+    new_path = OUTPUT_DIR / "write_only.xlsx"
+    legacy_create_output_excel(results, legacy_path)
+    write_scan_report(results, new_path, HEADERS, COLUMN_WIDTHS)
+
+    legacy_ws = load_workbook(legacy_path).active
+    new_ws = load_workbook(new_path).active
+    assert legacy_ws.title == new_ws.title, "工作表名称不一致"
+    assert legacy_ws.freeze_panes == new_ws.freeze_panes, "冻结窗格不一致"
+    assert legacy_ws.max_row == new_ws.max_row and legacy_ws.max_column == new_ws.max_column, "尺寸不一致"
+    for letter in "ABCDE":
+        assert legacy_ws.column_dimensions[letter].width == new_ws.column_dimensions[letter].width, f"{letter}列宽不一致"
+    for legacy_row, new_row in zip(legacy_ws.iter_rows(), new_ws.iter_rows()):
+        for legacy_cell, new_cell in zip(legacy_row, new_row):
+            assert _cell_layout(legacy_cell) == _cell_layout(new_cell), f"单元格 {legacy_cell.coordinate} 格式不一致"
+    print("    ✓ 内容、字体、填充、边框、对齐、列宽、冻结窗格一致")
+
+
+def _measure(func, *args):
+    """测量耗时与峰值内存"""
+    tracemalloc.start()
+    start_time = time.time()
+    func(*args)
+    elapsed = time.time() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def test_performance(row_count: int = 5000):
+    """性能对比"""
+    print(f"\n[2] 性能对比（{row_count} 行）...")
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    results = make_results(row_count)
+
+    legacy_time, legacy_mem = _measure(legacy_create_output_excel, results, OUTPUT_DIR / "legacy_big.xlsx")
+    print(f"    旧版写入: {legacy_time:.2f} 秒, 峰值内存 {legacy_mem:.1f} MB")
+
+    new_time, new_mem = _measure(write_scan_report, results, OUTPUT_DIR / "write_only_big.xlsx",
+                                 HEADERS, COLUMN_WIDTHS)
+    print(f"    write_only写入: {new_time:.2f} 秒, 峰值内存 {new_mem:.1f} MB")
+
+    if new_time > 0:
+        print(f"    ✓ 加速 {legacy_time / new_time:.1f}x, 内存降低 {legacy_mem / max(new_mem, 0.1):.1f}x")
+
+
+if __name__ == "__main__":
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    print("=" * 60)
+    print("扫描报告写入性能测试")
+    print("=" * 60)
+
+    if OUTPUT_DIR.exists():
+        shutil.rmtree(OUTPUT_DIR)
+    OUTPUT_DIR.mkdir()
+
+    try:
+        test_same_layout()
+        test_performance(row_count)
+    finally:
+        shutil.rmtree(OUTPUT_DIR, ignore_errors=True)
+
+    print("\n✓ 测试完成！")
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+无交互命令行扫描测试
+以子进程方式运行 scan_cli（与 CI 中的用法相同），验证 NDJSON/CSV/Excel 输出与扫描器 API 结果一致、
+多进程结果与单进程一致、增量扫描只扫描修改过的文件，以及 --fail-on-found / --stats 的行为
+
+运行方式:
+  python test/test_scan_cli.py            # 默认 40 个文件
+  python test/test_scan_cli.py 400
+"""
+
+import io
+import csv
+import json
+import sys
+import time
+import shutil
+import contextlib
+import subprocess
+from pathlib import Path
+
+# 添加模块路径
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "core"))
+
+import pandas as pd
+import openpyxl
+
+from core.localization_checker import LocalizationChecker
+from vietnamese_excel_processor import VietnameseExcelProcessor
+
+
+TEST_DIR = Path("test_scan_cli_demo").resolve()
+DATA_DIR = TEST_DIR / "data"
+CLEAN_DIR = TEST_DIR / "clean"
+JOURNAL_PATH = TEST_DIR / "journal.jsonl"
+
+
+def _create_tree(file_count: int):
+    """创建混合目录：xlsx（多工作表）与 csv，约三分之一包含越南文；另建一个不含越南文的目录"""
+    for i in range(file_count):
+        directory = DATA_DIR / f"group_{i % 4}"
+        directory.mkdir(parents=True, exist_ok=True)
+        name = f"物品{i}" if i % 3 else f"Thanh kiếm {i}"
+        if i % 2:
+            (directory / f"data_{i}.csv").write_text(f"id,name\n{i},{name}\n{i + 1},宝剑\n", encoding='utf-8')
+        else:
+            with pd.ExcelWriter(directory / f"book_{i}.xlsx") as writer:
+                pd.DataFrame({'id': [i], 'name': ['宝剑']}).to_excel(writer, sheet_name="中文表", index=False)
+                pd.DataFrame({'id': [i, i + 1], 'name': [name, 'Sword']}).to_excel(
+                    writer, sheet_name="物品表", index=False)
+    CLEAN_DIR.mkdir(parents=True, exist_ok=True)
+    (CLEAN_DIR / "clean.csv").write_text("id,name\n1,宝剑\n", encoding='utf-8')
+
+
+def _run(*args, module: str = "core.scan_cli"):
+    """以子进程运行命令行，返回 (退出码, stdout, stderr)"""
+    if module.endswith(".py"):
+        command = [sys.executable, str(ROOT / module), *args]
+    else:
+        command = [sys.executable, "-m", module, *args]
+    completed = subprocess.run(command, cwd=str(ROOT), capture_output=True, text=True, encoding='utf-8')
+    return completed.returncode, completed.stdout, completed.stderr
+
+
+def _stats(stderr: str) -> dict:
+    """--stats 输出为 stderr 最后一行 JSON"""
+    return json.loads(stderr.strip().splitlines()[-1])
+
+
+def _expected_rows():
+    processor = VietnameseExcelProcessor()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = processor.scan_directory(str(DATA_DIR))
+    return [[item['file_path'], item['sheet_name'], item['position'], str(item['column_name']), item['content']]
+            for item in results]
+
+
+def _ndjson_rows(text: str):
+    items = [json.loads(line) for line in text.splitlines()]
+    return [[item['file_path'], item['sheet_name'], item['position'], item['column_name'], item['content']]
+            for item in items]
+
+
+def test_outputs(file_count: int):
+    """NDJSON/CSV/Excel 输出与扫描器 API 一致，多进程与单进程一致"""
+    print("\n[1] 验证输出格式与并行扫描...")
+    expected = _expected_rows()
+
+    timings = {}
+    for workers in (1, 4):
+        start_time = time.time()
+        code, stdout, stderr = _run(str(DATA_DIR), "--workers", str(workers), "--stats")
+        timings[workers] = time.time() - start_time
+        assert code == 0, stderr
+        assert _ndjson_rows(stdout) == expected, f"workers={workers} 的 NDJSON 输出与 API 结果不一致"
+        stats = _stats(stderr)
+        assert stats['files_discovered'] == file_count
+        assert stats['total_vietnamese_locations'] == len(expected)
+        assert stats['sheets_scanned'] > 0 and stats['elapsed_seconds'] >= 0
+    print(f"    ✓ NDJSON 输出 {len(expected)} 个位置与 API 一致（单进程 {timings[1]:.2f} 秒，"
+          f"4 进程 {timings[4]:.2f} 秒，顺序相同）")
+
+    csv_path = TEST_DIR / "out" / "result.csv"
+    code, _, stderr = _run(str(DATA_DIR), "--format", "csv", "-o", str(csv_path))
+    assert code == 0, stderr
+    with open(csv_path, encoding='utf-8-sig', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [[row['file_path'], row['sheet_name'], row['position'], row['column_name'], row['content']]
+            for row in rows] == expected
+    print("    ✓ CSV 输出一致")
+
+    xlsx_path = TEST_DIR / "out" / "result.xlsx"
+    code, stdout, stderr = _run(str(DATA_DIR), "--format", "xlsx", str(xlsx_path), "--workers", "2")
+    assert code == 0 and not stdout, stderr
+    workbook = openpyxl.load_workbook(xlsx_path, read_only=True)
+    rows = list(workbook.active.iter_rows(values_only=True))
+    workbook.close()
+    assert rows[0] == ('序号', '文件名', '位置', '越南文内容', '语言类型')
+    assert [(row[2], row[3]) for row in rows[1:]] == [(item[2], item[4]) for item in expected]
+    print("    ✓ Excel 输出一致，stdout 无提示信息")
+
+
+def test_incremental(file_count: int):
+    """增量扫描：未修改的文件直接复用日志中的结论"""
+    print("\n[2] 验证增量扫描...")
+    args = (str(DATA_DIR), "--incremental", "--journal", str(JOURNAL_PATH), "--stats")
+    code, first, stderr = _run(*args)
+    assert code == 0 and _stats(stderr)['files_resumed'] == 0
+
+    start_time = time.time()
+    code, second, stderr = _run(*args, "--workers", "2")
+    elapsed = time.time() - start_time
+    stats = _stats(stderr)
+    assert code == 0 and second == first
+    assert stats['files_resumed'] == file_count
+    print(f"    ✓ 第二次运行全部 {file_count} 个文件来自日志（{elapsed:.2f} 秒），输出相同")
+
+    changed = next(DATA_DIR.rglob("*.csv"))
+    changed.write_text("id,name\n1,Khiên mới\n", encoding='utf-8')
+    code, third, stderr = _run(*args)
+    stats = _stats(stderr)
+    assert stats['files_resumed'] == file_count - 1
+    assert 'Khiên mới' in third
+    print("    ✓ 修改过的文件重新扫描")
+
+
+def test_exit_codes():
+    """--fail-on-found 与目录错误的退出码"""
+    print("\n[3] 验证退出码...")
+    assert _run(str(DATA_DIR), "--fail-on-found", "--scanner", "checker")[0] == 1
+    code, stdout, _ = _run(str(CLEAN_DIR), "--fail-on-found")
+    assert code == 0 and stdout == ""
+    assert _run(str(TEST_DIR / "missing"))[0] == 2
+    assert _run(str(DATA_DIR), "--workers", "0")[0] == 2
+    print("    ✓ 发现越南文 1，未发现 0，参数/目录错误 2")
+
+    # 无法打开的文件（损坏的工作簿）计入统计并影响退出码，不当作 "没有越南文"
+    broken_dir = TEST_DIR / "broken"
+    broken_dir.mkdir()
+    (broken_dir / "a.xlsx").write_bytes(b"not a zip")
+    (broken_dir / "b.xls").write_bytes(b"not an xls")
+    (broken_dir / "ok.csv").write_text("id,name\n1,Thanh kiếm\n", encoding='utf-8')
+    broken_only = TEST_DIR / "broken_only"
+    broken_only.mkdir()
+    (broken_only / "a.xlsx").write_bytes(b"not a zip")
+    for scanner in ('processor', 'excel', 'checker'):
+        code, _, stderr = _run(str(broken_dir), "--scanner", scanner, "--stats")
+        assert code == 2, (scanner, stderr)
+        assert "a.xlsx: BadZipFile" in stderr and _stats(stderr)['files_with_errors'] == 2, (scanner, stderr)
+        code, _, stderr = _run(str(broken_only), "--scanner", scanner, "--fail-on-found", "--workers", "2")
+        assert code == 2, (scanner, stderr)
+    assert _run(str(broken_dir), "--fail-on-found")[0] == 1
+    print("    ✓ 有文件无法打开 2（三个扫描器，含多进程；--fail-on-found 且发现越南文时仍为 1）")
+
+
+def test_legacy_entry_points():
+    """三个扫描器的 main() 带参数时不再等待输入"""
+    print("\n[4] 验证扫描器入口委托给命令行...")
+    checker = LocalizationChecker()
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = sorted(checker.scan_directory(str(DATA_DIR), recursive=True))
+
+    code, stdout, stderr = _run(str(DATA_DIR), "--recursive", "--fail-on-found",
+                                module="core/localization_checker.py")
+    assert code == 1, stderr
+    assert sorted(json.loads(line)['excel_file'] for line in stdout.splitlines()) == expected
+
+    # 旧用法：目录 输出文件夹（默认 Excel 输出）
+    output_folder = TEST_DIR / "legacy_output"
+    code, _, stderr = _run(str(DATA_DIR), str(output_folder), module="core/vietnamese_excel_processor.py")
+    assert code == 0 and (output_folder / "越南文检测结果.xlsx").exists(), stderr
+
+    code, stdout, stderr = _run(str(DATA_DIR), "-", "--format", "ndjson", module="core.excel_vietnamese_scanner")
+    assert code == 0, stderr
+    positions = {json.loads(line)['position'] for line in stdout.splitlines()}
+    assert positions and all(position.startswith("第") for position in positions)
+    print("    ✓ localization_checker / vietnamese_excel_processor / excel_vietnamese_scanner 均可无交互运行")
+
+
+if __name__ == "__main__":
+    file_count = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+
+    print("=" * 60)
+    print("无交互命令行扫描测试")
+    print("=" * 60)
+
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    try:
+        _create_tree(file_count)
+        test_outputs(file_count)
+        test_incremental(file_count)
+        test_exit_codes()
+        test_legacy_entry_points()
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    print("\n✓ 测试完成！")
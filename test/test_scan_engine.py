@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+两阶段扫描引擎测试
+验证只定位包含越南文的工作表时结果与完整扫描一致，并测试工作表级结果与单文件上限
+
+运行方式:
+  python test/test_scan_engine.py            # 默认每个工作表 5000 行
+  python test/test_scan_engine.py 20000
+"""
+
+import io
+import sys
+import time
+import shutil
+import contextlib
+from pathlib import Path
+
+# 添加模块路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "core"))
+
+import pandas as pd
+
+from core.excel_vietnamese_scanner import ExcelVietnameseScanner
+from vietnamese_excel_processor import VietnameseExcelProcessor
+
+
+TEST_DIR = Path("test_scan_engine_demo")
+
+
+def _create_workbook(path: Path, rows: int, negative_sheets: int = 9):
+    """创建一个工作簿：一个工作表含越南文，其余工作表只有中英文"""
+    with pd.ExcelWriter(path) as writer:
+        for i in range(negative_sheets):
+            pd.DataFrame({
+                'id': range(rows),
+                'name': [f"物品{j}" for j in range(rows)],
+                'desc': [f"Item description {j}" for j in range(rows)],
+            }).to_excel(writer, sheet_name=f"中文表{i}", index=False)
+        pd.DataFrame({
+            'id': range(rows),
+            'name': [f"物品{j}" if j % 100 else f"Thanh kiếm {j}" for j in range(rows)],
+        }).to_excel(writer, sheet_name="越南文表", index=False)
+
+
+def _scan(scanner, directory):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return scanner.scan_directory(str(directory))
+
+
+def test_same_results(rows: int):
+    """两阶段扫描与完整扫描结果一致"""
+    print(f"\n[1] 验证两阶段扫描结果一致（10 个工作表 x {rows} 行）...")
+    TEST_DIR.mkdir(exist_ok=True)
+    _create_workbook(TEST_DIR / "mixed.xlsx", rows)
+    (TEST_DIR / "data.csv").write_text("id,name\n1,宝剑\n2,Khiên\n", encoding='utf-8')
+    (TEST_DIR / "chinese.csv").write_text("id,name\n1,宝剑\n2,盾牌\n", encoding='utf-8')
+
+    timings = {}
+    results = {}
+    for two_phase in (False, True):
+        for scanner_class in (ExcelVietnameseScanner, VietnameseExcelProcessor):
+            scanner = scanner_class(two_phase=two_phase)
+            start_time = time.time()
+            results[(scanner_class, two_phase)] = _scan(scanner, TEST_DIR).to_dicts()
+            timings[(scanner_class, two_phase)] = time.time() - start_time
+
+    for scanner_class in (ExcelVietnameseScanner, VietnameseExcelProcessor):
+        assert results[(scanner_class, True)] == results[(scanner_class, False)], \
+            f"{scanner_class.__name__} 两阶段扫描结果不一致"
+        print(f"    ✓ {scanner_class.__name__}: {len(results[(scanner_class, True)])} 个位置一致, "
+              f"完整扫描 {timings[(scanner_class, False)]:.2f} 秒, "
+              f"两阶段扫描 {timings[(scanner_class, True)]:.2f} 秒")
+
+
+def test_sheet_results():
+    """工作表级结果"""
+    print("\n[2] 验证工作表级结果...")
+    processor = VietnameseExcelProcessor()
+    _scan(processor, TEST_DIR)
+    summary = processor.scan_engine.summarize_sheets()
+    by_sheet = {(item['excel_file'], item['sheet_name']): item for item in processor.scan_engine.sheet_results}
+
+    assert summary['sheets_scanned'] == 12, summary
+    assert summary['sheets_with_vietnamese'] == 2, summary
+    assert by_sheet[('mixed.xlsx', '越南文表')]['hits'] > 0
+    assert not by_sheet[('mixed.xlsx', '中文表0')]['has_vietnamese']
+    assert by_sheet[('data.csv', 'CSV数据')]['hits'] == 1
+    assert not by_sheet[('chinese.csv', 'CSV数据')]['has_vietnamese']
+    print(f"    ✓ {summary['sheets_with_vietnamese']}/{summary['sheets_scanned']} 个工作表包含越南文")
+
+
+def test_max_hits_per_file():
+    """单文件上限"""
+    print("\n[3] 验证单文件上限...")
+    processor = VietnameseExcelProcessor(max_hits_per_file=3)
+    results = _scan(processor, TEST_DIR)
+    per_file = {}
+    for item in results:
+        per_file[item['excel_file']] = per_file.get(item['excel_file'], 0) + 1
+    assert per_file == {'mixed.xlsx': 3, 'data.csv': 1}, per_file
+    assert processor.scan_engine.summarize_sheets()['sheets_truncated'] == 1
+    print(f"    ✓ 每个文件最多记录 3 个位置: {per_file}")
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    print("=" * 60)
+    print("两阶段扫描引擎测试")
+    print("=" * 60)
+
+    if TEST_DIR.exists():
+        shutil.rmtree(TEST_DIR)
+
+    try:
+        test_same_results(rows)
+        test_sheet_results()
+        test_max_hits_per_file()
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    print("\n✓ 测试完成！")
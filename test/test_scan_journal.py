@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+扫描进度日志（断点续扫）测试
+模拟扫描中途中断后以 resume=True 续扫，验证只扫描剩余文件且最终结果与一次完整扫描一致
+
+运行方式:
+  python test/test_scan_journal.py            # 默认 60 个文件
+  python test/test_scan_journal.py 300
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import contextlib
+import subprocess
+from pathlib import Path
+
+# 添加模块路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "core"))
+
+import pandas as pd
+
+from core.localization_checker import LocalizationChecker
+from core.scan_journal import ScanJournal
+from vietnamese_excel_processor import VietnameseExcelProcessor
+
+
+TEST_DIR = Path("test_scan_journal_demo")
+JOURNAL_PATH = TEST_DIR.parent / "test_scan_journal_demo.jsonl"
+
+
+class _Interrupted(Exception):
+    """模拟进程在扫描中途被终止"""
+
+
+def _create_tree(file_count: int):
+    """创建混合目录：xlsx（多工作表）与 csv，约三分之一包含越南文"""
+    for i in range(file_count):
+        directory = TEST_DIR / f"group_{i % 4}"
+        directory.mkdir(parents=True, exist_ok=True)
+        name = f"物品{i}" if i % 3 else f"Thanh kiếm {i}"
+        if i % 2:
+            (directory / f"data_{i}.csv").write_text(f"id,name\n{i},{name}\n{i + 1},宝剑\n", encoding='utf-8')
+        else:
+            with pd.ExcelWriter(directory / f"book_{i}.xlsx") as writer:
+                pd.DataFrame({'id': [i], 'name': ['宝剑']}).to_excel(writer, sheet_name="中文表", index=False)
+                pd.DataFrame({'id': [i, i + 1], 'name': [name, 'Sword']}).to_excel(
+                    writer, sheet_name="物品表", index=False)
+
+
+def _quiet(func, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def _interrupt_after(scanner, method_name: str, count: int):
+    """让扫描器在完成 count 个文件后抛出异常，模拟中断"""
+    original = getattr(scanner, method_name)
+    calls = []
+
+    def wrapper(file_path):
+        if len(calls) >= count:
+            raise _Interrupted()
+        calls.append(file_path)
+        return original(file_path)
+
+    setattr(scanner, method_name, wrapper)
+    return calls
+
+
+def test_processor_resume(file_count: int):
+    """VietnameseExcelProcessor：中断后续扫结果与完整扫描一致"""
+    print("\n[1] 验证 VietnameseExcelProcessor 续扫...")
+    processor = VietnameseExcelProcessor()
+    start_time = time.time()
+    expected = _quiet(processor.scan_directory, str(TEST_DIR)).to_dicts()
+    expected_sheets = list(processor.scan_engine.sheet_results)
+    full_time = time.time() - start_time
+
+    interrupted = VietnameseExcelProcessor()
+    half = file_count // 2
+    _interrupt_after(interrupted, 'scan_single_file', half)
+    try:
+        _quiet(interrupted.scan_directory, str(TEST_DIR), journal_path=str(JOURNAL_PATH))
+        raise AssertionError("扫描未被中断")
+    except _Interrupted:
+        pass
+
+    # 模拟写入最后一行时进程被终止：残缺的行应被丢弃
+    with open(JOURNAL_PATH, 'a', encoding='utf-8') as f:
+        f.write('{"path": "broken')
+
+    resumed = VietnameseExcelProcessor()
+    calls = _interrupt_after(resumed, 'scan_single_file', file_count)
+    start_time = time.time()
+    results = _quiet(resumed.scan_directory, str(TEST_DIR), resume=True, journal_path=str(JOURNAL_PATH))
+    resume_time = time.time() - start_time
+
+    assert len(calls) == file_count - half, f"续扫应只扫描剩余 {file_count - half} 个文件，实际 {len(calls)}"
+    assert results.to_dicts() == expected, "续扫结果与完整扫描不一致"
+    assert resumed.scan_engine.sheet_results == expected_sheets, "续扫的工作表级结果不一致"
+    print(f"    ✓ 中断于 {half}/{file_count}，续扫只扫描剩余 {len(calls)} 个文件，{len(results)} 个位置一致")
+
+    # 全部完成后再次续扫：不再打开任何文件
+    again = VietnameseExcelProcessor()
+    calls = _interrupt_after(again, 'scan_single_file', file_count)
+    start_time = time.time()
+    results = _quiet(again.scan_directory, str(TEST_DIR), resume=True, journal_path=str(JOURNAL_PATH))
+    journal_time = time.time() - start_time
+    assert not calls and results.to_dicts() == expected
+    print(f"    ✓ 完整扫描 {full_time:.2f} 秒，续扫一半 {resume_time:.2f} 秒，"
+          f"全部来自日志 {journal_time:.2f} 秒")
+
+    # 修改过的文件重新扫描
+    changed = next(TEST_DIR.rglob("*.csv"))
+    changed.write_text("id,name\n1,Khiên mới\n", encoding='utf-8')
+    again = VietnameseExcelProcessor()
+    calls = _interrupt_after(again, 'scan_single_file', file_count)
+    results = _quiet(again.scan_directory, str(TEST_DIR), resume=True, journal_path=str(JOURNAL_PATH))
+    assert calls == [changed], "只有被修改的文件应重新扫描"
+    assert any(item['content'] == 'Khiên mới' for item in results)
+    print("    ✓ 被修改的文件（大小/修改时间变化）重新扫描")
+
+    # 扫描参数变化时旧日志不再适用
+    truncated = VietnameseExcelProcessor(max_hits_per_file=1)
+    calls = _interrupt_after(truncated, 'scan_single_file', file_count)
+    _quiet(truncated.scan_directory, str(TEST_DIR), resume=True, journal_path=str(JOURNAL_PATH))
+    assert len(calls) == file_count
+    print("    ✓ 扫描参数变化时丢弃旧日志，重新扫描全部文件")
+
+
+def test_process_directory():
+    """process_directory 只在续扫时默认在输出文件夹写入日志，resume=True 续扫"""
+    print("\n[2] 验证 process_directory 续扫...")
+    output_folder = TEST_DIR.parent / "test_scan_journal_output"
+    try:
+        first = _quiet(VietnameseExcelProcessor().process_directory, str(TEST_DIR), str(output_folder))
+        assert not (output_folder / "越南文扫描进度.jsonl").exists(), "不续扫时不应写入日志"
+        _quiet(VietnameseExcelProcessor().process_directory, str(TEST_DIR), str(output_folder), resume=True)
+        assert (output_folder / "越南文扫描进度.jsonl").exists()
+
+        processor = VietnameseExcelProcessor()
+        calls = _interrupt_after(processor, 'scan_single_file', 0)
+        stats = _quiet(processor.process_directory, str(TEST_DIR), str(output_folder), resume=True)
+        assert not calls
+        for key in ('total_files_scanned', 'files_with_vietnamese', 'total_vietnamese_locations',
+                    'files_prefiltered', 'sheets_scanned', 'sheets_with_vietnamese'):
+            assert stats[key] == first[key], key
+        print(f"    ✓ 续扫统计与首次一致: {stats['files_with_vietnamese']}/{stats['total_files_scanned']} 个文件")
+    finally:
+        shutil.rmtree(output_folder, ignore_errors=True)
+
+
+def test_checker_resume(file_count: int):
+    """LocalizationChecker：中断后续扫结果与完整扫描一致"""
+    print("\n[3] 验证 LocalizationChecker 续扫...")
+    checker = LocalizationChecker()
+    expected = _quiet(checker.scan_directory, str(TEST_DIR), recursive=True)
+
+    interrupted = LocalizationChecker()
+    half = file_count // 3
+    _interrupt_after(interrupted.table_checker, 'check_table_has_vietnamese', half)
+    try:
+        _quiet(interrupted.scan_directory, str(TEST_DIR), recursive=True, resume=True,
+               journal_path=str(JOURNAL_PATH))
+        raise AssertionError("扫描未被中断")
+    except _Interrupted:
+        pass
+
+    resumed = LocalizationChecker()
+    calls = _interrupt_after(resumed.table_checker, 'check_table_has_vietnamese', file_count)
+    valid_tables = _quiet(resumed.scan_directory, str(TEST_DIR), recursive=True, resume=True,
+                          journal_path=str(JOURNAL_PATH))
+    assert len(calls) == file_count - half
+    assert valid_tables == expected, "续扫结果与完整扫描不一致"
+    print(f"    ✓ 中断于 {half}/{file_count}，续扫只检测剩余 {len(calls)} 个文件，"
+          f"{len(valid_tables)} 个包含越南文的文件一致")
+
+    # 日志按最后一条为准，且不完整的行不影响后续追加
+    journal = ScanJournal(JOURNAL_PATH, signature={'kind': 'localization',
+                                                   'directory': os.path.realpath(TEST_DIR),
+                                                   'recursive': True})
+    assert len(journal.entries) == file_count
+    journal.close()
+    print("    ✓ 日志记录完整")
+
+
+def _journaled_paths(journal_path: Path):
+    """日志中已记录的文件路径（第一行为日志头）"""
+    lines = journal_path.read_text(encoding='utf-8').splitlines()[1:]
+    return {os.path.basename(json.loads(line)['path']) for line in lines}
+
+
+def test_unreadable_files():
+    """无法打开的文件不写入日志，续扫时重新扫描"""
+    print("\n[4] 验证无法打开的文件...")
+    directory = TEST_DIR.parent / "test_scan_journal_unreadable"
+    journal_path = TEST_DIR.parent / "test_scan_journal_unreadable.jsonl"
+    shutil.rmtree(directory, ignore_errors=True)
+    directory.mkdir()
+    (directory / "broken.xlsx").write_bytes(b"not a zip")
+    (directory / "ok.csv").write_text("id,name\n1,Thanh kiếm\n", encoding='utf-8')
+    try:
+        for run in range(2):
+            processor = VietnameseExcelProcessor()
+            calls = _interrupt_after(processor, 'scan_single_file', 10)
+            results = _quiet(processor.scan_directory, str(directory), resume=True, journal_path=str(journal_path))
+            assert len(results) == 1 and _journaled_paths(journal_path) == {"ok.csv"}
+            assert [path.name for path in calls] == (["broken.xlsx", "ok.csv"] if run == 0 else ["broken.xlsx"])
+        print("    ✓ VietnameseExcelProcessor：无法打开的文件不写入日志，续扫时重新扫描")
+
+        for run in range(2):
+            checker = LocalizationChecker()
+            calls = _interrupt_after(checker.table_checker, 'check_table_has_vietnamese', 10)
+            valid_tables = _quiet(checker.scan_directory, str(directory), resume=True,
+                                  journal_path=str(journal_path))
+            assert valid_tables == ["ok.csv"] and _journaled_paths(journal_path) == {"ok.csv"}
+            assert len(calls) == (2 if run == 0 else 1)
+        print("    ✓ LocalizationChecker：无法打开的文件不写入日志，续扫时重新检测")
+
+        root = Path(__file__).parent.parent
+        for run in range(2):
+            completed = subprocess.run(
+                [sys.executable, "-m", "core.scan_cli", str(directory.resolve()), "--incremental",
+                 "--journal", str(journal_path.resolve()), "--stats"],
+                cwd=str(root), capture_output=True, text=True, encoding='utf-8')
+            stats = json.loads(completed.stderr.strip().splitlines()[-1])
+            assert completed.returncode == 2 and stats['files_with_errors'] == 1, completed.stderr
+            assert stats['files_resumed'] == run and _journaled_paths(journal_path) == {"ok.csv"}
+        print("    ✓ 命令行 --incremental：无法打开的文件每次都报告为错误")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+        if journal_path.exists():
+            journal_path.unlink()
+
+
+if __name__ == "__main__":
+    file_count = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+
+    print("=" * 60)
+    print("扫描进度日志（断点续扫）测试")
+    print("=" * 60)
+
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    try:
+        _create_tree(file_count)
+        test_processor_resume(file_count)
+        test_process_directory()
+        test_checker_resume(file_count)
+        test_unreadable_files()
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+        if JOURNAL_PATH.exists():
+            JOURNAL_PATH.unlink()
+
+    print("\n✓ 测试完成！")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+紧凑扫描结果测试
+验证 FindingBatch 与旧版字典结果等价，并对比百万条结果的内存占用
+
+运行方式:
+  python test/test_scan_results.py             # 默认 200000 条
+  python test/test_scan_results.py 1000000     # 百万条基准
+"""
+
+import sys
+import tracemalloc
+from pathlib import Path
+
+# 添加模块路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.scan_results import FindingBatch, Finding, chinese_position, as_finding_batch
+
+
+def _legacy_dict(i: int) -> dict:
+    """旧版字典格式的单条结果"""
+    row, col = i % 5000 + 2, i % 12 + 1
+    col_letter = "ABCDEFGHIJKL"[col - 1]
+    return {
+        'excel_file': f"table_{i % 300}.xlsx",
+        'sheet_name': f"Sheet{i % 4}",
+        'row': row,
+        'col': col,
+        'column_name': f"field_{col}",
+        'content': f"Tên vật phẩm {i % 20000}",
+        'language_type': "越南文",
+        'position': f"{col_letter}{row}",
+        'file_path': f"/data/vn/tables/table_{i % 300}.xlsx",
+    }
+
+
+def _append(batch: FindingBatch, item: dict) -> None:
+    batch.append(item['file_path'], item['excel_file'], item['sheet_name'], item['row'],
+                 item['col'], item['column_name'], item['content'], item['language_type'])
+
+
+def test_equivalence():
+    """批次与旧版字典结果等价"""
+    print("\n[1] 验证与旧版字典结果等价...")
+    legacy = [_legacy_dict(i) for i in range(1000)]
+    batch = FindingBatch()
+    for item in legacy:
+        _append(batch, item)
+
+    assert len(batch) == len(legacy)
+    assert batch.to_dicts() == legacy, "转换结果与旧版字典不一致"
+    assert batch[-1] == legacy[-1] and batch[10:12] == legacy[10:12]
+    assert batch.unique_files() == {item['excel_file'] for item in legacy}
+    assert isinstance(next(batch.records()), Finding)
+    assert next(batch.records())['content'] == legacy[0]['content']
+
+    # 合并批次与合并字典列表结果一致
+    merged = FindingBatch()
+    merged.extend(as_finding_batch(legacy[:500]))
+    merged.extend(legacy[500:])
+    assert merged.to_dicts() == legacy, "合并后结果不一致"
+
+    # 中文位置格式
+    cn_batch = FindingBatch(position_format=chinese_position)
+    _append(cn_batch, legacy[0])
+    assert cn_batch[0]['position'] == f"第{legacy[0]['row']}行第{legacy[0]['col']}列"
+    print("    ✓ 字典转换、切片、合并、位置格式均一致")
+
+
+def _peak_memory(builder, count: int) -> float:
+    tracemalloc.start()
+    result = builder(count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / 1024 / 1024
+
+
+def _build_legacy(count: int):
+    return [_legacy_dict(i) for i in range(count)]
+
+
+def _build_batch(count: int):
+    batch = FindingBatch()
+    for i in range(count):
+        _append(batch, _legacy_dict(i))
+    return batch
+
+
+def test_memory(count: int = 100000):
+    """对比内存占用"""
+    print(f"\n[2] 内存占用对比（{count} 条结果）...")
+    legacy_mb = _peak_memory(_build_legacy, count)
+    batch_mb = _peak_memory(_build_batch, count)
+    print(f"    字典列表: {legacy_mb:.1f} MB")
+    print(f"    FindingBatch: {batch_mb:.1f} MB")
+    print(f"    ✓ 内存降低 {legacy_mb / max(batch_mb, 0.1):.1f}x")
+    assert batch_mb * 5 < legacy_mb, "FindingBatch 内存占用未明显降低"
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    print("=" * 60)
+    print("紧凑扫描结果测试")
+    print("=" * 60)
+
+    test_equivalence()
+    test_memory(count)
+
+    print("\n✓ 测试完成！")
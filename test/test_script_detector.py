@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文字体系检测注册表测试
+验证共用码位区间表与原先各检测器的正则结论一致，并对比一次遍历与多个正则分别匹配的耗时
+
+运行方式:
+  python test/test_script_detector.py            # 默认 200000 条
+  python test/test_script_detector.py 1000000
+"""
+
+import re
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+# 添加模块路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.script_detector import (script_bits, script_names, register_script, has_script,
+                                  SCRIPT_CJK_UNIFIED, SCRIPT_LATIN_BASIC, SCRIPT_THAI,
+                                  SCRIPT_HANGUL, SCRIPT_KANA, SCRIPT_CYRILLIC, LATIN_EXTENDED_MASK)
+from core.localization_checker import VietnameseDetector
+from tools.excel_text_extractor import ExcelTextExtractor
+
+
+# 原先各检测器使用的正则
+LEGACY_CHINESE = [re.compile(r'[一-鿿]'), re.compile(r'[㐀-䶿]'), re.compile(r'[豈-﫿]')]
+LEGACY_ENGLISH = re.compile(r'[a-zA-Z]')
+LEGACY_EXTRACTOR_CHINESE = re.compile(r'[一-鿿]')
+LEGACY_EXTRACTOR_VIETNAMESE = re.compile(r'[Ḁ-ỿἀ-῿Ā-ſƀ-ɏ]')
+
+
+def legacy_contains_vietnamese(detector: VietnameseDetector, text: str) -> bool:
+    """旧版越南文检测：NFC 规范化后用合并正则匹配"""
+    normalized = unicodedata.normalize('NFC', text)
+    if normalized.isascii():
+        return False
+    return bool(detector.combined_pattern.search(normalized))
+
+
+def test_codepoints():
+    """逐码位验证（基本多文种平面）"""
+    print("\n[1] 逐码位验证与原正则一致...")
+    detector = VietnameseDetector(memo_size=0)
+    for code in range(0x10000):
+        if 0xD800 <= code <= 0xDFFF:
+            continue
+        char = chr(code)
+        bits = script_bits(char)
+        assert bool(bits & SCRIPT_CJK_UNIFIED) == bool(LEGACY_EXTRACTOR_CHINESE.search(char)), hex(code)
+        assert bool(bits & LATIN_EXTENDED_MASK) == bool(LEGACY_EXTRACTOR_VIETNAMESE.search(char)), hex(code)
+        assert bool(bits & SCRIPT_LATIN_BASIC) == bool(LEGACY_ENGLISH.search(char)), hex(code)
+        assert detector.contains_chinese(char) == any(p.search(char) for p in LEGACY_CHINESE), hex(code)
+        assert detector.contains_vietnamese(char) == legacy_contains_vietnamese(detector, char), hex(code)
+    print("    ✓ 65536 个码位的中文/英文/越南文判断与原正则一致")
+
+    # 分解写法：任意可被忽略大小写的拉丁字母匹配到的字母后跟组合音标
+    for base in 'aEİıſKzß':
+        for mark in ('̀', '̈', '̣', '̂́'):
+            text = f"x{base}{mark}y"
+            assert detector.contains_vietnamese(text) == legacy_contains_vietnamese(detector, text), repr(text)
+    print("    ✓ 分解写法（字母+组合音标）判断一致")
+
+
+def test_extractor():
+    """文本提取器的文本判断与类型分析保持不变"""
+    print("\n[2] 验证文本提取器判断...")
+    extractor = ExcelTextExtractor()
+    cases = {
+        '宝剑': (True, "中文"), 'Thanh kiếm': (True, "越英混合"), 'Sword': (False, "其他"),
+        '["a","b"]': (False, "其他"), '["宝剑"]': (True, "中文"), '{"k": "Ă"}': (True, "越英混合"),
+        '—': (True, "其他"), 'ภาษาไทย': (False, "其他"), '宝剑 Thanh kiếm': (True, "中越混合"),
+        '宝剑 sword': (True, "中英混合"), 'ἀγάπη': (True, "越南文"),
+    }
+    for text, (is_text, text_type) in cases.items():
+        assert extractor._is_text_content(text) == is_text, text
+        assert extractor._analyze_text_type(text) == text_type, text
+    print(f"    ✓ {len(cases)} 个样例结论不变")
+
+
+def test_scripts():
+    """多文种分类与注册扩展"""
+    print("\n[3] 验证多文种分类...")
+    bits = script_bits('Tên 宝剑 ภาษาไทย 한국어 カタカナ Привет')
+    for mask in (SCRIPT_THAI, SCRIPT_HANGUL, SCRIPT_KANA, SCRIPT_CYRILLIC, SCRIPT_CJK_UNIFIED):
+        assert bits & mask
+    print(f"    ✓ {', '.join(script_names(bits))}")
+
+    detector = VietnameseDetector()
+    assert detector.contains_script('สวัสดี', SCRIPT_THAI)
+    assert not detector.contains_script('Xin chào', SCRIPT_THAI)
+    assert detector.contains_vietnamese('Xin chào')
+
+    devanagari = register_script('devanagari', [(0x0900, 0x097F)])
+    assert has_script('नमस्ते', devanagari) and not has_script('宝剑', devanagari)
+    assert register_script('devanagari', [(0x0900, 0x097F)]) == devanagari
+    print("    ✓ 检测器共用位集合（泰文检查无需额外遍历），可注册新文字体系")
+
+
+def test_speed(count: int):
+    """一次遍历 vs 多个正则分别匹配"""
+    print(f"\n[4] 一次遍历与多正则耗时对比（{count} 条）...")
+    samples = ['Nhiệm vụ hằng ngày', '每日任务说明', 'ภารกิจประจำวัน', 'Daily quest description']
+    corpus = [f"{samples[i % len(samples)]} {i}" for i in range(count)]
+    detector = VietnameseDetector()
+    patterns = [detector.combined_pattern, LEGACY_CHINESE[0], re.compile(r'[฀-๿]'), LEGACY_ENGLISH]
+
+    start_time = time.time()
+    legacy = [tuple(bool(pattern.search(text)) for pattern in patterns) for text in corpus]
+    legacy_time = time.time() - start_time
+
+    start_time = time.time()
+    bits_list = [script_bits(text) for text in corpus]
+    bits_time = time.time() - start_time
+
+    assert [row[1:] for row in legacy] == [
+        (bool(bits & SCRIPT_CJK_UNIFIED), bool(bits & SCRIPT_THAI), bool(bits & SCRIPT_LATIN_BASIC))
+        for bits in bits_list
+    ]
+    print(f"    4个正则分别匹配: {legacy_time:.3f} 秒")
+    print(f"    码位区间表一次遍历: {bits_time:.3f} 秒")
+    print(f"    ✓ 加速 {legacy_time / max(bits_time, 1e-6):.1f}x")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    print("=" * 60)
+    print("文字体系检测注册表测试")
+    print("=" * 60)
+
+    test_codepoints()
+    test_extractor()
+    test_scripts()
+    test_speed(count)
+
+    print("\n✓ 测试完成！")
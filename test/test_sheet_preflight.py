@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+工作表预检测试
+验证 ExcelTextExtractor 先只读取前几行判断策划表、取得字段名行后，
+提取结果与原来读取整个工作表后再判断完全一致，策划表不再完整读取，并对比策划表较多时的耗时
+
+运行方式:
+  python test/test_sheet_preflight.py            # 默认每个策划表 5000 行
+  python test/test_sheet_preflight.py 20000
+"""
+
+import sys
+import time
+import shutil
+import logging
+from pathlib import Path
+
+# 添加模块路径
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+import pandas as pd
+
+from tools.excel_text_extractor import ExcelTextExtractor, PREFLIGHT_ROWS
+
+
+TEST_DIR = Path("test_sheet_preflight_demo").resolve()
+
+
+def _table(rows: int, planner: bool = False, width: int = 3):
+    """游戏配置表格式：列名行之后 6 行为表头区（第 5 行为字段名，第 6 行为策划标识），之后为数据"""
+    data = [['id', 'name', 'desc'] + [''] * (width - 3)] * 5
+    data += [['ID', '名称', '描述'] + [f"扩展{index}" for index in range(width - 3)]]
+    data += [['策划' if planner else '', '', ''] + [''] * (width - 3)]
+    data += [[f"{row}", f"物品{row}", f"Vật phẩm {row}"] + [f"备注{row}"] * (width - 3) for row in range(rows)]
+    return data
+
+
+def _create_workbook(path: Path, sheets: dict):
+    with pd.ExcelWriter(path) as writer:
+        for sheet_name, data in sheets.items():
+            # 第 1 行作为列名行原样写出；各行长度可以不同
+            pd.DataFrame(data).to_excel(writer, sheet_name=sheet_name, index=False, header=False)
+
+
+def _reference_extract(extractor: ExcelTextExtractor, file_path: str) -> dict:
+    """原实现：读取整个工作表后再判断策划表、取得字段名"""
+    extracted_data = {}
+    with pd.ExcelFile(file_path) as excel_file:
+        for sheet_name in excel_file.sheet_names:
+            sheet_data = extractor._extract_texts_from_dataframe(excel_file.parse(sheet_name))
+            if sheet_data and sheet_data['items']:
+                extracted_data[sheet_name] = sheet_data
+    return extracted_data
+
+
+def test_equivalence():
+    """各种表头区写法的提取结果与原实现一致"""
+    print("\n[1] 验证提取结果...")
+    wide_later = _table(20)
+    wide_later[10] = wide_later[10] + ["第4列文本", "第5列文本"]
+    empty_header = _table(20)
+    empty_header[5] = ['ID', '', '描述']
+    duplicated = _table(20)
+    duplicated[0] = ['id', 'id', 'id']
+    sheets = {
+        "普通": _table(30),
+        "策划": _table(30, planner=True),
+        "策划在其他列": [row if index != 6 else ['', '', '策划备注'] for index, row in enumerate(_table(30))],
+        "较宽": _table(30, width=6),
+        "后面的行更宽": wide_later,
+        "字段名为空": empty_header,
+        "列名重复": duplicated,
+        "只有4行": _table(0)[:5],
+        "只有5行": _table(0)[:6],
+        "只有表头区": _table(0),
+    }
+    file_path = TEST_DIR / "cases.xlsx"
+    _create_workbook(file_path, sheets)
+
+    extractor = ExcelTextExtractor()
+    expected = _reference_extract(extractor, str(file_path))
+    actual = extractor.extract_text_from_excel(str(file_path))
+    assert actual == expected
+    assert "策划" not in actual and "策划在其他列" not in actual
+    assert actual["后面的行更宽"]['headers'][-2:] == ["Unnamed: 3", "Unnamed: 4"]
+    print(f"    ✓ {len(sheets)} 个工作表（策划表、字段名为空、列名重复、后面的行更宽、行数不足等）的结果一致")
+
+    # 字段名按单元格原值取得：整列为数字时不再显示为 5.0
+    numeric = _table(20)
+    numeric[5] = ['ID', '名称', 5]
+    numeric = [row[:2] + ([row[2]] if index in (0, 5) else [None]) for index, row in enumerate(numeric)]
+    numeric_path = TEST_DIR / "numeric.xlsx"
+    _create_workbook(numeric_path, {"数字字段名": numeric})
+    head = pd.read_excel(numeric_path, nrows=PREFLIGHT_ROWS, dtype=object)
+    assert extractor._preflight_sheet(pd.ExcelFile(numeric_path), "数字字段名") == (False, ['ID', '名称', '5'])
+    assert extractor._header_names(head) == ['ID', '名称', '5']
+    print("    ✓ 数字字段名按单元格原值取得")
+
+
+def test_preflight_reads(rows: int):
+    """策划表只读取前几行"""
+    print("\n[2] 验证策划表只读取前几行...")
+    file_path = TEST_DIR / "planner.xlsx"
+    _create_workbook(file_path, {"普通": _table(50), "策划1": _table(rows, planner=True),
+                                 "策划2": _table(rows, planner=True)})
+
+    parsed = []
+    original_parse = pd.ExcelFile.parse
+
+    def parse(self, sheet_name=0, *args, **kwargs):
+        parsed.append((sheet_name, kwargs.get('nrows')))
+        return original_parse(self, sheet_name, *args, **kwargs)
+
+    pd.ExcelFile.parse = parse
+    try:
+        ExcelTextExtractor().extract_text_from_excel(str(file_path))
+    finally:
+        pd.ExcelFile.parse = original_parse
+    assert parsed == [("普通", PREFLIGHT_ROWS), ("普通", None), ("策划1", PREFLIGHT_ROWS), ("策划2", PREFLIGHT_ROWS)]
+    print(f"    ✓ 策划表只读取前 {PREFLIGHT_ROWS} 行，其他工作表读取前几行后再完整读取")
+
+
+def test_performance(rows: int):
+    """策划表较多时的耗时"""
+    print(f"\n[3] 耗时对比（4 个策划表 x {rows} 行 + 1 个普通表）...")
+    file_path = TEST_DIR / "mixed.xlsx"
+    sheets = {f"策划{index}": _table(rows, planner=True) for index in range(4)}
+    sheets["普通"] = _table(rows // 5)
+    _create_workbook(file_path, sheets)
+    extractor = ExcelTextExtractor()
+
+    start_time = time.time()
+    expected = _reference_extract(extractor, str(file_path))
+    reference_time = time.time() - start_time
+
+    start_time = time.time()
+    actual = extractor.extract_text_from_excel(str(file_path))
+    preflight_time = time.time() - start_time
+
+    assert actual == expected
+    print(f"    读取整个工作表后判断: {reference_time:.2f} 秒")
+    print(f"    预检前几行: {preflight_time:.2f} 秒")
+    print(f"    ✓ 结果一致，加速 {reference_time / max(preflight_time, 1e-6):.1f}x")
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    logging.disable(logging.ERROR)
+
+    print("=" * 60)
+    print("工作表预检测试")
+    print("=" * 60)
+
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+    TEST_DIR.mkdir(parents=True)
+
+    try:
+        test_equivalence()
+        test_preflight_reads(rows // 10)
+        test_performance(rows)
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    print("\n✓ 测试完成！")
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多语言汇总合并测试
+验证按 (文件, 工作表, 位置) 哈希连接得到的汇总与逐条线性查找的结果完全一致
+（缺少文件/工作表/位置、同一位置重复、基准语言不是中文），并在 20 万个文本上对比耗时
+
+运行方式:
+  python test/test_summary_merge.py            # 默认 200000 个文本
+  python test/test_summary_merge.py 1000000
+"""
+
+import sys
+import time
+import random
+from pathlib import Path
+
+# 添加模块路径
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from tools.excel_text_extractor import SUMMARY_LANGUAGES, merge_language_texts
+
+
+# 每个工作表的文本数（实际表格中常见的规模）
+SHEET_SIZE = 2000
+
+
+def _find_text_at_position(lang_data, file_name, sheet_name, excel_pos):
+    """原实现：在指定语言数据中逐条查找特定位置的文本"""
+    if not lang_data or file_name not in lang_data:
+        return ""
+    file_data = lang_data[file_name]
+    if sheet_name not in file_data:
+        return ""
+    sheet_data = file_data[sheet_name]
+    if not sheet_data or 'items' not in sheet_data:
+        return ""
+    for item in sheet_data['items']:
+        if item.get('excel_row_ref') == excel_pos:
+            return item.get('text', '')
+    return ""
+
+
+def _linear_merge(all_lang_data):
+    """原实现：基准语言的每个文本对其他语言各做一次线性查找"""
+    base_lang = next((lang for lang in SUMMARY_LANGUAGES if all_lang_data.get(lang)), None)
+    rows = []
+    for file_name, file_data in all_lang_data[base_lang].items():
+        for sheet_name, sheet_data in file_data.items():
+            if not sheet_data or 'items' not in sheet_data:
+                continue
+            for item in sheet_data['items']:
+                excel_pos = item.get('excel_row_ref', '')
+                base_text = item.get('text', '')
+                row = [file_name, excel_pos]
+                for lang in SUMMARY_LANGUAGES:
+                    row.append(base_text if lang == base_lang else _find_text_at_position(
+                        all_lang_data.get(lang, {}), file_name, sheet_name, excel_pos))
+                rows.append(row)
+    return base_lang, rows
+
+
+def _sheet(rng, prefix, size, drop_rate=0.0):
+    items = []
+    for index in range(size):
+        if rng.random() < drop_rate:
+            continue
+        position = f"{'BCDEF'[index % 5]}{7 + index // 5}"
+        items.append({'text': f"{prefix}{index}", 'a_column': str(index // 5), 'row': 7 + index // 5,
+                      'column': 'name', 'column_index': 1 + index % 5, 'excel_row_ref': position})
+    rng.shuffle(items)
+    return {'items': items, 'headers': [], 'a_column': 'id'}
+
+
+def _create_data(rng, file_count, sheet_count, sheet_size, drop_rate=0.0):
+    """四种语言的提取结果；非基准语言随机缺少部分位置"""
+    all_lang_data = {}
+    for lang in SUMMARY_LANGUAGES:
+        lang_drop = 0.0 if lang == 'cn' else drop_rate
+        all_lang_data[lang] = {
+            f"表{file_index}": {f"Sheet{sheet_index}": _sheet(rng, f"{lang}-{file_index}-{sheet_index}-",
+                                                             sheet_size, lang_drop)
+                                for sheet_index in range(sheet_count)}
+            for file_index in range(file_count)
+        }
+    return all_lang_data
+
+
+def _rows(df):
+    return df.values.tolist()
+
+
+def test_equivalence():
+    """与逐条查找的结果一致"""
+    print("\n[1] 验证合并结果...")
+    rng = random.Random(0)
+    for trial in range(30):
+        all_lang_data = _create_data(rng, rng.randint(1, 3), rng.randint(1, 3), rng.randint(0, 40), drop_rate=0.3)
+        # 缺少文件/工作表、空工作表、同一位置重复出现、缺少某种语言
+        all_lang_data['vn'].pop("表0", None)
+        all_lang_data['en'].get("表1", {}).pop("Sheet0", None)
+        all_lang_data['th'].setdefault("表0", {})["Sheet1"] = None
+        for sheet_data in all_lang_data['en'].get("表0", {}).values():
+            if sheet_data['items']:
+                sheet_data['items'].append(dict(sheet_data['items'][0], text="重复位置"))
+        if trial % 3 == 0:
+            all_lang_data['en'] = {}
+        if trial % 5 == 0:
+            all_lang_data.pop('cn')
+
+        expected_base, expected = _linear_merge(all_lang_data)
+        base_lang, df = merge_language_texts(all_lang_data)
+        assert base_lang == expected_base
+        assert list(df.columns) == ['name', 'num', *SUMMARY_LANGUAGES]
+        assert _rows(df) == expected, f"第 {trial} 组数据合并结果不一致"
+    print("    ✓ 30 组随机数据与逐条查找一致（含缺失文件/工作表/位置、重复位置、基准语言不是中文）")
+
+    base_lang, df = merge_language_texts({'cn': {}, 'vn': {}})
+    assert base_lang is None and df.empty
+    print("    ✓ 没有任何数据时返回 None")
+
+
+def test_performance(text_count: int):
+    """20 万个文本的合并耗时"""
+    print(f"\n[2] 耗时对比（{text_count} 个文本）...")
+    rng = random.Random(1)
+    sheet_count = max(1, text_count // SHEET_SIZE)
+    all_lang_data = _create_data(rng, sheet_count, 1, SHEET_SIZE, drop_rate=0.05)
+
+    start_time = time.time()
+    base_lang, df = merge_language_texts(all_lang_data)
+    merge_time = time.time() - start_time
+    assert base_lang == 'cn' and len(df) == sheet_count * SHEET_SIZE
+
+    # 逐条查找的耗时与工作表数成正比，只在一部分工作表上运行后按工作表数推算
+    sample_count = min(sheet_count, 3)
+    sample = {lang: dict(list(files.items())[:sample_count]) for lang, files in all_lang_data.items()}
+    start_time = time.time()
+    _, expected = _linear_merge(sample)
+    linear_time = (time.time() - start_time) * sheet_count / sample_count
+    assert _rows(df.iloc[:len(expected)]) == expected
+
+    print(f"    逐条查找: 约 {linear_time:.1f} 秒（由 {sample_count} 个工作表推算）")
+    print(f"    哈希连接: {merge_time:.2f} 秒")
+    print(f"    ✓ {len(df)} 行结果一致，加速约 {linear_time / max(merge_time, 1e-6):.0f}x")
+
+
+if __name__ == "__main__":
+    text_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    print("=" * 60)
+    print("多语言汇总合并测试")
+    print("=" * 60)
+
+    test_equivalence()
+    test_performance(text_count)
+
+    print("\n✓ 测试完成！")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+翻译提取汇总表写出测试
+验证 write_summary_workbook 一次流式写出的汇总表与原来 to_excel 后重新打开设置格式的结果一致
+（单元格值、标题行样式、列宽），并对比耗时和内存
+
+运行方式:
+  python test/test_summary_writer.py            # 默认 20000 行
+  python test/test_summary_writer.py 300000
+"""
+
+import sys
+import time
+import shutil
+import tracemalloc
+from pathlib import Path
+
+# 添加模块路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.styles import Font, PatternFill, Alignment
+
+from tools.multi_language_extractor import write_summary_workbook, SUMMARY_SHEET_TITLE
+
+
+OUTPUT_DIR = Path("test_summary_writer_demo")
+
+
+def make_summary(count: int) -> pd.DataFrame:
+    """模拟 MultiLanguageResult.merge 的结果（name | num | cn | vn | en | th，缺少的译文为空字符串）"""
+    index = np.arange(count)
+    return pd.DataFrame({
+        'name': [f"config_{i % 50}" for i in index],
+        'num': [f"表{i % 3}!C{i % 5000 + 7}" for i in index],
+        'cn': [f"物品{i}" for i in index],
+        'vn': [f"Vật phẩm {i}" if i % 7 else '' for i in index],
+        'en': [f"Item {i}" if i % 3 else '' for i in index],
+        'th': [''] * count,
+    }, dtype=object)
+
+
+def legacy_write_summary(df: pd.DataFrame, output_file):
+    """原实现：to_excel 写出后重新打开，设置标题行样式和列宽再保存"""
+    df.to_excel(output_file, index=False, sheet_name='汇总')
+    wb = load_workbook(output_file)
+    ws = wb['汇总']
+    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    header_font = Font(bold=True, color="FFFFFF", size=11)
+    for cell in ws[1]:
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = Alignment(horizontal='center', vertical='center')
+    for column, width in zip("ABCDEF", [25, 10, 40, 40, 40, 40]):
+        ws.column_dimensions[column].width = width
+    wb.save(output_file)
+
+
+def _border_style(cell):
+    return tuple(side.style if side is not None else None
+                 for side in (cell.border.left, cell.border.right, cell.border.top, cell.border.bottom))
+
+
+def _read_back(path: Path):
+    wb = load_workbook(path)
+    ws = wb[SUMMARY_SHEET_TITLE]
+    values = [list(row) for row in ws.iter_rows(values_only=True)]
+    header_styles = [
+        (cell.font.b, cell.font.color.rgb, cell.font.sz, cell.fill.fgColor.rgb, cell.fill.fill_type,
+         cell.alignment.horizontal, cell.alignment.vertical, _border_style(cell))
+        for cell in ws[1]
+    ]
+    body_styles = {(cell.font.b, cell.fill.fill_type, _border_style(cell)) for cell in ws[2]}
+    widths = {column: ws.column_dimensions[column].width for column in "ABCDEF"}
+    return wb.sheetnames, values, header_styles, body_styles, widths
+
+
+def test_equivalence():
+    """写出的内容、样式、列宽与原实现一致"""
+    print("\n[1] 验证汇总表内容与格式...")
+    df = make_summary(500)
+    df.loc[3, 'en'] = None
+    df.loc[4, 'th'] = np.nan
+    legacy_path = OUTPUT_DIR / "legacy.xlsx"
+    new_path = OUTPUT_DIR / "new.xlsx"
+    legacy_write_summary(df, legacy_path)
+    assert write_summary_workbook(df, new_path) == len(df)
+
+    legacy, new = _read_back(legacy_path), _read_back(new_path)
+    for label, expected, actual in zip(["工作表", "单元格值", "标题行样式", "数据行样式", "列宽"], legacy, new):
+        assert actual == expected, f"{label}不一致: {actual} != {expected}"
+    assert new[2][0][:4] == (True, "00FFFFFF", 11, "004472C4")
+    print(f"    ✓ {len(df)} 行的单元格值、标题行样式、列宽与原实现一致（空值写为空单元格）")
+
+    empty_path = OUTPUT_DIR / "empty.xlsx"
+    assert write_summary_workbook(make_summary(0), empty_path) == 0
+    assert _read_back(empty_path)[1] == [['name', 'num', 'cn', 'vn', 'en', 'th']]
+    print("    ✓ 没有数据时只写出标题行")
+
+
+def _measure(func, *args):
+    tracemalloc.start()
+    start_time = time.time()
+    func(*args)
+    elapsed = time.time() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def test_performance(row_count: int):
+    """耗时与内存对比"""
+    print(f"\n[2] 耗时与内存对比（{row_count} 行）...")
+    df = make_summary(row_count)
+    legacy_time, legacy_peak = _measure(legacy_write_summary, df, OUTPUT_DIR / "legacy_perf.xlsx")
+    new_time, new_peak = _measure(write_summary_workbook, df, OUTPUT_DIR / "new_perf.xlsx")
+    print(f"    原实现（to_excel + 重新打开设置格式）: {legacy_time:.2f} 秒，峰值内存 {legacy_peak:.1f} MB")
+    print(f"    流式写出: {new_time:.2f} 秒，峰值内存 {new_peak:.1f} MB")
+    assert new_peak < legacy_peak
+    print(f"    ✓ 加速 {legacy_time / max(new_time, 1e-6):.1f}x，峰值内存降低 {legacy_peak / max(new_peak, 1e-6):.1f}x")
+
+
+if __name__ == "__main__":
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    print("=" * 60)
+    print("翻译提取汇总表写出测试")
+    print("=" * 60)
+
+    shutil.rmtree(OUTPUT_DIR, ignore_errors=True)
+    OUTPUT_DIR.mkdir()
+
+    try:
+        test_equivalence()
+        test_performance(row_count)
+    finally:
+        shutil.rmtree(OUTPUT_DIR, ignore_errors=True)
+
+    print("\n✓ 测试完成！")
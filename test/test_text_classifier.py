@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文本分类器测试
+验证 TextClassifier 的特征位得到的提取判断与文本类型与原来逐次执行正则的
+_is_text_content / _analyze_text_type 完全一致，整列向量化计算与逐个计算一致，
+同一字符串只计算一次，并对比重复文本较多时的耗时
+
+运行方式:
+  python test/test_text_classifier.py            # 默认 200000 次判断
+  python test/test_text_classifier.py 1000000
+"""
+
+import re
+import sys
+import time
+import random
+from pathlib import Path
+
+# 添加模块路径
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+import pandas as pd
+
+from core.script_detector import script_bits, SCRIPT_CJK_UNIFIED, SCRIPT_LATIN_BASIC, LATIN_EXTENDED_MASK
+from core.text_classifier import TextClassifier, TEXT_CJK, TEXT_FLOAT, TEXT_LATIN
+from tools.excel_text_extractor import ExcelTextExtractor
+
+
+SAMPLES = [
+    "物品", "Vật phẩm", "Item", "中文 abc", "Thanh kiếm 3", "ไอเท็ม", "!!", "-", "()", "【】", "…",
+    "123", "１２３", "٣.٥", "1_000.5", "-1.5", "+5", "1e5", "inf", "-Infinity", "nan", "NaN", "0x10",
+    "2024-01-01", "12:30:00", "1+2", "(3*4)/5", "[1,2,3]", "{1, 2}", "(1.5)", "[\"a\",\"b\"]", "[中文]",
+    "{\"a\":1}", "{越南: ạ}", "[Ă]", "1,2;3", "1.2.3", "  ", "", " 5 ", "a_b", "#$%", "Ā", "ǅ", "ἀγάπη",
+    "　", "5\n", "物品\n", "[x]\n", "宝剑 Thanh kiếm", "宝剑 sword", "—",
+]
+# 随机拼接文本用的字符
+CHARS = "0123456789１٣.,;:+-*/()[]{}_ eEinfaxz物品ạĂ!—\n"
+
+
+def _legacy_is_text_content(detector, text):
+    """原实现：每次调用都重新执行各个正则"""
+    if not text or len(text.strip()) == 0:
+        return False
+    if text.isdigit():
+        return False
+    if re.match(r'^\d{4}-\d{2}-\d{2}$', text):
+        return False
+    if re.match(r'^\d{2}:\d{2}:\d{2}$', text):
+        return False
+    try:
+        float(text)
+        return False
+    except ValueError:
+        pass
+    if re.match(r'^[\d\+\-\*\/\(\)\.\s]+$', text):
+        return False
+    if re.match(r'^[\[\{\(][\d\s,\.]+\]?\}?\)?$', text):
+        return False
+    has_chinese, has_vietnamese, has_english = detector(text)
+    if re.match(r'^\[[\s\S]*\]$', text) and not (has_chinese or has_vietnamese):
+        return False
+    if re.match(r'^\{[\s\S]*\}$', text) and not (has_chinese or has_vietnamese):
+        return False
+    if re.match(r'^[\d\s,;\.]+$', text):
+        return False
+    if has_chinese or has_vietnamese:
+        return True
+    if has_english:
+        return False
+    if re.search(r'[^\w\s\d]', text):
+        return True
+    return False
+
+
+def _legacy_text_type(detector, text):
+    """原实现：重新检测一次中文/越南文/英文"""
+    has_chinese, has_vietnamese, has_english = detector(text)
+    if has_chinese and has_vietnamese:
+        return "中越混合"
+    elif has_chinese and has_english:
+        return "中英混合"
+    elif has_vietnamese and has_english:
+        return "越英混合"
+    elif has_chinese:
+        return "中文"
+    elif has_vietnamese:
+        return "越南文"
+    return "其他"
+
+
+def _scripts(text):
+    """原实现使用的文字体系判断"""
+    bits = script_bits(text)
+    return bits & SCRIPT_CJK_UNIFIED, bits & LATIN_EXTENDED_MASK, bits & SCRIPT_LATIN_BASIC
+
+
+def _random_texts(rng, count):
+    return [''.join(rng.choice(CHARS) for _ in range(rng.randint(0, 8))) for _ in range(count)]
+
+
+def test_equivalence():
+    """提取判断、文本类型与原实现一致"""
+    print("\n[1] 验证分类结果...")
+    rng = random.Random(0)
+    texts = SAMPLES + _random_texts(rng, 20000)
+    classifier = TextClassifier()
+    extractor = ExcelTextExtractor()
+    for text in texts:
+        expected = (_legacy_is_text_content(_scripts, text), _legacy_text_type(_scripts, text))
+        assert (classifier.is_text_content(text), classifier.text_type(text)) == expected, repr(text)
+        assert (extractor._is_text_content(text), extractor._analyze_text_type(text)) == expected, repr(text)
+    print(f"    ✓ {len(texts)} 个文本（样例 + 随机拼接）的判断与类型与原实现一致")
+
+    bits = classifier.classify("宝剑 sword")
+    assert bits & TEXT_CJK and bits & TEXT_LATIN and not bits & TEXT_FLOAT
+    assert classifier.classify("1_000.5") & TEXT_FLOAT
+    print("    ✓ 特征位可直接查询")
+
+
+def test_vectorized():
+    """整列向量化计算的特征位与逐个计算一致"""
+    print("\n[2] 验证向量化计算...")
+    rng = random.Random(1)
+    texts = SAMPLES + _random_texts(rng, 20000)
+    series = pd.Series(texts * 2, dtype=object)
+    bits = TextClassifier().classify_series(series)
+    scalar = TextClassifier()
+    assert bits.tolist() == [scalar.classify(text) for text in texts * 2]
+    mask = TextClassifier().content_mask(series)
+    assert mask.tolist() == [_legacy_is_text_content(_scripts, text) for text in texts * 2]
+    assert TextClassifier().classify_series(pd.Series([], dtype=object)).tolist() == []
+    print(f"    ✓ {len(series)} 个文本的特征位与逐个计算一致")
+
+
+def test_memoization():
+    """同一字符串只计算一次；缓存超出上限时清空"""
+    print("\n[3] 验证缓存...")
+    classifier = TextClassifier(max_cache_size=100)
+    calls = []
+    compute = classifier._compute
+    classifier._compute = lambda text: calls.append(text) or compute(text)
+    for _ in range(3):
+        classifier.is_text_content("物品")
+        classifier.text_type("物品")
+    assert calls == ["物品"]
+    classifier.classify_series(pd.Series(["物品", "Vật"], dtype=object))
+    assert len(calls) == 1 and "Vật" in classifier._cache, "向量化计算的结果也应缓存"
+    for index in range(150):
+        classifier.classify(f"物品{index}")
+    assert len(classifier._cache) <= 100
+    print("    ✓ 提取判断与类型分析共用一次计算，缓存不超过上限")
+
+
+def test_performance(call_count: int):
+    """重复文本较多时的耗时"""
+    print(f"\n[4] 耗时对比（{call_count} 次判断 + 类型分析）...")
+    rng = random.Random(2)
+    unique = [f"物品{index}" for index in range(2000)] + [f"Vật phẩm {index}" for index in range(2000)] + \
+        [str(index) for index in range(2000)] + [f"Item {index}" for index in range(2000)]
+    texts = [rng.choice(unique) for _ in range(call_count)]
+
+    start_time = time.time()
+    expected = [(_legacy_is_text_content(_scripts, text), _legacy_text_type(_scripts, text)) for text in texts]
+    legacy_time = time.time() - start_time
+
+    classifier = TextClassifier()
+    start_time = time.time()
+    actual = [(classifier.is_text_content(text), classifier.text_type(text)) for text in texts]
+    classifier_time = time.time() - start_time
+
+    assert actual == expected
+    print(f"    逐次执行正则: {legacy_time:.2f} 秒")
+    print(f"    特征位缓存: {classifier_time:.2f} 秒（{len(unique)} 个不重复文本）")
+    print(f"    ✓ 结果一致，加速 {legacy_time / max(classifier_time, 1e-6):.1f}x")
+
+
+if __name__ == "__main__":
+    call_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    print("=" * 60)
+    print("文本分类器测试")
+    print("=" * 60)
+
+    test_equivalence()
+    test_vectorized()
+    test_memoization()
+    test_performance(call_count)
+
+    print("\n✓ 测试完成！")
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+向量化文本提取测试
+验证按列向量化的 _extract_texts_from_dataframe 与原来逐行逐列调用 _is_text_content 的实现输出完全一致
+（数字/日期/时间/表达式/数组/JSON、float() 能解析的特殊写法、混合类型列、空值、重复文本），并对比耗时
+
+运行方式:
+  python test/test_vectorized_extraction.py            # 默认 20000 行
+  python test/test_vectorized_extraction.py 100000
+"""
+
+import sys
+import time
+import random
+import logging
+from pathlib import Path
+
+# 添加模块路径
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np
+import pandas as pd
+
+from tools.excel_text_extractor import ExcelTextExtractor
+
+
+# 覆盖 _is_text_content 各个分支的单元格值
+SAMPLE_VALUES = [
+    "物品", "Vật phẩm", "Item", "中文 abc", "Thanh kiếm 3", "ไอเท็ม", "!!", "-", "()", "【】", "…",
+    "123", "１２３", "٣.٥", "1_000.5", "-1.5", "+5", "1e5", "inf", "nan", "2024-01-01", "12:30:00",
+    "2024-01-01 10:00", "1+2", "(3*4)/5", "[1,2,3]", "{1, 2}", "(1.5)", "[\"a\",\"b\"]", "[中文]",
+    "{\"a\":1}", "{越南: ạ}", "1,2;3", "1.2.3", "  ", "", " 宝剑 ", "a_b", "#$%", "Ā", "ǅ", "ἀ",
+    "　", "5\n", "物品\n", "[x]\n", 7, 7.0, 2.5, -3, True, False, np.nan, None,
+    pd.Timestamp("2024-01-02 03:04:05"), pd.Timestamp("2024-01-02"),
+]
+
+
+def _reference_extract(extractor: ExcelTextExtractor, df: pd.DataFrame) -> dict:
+    """原实现：逐行 df.iloc，逐列调用 _is_text_content"""
+    extracted_items = []
+    try:
+        if extractor._is_planner_row(df):
+            return {'items': [], 'headers': [], 'a_column': None}
+        a_column = df.columns[0] if len(df.columns) > 0 else None
+        if a_column is None:
+            return {'items': [], 'headers': [], 'a_column': None}
+        if len(df) >= 5:
+            header_row = df.iloc[4]
+            headers = [str(header_row[col]).strip() if pd.notna(header_row[col]) else col for col in df.columns]
+        else:
+            headers = list(df.columns)
+        for row_idx in range(6, len(df)):
+            row_data = df.iloc[row_idx]
+            excel_physical_row = row_idx + 1
+            a_column_value = str(row_data[a_column]).strip() if pd.notna(row_data[a_column]) else ""
+            for col_idx, col in enumerate(df.columns):
+                value = row_data[col]
+                if pd.notna(value):
+                    text = str(value).strip()
+                    if text and extractor._is_text_content(text):
+                        extracted_items.append({
+                            'text': text,
+                            'a_column': a_column_value,
+                            'row': excel_physical_row,
+                            'column': col,
+                            'column_index': col_idx,
+                            'excel_row_ref': extractor._get_excel_position(col_idx, excel_physical_row)
+                        })
+        seen_texts = set()
+        unique_items = []
+        for item in extracted_items:
+            if item['text'] not in seen_texts:
+                seen_texts.add(item['text'])
+                unique_items.append(item)
+        return {'items': unique_items, 'headers': headers, 'a_column': a_column}
+    except Exception:
+        return {'items': [], 'headers': [], 'a_column': None}
+
+
+def _typed(result: dict):
+    """比较时连同值的类型一起比较（行号、列下标必须是 int）"""
+    return [[(key, type(value).__name__, value) for key, value in item.items()] for item in result['items']]
+
+
+def _random_frame(rng: random.Random) -> pd.DataFrame:
+    row_count = rng.randint(0, 30)
+    columns = {}
+    for col_idx in range(rng.randint(1, 6)):
+        kind = rng.random()
+        if kind < 0.15:
+            values = [rng.randint(0, 99) for _ in range(row_count)]
+        elif kind < 0.25:
+            values = [rng.choice([1.5, np.nan, 3.0]) for _ in range(row_count)]
+        else:
+            values = [rng.choice(SAMPLE_VALUES) for _ in range(row_count)]
+        name = rng.choice([f"col{col_idx}", col_idx, f"列{col_idx}"])
+        columns[name if name not in columns else f"dup{col_idx}"] = values
+    df = pd.DataFrame(columns)
+    if len(df) > 5 and rng.random() < 0.1:
+        df[df.columns[0]] = df[df.columns[0]].astype(object)
+        df.iloc[5, 0] = "策划"
+    return df
+
+
+def test_equivalence():
+    """与逐行逐列实现的输出一致"""
+    print("\n[1] 验证输出一致...")
+    extractor = ExcelTextExtractor()
+    for value in SAMPLE_VALUES:
+        if isinstance(value, str) and value.strip():
+            df = pd.DataFrame({'id': ['x'] * 7, 'text': [None] * 6 + [value]})
+            assert _typed(extractor._extract_texts_from_dataframe(df)) == \
+                _typed(_reference_extract(extractor, df)), repr(value)
+    print(f"    ✓ {len(SAMPLE_VALUES)} 种单元格值的判断一致")
+
+    rng = random.Random(0)
+    frames = [_random_frame(rng) for _ in range(500)]
+    # 全数值表：逐行读取时整数会被提升为浮点数
+    frames.append(pd.DataFrame({'a': range(10), 'b': np.linspace(0, 1, 10)}))
+    frames.append(pd.DataFrame({'only': ["物品"] * 6}))
+    for df in frames:
+        expected = _reference_extract(extractor, df)
+        actual = extractor._extract_texts_from_dataframe(df)
+        assert _typed(actual) == _typed(expected), f"\n{df}\n{actual['items']}\n{expected['items']}"
+        assert actual['headers'] == expected['headers'] and actual['a_column'] == expected['a_column']
+    print(f"    ✓ {len(frames)} 个随机表格（混合类型列、空值、重复文本、策划行、不足 7 行）输出一致")
+
+
+def test_performance(row_count: int):
+    """大表的提取耗时"""
+    print(f"\n[2] 耗时对比（{row_count} 行 × 10 列）...")
+    rng = random.Random(1)
+    strings = [value for value in SAMPLE_VALUES if isinstance(value, str)]
+    data = {'id': [f"id_{row}" for row in range(row_count)]}
+    for col_idx in range(3):
+        data[f"text{col_idx}"] = [f"物品{rng.randint(0, row_count)}" for _ in range(row_count)]
+    for col_idx in range(3):
+        data[f"num{col_idx}"] = np.arange(row_count) * (col_idx + 1)
+    for col_idx in range(3):
+        data[f"mixed{col_idx}"] = [rng.choice(strings) for _ in range(row_count)]
+    df = pd.DataFrame(data)
+    extractor = ExcelTextExtractor()
+
+    start_time = time.time()
+    expected = _reference_extract(extractor, df)
+    reference_time = time.time() - start_time
+
+    start_time = time.time()
+    actual = extractor._extract_texts_from_dataframe(df)
+    vectorized_time = time.time() - start_time
+
+    assert _typed(actual) == _typed(expected)
+    print(f"    逐行逐列: {reference_time:.2f} 秒")
+    print(f"    按列向量化: {vectorized_time:.2f} 秒")
+    print(f"    ✓ {len(actual['items'])} 个文本一致，加速 {reference_time / max(vectorized_time, 1e-6):.1f}x")
+
+
+if __name__ == "__main__":
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    logging.disable(logging.INFO)
+
+    print("=" * 60)
+    print("向量化文本提取测试")
+    print("=" * 60)
+
+    test_equivalence()
+    test_performance(row_count)
+
+    print("\n✓ 测试完成！")
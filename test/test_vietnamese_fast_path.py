@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+越南文检测快速路径基准测试
+在纯ASCII为主、NFC、NFD 三类语料上对比旧版（先 NFC 规范化再判断）与
+快速路径（isascii -> is_normalized -> 合并正则）的结论与耗时
+
+运行方式:
+  python test/test_vietnamese_fast_path.py            # 默认每类 200000 条
+  python test/test_vietnamese_fast_path.py 1000000
+"""
+
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+# 添加模块路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.localization_checker import VietnameseDetector
+
+
+VIETNAMESE_TEXTS = ['Thanh kiếm', 'Nhiệm vụ hằng ngày', 'Tên game', 'Khiên', 'Đội trưởng', 'ưu đãi']
+# 规范化前后可能结论不同的边界样例（开尔文符号、带分音符的a、中文、日文假名等）
+EDGE_CASES = ['K', 'ä', 'Å', '宝剑', 'かたな', 'ñ', 'ớ', 'ế', 'Ð', '']
+
+
+def legacy_contains_vietnamese(detector: VietnameseDetector, text: str) -> bool:
+    """旧版实现：每个字符串都先做 NFC 规范化再做 ASCII 过滤"""
+    if not isinstance(text, str):
+        return False
+    normalized = unicodedata.normalize('NFC', text)
+    if all(ord(ch) < 128 for ch in normalized):
+        return False
+    return bool(detector.combined_pattern.search(normalized))
+
+
+def make_corpora(count: int):
+    """生成三类语料（每条字符串唯一，避免命中备忘表）"""
+    ascii_heavy = [
+        f"Item description {i}" if i % 10 else f"{VIETNAMESE_TEXTS[i % len(VIETNAMESE_TEXTS)]} {i}"
+        for i in range(count)
+    ]
+    nfc = [f"{VIETNAMESE_TEXTS[i % len(VIETNAMESE_TEXTS)]} {i}" if i % 2 else f"宝剑{i}" for i in range(count)]
+    nfd = [unicodedata.normalize('NFD', text) for text in nfc]
+    return {'ASCII为主': ascii_heavy, 'NFC': nfc, 'NFD': nfd}
+
+
+def test_edge_cases():
+    """边界样例结论一致"""
+    print("\n[1] 验证边界样例...")
+    detector = VietnameseDetector(memo_size=0)
+    for text in EDGE_CASES + VIETNAMESE_TEXTS:
+        for variant in {text, unicodedata.normalize('NFC', text), unicodedata.normalize('NFD', text)}:
+            assert detector.contains_vietnamese(variant) == legacy_contains_vietnamese(detector, variant), repr(variant)
+    print(f"    ✓ {len(EDGE_CASES + VIETNAMESE_TEXTS)} 个样例及其 NFC/NFD 形式结论一致")
+
+
+def test_corpora(count: int):
+    """三类语料的结论与耗时对比"""
+    print(f"\n[2] 语料基准（每类 {count} 条）...")
+    for name, corpus in make_corpora(count).items():
+        # 关闭备忘表，只比较检测路径本身
+        detector = VietnameseDetector(memo_size=0)
+
+        start_time = time.time()
+        expected = [legacy_contains_vietnamese(detector, text) for text in corpus]
+        legacy_time = time.time() - start_time
+
+        start_time = time.time()
+        actual = [detector.contains_vietnamese(text) for text in corpus]
+        fast_time = time.time() - start_time
+
+        assert actual == expected, f"{name} 语料结论不一致"
+        print(f"    {name}: 旧版 {legacy_time:.3f} 秒, 快速路径 {fast_time:.3f} 秒, "
+              f"加速 {legacy_time / max(fast_time, 1e-6):.1f}x（命中 {sum(actual)} 条）")
+    print("    ✓ 三类语料结论完全一致")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    print("=" * 60)
+    print("越南文检测快速路径基准测试")
+    print("=" * 60)
+
+    test_edge_cases()
+    test_corpora(count)
+
+    print("\n✓ 测试完成！")
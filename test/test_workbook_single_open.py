@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+工作簿单次打开测试
+验证 ExcelTextExtractor 只打开一次工作簿、从同一个句柄读取各工作表后，
+提取结果与进度消息与原来按工作表逐个 pd.read_excel(file_path, sheet_name=...) 完全一致，并对比多工作表工作簿的耗时
+
+运行方式:
+  python test/test_workbook_single_open.py            # 默认 20 个工作表
+  python test/test_workbook_single_open.py 60
+"""
+
+import sys
+import time
+import shutil
+import logging
+from pathlib import Path
+
+# 添加模块路径
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+import pandas as pd
+
+from tools.excel_text_extractor import ExcelTextExtractor
+
+
+TEST_DIR = Path("test_workbook_single_open_demo").resolve()
+
+
+def _create_workbook(path: Path, sheet_count: int, rows: int):
+    """游戏配置表格式的多工作表工作簿（每个工作表的文本都不同，共享字符串随工作表数增长）"""
+    with pd.ExcelWriter(path) as writer:
+        for sheet_index in range(sheet_count):
+            data = [['id', 'name', 'desc']] * 4 + [['ID', '名称', '描述'], ['', '', '']]
+            data += [[f"{sheet_index}_{row}", f"物品{sheet_index}-{row}", f"Vật phẩm {sheet_index}-{row}"]
+                     for row in range(rows)]
+            if sheet_index == 1:
+                data[5] = ["策划", "", ""]
+            pd.DataFrame(data, columns=['id', 'name', 'desc']).to_excel(
+                writer, sheet_name=f"表{sheet_index}", index=False)
+
+
+def _reference_extract(extractor: ExcelTextExtractor, file_path: str, events: list) -> dict:
+    """原实现：ExcelFile 只用来列出工作表名，每个工作表重新打开文件读取"""
+    def report(message):
+        events.append(message)
+
+    excel_file = pd.ExcelFile(file_path)
+    sheet_names = excel_file.sheet_names
+    report("开始读取文件")
+    report(f"发现 {len(sheet_names)} 个工作表")
+    extracted_data = {}
+    total_texts = 0
+    for i, sheet_name in enumerate(sheet_names):
+        report(f"处理工作表 '{sheet_name}' ({i+1}/{len(sheet_names)})")
+        df = pd.read_excel(file_path, sheet_name=sheet_name)
+        if extractor._is_planner_row(df):
+            # 策划表在预检时跳过，不读取整个工作表
+            report(f"工作表 '{sheet_name}' 为策划表，跳过读取")
+            report(f"工作表 '{sheet_name}' 未提取到文本")
+            continue
+        report(f"工作表 '{sheet_name}' 读取完成，共 {len(df)} 行")
+        sheet_data = extractor._extract_texts_from_dataframe(df)
+        if sheet_data and sheet_data['items']:
+            extracted_data[sheet_name] = sheet_data
+            total_texts += len(sheet_data['items'])
+            report(f"工作表 '{sheet_name}' 提取到 {len(sheet_data['items'])} 个文本")
+        else:
+            report(f"工作表 '{sheet_name}' 未提取到文本")
+    report(f"文件处理完成，共提取 {total_texts} 个文本")
+    return extracted_data
+
+
+def test_equivalence():
+    """提取结果与进度消息一致"""
+    print("\n[1] 验证提取结果...")
+    file_path = TEST_DIR / "small.xlsx"
+    _create_workbook(file_path, 4, 30)
+
+    events = []
+    extractor = ExcelTextExtractor(progress_callback=lambda current, total, filename, message: events.append(message))
+    expected_events = []
+    expected = _reference_extract(extractor, str(file_path), expected_events)
+    events.clear()
+    actual = extractor.extract_text_from_excel(str(file_path))
+    assert actual == expected
+    assert events == expected_events
+    assert "表1" not in actual, "策划工作表应跳过"
+    print(f"    ✓ {len(actual)} 个工作表的提取结果与逐个读取一致，进度消息一致（{len(events)} 条）")
+
+    broken = TEST_DIR / "broken.xlsx"
+    broken.write_bytes(b"not a zip file")
+    assert extractor.extract_text_from_excel(str(broken)) == {}
+    print("    ✓ 无法打开的文件返回空结果")
+
+
+def test_performance(sheet_count: int):
+    """多工作表工作簿的读取耗时"""
+    print(f"\n[2] 耗时对比（{sheet_count} 个工作表）...")
+    file_path = TEST_DIR / "large.xlsx"
+    _create_workbook(file_path, sheet_count, 300)
+    extractor = ExcelTextExtractor()
+
+    start_time = time.time()
+    expected = _reference_extract(extractor, str(file_path), [])
+    reference_time = time.time() - start_time
+
+    start_time = time.time()
+    actual = extractor.extract_text_from_excel(str(file_path))
+    single_open_time = time.time() - start_time
+
+    assert actual == expected
+    print(f"    每个工作表重新打开: {reference_time:.2f} 秒")
+    print(f"    只打开一次: {single_open_time:.2f} 秒")
+    print(f"    ✓ 结果一致，加速 {reference_time / max(single_open_time, 1e-6):.1f}x")
+
+
+if __name__ == "__main__":
+    sheet_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    logging.disable(logging.ERROR)
+
+    print("=" * 60)
+    print("工作簿单次打开测试")
+    print("=" * 60)
+
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+    TEST_DIR.mkdir(parents=True)
+
+    try:
+        test_equivalence()
+        test_performance(sheet_count)
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    print("\n✓ 测试完成！")
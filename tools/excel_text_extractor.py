@@ -5,28 +5,60 @@ Excel文本提取器
 检测目录中的Excel文件，提取文本内容并创建同名的新Excel文件
 """
 
+import numpy as np
 import pandas as pd
 import os
+import sys
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Set
+from typing import Dict, List, Tuple, Optional, Sequence, Set
 import logging
-import re
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import xlsxwriter
+except ImportError:  # 未安装时用 openpyxl 写出
+    xlsxwriter = None
+
+# 添加项目根目录到路径
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.file_discovery import discover_files
+from core.text_classifier import TextClassifier
+from tools.extraction_cache import ExtractionCache
 
 # 设置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 提取规则版本：修改提取或文本判断规则时递增，提取结果缓存随之失效
+EXTRACTOR_VERSION = 2
+
+# 多语言汇总表的语言顺序（第一个有数据的语言作为基准）
+SUMMARY_LANGUAGES = ['cn', 'vn', 'en', 'th']
+
+# 各语言文本按 (文件名, 工作表名, Excel物理位置) 对应
+POSITION_KEYS = ['name', 'sheet', 'num']
+
+# 输出文件中汇总工作表与文本工作表的列
+SUMMARY_SHEET_NAME = "提取汇总"
+SUMMARY_COLUMNS = ['项目', '值']
+TEXT_COLUMNS = ['id', '位置', '字段名', 'doc', 'name']
+
+# 预检读取的数据行数：第5行为字段名（索引4），第6行为策划标识（索引5）
+PREFLIGHT_ROWS = 6
+
 
 class ExcelTextExtractor:
     """Excel文本提取器"""
     
-    def __init__(self, progress_callback=None):
+    def __init__(self, progress_callback=None, cache_dir: Optional[str] = None):
         """
         初始化文本提取器
         
         Args:
             progress_callback: 进度回调函数，接收 (current, total, filename, message) 参数
+            cache_dir: 提取结果缓存目录（None 时不使用缓存；内容未变化的文件直接从缓存读取）
         """
         self.supported_formats = ['.xlsx', '.xls']
         self.extracted_texts = {}
@@ -37,6 +69,9 @@ class ExcelTextExtractor:
             'total_texts': 0
         }
         self.progress_callback = progress_callback
+        # 文本分类器（按不重复的文本缓存特征，提取判断与类型分析共用）
+        self.text_classifier = TextClassifier()
+        self.extraction_cache = ExtractionCache(cache_dir, version=EXTRACTOR_VERSION) if cache_dir else None
     
     def _report_progress(self, current: int, total: int, filename: str, message: str):
         """
@@ -72,13 +107,7 @@ class ExcelTextExtractor:
             if not os.path.isdir(directory_path):
                 raise ValueError(f"路径不是目录: {directory_path}")
             
-            excel_files = []
-            for root, dirs, files in os.walk(directory_path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    file_ext = Path(file_path).suffix.lower()
-                    if file_ext in self.supported_formats:
-                        excel_files.append(file_path)
+            excel_files = [str(file_path) for file_path, _ in discover_files(directory_path, self.supported_formats)]
             
             logger.info(f"在目录 {directory_path} 中找到 {len(excel_files)} 个Excel文件")
             return excel_files
@@ -104,35 +133,57 @@ class ExcelTextExtractor:
         try:
             self._report_progress(current, total, filename, "开始读取文件")
             
-            # 读取Excel文件的所有工作表
-            excel_file = pd.ExcelFile(file_path)
-            sheet_names = excel_file.sheet_names
-            self._report_progress(current, total, filename, f"发现 {len(sheet_names)} 个工作表")
-            
-            extracted_data = {}
-            total_texts = 0
-            
-            for i, sheet_name in enumerate(sheet_names):
-                try:
-                    self._report_progress(current, total, filename, f"处理工作表 '{sheet_name}' ({i+1}/{len(sheet_names)})")
-                    
-                    # 读取工作表数据
-                    df = pd.read_excel(file_path, sheet_name=sheet_name)
-                    self._report_progress(current, total, filename, f"工作表 '{sheet_name}' 读取完成，共 {len(df)} 行")
-                    
-                    # 提取文本内容
-                    sheet_data = self._extract_texts_from_dataframe(df)
-                    if sheet_data and sheet_data['items']:
-                        extracted_data[sheet_name] = sheet_data
-                        total_texts += len(sheet_data['items'])
-                        self._report_progress(current, total, filename, f"工作表 '{sheet_name}' 提取到 {len(sheet_data['items'])} 个文本")
-                    else:
-                        self._report_progress(current, total, filename, f"工作表 '{sheet_name}' 未提取到文本")
-                    
-                except Exception as e:
-                    self._report_progress(current, total, filename, f"处理工作表 '{sheet_name}' 失败: {str(e)}")
-                    logger.warning(f"处理工作表 '{sheet_name}' 失败: {str(e)}")
-                    continue
+            # 内容未变化的文件直接使用缓存的提取结果
+            digest = None
+            if self.extraction_cache is not None:
+                digest, cached_data = self.extraction_cache.load(file_path)
+                if cached_data is not None:
+                    total_texts = sum(len(sheet_data['items']) for sheet_data in cached_data.values())
+                    self._report_progress(current, total, filename, f"文件未变化，从缓存读取 {total_texts} 个文本")
+                    return cached_data
+            
+            # 只打开一次工作簿（压缩包、共享字符串只解析一次），各工作表都从同一个句柄读取
+            with pd.ExcelFile(file_path) as excel_file:
+                sheet_names = excel_file.sheet_names
+                self._report_progress(current, total, filename, f"发现 {len(sheet_names)} 个工作表")
+                
+                extracted_data = {}
+                total_texts = 0
+                sheet_failed = False
+                
+                for i, sheet_name in enumerate(sheet_names):
+                    try:
+                        self._report_progress(current, total, filename, f"处理工作表 '{sheet_name}' ({i+1}/{len(sheet_names)})")
+                        
+                        # 先只读前几行：策划表不再读取整个工作表
+                        is_planner, headers = self._preflight_sheet(excel_file, sheet_name)
+                        if is_planner:
+                            self._report_progress(current, total, filename, f"工作表 '{sheet_name}' 为策划表，跳过读取")
+                            self._report_progress(current, total, filename, f"工作表 '{sheet_name}' 未提取到文本")
+                            continue
+                        
+                        # 读取工作表数据
+                        df = excel_file.parse(sheet_name)
+                        self._report_progress(current, total, filename, f"工作表 '{sheet_name}' 读取完成，共 {len(df)} 行")
+                        
+                        # 提取文本内容
+                        sheet_data = self._extract_texts_from_dataframe(df, headers)
+                        if sheet_data and sheet_data['items']:
+                            extracted_data[sheet_name] = sheet_data
+                            total_texts += len(sheet_data['items'])
+                            self._report_progress(current, total, filename, f"工作表 '{sheet_name}' 提取到 {len(sheet_data['items'])} 个文本")
+                        else:
+                            self._report_progress(current, total, filename, f"工作表 '{sheet_name}' 未提取到文本")
+                        
+                    except Exception as e:
+                        self._report_progress(current, total, filename, f"处理工作表 '{sheet_name}' 失败: {str(e)}")
+                        logger.warning(f"处理工作表 '{sheet_name}' 失败: {str(e)}")
+                        sheet_failed = True
+                        continue
+                
+            # 有工作表处理失败时不缓存，下次重新解析
+            if self.extraction_cache is not None and not sheet_failed:
+                self.extraction_cache.store(digest, extracted_data)
             
             self._report_progress(current, total, filename, f"文件处理完成，共提取 {total_texts} 个文本")
             return extracted_data
@@ -142,18 +193,43 @@ class ExcelTextExtractor:
             logger.error(f"提取Excel文件文本失败: {str(e)}")
             return {}
     
-    def _extract_texts_from_dataframe(self, df: pd.DataFrame) -> Dict:
+    def _preflight_sheet(self, excel_file: pd.ExcelFile, sheet_name: str) -> Tuple[bool, List]:
+        """
+        只读取工作表的前几行，判断是否为策划表并取得字段名行（第5行）
+        
+        字段名按单元格原值取得（dtype=object，不受整列类型推断影响）
+        
+        Args:
+            excel_file: 已打开的工作簿
+            sheet_name: 工作表名
+            
+        Returns:
+            (是否为策划表, 字段名列表)
+        """
+        head = excel_file.parse(sheet_name, nrows=PREFLIGHT_ROWS, dtype=object)
+        if self._is_planner_row(head):
+            return True, []
+        return False, self._header_names(head)
+    
+    @staticmethod
+    def _header_names(df: pd.DataFrame) -> List:
+        """第5行（索引为4）的字段名；单元格为空或不足5行时使用列名"""
+        if len(df) < 5:
+            return list(df.columns)
+        header_row = df.iloc[4]  # 第5行，索引为4
+        return [str(header_row[col]).strip() if pd.notna(header_row[col]) else col for col in df.columns]
+    
+    def _extract_texts_from_dataframe(self, df: pd.DataFrame, headers: Optional[List] = None) -> Dict:
         """
         从DataFrame中提取文本内容，使用Excel物理行数从第7行开始检测
         
         Args:
             df: pandas DataFrame
+            headers: 预检得到的字段名（None 时从 df 的第5行取得）
             
         Returns:
             包含提取数据和元信息的字典
         """
-        extracted_items = []
-        
         try:
             # 检查第7行（索引为6）是否为策划，如果是则跳过提取
             if self._is_planner_row(df):
@@ -167,45 +243,38 @@ class ExcelTextExtractor:
                 return {'items': [], 'headers': [], 'a_column': None}
             
             # 获取第5行作为字段名（索引为4）
-            headers = []
-            if len(df) >= 5:
-                header_row = df.iloc[4]  # 第5行，索引为4
-                headers = [str(header_row[col]).strip() if pd.notna(header_row[col]) else col for col in df.columns]
-            else:
-                headers = list(df.columns)
-            
-            # 从第7行开始遍历，使用Excel物理行数（从1开始计数）
-            # pandas DataFrame的索引从0开始，但Excel物理行数从1开始
-            # 所以第7行的DataFrame索引是6，但Excel物理行号是7
-            for row_idx in range(6, len(df)):  # DataFrame索引从6开始（对应Excel第7行）
-                row_data = df.iloc[row_idx]
-                excel_physical_row = row_idx + 1  # Excel物理行号（从1开始）
-                a_column_value = str(row_data[a_column]).strip() if pd.notna(row_data[a_column]) else ""
-                
-                # 遍历该行的所有列
-                for col_idx, col in enumerate(df.columns):
-                    value = row_data[col]
-                    if pd.notna(value):  # 跳过空值
-                        text = str(value).strip()
-                        if text and self._is_text_content(text):
-                            # 生成Excel物理位置（如F7），使用Excel物理行号
-                            excel_position = self._get_excel_position(col_idx, excel_physical_row)
-                            extracted_items.append({
-                                'text': text,
-                                'a_column': a_column_value,
-                                'row': excel_physical_row,  # Excel物理行号（从1开始）
-                                'column': col,
-                                'column_index': col_idx,
-                                'excel_row_ref': excel_position  # Excel物理位置（如F7）
-                            })
-            
-            # 去重并保持顺序（基于文本内容去重）
-            seen_texts = set()
-            unique_items = []
-            for item in extracted_items:
-                if item['text'] not in seen_texts:
-                    seen_texts.add(item['text'])
-                    unique_items.append(item)
+            if headers is None:
+                headers = self._header_names(df)
+            elif len(headers) < len(df.columns):
+                # 前几行之后才出现的列没有字段名，使用列名
+                headers = list(headers) + list(df.columns[len(headers):])
+            
+            # 从第7行开始（DataFrame索引6，Excel物理行号7）整块取出单元格，按列向量化判断
+            body = df.iloc[6:].to_numpy(dtype=object)
+            # 非空单元格的行列下标（np.nonzero 按行优先，与逐行逐列遍历的顺序一致）
+            row_offsets, col_indices = np.nonzero(pd.notna(body))
+            texts = pd.Series([str(value).strip() for value in body[row_offsets, col_indices]], dtype=object)
+            
+            # 去重并保持顺序（基于文本内容去重，保留第一次出现）
+            selected = texts[self.text_classifier.content_mask(texts)].drop_duplicates(keep='first')
+            kept = selected.index.to_numpy()
+            excel_rows = (row_offsets[kept] + 7).tolist()  # Excel物理行号（从1开始）
+            kept_columns = col_indices[kept].tolist()
+            
+            columns = list(df.columns)
+            column_letters = [self._index_to_excel_column(col_idx) for col_idx in range(len(columns))]
+            a_column_values = [str(value).strip() if pd.notna(value) else "" for value in body[:, 0]]
+            unique_items = [
+                {
+                    'text': text,
+                    'a_column': a_column_values[excel_row - 7],
+                    'row': excel_row,
+                    'column': columns[col_idx],
+                    'column_index': col_idx,
+                    'excel_row_ref': f"{column_letters[col_idx]}{excel_row}"  # Excel物理位置（如F7）
+                }
+                for text, excel_row, col_idx in zip(selected.tolist(), excel_rows, kept_columns)
+            ]
             
             return {
                 'items': unique_items,
@@ -259,70 +328,7 @@ class ExcelTextExtractor:
         Returns:
             是否为文本内容
         """
-        if not text or len(text.strip()) == 0:
-            return False
-        
-        # 跳过纯数字
-        if text.isdigit():
-            return False
-        
-        # 跳过纯日期格式
-        if re.match(r'^\d{4}-\d{2}-\d{2}$', text):
-            return False
-        
-        # 跳过纯时间格式
-        if re.match(r'^\d{2}:\d{2}:\d{2}$', text):
-            return False
-        
-        # 跳过纯浮点数
-        try:
-            float(text)
-            return False
-        except ValueError:
-            pass
-        
-        # 跳过数值表达式（如：1+2, 3*4, 5-6等）
-        if re.match(r'^[\d\+\-\*\/\(\)\.\s]+$', text):
-            return False
-        
-        # 跳过数组格式（如：[1,2,3], {1,2,3}, (1,2,3)等）
-        if re.match(r'^[\[\{\(][\d\s,\.]+\]?\}?\)?$', text):
-            return False
-        
-        # 跳过JSON数组格式（如：["a","b"], [1,2,3]等）
-        if re.match(r'^\[[\s\S]*\]$', text) and not re.search(r'[\u4e00-\u9fff\u1e00-\u1eff\u1f00-\u1fff\u0100-\u017f\u0180-\u024f]', text):
-            return False
-        
-        # 跳过对象格式（如：{"a":1}, {1,2,3}等）
-        if re.match(r'^\{[\s\S]*\}$', text) and not re.search(r'[\u4e00-\u9fff\u1e00-\u1eff\u1f00-\u1fff\u0100-\u017f\u0180-\u024f]', text):
-            return False
-        
-        # 跳过纯数值列表（如：1,2,3 或 1;2;3 等）
-        if re.match(r'^[\d\s,;\.]+$', text):
-            return False
-        
-        # 检查是否包含中文字符
-        has_chinese = re.search(r'[\u4e00-\u9fff]', text)
-        
-        # 检查是否包含越南文字符
-        has_vietnamese = re.search(r'[\u1e00-\u1eff\u1f00-\u1fff\u0100-\u017f\u0180-\u024f]', text)
-        
-        # 检查是否包含英文字符
-        has_english = re.search(r'[a-zA-Z]', text)
-        
-        # 只提取包含中文或越南文的文本，跳过纯英文
-        if has_chinese or has_vietnamese:
-            return True
-        
-        # 如果是纯英文，跳过提取
-        if has_english and not has_chinese and not has_vietnamese:
-            return False
-        
-        # 包含特殊字符或标点符号（但不包含英文字母）
-        if re.search(r'[^\w\s\d]', text) and not has_english:
-            return True
-        
-        return False
+        return self.text_classifier.is_text_content(text)
     
     def _get_excel_position(self, col_index: int, row_number: int) -> str:
         """
@@ -388,49 +394,7 @@ class ExcelTextExtractor:
         try:
             logger.info(f"正在创建文本Excel文件: {output_path}")
             
-            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-                # 创建汇总工作表
-                summary_data = self._create_summary_data(extracted_data, source_file)
-                summary_df = pd.DataFrame(summary_data)
-                summary_df.to_excel(writer, sheet_name="提取汇总", index=False)
-                
-                # 为每个工作表创建文本列表
-                for sheet_name, sheet_data in extracted_data.items():
-                    if sheet_data and sheet_data['items']:
-                        # 清理工作表名称
-                        clean_sheet_name = self._clean_sheet_name(sheet_name)
-                        
-                        # 获取字段名（第5行内容）
-                        headers = sheet_data['headers']
-                        a_column = sheet_data['a_column']
-                        
-                        # 创建新的数据结构，参考用户提供的格式
-                        # A列：id（原文件的A列内容）
-                        # B列：位置（提取文本在Excel的行号，如B4）
-                        # C列：字段名（原Excel第五行的字段名）
-                        # D列：doc（文本类型或描述）
-                        # E列：name（提取的文本内容）
-                        text_data = []
-                        
-                        # 跳过第二行，直接从数据行开始
-                        
-                        # 数据行
-                        for item in sheet_data['items']:
-                            # 获取该文本对应的原Excel第五行字段名
-                            original_field_name = self._get_original_field_name(item['column_index'], headers)
-                            
-                            data_row = {
-                                'id': item['a_column'],  # A列：原文件的A列内容
-                                '位置': item['excel_row_ref'],  # B列：Excel行号引用（如B4）
-                                '字段名': original_field_name,  # C列：原Excel第五行字段名
-                                'doc': self._analyze_text_type(item['text']),  # D列：文本类型分析
-                                'name': item['text']  # E列：提取的文本内容
-                            }
-                            text_data.append(data_row)
-                        
-                        # 创建DataFrame
-                        text_df = pd.DataFrame(text_data)
-                        text_df.to_excel(writer, sheet_name=clean_sheet_name, index=False)
+            write_text_workbook(output_path, self._build_output_sheets(extracted_data, source_file))
             
             logger.info(f"文本Excel文件创建成功: {output_path}")
             return True
@@ -439,6 +403,43 @@ class ExcelTextExtractor:
             logger.error(f"创建文本Excel文件失败: {str(e)}")
             return False
     
+    def _build_output_sheets(self, extracted_data: Dict[str, Dict],
+                             source_file: str) -> List[Tuple[str, List[str], List[list]]]:
+        """
+        生成输出文件各工作表的内容（汇总工作表 + 每个提取到文本的工作表一个文本列表）
+        
+        Args:
+            extracted_data: 提取的文本数据
+            source_file: 源文件路径
+            
+        Returns:
+            [(工作表名, 列名, 数据行), ...]，可直接交给 write_text_workbook（也可传给写出进程）
+        """
+        summary_data = self._create_summary_data(extracted_data, source_file)
+        sheets = [(SUMMARY_SHEET_NAME, SUMMARY_COLUMNS,
+                   [[row[column] for column in SUMMARY_COLUMNS] for row in summary_data])]
+        
+        # 为每个工作表创建文本列表
+        for sheet_name, sheet_data in extracted_data.items():
+            if sheet_data and sheet_data['items']:
+                # 获取字段名（第5行内容）
+                headers = sheet_data['headers']
+                
+                # A列：id（原文件的A列内容）
+                # B列：位置（提取文本在Excel的行号，如B4）
+                # C列：字段名（原Excel第五行的字段名）
+                # D列：doc（文本类型或描述）
+                # E列：name（提取的文本内容）
+                rows = [
+                    [item['a_column'], item['excel_row_ref'],
+                     self._get_original_field_name(item['column_index'], headers),
+                     self._analyze_text_type(item['text']), item['text']]
+                    for item in sheet_data['items']
+                ]
+                sheets.append((self._clean_sheet_name(sheet_name), TEXT_COLUMNS, rows))
+        
+        return sheets
+    
     def _create_summary_data(self, extracted_data: Dict[str, Dict], 
                            source_file: str) -> List[Dict]:
         """
@@ -525,35 +526,23 @@ class ExcelTextExtractor:
         Returns:
             文本类型描述
         """
-        has_chinese = re.search(r'[\u4e00-\u9fff]', text)
-        has_vietnamese = re.search(r'[\u1e00-\u1eff\u1f00-\u1fff\u0100-\u017f\u0180-\u024f]', text)
-        has_english = re.search(r'[a-zA-Z]', text)
-        
-        if has_chinese and has_vietnamese:
-            return "中越混合"
-        elif has_chinese and has_english:
-            return "中英混合"
-        elif has_vietnamese and has_english:
-            return "越英混合"
-        elif has_chinese:
-            return "中文"
-        elif has_vietnamese:
-            return "越南文"
-        else:
-            # 由于跳过了纯英文，这里不会返回"英文"类型
-            return "其他"
+        return self.text_classifier.text_type(text)
     
-    def process_directory(self, input_directory: str, output_directory: str = None) -> bool:
+    def process_directory(self, input_directory: str, output_directory: str = None, writers: int = 0) -> bool:
         """
         处理目录中的所有Excel文件
         
         Args:
             input_directory: 输入目录路径
             output_directory: 输出目录路径（默认为输入目录）
+            writers: 写出进程数。0 时在当前线程中逐个文件提取、写出；
+                大于 0 时为流水线模式：当前线程继续提取后续文件，结果文件交给写出进程写出，
+                等待写出的文件数有上限（writers * 2）
             
         Returns:
             是否处理成功
         """
+        executor = None
         try:
             # 设置输出目录
             if output_directory is None:
@@ -562,22 +551,51 @@ class ExcelTextExtractor:
             # 确保输出目录存在
             os.makedirs(output_directory, exist_ok=True)
             
-            # 扫描Excel文件
-            excel_files = self.scan_directory(input_directory)
-            self.processing_stats['total_files'] = len(excel_files)
+            if not os.path.isdir(input_directory):
+                raise FileNotFoundError(f"目录不存在或不是目录: {input_directory}")
             
-            if not excel_files:
-                logger.warning("未找到Excel文件")
-                return True
+            # 后台线程遍历目录，边发现边提取；总数随遍历推进更新
+            # 输出目录位于输入目录内时不进入，避免把刚写出的文件再次当作输入
+            discovery = discover_files(input_directory, self.supported_formats, exclude_dirs=[output_directory])
             
             processed_files = []
             failed_files = []
             
+            # 流水线模式：(序号, 文件路径, 输出路径, 写出任务)，按提交顺序完成
+            if writers > 0:
+                executor = ProcessPoolExecutor(max_workers=writers)
+            max_pending = writers * 2
+            pending = deque()
+            
+            def finish_output(i: int, file_path: str, output_path: str, success: bool):
+                filename = os.path.basename(file_path)
+                if success:
+                    processed_files.append(output_path)
+                    self.processing_stats['processed_files'] += 1
+                    self._report_progress(i, discovery.discovered, filename, "处理成功")
+                    logger.info(f"处理成功: {output_path}")
+                else:
+                    failed_files.append(file_path)
+                    self.processing_stats['failed_files'] += 1
+                    self._report_progress(i, discovery.discovered, filename, "创建输出文件失败")
+            
+            def finish_pending():
+                i, file_path, output_path, future = pending.popleft()
+                try:
+                    future.result()
+                    logger.info(f"文本Excel文件创建成功: {output_path}")
+                    success = True
+                except Exception as e:
+                    logger.error(f"创建文本Excel文件失败: {str(e)}")
+                    success = False
+                finish_output(i, file_path, output_path, success)
+            
             # 处理每个Excel文件
-            for i, file_path in enumerate(excel_files, 1):
+            for i, (path, _) in enumerate(discovery, 1):
+                file_path = str(path)
                 try:
                     # 提取文本
-                    extracted_data = self.extract_text_from_excel(file_path, i, len(excel_files))
+                    extracted_data = self.extract_text_from_excel(file_path, i, discovery.discovered)
                     
                     # 检查是否提取到内容
                     total_texts = sum(len(sheet_data['items']) for sheet_data in extracted_data.values()) if extracted_data else 0
@@ -589,37 +607,49 @@ class ExcelTextExtractor:
                         output_path = os.path.join(output_directory, output_filename)
                         
                         filename = os.path.basename(file_path)
-                        self._report_progress(i, len(excel_files), filename, f"创建输出文件: {output_filename}")
-                        
-                        # 创建文本Excel文件
-                        success = self.create_text_excel(output_path, extracted_data, file_path)
+                        self._report_progress(i, discovery.discovered, filename, f"创建输出文件: {output_filename}")
                         
-                        if success:
-                            processed_files.append(output_path)
-                            self.processing_stats['processed_files'] += 1
-                            self._report_progress(i, len(excel_files), filename, "处理成功")
-                            logger.info(f"处理成功: {output_path}")
+                        if executor is not None:
+                            # 交给写出进程，当前线程继续提取下一个文件
+                            sheets = self._build_output_sheets(extracted_data, file_path)
+                            pending.append((i, file_path, output_path,
+                                            executor.submit(_write_output_file, output_path, sheets)))
+                            while len(pending) > max_pending:
+                                finish_pending()
                         else:
-                            failed_files.append(file_path)
-                            self.processing_stats['failed_files'] += 1
-                            self._report_progress(i, len(excel_files), filename, "创建输出文件失败")
+                            # 创建文本Excel文件
+                            success = self.create_text_excel(output_path, extracted_data, file_path)
+                            finish_output(i, file_path, output_path, success)
                     else:
                         filename = os.path.basename(file_path)
                         if total_texts == 0:
-                            self._report_progress(i, len(excel_files), filename, "未提取到文本内容，跳过文件创建")
+                            self._report_progress(i, discovery.discovered, filename, "未提取到文本内容，跳过文件创建")
                             logger.info(f"未提取到文本内容，跳过文件创建: {file_path}")
                         else:
-                            self._report_progress(i, len(excel_files), filename, "未提取到文本内容")
+                            self._report_progress(i, discovery.discovered, filename, "未提取到文本内容")
                             logger.warning(f"未提取到文本内容: {file_path}")
                         # 不将空文件添加到失败列表，因为这是正常情况
                 
                 except Exception as e:
                     filename = os.path.basename(file_path)
-                    self._report_progress(i, len(excel_files), filename, f"处理失败: {str(e)}")
+                    self._report_progress(i, discovery.discovered, filename, f"处理失败: {str(e)}")
                     logger.error(f"处理文件失败 {file_path}: {str(e)}")
                     failed_files.append(file_path)
                     self.processing_stats['failed_files'] += 1
             
+            # 等待剩余的写出任务
+            while pending:
+                finish_pending()
+            
+            self.processing_stats['total_files'] = discovery.discovered
+            if self.extraction_cache is not None:
+                # 清理长期未使用的条目（修改前的旧内容），并统计缓存目录大小
+                self.extraction_cache.prune()
+                self.processing_stats.update(self.extraction_cache.summary())
+            if not discovery.discovered:
+                logger.warning("未找到Excel文件")
+                return True
+            
             # 显示处理结果
             self._display_processing_results(processed_files, failed_files)
             
@@ -628,6 +658,10 @@ class ExcelTextExtractor:
         except Exception as e:
             logger.error(f"处理目录失败: {str(e)}")
             return False
+        
+        finally:
+            if executor is not None:
+                executor.shutdown()
     
     def _display_processing_results(self, processed_files: List[str], failed_files: List[str]):
         """
@@ -644,6 +678,8 @@ class ExcelTextExtractor:
         print(f"成功处理: {len(processed_files)}")
         print(f"处理失败: {len(failed_files)}")
         print(f"提取文本总数: {self.processing_stats['total_texts']}")
+        if self.extraction_cache is not None:
+            print(self.extraction_cache.report())
         
         if processed_files:
             print(f"\n成功创建的文件:")
@@ -672,11 +708,138 @@ class ExcelTextExtractor:
         report_lines.append(f"成功处理: {self.processing_stats['processed_files']}")
         report_lines.append(f"处理失败: {self.processing_stats['failed_files']}")
         report_lines.append(f"提取文本总数: {self.processing_stats['total_texts']}")
+        if self.extraction_cache is not None:
+            report_lines.append(self.extraction_cache.report())
         report_lines.append("=" * 50)
         
         return "\n".join(report_lines)
 
 
+def write_text_workbook(output_path: str, sheets: Sequence[Tuple[str, List[str], List[list]]],
+                        engine: Optional[str] = None):
+    """
+    写出提取结果文件：安装了 xlsxwriter 时用其 constant_memory 模式逐行写出（内存占用恒定），
+    否则（或工作表名有重复时）与原来一样通过 pandas + openpyxl 写出
+
+    Args:
+        output_path: 输出文件路径
+        sheets: [(工作表名, 列名, 数据行), ...]
+        engine: 'xlsxwriter' / 'openpyxl'（None 时自动选择）
+    """
+    if engine is None:
+        # 工作表名重复（不区分大小写）时 pandas + openpyxl 会写入同一个工作表，只有 openpyxl 能保持原来的结果
+        names = {name.lower() for name, _, _ in sheets}
+        engine = 'xlsxwriter' if xlsxwriter is not None and len(names) == len(sheets) else 'openpyxl'
+
+    if engine == 'xlsxwriter':
+        _write_with_xlsxwriter(output_path, sheets)
+    else:
+        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+            for sheet_name, columns, rows in sheets:
+                pd.DataFrame(rows, columns=columns).to_excel(writer, sheet_name=sheet_name, index=False)
+
+
+def _write_with_xlsxwriter(output_path: str, sheets: Sequence[Tuple[str, List[str], List[list]]]):
+    """xlsxwriter constant_memory 模式逐行写出；标题行与 pandas 导出的格式相同（粗体、细边框、居中）"""
+    workbook = xlsxwriter.Workbook(output_path, {'constant_memory': True, 'strings_to_urls': False})
+    try:
+        header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+        for sheet_name, columns, rows in sheets:
+            worksheet = workbook.add_worksheet(sheet_name)
+            worksheet.write_row(0, 0, columns, header_format)
+            for row_index, row in enumerate(rows, 1):
+                worksheet.write_row(row_index, 0, row)
+    finally:
+        workbook.close()
+
+
+def _write_output_file(output_path: str, sheets: Sequence[Tuple[str, List[str], List[list]]]) -> str:
+    """在写出进程中写出单个结果文件"""
+    write_text_workbook(output_path, sheets)
+    return output_path
+
+
+def _position_frame(file_data: Optional[Dict[str, Dict]], default_position=None) -> pd.DataFrame:
+    """按提取顺序把一种语言的文本展开为 name / sheet / num / text 四列（逐个工作表整列构建）"""
+    names, sheets, positions, texts = [], [], [], []
+    for file_name, file_sheets in (file_data or {}).items():
+        for sheet_name, sheet_data in file_sheets.items():
+            if not sheet_data or 'items' not in sheet_data:
+                continue
+            items = sheet_data['items']
+            names += [file_name] * len(items)
+            sheets += [sheet_name] * len(items)
+            positions += [item.get('excel_row_ref', default_position) for item in items]
+            texts += [item.get('text', '') for item in items]
+    return pd.DataFrame({'name': names, 'sheet': sheets, 'num': positions, 'text': texts}, dtype=object)
+
+
+def build_position_index(frame: Optional[pd.DataFrame], text_column: str = 'text') -> pd.DataFrame:
+    """
+    把一种语言的提取结果整理为位置索引表（合并各语言时作为哈希连接的右表）
+    
+    Args:
+        frame: 含 name / sheet / num / text 列的提取结果（按提取顺序；None 表示没有数据）
+        text_column: 索引表中文本列的列名
+        
+    Returns:
+        name / sheet / num / 文本 四列的 DataFrame；同一位置出现多次时保留第一条
+    """
+    if frame is None:
+        frame = pd.DataFrame(columns=[*POSITION_KEYS, 'text'], dtype=object)
+    index = frame[[*POSITION_KEYS, 'text']].drop_duplicates(POSITION_KEYS, keep='first')
+    return index.rename(columns={'text': text_column})
+
+
+def merge_language_frames(frames: Dict[str, pd.DataFrame], base_lang: str,
+                          languages: Sequence[str] = SUMMARY_LANGUAGES) -> pd.DataFrame:
+    """
+    按位置对齐各语言的提取文本
+    
+    基准语言中的每个文本一行；其他语言各建一次位置索引，通过按 (文件名, 工作表名, 位置) 的
+    左连接取相同位置的文本，没有对应文本时为空字符串
+    
+    Args:
+        frames: 语言代码 -> 含 name / sheet / num / text 列的提取结果（按提取顺序）
+        base_lang: 基准语言
+        languages: 输出的语言列（按优先级排列）
+        
+    Returns:
+        name / num / 各语言列的 DataFrame
+    """
+    summary = frames[base_lang][[*POSITION_KEYS, 'text']].rename(columns={'text': base_lang})
+    for lang in languages:
+        if lang == base_lang:
+            continue
+        summary = summary.merge(build_position_index(frames.get(lang), lang), how='left',
+                                on=POSITION_KEYS, sort=False)
+        summary[lang] = summary[lang].fillna('')
+    
+    return summary[['name', 'num', *languages]].reset_index(drop=True)
+
+
+def merge_language_texts(all_lang_data: Dict[str, Dict],
+                         languages: Sequence[str] = SUMMARY_LANGUAGES) -> Tuple[Optional[str], pd.DataFrame]:
+    """
+    按位置对齐各语言的提取文本（以第一个有数据的语言为基准，见 merge_language_frames）
+    
+    Args:
+        all_lang_data: 语言代码 -> (文件名 -> extract_text_from_excel 的结果)
+        languages: 输出的语言列（按优先级排列）
+        
+    Returns:
+        (基准语言, name / num / 各语言列的 DataFrame)；没有任何数据时基准语言为 None
+    """
+    base_lang = next((lang for lang in languages if all_lang_data.get(lang)), None)
+    if base_lang is None:
+        return None, pd.DataFrame(columns=['name', 'num', *languages])
+    
+    # 基准语言缺少位置时按空字符串对应（与其他语言缺少位置的条目不会对上）
+    frames = {lang: _position_frame(all_lang_data.get(lang), '' if lang == base_lang else None)
+              for lang in languages}
+    return base_lang, merge_language_frames(frames, base_lang, languages)
+
+
 def main():
     """主函数 - 命令行使用示例"""
     import argparse
@@ -685,16 +848,20 @@ def main():
     parser.add_argument("input_directory", help="输入目录路径")
     parser.add_argument("--output-directory", help="输出目录路径（默认为输入目录）")
     parser.add_argument("--recursive", action="store_true", help="递归处理子目录")
+    parser.add_argument("--writers", type=int, default=0,
+                        help="写出进程数（大于 0 时提取与写出流水线并行，默认 0）")
+    parser.add_argument("--cache-dir", help="提取结果缓存目录（内容未变化的文件直接从缓存读取）")
     
     args = parser.parse_args()
     
     # 创建文本提取器实例
-    extractor = ExcelTextExtractor()
+    extractor = ExcelTextExtractor(cache_dir=args.cache_dir)
     
     # 处理目录
     success = extractor.process_directory(
         input_directory=args.input_directory,
-        output_directory=args.output_directory
+        output_directory=args.output_directory,
+        writers=args.writers
     )
     
     if success:
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文本提取结果缓存（持久化）
+按 "提取规则版本 + 文件内容摘要" 缓存 ExcelTextExtractor 对单个文件的提取结果：
+内容未变化的文件直接从缓存读取，只有新增或修改过的文件才重新解析；提取规则变化时递增版本号，旧缓存自动失效。
+
+每个工作表的文本按列存放（文本、A列值、位置各一个列表，行号与列下标为整数数组），pickle 后用 zlib 压缩，
+通过 core.cache_manager.FileCache 写入缓存目录。
+
+文件修改后旧内容的条目不会再命中：命中时更新条目的修改时间，
+提取结束时由 prune 删除长期未使用的条目，缓存目录不会无限增长。
+
+用法:
+    cache = ExtractionCache(DEFAULT_CACHE_DIR, version=EXTRACTOR_VERSION)
+    digest, extracted_data = cache.load(file_path)
+    if extracted_data is None:
+        extracted_data = ...
+        cache.store(digest, extracted_data)
+    cache.prune()
+    print(cache.report())
+"""
+
+import sys
+import time
+import zlib
+import pickle
+import logging
+from array import array
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# 添加项目根目录到路径
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.cache_manager import FileCache
+from core.duplicate_files import file_digest
+
+logger = logging.getLogger(__name__)
+
+
+def default_cache_dir() -> str:
+    """
+    默认缓存目录：打包后的程序在可执行文件所在目录，源码运行时在项目根目录
+    （不随当前工作目录变化，从其他目录启动时仍能命中之前的缓存）
+
+    Returns:
+        str: 缓存目录的绝对路径
+    """
+    if getattr(sys, 'frozen', False):
+        base_dir = Path(sys.executable).resolve().parent
+    else:
+        base_dir = Path(__file__).resolve().parent.parent
+    return str(base_dir / ".cache" / "text_extraction")
+
+
+# 默认缓存目录
+DEFAULT_CACHE_DIR = default_cache_dir()
+
+# 缓存数据格式版本（与提取规则版本一起组成缓存键）
+CACHE_FORMAT_VERSION = 1
+
+# 超过该天数未使用（未命中也未重新写入）的缓存条目在提取结束时删除
+DEFAULT_MAX_AGE_DAYS = 30
+
+
+def pack_extracted_data(extracted_data: Dict[str, Dict]) -> bytes:
+    """
+    把单个文件的提取结果（工作表名 -> {'items', 'headers', 'a_column'}）按列打包并压缩
+
+    Args:
+        extracted_data: extract_text_from_excel 的结果
+
+    Returns:
+        bytes: 压缩后的数据
+    """
+    sheets = []
+    for sheet_name, sheet_data in extracted_data.items():
+        items = sheet_data['items']
+        # 列标签按列下标只保存一次
+        column_labels = {item['column_index']: item['column'] for item in items}
+        sheets.append((
+            sheet_name,
+            sheet_data['headers'],
+            sheet_data['a_column'],
+            [item['text'] for item in items],
+            [item['a_column'] for item in items],
+            [item['excel_row_ref'] for item in items],
+            array('q', [item['row'] for item in items]).tobytes(),
+            array('q', [item['column_index'] for item in items]).tobytes(),
+            column_labels,
+        ))
+    return zlib.compress(pickle.dumps(sheets, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def unpack_extracted_data(packed: bytes) -> Dict[str, Dict]:
+    """
+    还原 pack_extracted_data 打包的提取结果
+
+    Args:
+        packed: 压缩后的数据
+
+    Returns:
+        Dict[str, Dict]: 与 extract_text_from_excel 的结果相同的结构
+    """
+    extracted_data = {}
+    for (sheet_name, headers, a_column, texts, a_values, positions, row_bytes, column_bytes,
+         column_labels) in pickle.loads(zlib.decompress(packed)):
+        rows = array('q')
+        rows.frombytes(row_bytes)
+        column_indices = array('q')
+        column_indices.frombytes(column_bytes)
+        items = [
+            {
+                'text': text,
+                'a_column': a_value,
+                'row': row,
+                'column': column_labels[column_index],
+                'column_index': column_index,
+                'excel_row_ref': position,
+            }
+            for text, a_value, row, column_index, position in zip(
+                texts, a_values, rows.tolist(), column_indices.tolist(), positions)
+        ]
+        extracted_data[sheet_name] = {'items': items, 'headers': headers, 'a_column': a_column}
+    return extracted_data
+
+
+class ExtractionCache:
+    """按文件内容摘要缓存文本提取结果，并统计命中/未命中的文件数"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, version: int = 1):
+        """
+        Args:
+            cache_dir: 缓存目录
+            version: 提取规则版本（变化后旧缓存不再命中）
+        """
+        self.file_cache = FileCache(cache_dir=cache_dir)
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        # 最近一次 prune 的结果（清理的条目数、剩余条目数与字节数）
+        self.disk_stats: Dict[str, int] = {}
+
+    def _key(self, digest: str) -> str:
+        return f"text_extraction:v{CACHE_FORMAT_VERSION}.{self.version}:{digest}"
+
+    def load(self, file_path: str) -> Tuple[Optional[str], Optional[Dict[str, Dict]]]:
+        """
+        读取文件的缓存结果
+
+        Args:
+            file_path: 表格文件路径
+
+        Returns:
+            (内容摘要, 提取结果)；未命中时提取结果为 None，文件无法读取时摘要也为 None
+        """
+        try:
+            digest = file_digest(file_path)
+        except OSError as e:
+            logger.warning(f"计算文件摘要失败 {file_path}: {e}")
+            self.misses += 1
+            return None, None
+
+        key = self._key(digest)
+        packed = self.file_cache.get(key)
+        if packed is not None:
+            try:
+                extracted_data = unpack_extracted_data(packed)
+                self.hits += 1
+                # 记录最近一次使用，仍在使用的条目不会被清理
+                self.file_cache.touch(key)
+                return digest, extracted_data
+            except Exception as e:
+                logger.warning(f"缓存数据损坏，重新提取 {file_path}: {e}")
+        self.misses += 1
+        return digest, None
+
+    def store(self, digest: Optional[str], extracted_data: Dict[str, Dict]) -> bool:
+        """
+        保存文件的提取结果
+
+        Args:
+            digest: load 返回的内容摘要（None 时不保存）
+            extracted_data: 提取结果
+
+        Returns:
+            是否保存成功
+        """
+        if digest is None:
+            return False
+        return self.file_cache.set(self._key(digest), pack_extracted_data(extracted_data))
+
+    def prune(self, max_age_days: float = DEFAULT_MAX_AGE_DAYS) -> Dict[str, int]:
+        """
+        删除超过 max_age_days 天未使用的缓存条目（修改前的旧内容、旧提取规则版本的条目），并统计缓存目录大小
+
+        Args:
+            max_age_days: 条目最近一次命中或写入后保留的天数
+
+        Returns:
+            Dict[str, int]: {'cache_pruned': 删除的条目数, 'cache_files': 剩余条目数, 'cache_bytes': 剩余字节数}
+        """
+        cutoff = time.time() - max_age_days * 86400
+        pruned = files = total_bytes = 0
+        for path in self.file_cache.cache_dir.iterdir():
+            # 写入中途被终止留下的临时文件同样按时间清理
+            if path.suffix not in ('.cache', '.tmp'):
+                continue
+            try:
+                stat = path.stat()
+                if stat.st_mtime < cutoff:
+                    path.unlink()
+                    pruned += path.suffix == '.cache'
+                    continue
+            except OSError as e:
+                logger.warning(f"清理缓存条目失败 {path}: {e}")
+                continue
+            if path.suffix == '.cache':
+                files += 1
+                total_bytes += stat.st_size
+        self.disk_stats = {'cache_pruned': pruned, 'cache_files': files, 'cache_bytes': total_bytes}
+        return self.disk_stats
+
+    def summary(self) -> Dict[str, int]:
+        """命中/未命中的文件数（prune 之后还包括缓存目录的统计）"""
+        return {'cache_hits': self.hits, 'cache_misses': self.misses, **self.disk_stats}
+
+    def report(self) -> str:
+        """命中/未命中报告"""
+        return cache_report(self.summary())
+
+
+def cache_report(stats: Dict[str, int]) -> str:
+    """
+    缓存命中/未命中报告
+
+    Args:
+        stats: {'cache_hits': 命中文件数, 'cache_misses': 未命中文件数}，
+               以及可选的 prune 结果 {'cache_files', 'cache_bytes', 'cache_pruned'}
+
+    Returns:
+        str: 如 "缓存命中 3 个文件，重新解析 1 个文件（命中率 75.0%）；缓存共 4 个条目，1.2 MB"
+    """
+    hits, misses = stats['cache_hits'], stats['cache_misses']
+    hit_rate = hits / (hits + misses) * 100 if hits + misses else 0.0
+    report = f"缓存命中 {hits} 个文件，重新解析 {misses} 个文件（命中率 {hit_rate:.1f}%）"
+    if 'cache_files' in stats:
+        report += f"；缓存共 {stats['cache_files']} 个条目，{stats['cache_bytes'] / 1024 / 1024:.1f} MB"
+        if stats.get('cache_pruned'):
+            report += f"（已清理 {stats['cache_pruned']} 个长期未使用的条目）"
+    return report
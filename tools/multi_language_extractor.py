@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多语言文本提取引擎（无界面）
+同时提取 cn/vn/en/th 各语言版本的全部表格：所有语言的所有文件放进同一个进程池，
+按文件大小从大到小提交（最大的文件最先开始，总耗时接近最慢的单个文件/语言），
+每个文件的结果在工作进程中转换为按列存放的数据再传回，最终每种语言得到一个 DataFrame。
+
+界面只需订阅进度事件（与 ExcelTextExtractor 相同的 progress_callback(current, total, filename, message)）
+指定 cache_dir 时内容未变化的文件直接使用缓存的提取结果，结束时报告缓存命中/未命中的文件数
+汇总表中各语言按 (文件, 工作表, A列ID, 字段名) 对齐，ID 对不上时按位置对齐（见 align_language_frames）
+
+用法:
+    engine = MultiLanguageExtractor(workers=4)
+    result = engine.extract({'cn': "中文版/表格", 'vn': "越南文版/表格"})
+    base_lang, summary = result.merge()
+    write_summary_workbook(summary, "翻译提取汇总.xlsx")
+"""
+
+import os
+import sys
+import time
+import logging
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill
+
+# 添加项目根目录到路径
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.report_writer import ScanReportWriter
+from tools.excel_text_extractor import ExcelTextExtractor, POSITION_KEYS, SUMMARY_LANGUAGES, merge_language_frames
+from tools.extraction_cache import ExtractionCache, cache_report
+
+logger = logging.getLogger(__name__)
+
+
+# 每种语言提取结果的列（每个提取到的文本一行，按文件、工作表、提取顺序排列）
+EXTRACTION_COLUMNS = ['name', 'sheet', 'num', 'text', 'a_column', 'row', 'column', 'column_index', 'field']
+
+# 按 ID 对齐各语言文本时的连接键
+ALIGNMENT_KEYS = ['name', 'sheet', 'a_column', 'field']
+
+# 对齐方式
+MATCH_BY_ID = 'id'
+MATCH_BY_POSITION = 'position'
+
+# 未对齐文本报告的列
+UNMATCHED_COLUMNS = ['lang', 'status', 'name', 'sheet', 'a_column', 'field', 'num', 'text']
+# 基准语言的文本在该语言中没有对应文本 / 该语言的文本没有对应到基准语言
+STATUS_MISSING = '缺少译文'
+STATUS_EXTRA = '未对应'
+
+# 汇总表工作表名与列宽（name | num | 各语言）
+SUMMARY_SHEET_TITLE = '汇总'
+SUMMARY_COLUMN_WIDTHS = [25, 10, 40, 40, 40, 40]
+
+# 工作进程中的提取器（每个进程创建一次）
+_worker_extractor: Optional[ExcelTextExtractor] = None
+
+
+def extraction_columns(extractor: ExcelTextExtractor, extracted_data: Dict[str, Dict]) -> Dict[str, list]:
+    """
+    把单个文件的提取结果（工作表名 -> {'items', 'headers', 'a_column'}）转换为按列存放的数据
+
+    Args:
+        extractor: 文本提取器（用于查找字段名）
+        extracted_data: extract_text_from_excel 的结果
+
+    Returns:
+        Dict[str, list]: 除 name 外 EXTRACTION_COLUMNS 各列的值列表
+    """
+    columns = {column: [] for column in EXTRACTION_COLUMNS[1:]}
+    for sheet_name, sheet_data in extracted_data.items():
+        if not sheet_data or 'items' not in sheet_data:
+            continue
+        items = sheet_data['items']
+        headers = sheet_data.get('headers', [])
+        columns['sheet'] += [sheet_name] * len(items)
+        columns['num'] += [item['excel_row_ref'] for item in items]
+        columns['text'] += [item['text'] for item in items]
+        columns['a_column'] += [item['a_column'] for item in items]
+        columns['row'] += [item['row'] for item in items]
+        columns['column'] += [item['column'] for item in items]
+        columns['column_index'] += [item['column_index'] for item in items]
+        columns['field'] += [extractor._get_original_field_name(item['column_index'], headers) for item in items]
+    return columns
+
+
+def _extract_columns(extractor: ExcelTextExtractor, file_path: str) -> Tuple[Dict[str, list], bool]:
+    """提取单个文件，返回 (按列存放的结果, 是否来自缓存)"""
+    cache = extractor.extraction_cache
+    hits = cache.hits if cache is not None else 0
+    columns = extraction_columns(extractor, extractor.extract_text_from_excel(file_path))
+    return columns, cache is not None and cache.hits > hits
+
+
+def _init_worker(cache_dir: Optional[str]):
+    """工作进程初始化：每个进程创建一次提取器"""
+    global _worker_extractor
+    _worker_extractor = ExcelTextExtractor(cache_dir=cache_dir)
+
+
+def _extract_file(file_path: str) -> Tuple[Dict[str, list], bool]:
+    """在工作进程中提取单个文件"""
+    return _extract_columns(_worker_extractor, file_path)
+
+
+class MultiLanguageResult:
+    """多语言提取结果：每种语言一个按列存放的 DataFrame"""
+
+    def __init__(self, frames: Dict[str, pd.DataFrame], files_found: Dict[str, int],
+                 errors: Dict[str, str], elapsed: float, cache_stats: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            frames: 语言代码 -> EXTRACTION_COLUMNS 列的 DataFrame
+            files_found: 语言代码 -> 找到的表格文件数
+            errors: 语言代码 -> 无法提取该语言时的错误信息
+            elapsed: 提取耗时（秒）
+            cache_stats: 使用缓存时的命中/未命中文件数与缓存目录统计（见 tools.extraction_cache.cache_report）
+        """
+        self.frames = frames
+        self.files_found = files_found
+        self.errors = errors
+        self.elapsed = elapsed
+        self.cache_stats = cache_stats
+
+    def text_count(self, lang: str) -> int:
+        """该语言提取到的文本数"""
+        frame = self.frames.get(lang)
+        return len(frame) if frame is not None else 0
+
+    def file_count(self, lang: str) -> int:
+        """该语言提取到文本的文件数"""
+        frame = self.frames.get(lang)
+        return frame['name'].nunique() if frame is not None else 0
+
+    def base_language(self, languages: Sequence[str] = SUMMARY_LANGUAGES) -> Optional[str]:
+        """第一个有数据的语言（汇总表的基准语言）"""
+        return next((lang for lang in languages if self.text_count(lang)), None)
+
+    def align(self, languages: Sequence[str] = SUMMARY_LANGUAGES) -> Optional['LanguageAlignment']:
+        """
+        按 (文件, 工作表, A列ID, 字段名) 对齐各语言的文本，ID 对不上时按位置对齐
+
+        Args:
+            languages: 输出的语言列（按优先级排列）
+
+        Returns:
+            对齐结果；没有任何数据时为 None
+        """
+        base_lang = self.base_language(languages)
+        if base_lang is None:
+            return None
+        return align_language_frames(self.frames, base_lang, languages)
+
+    def merge(self, languages: Sequence[str] = SUMMARY_LANGUAGES,
+              by: str = MATCH_BY_ID) -> Tuple[Optional[str], pd.DataFrame]:
+        """
+        对齐各语言的文本（汇总表：name | num | cn | vn | en | th）
+
+        Args:
+            languages: 输出的语言列（按优先级排列）
+            by: MATCH_BY_ID 按 ID 对齐（对不上时按位置）；MATCH_BY_POSITION 只按位置对齐
+
+        Returns:
+            (基准语言, 汇总 DataFrame)；没有任何数据时基准语言为 None
+        """
+        base_lang = self.base_language(languages)
+        if base_lang is None:
+            return None, pd.DataFrame(columns=['name', 'num', *languages])
+        if by == MATCH_BY_POSITION:
+            return base_lang, merge_language_frames(self.frames, base_lang, languages)
+        return base_lang, align_language_frames(self.frames, base_lang, languages).summary
+
+
+class MultiLanguageExtractor:
+    """多语言文本提取引擎：所有语言、所有文件在一个进程池中并行提取"""
+
+    def __init__(self, workers: Optional[int] = None,
+                 progress_callback: Optional[Callable[[int, int, str, str], None]] = None,
+                 cache_dir: Optional[str] = None):
+        """
+        Args:
+            workers: 进程数（None 时为 CPU 核数；1 时在当前进程中依次提取）
+            progress_callback: 进度回调，每完成一个文件调用一次 (已完成数, 总文件数, 文件名, 消息)
+            cache_dir: 提取结果缓存目录（None 时不使用缓存）
+        """
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.progress_callback = progress_callback
+        self.cache_dir = cache_dir
+
+    def _report_progress(self, current: int, total: int, filename: str, message: str):
+        if self.progress_callback:
+            self.progress_callback(current, total, filename, message)
+
+    def _discover(self, languages: Dict[str, str]) -> Tuple[List[Tuple[str, int, str]], Dict[str, int],
+                                                            Dict[str, str]]:
+        """列出各语言要提取的文件：(语言代码, 序号, 文件路径)"""
+        discovery = ExcelTextExtractor()
+        tasks, files_found, errors = [], {}, {}
+        for lang, path in languages.items():
+            try:
+                file_paths = [path] if os.path.isfile(path) else discovery.scan_directory(path)
+            except Exception as e:
+                errors[lang] = str(e)
+                continue
+            files_found[lang] = len(file_paths)
+            tasks += [(lang, index, file_path) for index, file_path in enumerate(file_paths)]
+        return tasks, files_found, errors
+
+    def extract(self, languages: Dict[str, str]) -> MultiLanguageResult:
+        """
+        提取各语言版本的全部表格
+
+        Args:
+            languages: 语言代码 -> 表格目录或单个表格文件路径
+
+        Returns:
+            MultiLanguageResult: 每种语言的提取结果
+        """
+        start_time = time.time()
+        tasks, files_found, errors = self._discover(languages)
+        total = len(tasks)
+        self._report_progress(0, total, "多语言提取", f"开始提取 {len(files_found)} 种语言的 {total} 个文件")
+
+        results: Dict[Tuple[str, int], Dict[str, list]] = {}
+        cache_stats = {'cache_hits': 0, 'cache_misses': 0} if self.cache_dir else None
+
+        def file_done(current: int, lang: str, index: int, file_path: str, columns: Dict[str, list],
+                      cache_hit: bool):
+            results[lang, index] = columns
+            if cache_stats is not None:
+                cache_stats['cache_hits' if cache_hit else 'cache_misses'] += 1
+            self._report_file_done(current, total, lang, file_path, columns, cache_hit)
+
+        if self.workers <= 1 or total <= 1:
+            local_extractor = ExcelTextExtractor(cache_dir=self.cache_dir)
+            for current, (lang, index, file_path) in enumerate(tasks, 1):
+                file_done(current, lang, index, file_path, *_extract_columns(local_extractor, file_path))
+        else:
+            # 大文件先提交，避免最后才开始的大文件拖长总耗时
+            ordered = sorted(tasks, key=lambda task: _file_size(task[2]), reverse=True)
+            with ProcessPoolExecutor(max_workers=min(self.workers, total), initializer=_init_worker,
+                                     initargs=(self.cache_dir,)) as executor:
+                futures = {executor.submit(_extract_file, file_path): (lang, index, file_path)
+                           for lang, index, file_path in ordered}
+                for current, future in enumerate(as_completed(futures), 1):
+                    lang, index, file_path = futures[future]
+                    try:
+                        columns, cache_hit = future.result()
+                    except Exception as e:
+                        logger.error(f"提取文件失败: {file_path}: {e}")
+                        self._report_progress(current, total, f"[{lang}] {os.path.basename(file_path)}",
+                                              f"提取失败: {e}")
+                        continue
+                    file_done(current, lang, index, file_path, columns, cache_hit)
+
+        frames = {lang: self._assemble(lang, tasks, results) for lang in files_found}
+        if cache_stats is not None:
+            # 清理长期未使用的条目（修改前的旧内容），并统计缓存目录大小
+            cache_stats.update(ExtractionCache(self.cache_dir).prune())
+        elapsed = time.time() - start_time
+        message = f"提取完成，共 {sum(len(frame) for frame in frames.values())} 个文本，耗时 {elapsed:.2f} 秒"
+        if cache_stats is not None:
+            message += f"；{cache_report(cache_stats)}"
+        self._report_progress(total, total, "多语言提取", message)
+        return MultiLanguageResult(frames, files_found, errors, elapsed, cache_stats)
+
+    def _report_file_done(self, current: int, total: int, lang: str, file_path: str, columns: Dict[str, list],
+                          cache_hit: bool = False):
+        count = len(columns['text'])
+        message = f"完成，提取 {count} 个文本" if count else "完成，未提取到文本"
+        if cache_hit:
+            message += "（来自缓存）"
+        self._report_progress(current, total, f"[{lang}] {os.path.basename(file_path)}", message)
+
+    @staticmethod
+    def _assemble(lang: str, tasks: List[Tuple[str, int, str]],
+                  results: Dict[Tuple[str, int], Dict[str, list]]) -> pd.DataFrame:
+        """按发现顺序拼接一种语言各文件的结果（同名文件以后出现的为准，与按文件名建字典一致）"""
+        by_name: Dict[str, Dict[str, list]] = {}
+        for task_lang, index, file_path in tasks:
+            columns = results.get((task_lang, index))
+            if task_lang != lang or not columns or not columns['text']:
+                continue
+            by_name[os.path.splitext(os.path.basename(file_path))[0]] = columns
+
+        data = {column: [] for column in EXTRACTION_COLUMNS}
+        for file_name, columns in by_name.items():
+            data['name'] += [file_name] * len(columns['text'])
+            for column in EXTRACTION_COLUMNS[1:]:
+                data[column] += columns[column]
+        return pd.DataFrame(data, columns=EXTRACTION_COLUMNS, dtype=object)
+
+
+class LanguageAlignment:
+    """各语言文本的对齐结果"""
+
+    def __init__(self, base_lang: str, summary: pd.DataFrame, match_counts: Dict[str, Dict[str, int]],
+                 unmatched: pd.DataFrame):
+        """
+        Args:
+            base_lang: 基准语言
+            summary: 汇总表（name | num | 各语言）
+            match_counts: 有数据的语言代码 -> {'id': 按 ID 对齐数, 'position': 按位置对齐数,
+                          'missing': 缺少译文数, 'extra': 未对应文本数}
+            unmatched: 未对齐文本报告（UNMATCHED_COLUMNS 列）
+        """
+        self.base_lang = base_lang
+        self.summary = summary
+        self.match_counts = match_counts
+        self.unmatched = unmatched
+
+    def report(self) -> str:
+        """各语言对齐情况"""
+        lines = [f"基准语言: {self.base_lang}"]
+        for lang, counts in self.match_counts.items():
+            lines.append(f"{lang}: 按ID对齐 {counts['id']} 个，按位置对齐 {counts['position']} 个，"
+                         f"缺少译文 {counts['missing']} 个，未对应 {counts['extra']} 个")
+        return "\n".join(lines)
+
+
+def _key_codes(base: pd.DataFrame, other: pd.DataFrame, keys: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    把两种语言的多列连接键编码为同一组整数（逐列联合 factorize，编码始终小于两边的行数之和），
+    之后只需按一个整数列连接
+    """
+    codes = np.zeros(len(base) + len(other), dtype=np.int64)
+    for key in keys:
+        column_codes, uniques = pd.factorize(pd.concat([base[key], other[key]], ignore_index=True))
+        # 空值的编码为 -1，加 1 后单独占一个编码
+        codes, _ = pd.factorize(codes * (len(uniques) + 1) + (column_codes + 1))
+    return codes[:len(base)], codes[len(base):]
+
+
+def _join_rows(base_codes: np.ndarray, base_rows: np.ndarray, other_codes: np.ndarray,
+               other_rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """按整数键连接，同一个键在两边按出现顺序一一对应；返回对应的 (基准语言行号, 该语言行号)"""
+    base_keys = pd.DataFrame({'key': base_codes, 'row': base_rows})
+    other_keys = pd.DataFrame({'key': other_codes, 'row': other_rows})
+    base_keys['occurrence'] = base_keys.groupby('key', sort=False).cumcount()
+    other_keys['occurrence'] = other_keys.groupby('key', sort=False).cumcount()
+    joined = base_keys.merge(other_keys, on=['key', 'occurrence'], suffixes=('_base', '_other'), sort=False)
+    return joined['row_base'].to_numpy(dtype=np.int64), joined['row_other'].to_numpy(dtype=np.int64)
+
+
+def _match_rows(base: pd.DataFrame, other: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    对齐两种语言的文本（哈希连接，耗时与文本数成线性关系）
+
+    1. 有 ID 的文本按 (文件, 工作表, A列ID, 字段名) 连接，同一个键出现多次时按出现顺序一一对应
+    2. 剩余的文本按 (文件, 工作表, 位置) 连接，只使用尚未对应的文本，且两边的 ID 相同或有一边没有 ID
+       （ID 不同说明是不同的记录，不按位置对应）
+
+    Returns:
+        (基准语言的行号, 对应的该语言行号, 对齐方式)，对齐方式为 MATCH_BY_ID / MATCH_BY_POSITION
+    """
+    base_ids = base['a_column'].to_numpy()
+    other_ids = other['a_column'].to_numpy()
+    base_codes, other_codes = _key_codes(base, other, ALIGNMENT_KEYS)
+    base_keyed = np.flatnonzero(base_ids != '')
+    other_keyed = np.flatnonzero(other_ids != '')
+    id_base, id_other = _join_rows(base_codes[base_keyed], base_keyed, other_codes[other_keyed], other_keyed)
+
+    base_left = np.ones(len(base), dtype=bool)
+    base_left[id_base] = False
+    other_left = np.ones(len(other), dtype=bool)
+    other_left[id_other] = False
+    base_rest = np.flatnonzero(base_left)
+    other_rest = np.flatnonzero(other_left)
+    base_codes, other_codes = _key_codes(base.iloc[base_rest], other.iloc[other_rest], POSITION_KEYS)
+    # 同一位置只保留该语言中第一条尚未对应的文本
+    first = ~pd.Series(other_codes).duplicated(keep='first').to_numpy()
+    position_base, position_other = _join_rows(base_codes, base_rest, other_codes[first], other_rest[first])
+    same_record = ((base_ids[position_base] == other_ids[position_other])
+                   | (base_ids[position_base] == '') | (other_ids[position_other] == ''))
+    position_base, position_other = position_base[same_record], position_other[same_record]
+
+    methods = np.array([MATCH_BY_ID] * len(id_base) + [MATCH_BY_POSITION] * len(position_base), dtype=object)
+    return np.concatenate([id_base, position_base]), np.concatenate([id_other, position_other]), methods
+
+
+def _unmatched_rows(lang: str, status: str, frame: pd.DataFrame, matched: np.ndarray) -> pd.DataFrame:
+    """frame 中未对应的文本（按原顺序）"""
+    unmatched = frame.loc[~matched, UNMATCHED_COLUMNS[2:]]
+    return unmatched.assign(lang=lang, status=status)[UNMATCHED_COLUMNS]
+
+
+def align_language_frames(frames: Dict[str, pd.DataFrame], base_lang: str,
+                          languages: Sequence[str] = SUMMARY_LANGUAGES) -> LanguageAlignment:
+    """
+    以基准语言为准对齐各语言的提取文本：
+
+    - 按 (文件, 工作表, A列ID, 字段名) 连接，某个版本插入或删除了行时其后的文本仍能对上
+    - ID 为空或对不上的文本按 (文件, 工作表, 位置) 连接（见 _match_rows）
+    - 两种方式都对不上的文本列入未对齐报告：基准语言中缺少译文的、其他语言中未对应到基准语言的
+
+    Args:
+        frames: 语言代码 -> EXTRACTION_COLUMNS 列的 DataFrame（按提取顺序）
+        base_lang: 基准语言
+        languages: 输出的语言列（按优先级排列）
+
+    Returns:
+        LanguageAlignment: 汇总表（与 merge_language_frames 相同的列）、各语言对齐数与未对齐报告
+    """
+    base = frames[base_lang].reset_index(drop=True)
+    summary = base[['name', 'num']].copy()
+    match_counts = {}
+    reports = []
+    for lang in languages:
+        if lang == base_lang:
+            summary[lang] = base['text'].to_numpy()
+            continue
+        other = frames.get(lang)
+        if other is None or other.empty:
+            # 没有该语言的数据（未配置或未提取到文本）时不列入报告
+            summary[lang] = ''
+            continue
+        other = other.reset_index(drop=True)
+
+        base_rows, other_rows, methods = _match_rows(base, other)
+        texts = np.full(len(base), '', dtype=object)
+        texts[base_rows] = other['text'].to_numpy()[other_rows]
+        summary[lang] = texts
+
+        base_matched = np.zeros(len(base), dtype=bool)
+        base_matched[base_rows] = True
+        other_matched = np.zeros(len(other), dtype=bool)
+        other_matched[other_rows] = True
+        reports.append(_unmatched_rows(lang, STATUS_MISSING, base, base_matched))
+        reports.append(_unmatched_rows(lang, STATUS_EXTRA, other, other_matched))
+        by_id = int(np.count_nonzero(methods == MATCH_BY_ID))
+        match_counts[lang] = {
+            'id': by_id,
+            'position': len(methods) - by_id,
+            'missing': int(len(base) - base_matched.sum()),
+            'extra': int(len(other) - other_matched.sum()),
+        }
+
+    unmatched = (pd.concat(reports, ignore_index=True) if reports
+                 else pd.DataFrame(columns=UNMATCHED_COLUMNS, dtype=object))
+    return LanguageAlignment(base_lang, summary[['name', 'num', *languages]], match_counts, unmatched)
+
+
+def _file_size(file_path: str) -> int:
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
+
+
+def create_summary_header_style(name: str = "translation_summary_header") -> NamedStyle:
+    """
+    创建汇总表标题行样式（蓝底白色粗体、居中）
+
+    Args:
+        name: 命名样式名称
+
+    Returns:
+        NamedStyle: 标题行命名样式
+    """
+    return NamedStyle(
+        name=name,
+        font=Font(bold=True, color="FFFFFF", size=11),
+        fill=PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid"),
+        alignment=Alignment(horizontal='center', vertical='center'),
+    )
+
+
+def write_summary_workbook(summary: pd.DataFrame, output_path) -> int:
+    """
+    流式写出汇总表（write_only 模式）：标题行样式与列宽在写入数据前设置，
+    数据行直接从 DataFrame 各列逐行写入，不再复制一份数据，也不需要写出后重新打开设置格式
+
+    Args:
+        summary: MultiLanguageResult.merge 得到的汇总 DataFrame
+        output_path: 输出文件路径
+
+    Returns:
+        int: 写入的数据行数
+    """
+    # 空值（NaN）与 to_excel 一样写为空单元格；只有含空值的列才转换
+    columns = []
+    for column in summary.columns:
+        values = summary[column]
+        if values.isna().any():
+            values = values.astype(object).where(values.notna(), None)
+        columns.append(values.to_numpy())
+
+    writer = ScanReportWriter(SUMMARY_SHEET_TITLE, [str(column) for column in summary.columns],
+                              SUMMARY_COLUMN_WIDTHS, header_style=create_summary_header_style(),
+                              freeze_header=False, style_body=False)
+    return writer.write(zip(*columns), Path(output_path))